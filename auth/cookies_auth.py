@@ -8,20 +8,30 @@ import re
 from typing import Dict, Optional
 
 import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+
+try:
+    from .session_pool import new_session, pooled_session
+except ImportError:
+    from auth.session_pool import new_session, pooled_session
 
 # Configuration du logger
 logger = logging.getLogger(__name__)
 
 
-def build_session_from_cookie_header(cookie_header: str) -> requests.Session:
+def build_session_from_cookie_header(cookie_header: str, pooled: bool = False) -> requests.Session:
     """
     Construit une session requests authentifiée à partir d'un header cookie.
 
+    Par défaut la session est indépendante: l'appelant peut modifier ses headers ou
+    ses cookies. Avec pooled=True, elle provient du registre partagé
+    (auth.session_pool): les appels suivants avec les mêmes cookies, y compris
+    fetch_wigor_html, réutilisent ses connexions keep-alive, mais toute modification
+    de la session est vue par ses autres utilisateurs.
+
     Args:
         cookie_header (str): Header cookie brut copié depuis l'onglet Network
                            Format: "ASP.NET_SessionId=value; .DotNetCasClientAuth=value; ..."
+        pooled (bool): Utiliser la session partagée (défaut: session indépendante)
 
     Returns:
         requests.Session: Session configurée avec les cookies et headers appropriés
@@ -32,27 +42,6 @@ def build_session_from_cookie_header(cookie_header: str) -> requests.Session:
     if not cookie_header:
         raise ValueError("Le header cookie ne peut pas être vide")
 
-    # Créer la session
-    session = requests.Session()
-
-    # Configuration des headers pour imiter Chrome
-    session.headers.update(
-        {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
-            "Accept-Language": "fr-FR,fr;q=0.9,en;q=0.8",
-            "Accept-Encoding": "gzip, deflate, br",
-            "DNT": "1",
-            "Connection": "keep-alive",
-            "Upgrade-Insecure-Requests": "1",
-            "Sec-Fetch-Dest": "document",
-            "Sec-Fetch-Mode": "navigate",
-            "Sec-Fetch-Site": "none",
-            "Sec-Fetch-User": "?1",
-            "Cache-Control": "max-age=0",
-        }
-    )
-
     # Parser les cookies depuis le header
     cookies = _parse_cookie_header(cookie_header)
 
@@ -64,21 +53,10 @@ def build_session_from_cookie_header(cookie_header: str) -> requests.Session:
         logger.warning(f"Cookies essentiels manquants: {missing_cookies}")
         # Ne pas lever d'exception, certains cookies peuvent être optionnels selon le contexte
 
-    # Ajouter les cookies à la session
-    for name, value in cookies.items():
-        session.cookies.set(name, value)
-
-    # Configuration de retry strategy
-    retry_strategy = Retry(
-        total=3,
-        backoff_factor=1,
-        status_forcelist=[429, 500, 502, 503, 504],
-    )
-    adapter = HTTPAdapter(max_retries=retry_strategy)
-    session.mount("http://", adapter)
-    session.mount("https://", adapter)
+    # Session avec headers Chrome, cookies et retry strategy
+    session = pooled_session(cookies) if pooled else new_session(cookies)
 
-    logger.info(f"Session créée avec {len(cookies)} cookies")
+    logger.info(f"Session {'mutualisée' if pooled else 'créée'} avec {len(cookies)} cookies")
     logger.debug(f"Cookies configurés: {list(cookies.keys())}")
 
     return session
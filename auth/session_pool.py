@@ -0,0 +1,313 @@
+"""
+Module de mutualisation des sessions HTTP Wigor.
+Un registre partagé par le processus associe une session requests (connexions
+keep-alive, stratégie de retry) à l'empreinte des cookies de l'utilisateur.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Configuration du logger
+logger = logging.getLogger(__name__)
+
+# Désactivation du registre: WIGOR_SESSION_POOL=0 (ou off, false, no)
+SESSION_POOL_ENV_VAR = "WIGOR_SESSION_POOL"
+
+# Nombre maximal de sessions conservées (une par jeu de cookies)
+DEFAULT_MAX_SESSIONS = 16
+
+# Durée d'inactivité après laquelle une session est fermée (secondes)
+DEFAULT_IDLE_TTL = 600.0
+
+# Pools urllib3 par session: nombre d'hôtes et connexions keep-alive par hôte
+DEFAULT_POOL_CONNECTIONS = 4
+DEFAULT_POOL_MAXSIZE = 8
+
+# Headers pour imiter Chrome
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
+    "Accept-Language": "fr-FR,fr;q=0.9,en;q=0.8",
+    "Accept-Encoding": "gzip, deflate, br",
+    "DNT": "1",
+    "Connection": "keep-alive",
+    "Upgrade-Insecure-Requests": "1",
+    "Sec-Fetch-Dest": "document",
+    "Sec-Fetch-Mode": "navigate",
+    "Sec-Fetch-Site": "none",
+    "Sec-Fetch-User": "?1",
+    "Cache-Control": "max-age=0",
+}
+
+
+def cookie_fingerprint(cookies: Dict[str, str]) -> str:
+    """
+    Calcule l'empreinte d'un jeu de cookies (indépendante de leur ordre).
+
+    Seule l'empreinte est conservée comme clé: les valeurs des cookies
+    n'apparaissent ni dans le registre ni dans les logs.
+
+    Args:
+        cookies (Dict[str, str]): Cookies {nom: valeur}
+
+    Returns:
+        str: Empreinte SHA-256 hexadécimale
+    """
+    digest = hashlib.sha256()
+    for name, value in sorted(cookies.items()):
+        digest.update(f"{name}={value}\x00".encode("utf-8", "surrogatepass"))
+    return digest.hexdigest()
+
+
+def new_session(
+    cookies: Optional[Dict[str, str]] = None,
+    pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+    pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+) -> requests.Session:
+    """
+    Construit une session configurée (headers, cookies, retry, pools de connexions).
+
+    Args:
+        cookies (Optional[Dict[str, str]]): Cookies à installer dans la session
+        pool_connections (int): Nombre d'hôtes dont les connexions sont conservées
+        pool_maxsize (int): Connexions keep-alive conservées par hôte
+
+    Returns:
+        requests.Session: Nouvelle session
+    """
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+
+    for name, value in (cookies or {}).items():
+        session.cookies.set(name, value)
+
+    # Configuration de retry strategy
+    retry_strategy = Retry(
+        total=3,
+        backoff_factor=1,
+        status_forcelist=[429, 500, 502, 503, 504],
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=retry_strategy,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    return session
+
+
+class _PooledSession:
+    """Session du registre et date de dernière utilisation."""
+
+    __slots__ = ("session", "last_used")
+
+    def __init__(self, session: requests.Session, last_used: float):
+        self.session = session
+        self.last_used = last_used
+
+
+class SessionPool:
+    """
+    Registre de sessions HTTP indexé par l'empreinte des cookies.
+
+    Les appels successifs avec les mêmes cookies réutilisent la même session, donc
+    ses connexions TCP/TLS déjà ouvertes. Les sessions inactives depuis plus de
+    ``idle_ttl`` secondes sont retirées du registre, puis les moins récemment
+    utilisées au-delà de ``max_sessions``. Une session retirée n'est pas fermée:
+    un autre thread peut encore s'en servir, ses connexions sont libérées quand
+    plus personne ne la référence.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = DEFAULT_MAX_SESSIONS,
+        idle_ttl: float = DEFAULT_IDLE_TTL,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+    ):
+        """
+        Initialise le registre.
+
+        Args:
+            max_sessions (int): Nombre maximal de sessions conservées
+            idle_ttl (float): Durée d'inactivité avant fermeture (secondes)
+            pool_connections (int): Hôtes conservés par session (voir new_session)
+            pool_maxsize (int): Connexions keep-alive par hôte (voir new_session)
+
+        Raises:
+            ValueError: Si max_sessions < 1 ou idle_ttl <= 0
+        """
+        if max_sessions < 1:
+            raise ValueError("max_sessions doit être au moins 1")
+        if idle_ttl <= 0:
+            raise ValueError("idle_ttl doit être positif")
+
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._sessions: "OrderedDict[str, _PooledSession]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, cookies: Dict[str, str]) -> requests.Session:
+        """
+        Retourne la session associée aux cookies, créée au premier appel.
+
+        Args:
+            cookies (Dict[str, str]): Cookies {nom: valeur}
+
+        Returns:
+            requests.Session: Session partagée pour ces cookies
+        """
+        key = cookie_fingerprint(cookies)
+        now = time.monotonic()
+
+        with self._lock:
+            self._drop_expired(now)
+            entry = self._sessions.get(key)
+            created = entry is None
+            if created:
+                session = new_session(cookies, self.pool_connections, self.pool_maxsize)
+                entry = self._sessions[key] = _PooledSession(session, now)
+                self.misses += 1
+                self._drop_overflow()
+            else:
+                entry.last_used = now
+                self._sessions.move_to_end(key)
+                self.hits += 1
+
+        if created:
+            logger.debug(f"Nouvelle session mutualisée {key[:12]} ({len(cookies)} cookies)")
+        return entry.session
+
+    def _drop_expired(self, now: float):
+        """Retire les sessions inactives depuis plus de idle_ttl (verrou tenu)."""
+        while self._sessions:
+            key, entry = next(iter(self._sessions.items()))
+            if now - entry.last_used <= self.idle_ttl:
+                break
+            del self._sessions[key]
+            self.evictions += 1
+
+    def _drop_overflow(self):
+        """Retire les sessions les moins récemment utilisées au-delà de max_sessions."""
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+            self.evictions += 1
+
+    @staticmethod
+    def _close(sessions: list):
+        """Ferme des sessions retirées du registre (hors verrou)."""
+        for session in sessions:
+            try:
+                session.close()
+            except Exception as e:
+                logger.debug(f"Fermeture de session impossible: {e}")
+
+    def close_all(self):
+        """Ferme et oublie toutes les sessions du registre."""
+        with self._lock:
+            sessions = [entry.session for entry in self._sessions.values()]
+            self._sessions.clear()
+        self._close(sessions)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Statistiques du registre.
+
+        Returns:
+            Dict[str, int]: {"sessions", "hits", "misses", "evictions"}
+        """
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+# Registre par défaut du processus
+_default_pool: Optional[SessionPool] = None
+_default_pool_lock = threading.Lock()
+
+
+def get_session_pool() -> Optional[SessionPool]:
+    """
+    Retourne le registre de sessions du processus.
+
+    Returns:
+        Optional[SessionPool]: Registre partagé, ou None si désactivé par WIGOR_SESSION_POOL
+    """
+    if os.environ.get(SESSION_POOL_ENV_VAR, "").strip().lower() in ("0", "off", "false", "no"):
+        return None
+
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = SessionPool()
+        return _default_pool
+
+
+def configure_session_pool(**options) -> SessionPool:
+    """
+    Remplace le registre du processus par un registre configuré.
+
+    Les sessions de l'ancien registre sont fermées.
+
+    Args:
+        **options: Paramètres de SessionPool (max_sessions, idle_ttl,
+            pool_connections, pool_maxsize)
+
+    Returns:
+        SessionPool: Nouveau registre
+    """
+    global _default_pool
+    pool = SessionPool(**options)
+    with _default_pool_lock:
+        previous, _default_pool = _default_pool, pool
+    if previous is not None:
+        previous.close_all()
+    return pool
+
+
+def reset_session_pool():
+    """Ferme les sessions du registre du processus et l'oublie."""
+    global _default_pool
+    with _default_pool_lock:
+        previous, _default_pool = _default_pool, None
+    if previous is not None:
+        previous.close_all()
+
+
+def pooled_session(cookies: Dict[str, str]) -> requests.Session:
+    """
+    Retourne une session pour ces cookies, mutualisée si le registre est actif.
+
+    Args:
+        cookies (Dict[str, str]): Cookies {nom: valeur}
+
+    Returns:
+        requests.Session: Session du registre, ou nouvelle session si désactivé
+    """
+    pool = get_session_pool()
+    if pool is None:
+        return new_session(cookies)
+    return pool.get(cookies)
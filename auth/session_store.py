@@ -0,0 +1,351 @@
+"""
+Module de stockage chiffré des sessions Wigor authentifiées.
+Les cookies obtenus après la connexion CAS sont conservés sur disque, chiffrés
+(Fernet, bibliothèque cryptography), par utilisateur et hôte Wigor,
+avec leur date d'expiration: un nouveau lancement réutilise la session sans
+refaire la chaîne de redirections CAS.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+from urllib.parse import urlparse
+
+import requests
+
+try:
+    from cryptography.fernet import Fernet, InvalidToken
+
+    CRYPTOGRAPHY_AVAILABLE = True
+except ImportError:  # pragma: no cover - dépend de l'environnement
+    Fernet = None
+    InvalidToken = ValueError
+    CRYPTOGRAPHY_AVAILABLE = False
+
+# Configuration du logger
+logger = logging.getLogger(__name__)
+
+# Désactivation du stockage: WIGOR_SESSION_STORE=0 (ou off, false, no)
+SESSION_STORE_ENV_VAR = "WIGOR_SESSION_STORE"
+
+# Répertoire du stockage (défaut: ~/.cache/wigor_viewer/sessions)
+SESSION_STORE_DIR_ENV_VAR = "WIGOR_SESSION_STORE_DIR"
+
+# Clé Fernet (base64 urlsafe, 32 octets); défaut: fichier store.key du répertoire
+SESSION_KEY_ENV_VAR = "WIGOR_SESSION_KEY"
+
+# Durée de vie d'une session sans cookie daté (secondes)
+DEFAULT_SESSION_TTL = 8 * 3600.0
+
+_KEY_FILE = "store.key"
+_SESSION_SUFFIX = ".session"
+
+
+def wigor_host(url: str) -> str:
+    """
+    Hôte Wigor d'une URL (clé du stockage avec l'utilisateur).
+
+    Args:
+        url (str): URL Wigor ou nom d'hôte
+
+    Returns:
+        str: Nom d'hôte en minuscules
+    """
+    return (urlparse(url).netloc or url).lower()
+
+
+class StoredSession:
+    """
+    Session authentifiée conservée dans le stockage.
+
+    Attributes:
+        user: Identifiant de l'utilisateur
+        host: Hôte Wigor
+        cookies: Cookies de la session {nom: valeur}
+        stored_at: Date d'enregistrement (epoch)
+        expires_at: Date d'expiration (epoch)
+    """
+
+    __slots__ = ("user", "host", "cookies", "stored_at", "expires_at")
+
+    def __init__(
+        self,
+        user: str,
+        host: str,
+        cookies: Dict[str, str],
+        stored_at: float,
+        expires_at: float,
+    ):
+        self.user = user
+        self.host = host
+        self.cookies = cookies
+        self.stored_at = stored_at
+        self.expires_at = expires_at
+
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        """
+        Indique si la session a dépassé sa date d'expiration.
+
+        Args:
+            now (Optional[float]): Date courante (epoch, défaut: maintenant)
+
+        Returns:
+            bool: True si expirée
+        """
+        return (time.time() if now is None else now) >= self.expires_at
+
+    def cookie_header(self) -> str:
+        """
+        Cookies au format header.
+
+        Returns:
+            str: Cookies au format "name=value; name2=value2"
+        """
+        return "; ".join(f"{name}={value}" for name, value in self.cookies.items())
+
+    def to_dict(self) -> Dict[str, object]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> "StoredSession":
+        return cls(**{name: data[name] for name in cls.__slots__})
+
+
+class SessionStore:
+    """
+    Stockage chiffré des sessions, un fichier par couple (utilisateur, hôte).
+
+    Les noms de fichiers sont des empreintes: ni l'utilisateur ni l'hôte n'apparaissent
+    en clair. Chaque fichier est écrit de façon atomique avec les droits 0600.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[Union[str, Path]] = None,
+        cipher=None,
+        ttl: float = DEFAULT_SESSION_TTL,
+    ):
+        """
+        Initialise le stockage.
+
+        Args:
+            directory (Optional[Union[str, Path]]): Répertoire du stockage
+                (défaut: WIGOR_SESSION_STORE_DIR, sinon ~/.cache/wigor_viewer/sessions)
+            cipher: Objet avec encrypt(bytes) -> bytes et decrypt(bytes) -> bytes
+                (défaut: Fernet avec la clé WIGOR_SESSION_KEY ou celle du répertoire)
+            ttl (float): Durée de vie d'une session sans cookie daté (secondes)
+
+        Raises:
+            RuntimeError: Si aucun chiffrement n'est fourni et que cryptography
+                n'est pas installé
+        """
+        self.directory = Path(directory) if directory else default_session_store_directory()
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        if cipher is None:
+            if not CRYPTOGRAPHY_AVAILABLE:
+                raise RuntimeError(
+                    "Le stockage des sessions nécessite le module cryptography "
+                    "(pip install cryptography)"
+                )
+            cipher = Fernet(self._load_or_create_key())
+        self._cipher = cipher
+
+    def _load_or_create_key(self) -> bytes:
+        """Clé Fernet: WIGOR_SESSION_KEY, sinon fichier store.key (créé au besoin, 0600)."""
+        env_key = os.environ.get(SESSION_KEY_ENV_VAR, "").strip()
+        if env_key:
+            return env_key.encode("ascii")
+
+        key_path = self.directory / _KEY_FILE
+        try:
+            return key_path.read_bytes().strip()
+        except FileNotFoundError:
+            pass
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        key = Fernet.generate_key()
+        try:
+            # O_EXCL: un autre processus peut avoir créé la clé entre-temps
+            fd = os.open(key_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:
+            return key_path.read_bytes().strip()
+        with os.fdopen(fd, "wb") as f:
+            f.write(key)
+        logger.info(f"🔑 Clé de chiffrement des sessions créée: {key_path}")
+        return key
+
+    def _path(self, user: str, host: str) -> Path:
+        digest = hashlib.sha256(f"{user}\x00{wigor_host(host)}".encode("utf-8")).hexdigest()
+        return self.directory / f"{digest}{_SESSION_SUFFIX}"
+
+    def load(self, user: str, host: str) -> Optional[StoredSession]:
+        """
+        Lit la session d'un utilisateur.
+
+        Une session expirée ou illisible (clé différente, fichier corrompu) est supprimée.
+
+        Args:
+            user (str): Identifiant de l'utilisateur
+            host (str): Hôte ou URL Wigor
+
+        Returns:
+            Optional[StoredSession]: Session encore valide, ou None
+        """
+        path = self._path(user, host)
+        stored = self._read(path)
+        if stored is None:
+            return None
+        if stored.is_expired():
+            logger.info(f"Session stockée expirée pour {user}@{stored.host}")
+            self._unlink(path)
+            return None
+        return stored
+
+    def _read(self, path: Path) -> Optional[StoredSession]:
+        try:
+            token = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning(f"Session stockée illisible ({path.name}): {e}")
+            return None
+
+        try:
+            return StoredSession.from_dict(json.loads(self._cipher.decrypt(token)))
+        except (InvalidToken, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Session stockée invalide supprimée ({path.name}): {e!r}")
+            self._unlink(path)
+            return None
+
+    def save(
+        self,
+        user: str,
+        host: str,
+        cookies: Union[Dict[str, str], requests.cookies.RequestsCookieJar],
+        expires_at: Optional[float] = None,
+    ) -> StoredSession:
+        """
+        Enregistre la session d'un utilisateur.
+
+        Args:
+            user (str): Identifiant de l'utilisateur
+            host (str): Hôte ou URL Wigor
+            cookies (Union[Dict[str, str], RequestsCookieJar]): Cookies de la session;
+                avec un cookie jar, l'expiration la plus proche des cookies est retenue
+            expires_at (Optional[float]): Date d'expiration (défaut: maintenant + ttl,
+                ou expiration des cookies si plus proche)
+
+        Returns:
+            StoredSession: Session enregistrée
+        """
+        now = time.time()
+        if expires_at is None:
+            expires_at = now + self.ttl
+            if isinstance(cookies, requests.cookies.RequestsCookieJar):
+                dated = [cookie.expires for cookie in cookies if cookie.expires]
+                if dated:
+                    expires_at = min(expires_at, min(dated))
+        if isinstance(cookies, requests.cookies.RequestsCookieJar):
+            cookies = {cookie.name: cookie.value for cookie in cookies}
+
+        stored = StoredSession(user, wigor_host(host), dict(cookies), now, float(expires_at))
+        token = self._cipher.encrypt(json.dumps(stored.to_dict()).encode("utf-8"))
+
+        path = self._path(user, host)
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                # mkstemp crée le fichier avec les droits 0600
+                with os.fdopen(fd, "wb") as f:
+                    f.write(token)
+                os.replace(tmp_path, path)
+            except BaseException:
+                self._unlink(Path(tmp_path))
+                raise
+
+        logger.info(f"💾 Session enregistrée pour {user}@{stored.host}")
+        return stored
+
+    def delete(self, user: str, host: str):
+        """
+        Supprime la session d'un utilisateur.
+
+        Args:
+            user (str): Identifiant de l'utilisateur
+            host (str): Hôte ou URL Wigor
+        """
+        self._unlink(self._path(user, host))
+
+    def clear(self):
+        """Supprime toutes les sessions (la clé est conservée)."""
+        for path in self._paths():
+            self._unlink(path)
+
+    def _paths(self) -> List[Path]:
+        try:
+            return list(self.directory.glob(f"*{_SESSION_SUFFIX}"))
+        except OSError:
+            return []
+
+    @staticmethod
+    def _unlink(path: Path):
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+def default_session_store_directory() -> Path:
+    """
+    Répertoire du stockage par défaut.
+
+    Returns:
+        Path: WIGOR_SESSION_STORE_DIR, sinon ~/.cache/wigor_viewer/sessions
+    """
+    env_dir = os.environ.get(SESSION_STORE_DIR_ENV_VAR, "").strip()
+    if env_dir:
+        return Path(env_dir)
+    return Path.home() / ".cache" / "wigor_viewer" / "sessions"
+
+
+# Stockages par défaut, un par répertoire
+_default_stores: Dict[Path, SessionStore] = {}
+_default_stores_lock = threading.Lock()
+
+# L'absence de cryptography n'est signalée qu'une fois par processus
+_missing_cryptography_warned = False
+
+
+def get_session_store() -> Optional[SessionStore]:
+    """
+    Retourne le stockage de sessions par défaut.
+
+    Returns:
+        Optional[SessionStore]: Stockage du répertoire courant, ou None si désactivé
+            par WIGOR_SESSION_STORE ou si cryptography n'est pas installé
+    """
+    if os.environ.get(SESSION_STORE_ENV_VAR, "").strip().lower() in ("0", "off", "false", "no"):
+        return None
+    if not CRYPTOGRAPHY_AVAILABLE:
+        global _missing_cryptography_warned
+        if not _missing_cryptography_warned:
+            _missing_cryptography_warned = True
+            logger.warning(
+                "⚠️ cryptography non installé: sessions non conservées "
+                "(pip install cryptography)"
+            )
+        return None
+
+    directory = default_session_store_directory()
+    with _default_stores_lock:
+        if directory not in _default_stores:
+            _default_stores[directory] = SessionStore(directory)
+        return _default_stores[directory]
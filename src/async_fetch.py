@@ -0,0 +1,332 @@
+"""
+Module de récupération concurrente des emplois du temps Wigor (asyncio).
+Les téléchargements passent par fetch_wigor_page dans un pool de threads, sous une
+limite de concurrence globale et par hôte; le parsing est délégué à un executor
+pour ne jamais bloquer la boucle d'événements.
+"""
+
+import asyncio
+import logging
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from urllib.parse import urlparse
+
+import requests
+
+try:
+    from .course import Course
+    from .fetch_result import FetchResult
+    from .parse_pool import ParsePool
+    from .tracing import span
+    from .wigor_api import fetch_wigor_page
+except ImportError:
+    from src.course import Course
+    from src.fetch_result import FetchResult
+    from src.parse_pool import ParsePool
+    from src.tracing import span
+    from src.wigor_api import fetch_wigor_page
+
+# Configuration du logger
+logger = logging.getLogger(__name__)
+
+# Requêtes simultanées, tous hôtes confondus
+DEFAULT_MAX_CONCURRENCY = 16
+
+# Requêtes simultanées vers un même hôte (<= pool_maxsize des sessions mutualisées)
+DEFAULT_PER_HOST_LIMIT = 4
+
+
+class AsyncWigorFetcher:
+    """
+    Moteur de récupération concurrente des pages Wigor.
+
+    Exemple:
+        async with AsyncWigorFetcher(max_concurrency=32) as fetcher:
+            results = await fetcher.get_timetables([(url, cookie), ...])
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        per_host_limit: int = DEFAULT_PER_HOST_LIMIT,
+        parse_executor: Optional[Executor] = None,
+        parse_pool: Optional[ParsePool] = None,
+    ):
+        """
+        Initialise le moteur.
+
+        Args:
+            max_concurrency (int): Nombre maximal de requêtes simultanées
+            per_host_limit (int): Nombre maximal de requêtes simultanées par hôte
+            parse_executor (Optional[Executor]): Executor du parsing (défaut: un thread
+                dédié; un ProcessPoolExecutor parallélise le parsing sur plusieurs cœurs)
+            parse_pool (Optional[ParsePool]): Pool de processus de parsing, prioritaire sur
+                parse_executor: les pages lui sont transmises en octets et les cours
+                reviennent sous forme compacte (non fermé par le moteur)
+
+        Raises:
+            ValueError: Si une limite est inférieure à 1
+        """
+        if max_concurrency < 1 or per_host_limit < 1:
+            raise ValueError("Les limites de concurrence doivent être au moins 1")
+
+        self.max_concurrency = max_concurrency
+        self.per_host_limit = per_host_limit
+        self._fetch_executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="wigor-fetch"
+        )
+        self._owns_parse_executor = parse_executor is None
+        self._parse_executor = parse_executor or ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="wigor-parse"
+        )
+        self._parse_pool = parse_pool
+        # Sémaphores créés à la première utilisation, dans la boucle courante
+        self._global_limit: Optional[asyncio.Semaphore] = None
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+
+    async def __aenter__(self) -> "AsyncWigorFetcher":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> bool:
+        self.close()
+        return False
+
+    def close(self):
+        """Libère les pools de threads (l'executor de parsing fourni n'est pas fermé)."""
+        self._fetch_executor.shutdown(wait=False)
+        if self._owns_parse_executor:
+            self._parse_executor.shutdown(wait=False)
+
+    def _limits(self, url: str) -> Tuple[asyncio.Semaphore, asyncio.Semaphore]:
+        """Retourne les sémaphores global et par hôte d'une URL."""
+        if self._global_limit is None:
+            self._global_limit = asyncio.Semaphore(self.max_concurrency)
+        host = urlparse(url).netloc.lower()
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.per_host_limit)
+        return self._global_limit, self._host_limits[host]
+
+    async def fetch_html(
+        self, url: str, cookie_header: str = "", session: Optional[requests.Session] = None
+    ) -> str:
+        """
+        Version asynchrone de fetch_wigor_html.
+
+        Args:
+            url (str): URL de la page Wigor à télécharger
+            cookie_header (str): Header cookie au format "k=v; k2=v2" (ignoré si session fournie)
+            session (Optional[requests.Session]): Session existante à réutiliser
+
+        Returns:
+            str: Contenu HTML de la page
+
+        Raises:
+            requests.RequestException: En cas d'erreur lors de la requête
+            ValueError: En cas d'URL invalide
+        """
+        return (await self.fetch_page(url, cookie_header, session)).text
+
+    async def fetch_page(
+        self,
+        url: str,
+        cookie_header: str = "",
+        session: Optional[requests.Session] = None,
+        parser: Optional[str] = None,
+    ) -> FetchResult:
+        """
+        Version asynchrone de fetch_wigor_page.
+
+        Args:
+            url (str): URL de la page Wigor à télécharger
+            cookie_header (str): Header cookie au format "k=v; k2=v2" (ignoré si session fournie)
+            session (Optional[requests.Session]): Session existante à réutiliser
+            parser (Optional[str]): Backend HTML (défaut: WIGOR_HTML_PARSER ou html.parser)
+
+        Returns:
+            FetchResult: Page téléchargée (non parsée)
+
+        Raises:
+            requests.RequestException: En cas d'erreur lors de la requête
+            ValueError: En cas d'URL invalide
+        """
+        if not url:
+            raise ValueError("L'URL ne peut pas être vide")
+
+        global_limit, host_limit = self._limits(url)
+        loop = asyncio.get_running_loop()
+        async with host_limit, global_limit:
+            return await loop.run_in_executor(
+                self._fetch_executor, fetch_wigor_page, url, cookie_header, session, None, parser
+            )
+
+    async def get_timetable(
+        self,
+        url: str,
+        cookie_header: str = "",
+        session: Optional[requests.Session] = None,
+        parser: Optional[str] = None,
+        all_weeks: bool = False,
+    ) -> Dict[str, Union[str, List[Course], Dict[str, List[Course]]]]:
+        """
+        Version asynchrone de get_wigor_timetable.
+
+        Le créneau de concurrence est libéré dès la fin du téléchargement: le parsing
+        se fait dans l'executor de parsing pendant que d'autres pages se téléchargent.
+        Cours et semaines sont extraits du même arbre, en un seul passage dans l'executor.
+
+        Args:
+            url (str): URL de la page Wigor
+            cookie_header (str): Header cookie d'authentification (ignoré si session fournie)
+            session (Optional[requests.Session]): Session existante à réutiliser
+            parser (Optional[str]): Backend HTML (défaut: WIGOR_HTML_PARSER ou html.parser)
+            all_weeks (bool): Extraire aussi toutes les semaines présentes dans la page
+
+        Returns:
+            Dict: Même structure que get_wigor_timetable ('html', 'courses', 'weeks')
+        """
+        page = await self.fetch_page(url, cookie_header, session, parser)
+
+        if self._parse_pool is not None:
+            courses, weeks = await self._parse_pool.parse_async(
+                page.content, page.encoding, all_weeks, page.parser
+            )
+        else:
+            loop = asyncio.get_running_loop()
+            courses, weeks = await loop.run_in_executor(
+                self._parse_executor, _parse_page, page, all_weeks
+            )
+        result = {"html": page.text, "courses": courses}
+
+        if all_weeks:
+            result["weeks"] = weeks
+
+        logger.info(f"Emploi du temps récupéré ({url}): {len(courses)} cours")
+        return result
+
+    async def get_timetables(
+        self,
+        targets: Iterable[Tuple[str, str]],
+        parser: Optional[str] = None,
+        all_weeks: bool = False,
+        return_exceptions: bool = True,
+    ) -> List[Union[Dict[str, object], BaseException]]:
+        """
+        Récupère et parse plusieurs emplois du temps de façon concurrente.
+
+        Args:
+            targets (Iterable[Tuple[str, str]]): Couples (url, cookie_header)
+            parser (Optional[str]): Backend HTML (défaut: WIGOR_HTML_PARSER ou html.parser)
+            all_weeks (bool): Extraire aussi toutes les semaines présentes dans chaque page
+            return_exceptions (bool): Retourner les erreurs à la place des résultats
+                (False: la première erreur est levée)
+
+        Returns:
+            List[Union[Dict[str, object], BaseException]]: Résultats dans l'ordre des cibles
+        """
+        targets = list(targets)
+        with span("async.get_timetables", targets=len(targets)) as trace:
+            results = await asyncio.gather(
+                *(
+                    self.get_timetable(url, cookie_header, parser=parser, all_weeks=all_weeks)
+                    for url, cookie_header in targets
+                ),
+                return_exceptions=return_exceptions,
+            )
+            failures = sum(isinstance(result, BaseException) for result in results)
+            trace.set(failures=failures)
+
+        if failures:
+            logger.warning(f"⚠️ {failures}/{len(targets)} emploi(s) du temps en échec")
+        return results
+
+
+def _parse_page(
+    page: FetchResult, all_weeks: bool
+) -> Tuple[List[Course], Optional[Dict[str, List[Course]]]]:
+    """
+    Parse une page dans l'executor de parsing (fonction de module: compatible processus).
+
+    Args:
+        page (FetchResult): Page téléchargée
+        all_weeks (bool): Extraire aussi toutes les semaines présentes dans la page
+
+    Returns:
+        Tuple[List[Course], Optional[Dict[str, List[Course]]]]: (cours, semaines ou None)
+    """
+    courses = page.courses()
+    return courses, page.weeks() if all_weeks else None
+
+
+async def fetch_wigor_html_async(
+    url: str, cookie_header: str = "", session: Optional[requests.Session] = None
+) -> str:
+    """
+    Télécharge une page Wigor sans bloquer la boucle d'événements.
+
+    Args:
+        url (str): URL de la page Wigor à télécharger
+        cookie_header (str): Header cookie au format "k=v; k2=v2" (ignoré si session fournie)
+        session (Optional[requests.Session]): Session existante à réutiliser
+
+    Returns:
+        str: Contenu HTML de la page
+    """
+    async with AsyncWigorFetcher(max_concurrency=1) as fetcher:
+        return await fetcher.fetch_html(url, cookie_header, session)
+
+
+async def get_wigor_timetable_async(
+    url: str,
+    cookie_header: str = "",
+    session: Optional[requests.Session] = None,
+    parser: Optional[str] = None,
+    all_weeks: bool = False,
+) -> Dict[str, Union[str, List[Course], Dict[str, List[Course]]]]:
+    """
+    Version asynchrone de get_wigor_timetable pour une seule page.
+
+    Args:
+        url (str): URL de la page Wigor
+        cookie_header (str): Header cookie d'authentification (ignoré si session fournie)
+        session (Optional[requests.Session]): Session existante à réutiliser
+        parser (Optional[str]): Backend HTML (défaut: WIGOR_HTML_PARSER ou html.parser)
+        all_weeks (bool): Extraire aussi toutes les semaines présentes dans la page
+
+    Returns:
+        Dict: Même structure que get_wigor_timetable
+    """
+    async with AsyncWigorFetcher(max_concurrency=1) as fetcher:
+        return await fetcher.get_timetable(url, cookie_header, session, parser, all_weeks)
+
+
+def fetch_timetables(
+    targets: Iterable[Tuple[str, str]],
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    per_host_limit: int = DEFAULT_PER_HOST_LIMIT,
+    parser: Optional[str] = None,
+    all_weeks: bool = False,
+    parse_pool: Optional[ParsePool] = None,
+) -> List[Union[Dict[str, object], BaseException]]:
+    """
+    Point d'entrée synchrone: récupère plusieurs emplois du temps en parallèle.
+
+    Args:
+        targets (Iterable[Tuple[str, str]]): Couples (url, cookie_header)
+        max_concurrency (int): Nombre maximal de requêtes simultanées
+        per_host_limit (int): Nombre maximal de requêtes simultanées par hôte
+        parser (Optional[str]): Backend HTML (défaut: WIGOR_HTML_PARSER ou html.parser)
+        all_weeks (bool): Extraire aussi toutes les semaines présentes dans chaque page
+        parse_pool (Optional[ParsePool]): Pool de processus de parsing (défaut: un thread)
+
+    Returns:
+        List[Union[Dict[str, object], BaseException]]: Résultats (ou erreurs) dans
+            l'ordre des cibles
+    """
+
+    async def run():
+        async with AsyncWigorFetcher(
+            max_concurrency, per_host_limit, parse_pool=parse_pool
+        ) as fetcher:
+            return await fetcher.get_timetables(targets, parser=parser, all_weeks=all_weeks)
+
+    return asyncio.run(run())
@@ -0,0 +1,206 @@
+"""
+Module de récupération en lot des emplois du temps de plusieurs groupes.
+Les groupes d'un manifeste sont récupérés et parsés par un pool de threads borné;
+chaque résultat est écrit sur une ligne JSON dès qu'il est disponible, puis un
+bilan agrégé (latences, échecs) est produit à la fin du lot.
+"""
+
+import json
+import logging
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterable, List, Optional, TextIO, Tuple
+
+try:
+    from .service import TimetableGroup
+    from .tracing import span
+    from .wigor_api import get_wigor_timetable
+except ImportError:
+    from src.service import TimetableGroup
+    from src.tracing import span
+    from src.wigor_api import get_wigor_timetable
+
+# Configuration du logger
+logger = logging.getLogger(__name__)
+
+# Récupérations simultanées
+DEFAULT_BATCH_WORKERS = 4
+
+
+class BatchSummary:
+    """
+    Bilan d'un lot.
+
+    Attributes:
+        latencies: Durée de chaque groupe réussi (secondes)
+        failures: (groupe, message d'erreur) de chaque groupe en échec
+        elapsed: Durée totale du lot (secondes)
+    """
+
+    __slots__ = ("latencies", "failures", "elapsed")
+
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.failures: List[Tuple[str, str]] = []
+        self.elapsed = 0.0
+
+    @property
+    def total(self) -> int:
+        """Nombre de groupes traités."""
+        return len(self.latencies) + len(self.failures)
+
+    @property
+    def succeeded(self) -> int:
+        """Nombre de groupes réussis."""
+        return len(self.latencies)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """
+        Latence au rang demandé (méthode du rang le plus proche).
+
+        Args:
+            fraction (float): Rang entre 0 et 1 (0.5 = médiane)
+
+        Returns:
+            Optional[float]: Latence (secondes), None sans groupe réussi
+        """
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))
+        return ordered[index]
+
+    def to_dict(self) -> Dict[str, object]:
+        """
+        Représentation sérialisable en JSON (latences en millisecondes).
+
+        Returns:
+            Dict[str, object]: {"total", "succeeded", "failed", "elapsed_ms", "latency_ms",
+                "failures"}
+        """
+        latency = None
+        if self.latencies:
+            latency = {
+                "min": _ms(min(self.latencies)),
+                "mean": _ms(sum(self.latencies) / len(self.latencies)),
+                "p50": _ms(self.percentile(0.5)),
+                "p95": _ms(self.percentile(0.95)),
+                "max": _ms(max(self.latencies)),
+            }
+        return {
+            "total": self.total,
+            "succeeded": self.succeeded,
+            "failed": len(self.failures),
+            "elapsed_ms": _ms(self.elapsed),
+            "latency_ms": latency,
+            "failures": [{"group": group, "error": error} for group, error in self.failures],
+        }
+
+    def format(self) -> str:
+        """
+        Bilan lisible, pour la console.
+
+        Returns:
+            str: Bilan sur plusieurs lignes
+        """
+        data = self.to_dict()
+        lines = [
+            f"📊 Lot: {data['succeeded']}/{data['total']} groupe(s) réussi(s) "
+            f"en {data['elapsed_ms'] / 1000:.2f} s"
+        ]
+        latency = data["latency_ms"]
+        if latency:
+            lines.append(
+                f"  ⏱️  Latence (ms): min {latency['min']:.0f} · moyenne {latency['mean']:.0f}"
+                f" · p50 {latency['p50']:.0f} · p95 {latency['p95']:.0f}"
+                f" · max {latency['max']:.0f}"
+            )
+        for group, error in self.failures:
+            lines.append(f"  ❌ {group}: {error}")
+        return "\n".join(lines)
+
+
+def _ms(seconds: float) -> float:
+    """Convertit une durée en millisecondes arrondies au dixième."""
+    return round(seconds * 1000, 1)
+
+
+def run_batch(
+    groups: Iterable[TimetableGroup],
+    output: TextIO,
+    max_workers: int = DEFAULT_BATCH_WORKERS,
+    parser: Optional[str] = None,
+    all_weeks: bool = False,
+    fetch: Callable[..., Dict[str, object]] = get_wigor_timetable,
+) -> BatchSummary:
+    """
+    Récupère et parse les emplois du temps des groupes, une ligne JSON par groupe.
+
+    Les lignes sont écrites dans l'ordre de fin des récupérations, dès que chaque
+    groupe est terminé: {"group", "ok": true, "latency_ms", "courses", ...} ou
+    {"group", "ok": false, "latency_ms", "error", "error_type"}. Un groupe en échec
+    n'interrompt pas le lot.
+
+    Args:
+        groups (Iterable[TimetableGroup]): Groupes à récupérer
+        output (TextIO): Flux de sortie des lignes JSON
+        max_workers (int): Récupérations simultanées
+        parser (Optional[str]): Backend HTML (défaut: WIGOR_HTML_PARSER ou html.parser)
+        all_weeks (bool): Inclure toutes les semaines présentes dans chaque page
+        fetch (Callable): Récupération d'un emploi du temps (signature de
+            get_wigor_timetable)
+
+    Returns:
+        BatchSummary: Bilan du lot
+    """
+    groups = list(groups)
+    summary = BatchSummary()
+    started = time.perf_counter()
+
+    def run(
+        group: TimetableGroup,
+    ) -> Tuple[TimetableGroup, float, Optional[Dict[str, object]], Optional[Exception]]:
+        """Récupère un groupe dans le pool: (groupe, latence, résultat, erreur)."""
+        start = time.perf_counter()
+        try:
+            with span("batch.group", group=group.name):
+                result = fetch(
+                    group.url,
+                    group.cookie,
+                    parser=parser,
+                    all_weeks=all_weeks,
+                    credentials=group.credentials,
+                )
+            return group, time.perf_counter() - start, result, None
+        except Exception as e:
+            return group, time.perf_counter() - start, None, e
+
+    with span("batch.run", groups=len(groups), workers=max_workers) as trace:
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="wigor-batch") as pool:
+            futures = [pool.submit(run, group) for group in groups]
+            for future in as_completed(futures):
+                group, latency, result, error = future.result()
+                record = {"group": group.name, "ok": error is None, "latency_ms": _ms(latency)}
+                if error is None:
+                    summary.latencies.append(latency)
+                    record["courses"] = [dict(course) for course in result.get("courses", [])]
+                    if all_weeks:
+                        record["weeks"] = {
+                            week: [dict(course) for course in courses]
+                            for week, courses in (result.get("weeks") or {}).items()
+                        }
+                else:
+                    summary.failures.append((group.name, str(error)))
+                    record["error"] = str(error)
+                    record["error_type"] = type(error).__name__
+                    logger.warning(f"⚠️ Groupe {group.name} en échec: {error}")
+
+                # Écriture dans le thread appelant: les lignes ne se mélangent pas
+                output.write(json.dumps(record, ensure_ascii=False) + "\n")
+                output.flush()
+
+        summary.elapsed = time.perf_counter() - started
+        trace.set(failures=len(summary.failures))
+
+    return summary
@@ -15,16 +15,52 @@ from typing import Optional
 try:
     # Essai import relatif d'abord
     from . import wigor_api
-    from .timetable_parser import parse_wigor_html
+    from .batch import DEFAULT_BATCH_WORKERS, run_batch
+    from .html_backend import SUPPORTED_HTML_PARSERS, benchmark_html_parsers
+    from .parse_cache import parse_wigor_html_cached
+    from .parse_pool import ParsePool, benchmark_parse_scaling
+    from .scheduler import DEFAULT_POLL_INTERVAL, JsonLinesSink, PollingScheduler, log_sink
+    from .service import DEFAULT_SERVICE_PORT, DEFAULT_SERVICE_TTL, load_groups, serve
+    from .timetable_parser import (
+        iso_week_start,
+        parse_wigor_html,
+        parse_wigor_html_weeks,
+        write_courses_ics,
+    )
+    from .tracing import dump_trace, enable_tracing, span
 except ImportError:
     try:
         # Essai import absolu avec src
         import src.wigor_api as wigor_api
-        from src.timetable_parser import parse_wigor_html
+        from src.batch import DEFAULT_BATCH_WORKERS, run_batch
+        from src.html_backend import SUPPORTED_HTML_PARSERS, benchmark_html_parsers
+        from src.parse_cache import parse_wigor_html_cached
+        from src.parse_pool import ParsePool, benchmark_parse_scaling
+        from src.scheduler import DEFAULT_POLL_INTERVAL, JsonLinesSink, PollingScheduler, log_sink
+        from src.service import DEFAULT_SERVICE_PORT, DEFAULT_SERVICE_TTL, load_groups, serve
+        from src.timetable_parser import (
+            iso_week_start,
+            parse_wigor_html,
+            parse_wigor_html_weeks,
+            write_courses_ics,
+        )
+        from src.tracing import dump_trace, enable_tracing, span
     except ImportError:
         # Fallback imports directs
         import wigor_api
-        from timetable_parser import parse_wigor_html
+        from batch import DEFAULT_BATCH_WORKERS, run_batch
+        from html_backend import SUPPORTED_HTML_PARSERS, benchmark_html_parsers
+        from parse_cache import parse_wigor_html_cached
+        from parse_pool import ParsePool, benchmark_parse_scaling
+        from scheduler import DEFAULT_POLL_INTERVAL, JsonLinesSink, PollingScheduler, log_sink
+        from service import DEFAULT_SERVICE_PORT, DEFAULT_SERVICE_TTL, load_groups, serve
+        from timetable_parser import (
+            iso_week_start,
+            parse_wigor_html,
+            parse_wigor_html_weeks,
+            write_courses_ics,
+        )
+        from tracing import dump_trace, enable_tracing, span
 
 # Version de l'application
 __version__ = "2.0.0"
@@ -123,12 +159,13 @@ def smoke_test() -> int:
         return 1
 
 
-def test_parsing(file_path: Optional[str] = None) -> int:
+def test_parsing(file_path: Optional[str] = None, parser: Optional[str] = None) -> int:
     """
     Test du parsing d'un fichier HTML spécifique.
 
     Args:
         file_path: Chemin vers le fichier HTML à tester
+        parser: Backend HTML à utiliser (défaut: WIGOR_HTML_PARSER ou html.parser)
 
     Returns:
         int: Code de retour (0 = succès, 1 = échec)
@@ -150,7 +187,7 @@ def test_parsing(file_path: Optional[str] = None) -> int:
 
         print(f"  📄 Taille du fichier: {len(html_content):,} caractères")
 
-        courses = parse_wigor_html(html_content)
+        courses = parse_wigor_html_cached(html_content, parser=parser)
 
         print(f"  📊 Cours trouvés: {len(courses)}")
 
@@ -174,6 +211,126 @@ def test_parsing(file_path: Optional[str] = None) -> int:
         return 1
 
 
+def bench_parsers(file_path: str, repeat: int = 5) -> int:
+    """
+    Mesure le débit de parsing d'un fichier HTML pour chaque backend disponible.
+
+    Args:
+        file_path: Chemin vers le fichier HTML de référence
+        repeat: Nombre de parsings par backend
+
+    Returns:
+        int: Code de retour (0 = succès, 1 = échec)
+    """
+    file_path = Path(file_path)
+
+    if not file_path.exists():
+        print(f"❌ Fichier non trouvé: {file_path}")
+        return 1
+
+    with open(file_path, "r", encoding="utf-8") as f:
+        html_content = f.read()
+
+    print(f"⏱️  Débit de parsing par backend: {file_path} ({len(html_content):,} caractères)")
+
+    results = benchmark_html_parsers(html_content, parse_wigor_html, repeat=repeat)
+    fastest = min(results, key=lambda name: results[name]["seconds"])
+
+    for name, stats in sorted(results.items(), key=lambda item: item[1]["seconds"]):
+        marker = " ⭐" if name == fastest else ""
+        print(
+            f"  • {name:<12} {stats['seconds'] * 1000:8.1f} ms/page"
+            f"  {stats['pages_per_second']:8.1f} pages/s"
+            f"  {stats['mb_per_second']:6.2f} Mo/s{marker}"
+        )
+
+    missing = [name for name in SUPPORTED_HTML_PARSERS if name not in results]
+    if missing:
+        print(f"  (non installés: {', '.join(missing)})")
+
+    return 0
+
+
+def bench_parse_pool(file_path: str, pages: int = 32) -> int:
+    """
+    Mesure le débit du pool de parsing selon le nombre de processus.
+
+    Args:
+        file_path: Chemin vers le fichier HTML de référence
+        pages: Nombre de copies de la page parsées par mesure
+
+    Returns:
+        int: Code de retour (0 = succès, 1 = échec)
+    """
+    file_path = Path(file_path)
+
+    if not file_path.exists():
+        print(f"❌ Fichier non trouvé: {file_path}")
+        return 1
+
+    content = file_path.read_bytes()
+    print(f"⏱️  Débit du pool de parsing: {file_path} ({pages} pages par mesure)")
+
+    results = benchmark_parse_scaling([content] * pages)
+    for workers, stats in results.items():
+        print(
+            f"  • {workers:>3} processus  {stats['pages_per_second']:8.1f} pages/s"
+            f"  x{stats['speedup']:.2f}"
+        )
+
+    return 0
+
+
+def export_ics(
+    file_path: str,
+    output: str = "-",
+    parser: Optional[str] = None,
+    year: Optional[int] = None,
+) -> int:
+    """
+    Exporte au format iCalendar les cours d'une page Wigor enregistrée.
+
+    Toutes les semaines de la page sont exportées; les événements sont écrits au
+    fil des cours, sans construire le calendrier complet en mémoire. Une page sans
+    cours produit un calendrier vide valide.
+
+    Args:
+        file_path: Chemin vers le fichier HTML Wigor
+        output: Fichier .ics de destination ("-" = sortie standard)
+        parser: Backend HTML à utiliser (défaut: WIGOR_HTML_PARSER ou html.parser)
+        year: Année du premier jour de la page (défaut: année qui le rapproche le
+            plus d'aujourd'hui); les jours suivants peuvent passer à l'année suivante
+
+    Returns:
+        int: Code de retour (0 = succès, 1 = fichier introuvable)
+    """
+    file_path = Path(file_path)
+
+    if not file_path.exists():
+        print(f"❌ Fichier non trouvé: {file_path}", file=sys.stderr)
+        return 1
+
+    with open(file_path, "r", encoding="utf-8") as f:
+        html_content = f.read()
+
+    weeks = parse_wigor_html_weeks(html_content, parser=parser, year=year)
+    courses = (course for week in weeks.values() for course in week)
+    # Années résolues autour de la première semaine de la page (nouvel an compris)
+    reference = iso_week_start(next(iter(weeks))) if weeks else None
+
+    if output == "-":
+        events = write_courses_ics(courses, sys.stdout, reference=reference)
+        sys.stdout.flush()
+    else:
+        # newline="": les fins de ligne CRLF imposées par la RFC 5545 sont conservées
+        with open(output, "w", encoding="utf-8", newline="") as f:
+            events = write_courses_ics(courses, f, reference=reference)
+
+    # Les messages vont sur stderr pour ne pas se mêler au calendrier sur stdout
+    print(f"📆 {events} événement(s) exporté(s) vers {output}", file=sys.stderr)
+    return 0
+
+
 def check_environment() -> int:
     """
     Vérifie l'environnement et les dépendances.
@@ -203,6 +360,19 @@ def check_environment() -> int:
             print(f"  ❌ {description}: MANQUANT")
             missing_deps.append(module)
 
+    # Dépendances optionnelles (backends HTML plus rapides)
+    optional_dependencies = [
+        ("lxml", "Backend HTML lxml"),
+        ("html5lib", "Backend HTML html5lib"),
+    ]
+
+    for module, description in optional_dependencies:
+        try:
+            __import__(module)
+            print(f"  ✓ {description}: OK")
+        except ImportError:
+            print(f"  ➖ {description}: non installé (optionnel)")
+
     # Vérification des fichiers critiques
     project_root = Path(__file__).parent.parent
     critical_files = [
@@ -233,6 +403,108 @@ def check_environment() -> int:
     return 0
 
 
+def serve_timetables(groups_file: str, host: str, port: int, ttl: float) -> int:
+    """
+    Lance le service JSON des emplois du temps.
+
+    Args:
+        groups_file: Configuration des groupes (JSON)
+        host: Adresse d'écoute
+        port: Port d'écoute
+        ttl: Durée de fraîcheur des emplois du temps (secondes)
+
+    Returns:
+        int: Code de retour (0 = arrêt normal, 1 = configuration invalide)
+    """
+    try:
+        groups = load_groups(groups_file)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+
+    logging.getLogger().setLevel(logging.INFO)
+    print(f"🚀 Service sur http://{host}:{port} ({len(groups)} groupe(s): {', '.join(groups)})")
+    serve(groups, host, port, ttl=ttl)
+    return 0
+
+
+def batch_timetables(
+    manifest: str,
+    output: str = "-",
+    workers: int = DEFAULT_BATCH_WORKERS,
+    parser: Optional[str] = None,
+    all_weeks: bool = False,
+    parse_processes: int = 0,
+) -> int:
+    """
+    Récupère en lot les emplois du temps d'un manifeste, une ligne JSON par groupe.
+
+    Args:
+        manifest: Manifeste des groupes (JSON ou JSON lines, format de --serve)
+        output: Fichier des résultats ("-" = sortie standard)
+        workers: Récupérations simultanées
+        parser: Backend HTML à utiliser (défaut: WIGOR_HTML_PARSER ou html.parser)
+        all_weeks: Inclure toutes les semaines présentes dans chaque page
+        parse_processes: Processus de parsing (0 = parsing dans les threads de téléchargement)
+
+    Returns:
+        int: Code de retour (0 = tous les groupes réussis, 1 = au moins un échec)
+    """
+    try:
+        groups = load_groups(manifest)
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+
+    print(f"📦 Lot de {len(groups)} groupe(s), {workers} en parallèle", file=sys.stderr)
+    pool = ParsePool(parse_processes, parser).warm() if parse_processes > 0 else None
+    fetch = pool.get_timetable if pool is not None else wigor_api.get_wigor_timetable
+    try:
+        if output == "-":
+            summary = run_batch(groups.values(), sys.stdout, workers, parser, all_weeks, fetch)
+        else:
+            with open(output, "w", encoding="utf-8") as f:
+                summary = run_batch(groups.values(), f, workers, parser, all_weeks, fetch)
+    finally:
+        if pool is not None:
+            pool.close()
+
+    # Le bilan va sur stderr pour ne pas se mêler aux lignes JSON sur stdout
+    print(summary.format(), file=sys.stderr)
+    return 0 if not summary.failures else 1
+
+
+def watch_timetables(
+    groups_file: str, output: str = "-", interval: float = DEFAULT_POLL_INTERVAL
+) -> int:
+    """
+    Surveille les emplois du temps des groupes et écrit chaque changement en JSON.
+
+    Args:
+        groups_file: Configuration des groupes (JSON, format de --serve)
+        output: Fichier des événements, une ligne JSON par changement ("-" = sortie standard)
+        interval: Intervalle de base entre deux interrogations d'un groupe (secondes)
+
+    Returns:
+        int: Code de retour (0 = arrêt normal, 1 = configuration invalide)
+    """
+    try:
+        groups = load_groups(groups_file)
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+
+    logging.getLogger().setLevel(logging.INFO)
+    sink = JsonLinesSink(sys.stdout if output == "-" else output)
+    scheduler = PollingScheduler([log_sink, sink], interval=interval)
+    for group in groups.values():
+        scheduler.register(group.name, group.url, group.cookie, credentials=group.credentials)
+
+    print(f"👀 Surveillance de {len(groups)} groupe(s): {', '.join(groups)}", file=sys.stderr)
+    scheduler.run_forever()
+    return 0
+
+
 def create_parser() -> argparse.ArgumentParser:
     """Crée le parser d'arguments CLI."""
     parser = argparse.ArgumentParser(
@@ -244,7 +516,15 @@ Exemples:
   wigor-cli --version                    # Affiche la version
   wigor-cli --check                      # Lance le smoke test
   wigor-cli --test-parsing sample.html   # Test de parsing
+  wigor-cli --test-parsing sample.html --parser lxml
+  wigor-cli --bench-parsers sample.html  # Débit de parsing par backend
+  wigor-cli --bench-parse-pool sample.html  # Débit du parsing multi-processus
   wigor-cli --check-env                  # Vérification environnement
+  wigor-cli --test-parsing sample.html --trace trace.json
+  wigor-cli --serve groups.json --port 8080  # Service JSON des emplois du temps
+  wigor-cli --export-ics sample.html --output edt.ics  # Export iCalendar
+  wigor-cli --watch groups.json --output changes.jsonl  # Suivi des changements
+  wigor-cli --batch groups.jsonl --workers 8 --output edt.jsonl  # Récupération en lot
         """,
     )
 
@@ -263,11 +543,117 @@ Exemples:
         "--test-parsing", metavar="FILE", help="Test le parsing d'un fichier HTML spécifique"
     )
 
+    group.add_argument(
+        "--bench-parsers",
+        metavar="FILE",
+        help="Mesure le débit de parsing d'un fichier HTML pour chaque backend",
+    )
+
+    group.add_argument(
+        "--bench-parse-pool",
+        metavar="FILE",
+        help="Mesure le débit du parsing multi-processus selon le nombre de processus",
+    )
+
     group.add_argument(
         "--check-env", action="store_true", help="Vérifie l'environnement et les dépendances"
     )
 
+    group.add_argument(
+        "--serve",
+        metavar="GROUPS",
+        help='Sert les emplois du temps en JSON (GROUPS: {"nom": {"url": ..., "cookie": ...}})',
+    )
+
+    group.add_argument(
+        "--batch",
+        metavar="MANIFEST",
+        help="Récupère en lot les groupes d'un manifeste (une ligne JSON par groupe)",
+    )
+
+    group.add_argument(
+        "--watch",
+        metavar="GROUPS",
+        help="Surveille les emplois du temps des groupes et signale chaque changement (JSON)",
+    )
+
+    group.add_argument(
+        "--export-ics",
+        metavar="FILE",
+        help="Exporte les cours d'un fichier HTML Wigor au format iCalendar (.ics)",
+    )
+
     # Options globales
+    parser.add_argument(
+        "--parser",
+        choices=SUPPORTED_HTML_PARSERS,
+        help="Backend HTML (défaut: variable WIGOR_HTML_PARSER, sinon html.parser)",
+    )
+
+    parser.add_argument(
+        "--trace",
+        metavar="FILE",
+        help="Écrit la durée de chaque étape au format Chrome trace-event (JSON)",
+    )
+
+    parser.add_argument(
+        "--output",
+        "-o",
+        default="-",
+        help="Export iCalendar, lot, surveillance : fichier de destination (défaut: stdout)",
+    )
+
+    parser.add_argument(
+        "--year",
+        type=int,
+        help="Export iCalendar : année des dates (défaut: année courante)",
+    )
+
+    parser.add_argument(
+        "--host", default="0.0.0.0", help="Service : adresse d'écoute (défaut: 0.0.0.0)"
+    )
+
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=DEFAULT_SERVICE_PORT,
+        help=f"Service : port d'écoute (défaut: {DEFAULT_SERVICE_PORT})",
+    )
+
+    parser.add_argument(
+        "--ttl",
+        type=float,
+        default=DEFAULT_SERVICE_TTL,
+        help=f"Service : durée de fraîcheur en secondes (défaut: {DEFAULT_SERVICE_TTL:g})",
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_BATCH_WORKERS,
+        help=f"Lot : récupérations simultanées (défaut: {DEFAULT_BATCH_WORKERS})",
+    )
+
+    parser.add_argument(
+        "--parse-processes",
+        type=int,
+        default=0,
+        help="Lot : parse les pages dans N processus (défaut: 0, dans les threads)",
+    )
+
+    parser.add_argument(
+        "--all-weeks",
+        action="store_true",
+        help="Lot : inclut toutes les semaines présentes dans chaque page",
+    )
+
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=DEFAULT_POLL_INTERVAL,
+        help=f"Surveillance : intervalle de base en secondes (défaut: {DEFAULT_POLL_INTERVAL:g})",
+    )
+
     parser.add_argument(
         "--verbose", "-v", action="store_true", help="Mode verbeux (affiche plus de détails)"
     )
@@ -275,6 +661,30 @@ Exemples:
     return parser
 
 
+def _traced(trace_path: Optional[str], name: str, command, *args) -> int:
+    """
+    Exécute une commande, avec écriture de la trace des étapes si demandée.
+
+    Args:
+        trace_path: Fichier de trace Chrome (None = traçage désactivé)
+        name: Nom du span racine
+        command: Commande à exécuter
+        *args: Arguments de la commande
+
+    Returns:
+        int: Code de retour de la commande
+    """
+    if not trace_path:
+        return command(*args)
+
+    enable_tracing()
+    try:
+        with span(name):
+            return command(*args)
+    finally:
+        dump_trace(trace_path)
+
+
 def main() -> int:
     """
     Point d'entrée principal du CLI.
@@ -300,11 +710,51 @@ def main() -> int:
             return smoke_test()
 
         elif args.test_parsing:
-            return test_parsing(args.test_parsing)
+            return _traced(
+                args.trace, "cli.test_parsing", test_parsing, args.test_parsing, args.parser
+            )
+
+        elif args.bench_parsers:
+            return _traced(args.trace, "cli.bench_parsers", bench_parsers, args.bench_parsers)
+
+        elif args.bench_parse_pool:
+            return _traced(
+                args.trace, "cli.bench_parse_pool", bench_parse_pool, args.bench_parse_pool
+            )
 
         elif args.check_env:
             return check_environment()
 
+        elif args.serve:
+            return serve_timetables(args.serve, args.host, args.port, args.ttl)
+
+        elif args.batch:
+            return _traced(
+                args.trace,
+                "cli.batch",
+                batch_timetables,
+                args.batch,
+                args.output,
+                args.workers,
+                args.parser,
+                args.all_weeks,
+                args.parse_processes,
+            )
+
+        elif args.watch:
+            return watch_timetables(args.watch, args.output, args.interval)
+
+        elif args.export_ics:
+            return _traced(
+                args.trace,
+                "cli.export_ics",
+                export_ics,
+                args.export_ics,
+                args.output,
+                args.parser,
+                args.year,
+            )
+
         else:
             parser.print_help()
             return 1
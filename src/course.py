@@ -0,0 +1,182 @@
+"""
+Module définissant le cours Wigor retourné par le parser.
+Un dictionnaire aux chaînes internées, avec heures typées et accès par attribut.
+"""
+
+import re
+import sys
+from collections.abc import Mapping
+from datetime import time
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+# Champs exposés par l'accès de type dict, dans l'ordre historique des dictionnaires
+COURSE_FIELDS = ("titre", "prof", "horaire", "salle", "jour")
+
+# Horaire Wigor: "08:30 - 12:30" ou "08:30-12:30"
+_HORAIRE_PATTERN = re.compile(r"^\s*(\d{1,2}):(\d{2})(?:\s*-\s*(\d{1,2}):(\d{2}))?")
+
+
+@lru_cache(maxsize=512)
+def parse_horaire(horaire: str) -> Tuple[Optional[time], Optional[time]]:
+    """
+    Extrait les heures de début et de fin d'un horaire Wigor.
+
+    Les objets time retournés sont partagés entre tous les cours du même horaire.
+
+    Args:
+        horaire (str): Horaire brut (ex: "08:30 - 12:30")
+
+    Returns:
+        Tuple[Optional[time], Optional[time]]: (début, fin), None si absent ou invalide
+    """
+    match = _HORAIRE_PATTERN.match(horaire)
+    if not match:
+        return None, None
+
+    try:
+        start = time(int(match.group(1)), int(match.group(2)))
+    except ValueError:
+        return None, None
+
+    end = None
+    if match.group(3) is not None:
+        try:
+            end = time(int(match.group(3)), int(match.group(4)))
+        except ValueError:
+            end = None
+
+    return start, end
+
+
+class Course(dict):
+    """
+    Cours de l'emploi du temps: un ``Dict[str, str]`` aux valeurs internées.
+
+    Reste un vrai dictionnaire (``course["titre"]``, ``dict(course)``,
+    ``json.dumps``, comparaison avec un dict) et expose en plus les champs en
+    attributs ainsi que les heures typées ``debut``/``fin``. Chaque cours garde
+    donc le coût d'un dictionnaire: seul l'internement des chaînes réduit la
+    mémoire (titres, salles et professeurs répétés stockés une seule fois).
+    Seuls les champs de COURSE_FIELDS sont acceptés et le champ ``jour`` est
+    absent tant qu'il n'a pas été assigné.
+    """
+
+    __slots__ = ()
+
+    def __init__(
+        self,
+        titre: str = "",
+        prof: str = "",
+        horaire: str = "",
+        salle: str = "",
+        jour: Optional[str] = None,
+    ):
+        super().__init__(
+            titre=sys.intern(titre),
+            prof=sys.intern(prof),
+            horaire=sys.intern(horaire),
+            salle=sys.intern(salle),
+        )
+        if jour is not None:
+            dict.__setitem__(self, "jour", sys.intern(jour))
+
+    @classmethod
+    def from_dict(cls, data: Mapping) -> "Course":
+        """
+        Construit un cours depuis un dictionnaire (ex: snapshot JSON).
+
+        Args:
+            data (Mapping): Dictionnaire avec les clés de COURSE_FIELDS
+
+        Returns:
+            Course: Cours équivalent
+        """
+        return cls(
+            data.get("titre", ""),
+            data.get("prof", ""),
+            data.get("horaire", ""),
+            data.get("salle", ""),
+            data.get("jour"),
+        )
+
+    def to_dict(self) -> Dict[str, str]:
+        """Retourne un dictionnaire simple équivalent."""
+        return dict(self)
+
+    def copy(self) -> "Course":
+        """Retourne une copie du cours."""
+        return Course(self.titre, self.prof, self.horaire, self.salle, self.jour)
+
+    # Champs en attributs
+
+    @property
+    def titre(self) -> str:
+        return self.get("titre", "")
+
+    @property
+    def prof(self) -> str:
+        return self.get("prof", "")
+
+    @property
+    def horaire(self) -> str:
+        return self.get("horaire", "")
+
+    @property
+    def salle(self) -> str:
+        return self.get("salle", "")
+
+    @property
+    def jour(self) -> Optional[str]:
+        return self.get("jour")
+
+    @property
+    def debut(self) -> Optional[time]:
+        """Heure de début, None si l'horaire est absent ou invalide."""
+        return parse_horaire(self.horaire)[0]
+
+    @property
+    def fin(self) -> Optional[time]:
+        """Heure de fin, None si l'horaire est absent ou invalide."""
+        return parse_horaire(self.horaire)[1]
+
+    # Modifications: champs connus uniquement, valeurs internées
+
+    def __setitem__(self, key: str, value: str):
+        if key not in COURSE_FIELDS:
+            raise KeyError(f"Champ de cours inconnu: '{key}'")
+        dict.__setitem__(self, key, sys.intern(value))
+
+    def __delitem__(self, key: str):
+        if key != "jour":
+            raise KeyError(key)
+        dict.__delitem__(self, key)
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def setdefault(self, key: str, default: str = ""):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def pop(self, key: str, *default):
+        if key in COURSE_FIELDS and key != "jour":
+            raise KeyError(key)
+        return dict.pop(self, key, *default)
+
+    def popitem(self):
+        if "jour" not in self:
+            raise KeyError("popitem(): seul le champ 'jour' peut être retiré")
+        return "jour", dict.pop(self, "jour")
+
+    def clear(self):
+        dict.pop(self, "jour", None)
+
+    def __repr__(self) -> str:
+        return f"Course({dict.__repr__(self)})"
+
+    def __reduce__(self):
+        # Sérialisation compacte (pickle): uniquement les champs texte
+        return (Course, (self.titre, self.prof, self.horaire, self.salle, self.jour))
@@ -0,0 +1,327 @@
+"""
+Module d'archivage des pages HTML de debug.
+Les pages téléchargées sont écrites par un thread d'arrière-plan, compressées
+(gzip), dédupliquées par empreinte de contenu et conservées dans une limite de
+nombre de fichiers et de taille totale.
+"""
+
+import atexit
+import gzip
+import hashlib
+import logging
+import os
+import queue
+import random
+import tempfile
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+try:
+    from .tracing import span
+except ImportError:
+    from src.tracing import span
+
+# Configuration du logger
+logger = logging.getLogger(__name__)
+
+# Désactivation de l'archive: WIGOR_DEBUG_ARCHIVE=0 (ou off, false, no)
+DEBUG_ARCHIVE_ENV_VAR = "WIGOR_DEBUG_ARCHIVE"
+
+# Répertoire de l'archive (défaut: _debug)
+DEBUG_DIR_ENV_VAR = "WIGOR_DEBUG_DIR"
+
+# Proportion des pages archivées, entre 0 et 1 (défaut: toutes)
+DEBUG_SAMPLE_ENV_VAR = "WIGOR_DEBUG_SAMPLE"
+
+DEFAULT_DEBUG_DIR = "_debug"
+
+# Rétention: nombre de fichiers et taille totale sur disque (octets)
+DEFAULT_MAX_FILES = 200
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+# Pages en attente d'écriture; au-delà, les nouvelles pages sont ignorées
+DEFAULT_QUEUE_SIZE = 32
+
+# Fichiers gérés par la rétention (les anciens .html non compressés compris)
+_FILE_PREFIX = "edt_"
+_ARCHIVE_SUFFIX = ".html.gz"
+
+# Longueur de l'empreinte dans le nom de fichier
+_DIGEST_CHARS = 16
+
+
+class DebugArchive:
+    """
+    Archive des pages HTML de debug, alimentée sans bloquer les requêtes.
+
+    ``submit()`` met la page en file; un thread d'arrière-plan l'écrit sous
+    ``edt_<date>_<empreinte>.html.gz``. Une page identique à une page déjà archivée
+    n'est pas réécrite. Les fichiers les plus anciens sont supprimés au-delà de
+    ``max_files`` fichiers ou ``max_bytes`` octets.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path] = DEFAULT_DEBUG_DIR,
+        max_files: int = DEFAULT_MAX_FILES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        sample_rate: float = 1.0,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+    ):
+        """
+        Initialise l'archive (le thread d'écriture démarre à la première page).
+
+        Args:
+            directory (Union[str, Path]): Répertoire de l'archive
+            max_files (int): Nombre maximal de fichiers conservés
+            max_bytes (int): Taille totale maximale des fichiers conservés
+            sample_rate (float): Proportion des pages archivées (0 à 1)
+            queue_size (int): Pages en attente d'écriture au maximum
+
+        Raises:
+            ValueError: Si sample_rate n'est pas entre 0 et 1
+        """
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("sample_rate doit être entre 0 et 1")
+
+        self.directory = Path(directory)
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self.sample_rate = sample_rate
+        self.written = 0
+        self.deduplicated = 0
+        self.dropped = 0
+        self.sampled_out = 0
+        self.evicted = 0
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        # Empreinte -> fichier, construit à la première écriture
+        self._index: Optional[Dict[str, Path]] = None
+
+    def submit(self, html_content: str, response_url: str) -> bool:
+        """
+        Met une page en file d'archivage, sans attendre son écriture.
+
+        Args:
+            html_content (str): Contenu HTML
+            response_url (str): URL de la réponse
+
+        Returns:
+            bool: True si la page a été mise en file
+        """
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            self._count("sampled_out")
+            return False
+
+        self._ensure_writer()
+        try:
+            self._queue.put_nowait((html_content, response_url, datetime.now()))
+        except queue.Full:
+            self._count("dropped")
+            logger.debug("File d'archivage debug pleine, page ignorée")
+            return False
+        return True
+
+    def flush(self):
+        """Attend l'écriture de toutes les pages en file."""
+        if self._thread is not None:
+            self._queue.join()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Statistiques de l'archive.
+
+        Returns:
+            Dict[str, int]: {"written", "deduplicated", "dropped", "sampled_out",
+                "evicted", "pending"}
+        """
+        with self._lock:
+            return {
+                "written": self.written,
+                "deduplicated": self.deduplicated,
+                "dropped": self.dropped,
+                "sampled_out": self.sampled_out,
+                "evicted": self.evicted,
+                "pending": self._queue.unfinished_tasks,
+            }
+
+    def _count(self, counter: str, amount: int = 1):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+    def _ensure_writer(self):
+        """Démarre le thread d'écriture s'il ne tourne pas encore."""
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="wigor-debug-archive", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            html_content, response_url, timestamp = self._queue.get()
+            try:
+                self._write(html_content, response_url, timestamp)
+            except Exception as e:
+                logger.warning(f"Erreur lors de la sauvegarde debug: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _load_index(self) -> Dict[str, Path]:
+        """Indexe les pages déjà archivées par empreinte (nom de fichier)."""
+        index = {}
+        for path in self.directory.glob(f"{_FILE_PREFIX}*{_ARCHIVE_SUFFIX}"):
+            digest = path.name[: -len(_ARCHIVE_SUFFIX)].rsplit("_", 1)[-1]
+            index[digest] = path
+        return index
+
+    def _write(self, html_content: str, response_url: str, timestamp: datetime):
+        """Écrit une page compressée (thread d'arrière-plan)."""
+        if not self.directory.exists():
+            self.directory.mkdir(parents=True, exist_ok=True)
+            logger.info(f"Dossier de debug créé: {self.directory}")
+        if self._index is None:
+            self._index = self._load_index()
+
+        data = html_content.encode("utf-8", "surrogatepass")
+        digest = hashlib.blake2b(data, digest_size=_DIGEST_CHARS // 2).hexdigest()
+
+        existing = self._index.get(digest)
+        if existing is not None and existing.exists():
+            # Page déjà archivée: seule sa date d'accès à la rétention est rafraîchie
+            os.utime(existing)
+            self._count("deduplicated")
+            logger.debug(f"Page debug identique à {existing.name}, non réécrite")
+            return
+
+        path = self.directory / (
+            f"{_FILE_PREFIX}{timestamp.strftime('%Y%m%d_%H%M%S')}_{digest}{_ARCHIVE_SUFFIX}"
+        )
+        header = (
+            f"<!-- URL: {response_url} -->\n"
+            f"<!-- Timestamp: {timestamp.isoformat()} -->\n"
+            f"<!-- Size: {len(html_content)} characters -->\n"
+        ).encode("utf-8")
+
+        with span("debug.save", chars=len(html_content)):
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as raw, gzip.GzipFile(
+                    filename="", mode="wb", fileobj=raw, mtime=0
+                ) as f:
+                    f.write(header)
+                    f.write(data)
+                os.replace(tmp_path, path)
+            except BaseException:
+                Path(tmp_path).unlink(missing_ok=True)
+                raise
+
+        self._index[digest] = path
+        self._count("written")
+        logger.info(f"HTML sauvegardé dans: {path}")
+        self._enforce_retention()
+
+    def _enforce_retention(self):
+        """Supprime les fichiers les plus anciens au-delà des limites."""
+        files = []
+        total = 0
+        for path in self.directory.glob(f"{_FILE_PREFIX}*"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        files.sort()
+        count = len(files)
+        evicted = 0
+        for _, size, path in files:
+            if count <= self.max_files and total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            count -= 1
+            total -= size
+            evicted += 1
+
+        if evicted:
+            self._index = self._load_index()
+            self._count("evicted", evicted)
+            logger.debug(f"Archive debug: {evicted} fichier(s) supprimé(s)")
+
+
+# Archive par défaut du processus
+_default_archive: Optional[DebugArchive] = None
+_default_archive_lock = threading.Lock()
+
+
+def _sample_rate_from_env() -> float:
+    """Proportion d'archivage lue dans WIGOR_DEBUG_SAMPLE (1.0 si absente ou invalide)."""
+    value = os.environ.get(DEBUG_SAMPLE_ENV_VAR, "").strip()
+    if not value:
+        return 1.0
+    try:
+        return min(1.0, max(0.0, float(value)))
+    except ValueError:
+        logger.warning(f"{DEBUG_SAMPLE_ENV_VAR} invalide: {value!r}, toutes les pages archivées")
+        return 1.0
+
+
+def get_debug_archive() -> Optional[DebugArchive]:
+    """
+    Retourne l'archive de debug du processus.
+
+    Returns:
+        Optional[DebugArchive]: Archive (répertoire WIGOR_DEBUG_DIR, proportion
+            WIGOR_DEBUG_SAMPLE), ou None si désactivée par WIGOR_DEBUG_ARCHIVE
+    """
+    if os.environ.get(DEBUG_ARCHIVE_ENV_VAR, "").strip().lower() in ("0", "off", "false", "no"):
+        return None
+
+    global _default_archive
+    with _default_archive_lock:
+        if _default_archive is None:
+            _default_archive = DebugArchive(
+                os.environ.get(DEBUG_DIR_ENV_VAR, "").strip() or DEFAULT_DEBUG_DIR,
+                sample_rate=_sample_rate_from_env(),
+            )
+        return _default_archive
+
+
+def configure_debug_archive(**options) -> DebugArchive:
+    """
+    Remplace l'archive de debug du processus (les pages en file sont d'abord écrites).
+
+    Args:
+        **options: Paramètres de DebugArchive (directory, max_files, max_bytes,
+            sample_rate, queue_size)
+
+    Returns:
+        DebugArchive: Nouvelle archive
+    """
+    global _default_archive
+    archive = DebugArchive(**options)
+    with _default_archive_lock:
+        previous, _default_archive = _default_archive, archive
+    if previous is not None:
+        previous.flush()
+    return archive
+
+
+def flush_debug_archive():
+    """Attend l'écriture des pages en file de l'archive du processus."""
+    if _default_archive is not None:
+        _default_archive.flush()
+
+
+# Les pages en file sont écrites avant la fin du processus
+atexit.register(flush_debug_archive)
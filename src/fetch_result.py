@@ -0,0 +1,229 @@
+"""
+Module du résultat d'un téléchargement de page Wigor.
+Le corps de la réponse n'est tokenisé qu'une fois: titre, indicateurs
+d'authentification, cours de la semaine et semaines voisines sont tous lus
+dans le même arbre, construit à la première demande.
+"""
+
+import logging
+import threading
+from typing import Dict, List, Optional
+
+from bs4 import BeautifulSoup
+
+try:
+    from .course import Course
+    from .html_backend import make_soup, resolve_html_parser
+    from .parse_cache import ParseCache, parse_wigor_html_cached, parse_wigor_html_weeks_cached
+    from .timetable_parser import (
+        _courses_by_week_from_scan,
+        _courses_from_scan,
+        _PageScan,
+        _scan_document,
+    )
+    from .tracing import span
+except ImportError:
+    from src.course import Course
+    from src.html_backend import make_soup, resolve_html_parser
+    from src.parse_cache import ParseCache, parse_wigor_html_cached, parse_wigor_html_weeks_cached
+    from src.timetable_parser import (
+        _courses_by_week_from_scan,
+        _courses_from_scan,
+        _PageScan,
+        _scan_document,
+    )
+    from src.tracing import span
+
+# Configuration du logger
+logger = logging.getLogger(__name__)
+
+
+class FetchResult:
+    """
+    Page Wigor téléchargée.
+
+    L'arbre HTML (``soup``) et son parcours (``scan``) sont construits à la première
+    utilisation puis conservés: ``title``, ``contains_inner_case``, ``courses()`` et
+    ``weeks()`` ne reparsent pas la page. Un résultat présent dans le cache de parsing
+    est servi sans construire l'arbre.
+
+    Attributes:
+        text: HTML décodé
+        url: URL finale après redirections
+        status_code: Code HTTP de la réponse
+        encoding: Encodage utilisé pour décoder le corps (None si inconnu)
+        parser: Backend HTML résolu
+    """
+
+    __slots__ = (
+        "text",
+        "url",
+        "status_code",
+        "encoding",
+        "parser",
+        "_content",
+        "_soup",
+        "_scan",
+        "_lock",
+    )
+
+    def __init__(
+        self,
+        text: str,
+        url: str = "",
+        status_code: int = 200,
+        content: Optional[bytes] = None,
+        encoding: Optional[str] = None,
+        parser: Optional[str] = None,
+    ):
+        """
+        Initialise le résultat.
+
+        Args:
+            text (str): HTML décodé
+            url (str): URL finale après redirections
+            status_code (int): Code HTTP de la réponse
+            content (Optional[bytes]): Corps brut (défaut: text encodé)
+            encoding (Optional[str]): Encodage du corps
+            parser (Optional[str]): Backend HTML (défaut: WIGOR_HTML_PARSER ou html.parser)
+
+        Raises:
+            ValueError: Si le backend demandé est inconnu ou non installé
+        """
+        self.text = text
+        self.url = url
+        self.status_code = status_code
+        self.encoding = encoding
+        self.parser = resolve_html_parser(parser)
+        self._content = content
+        self._soup: Optional[BeautifulSoup] = None
+        self._scan: Optional[_PageScan] = None
+        # Un même résultat peut être partagé entre threads (single_flight)
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_response(cls, response, parser: Optional[str] = None) -> "FetchResult":
+        """
+        Construit le résultat d'une réponse requests.
+
+        Args:
+            response (requests.Response): Réponse HTTP
+            parser (Optional[str]): Backend HTML
+
+        Returns:
+            FetchResult: Résultat (corps brut et texte décodé conservés)
+        """
+        return cls(
+            response.text,
+            response.url,
+            response.status_code,
+            content=response.content,
+            encoding=response.encoding,
+            parser=parser,
+        )
+
+    @property
+    def content(self) -> bytes:
+        """Corps brut de la réponse."""
+        if self._content is None:
+            self._content = self.text.encode(self.encoding or "utf-8", "replace")
+        return self._content
+
+    @property
+    def soup(self) -> BeautifulSoup:
+        """Arbre HTML de la page, construit à la première demande."""
+        if self._soup is None:
+            with self._lock:
+                if self._soup is None:
+                    with span("parse.soup", parser=self.parser, chars=len(self.text)):
+                        self._soup = make_soup(self.text, self.parser)
+        return self._soup
+
+    @property
+    def scan(self) -> _PageScan:
+        """Parcours unique de l'arbre: jours, cours, titre et blocs innerCase."""
+        if self._scan is None:
+            with self._lock:
+                if self._scan is None:
+                    with span("parse.scan") as trace:
+                        scan = _scan_document(self.soup)
+                        trace.set(days=len(scan.day_columns), blocks=len(scan.course_blocks))
+                    # Publié une fois complet: les autres threads ne voient que le résultat final
+                    self._scan = scan
+                    logger.info(f"Titre de la page: {self.title}")
+                    logger.info(f"Contient innerCase: {self.contains_inner_case}")
+                    if not self.is_timetable:
+                        logger.warning(
+                            "⚠️ La page n'est pas un emploi du temps (session expirée ?)"
+                        )
+        return self._scan
+
+    @property
+    def title(self) -> str:
+        """Titre de la page ("Titre non trouvé" si absent)."""
+        title = self.scan.title
+        return title if title is not None else "Titre non trouvé"
+
+    @property
+    def contains_inner_case(self) -> bool:
+        """Indique si la page contient des blocs de cours (classe innerCase)."""
+        return self.scan.inner_case
+
+    @property
+    def is_timetable(self) -> bool:
+        """
+        Indique si la page est un emploi du temps plutôt qu'une page de connexion.
+
+        Returns:
+            bool: True si la page contient des colonnes de jours, des blocs innerCase
+                ou un titre "EDT"
+        """
+        scan = self.scan
+        return bool(scan.inner_case or scan.day_columns or "edt" in (scan.title or "").lower())
+
+    def courses(self, cache: Optional[ParseCache] = None) -> List[Course]:
+        """
+        Cours de la semaine principale.
+
+        Args:
+            cache (Optional[ParseCache]): Cache de parsing (défaut: get_parse_cache())
+
+        Returns:
+            List[Course]: Liste des cours, identique à parse_wigor_html
+        """
+        return parse_wigor_html_cached(self.text, self.parser, cache, compute=self._courses)
+
+    def weeks(self, cache: Optional[ParseCache] = None) -> Dict[str, List[Course]]:
+        """
+        Cours de toutes les semaines présentes dans la page.
+
+        Args:
+            cache (Optional[ParseCache]): Cache de parsing (défaut: get_parse_cache())
+
+        Returns:
+            Dict[str, List[Course]]: Cours par semaine ISO, identique à parse_wigor_html_weeks
+        """
+        return parse_wigor_html_weeks_cached(self.text, self.parser, cache, compute=self._weeks)
+
+    def _courses(self) -> List[Course]:
+        if not self.text:
+            logger.warning("HTML vide fourni au parser")
+            return []
+        try:
+            return _courses_from_scan(self.scan)
+        except Exception as e:
+            logger.error(f"Erreur lors du parsing HTML: {e}")
+            return []
+
+    def _weeks(self) -> Dict[str, List[Course]]:
+        if not self.text:
+            logger.warning("HTML vide fourni au parser")
+            return {}
+        try:
+            with span("parse.weeks") as trace:
+                weeks = _courses_by_week_from_scan(self.scan)
+                trace.set(weeks=len(weeks), items=sum(len(courses) for courses in weeks.values()))
+            return weeks
+        except Exception as e:
+            logger.error(f"Erreur lors du parsing HTML multi-semaines: {e}")
+            return {}
@@ -29,13 +29,17 @@ else:
 
 try:
     from ..auth.cookies_auth import build_session_from_cookie_header, is_authenticated
-    from .timetable_parser import parse_wigor_html
-    from .wigor_api import fetch_wigor_html
+    from ..auth.session_store import get_session_store
+    from .parse_cache import parse_wigor_html_cached
+    from .tracing import span
+    from .wigor_api import fetch_wigor_html, verify_stored_session
 except ImportError:
     # Imports absolus pour exécution directe
     from auth.cookies_auth import build_session_from_cookie_header, is_authenticated
-    from src.timetable_parser import parse_wigor_html
-    from src.wigor_api import fetch_wigor_html
+    from auth.session_store import get_session_store
+    from src.parse_cache import parse_wigor_html_cached
+    from src.tracing import span
+    from src.wigor_api import fetch_wigor_html, verify_stored_session
 
 # Configuration du logger
 logger = logging.getLogger(__name__)
@@ -76,6 +80,57 @@ class WigorViewerGUI:
 
         logger.info("Interface graphique initialisée")
 
+    def _restore_stored_session(self, event=None):
+        """Reprend la session enregistrée de l'identifiant saisi, sans connexion CAS."""
+        url = self.url_var.get().strip()
+        username = self.username_var.get().strip()
+        if not username or self.session is not None:
+            return
+        try:
+            store = get_session_store()
+            stored = store.load(username, url) if store is not None else None
+        except Exception as e:
+            logger.warning(f"Session stockée non reprise: {e}")
+            return
+        if stored is None:
+            return
+
+        # Vérification auprès du serveur dans un thread séparé
+        self.login_status_var.set("Vérification de la session...")
+        self.login_status_label.configure(foreground="orange")
+        thread = threading.Thread(
+            target=self._restore_session_thread, args=(store, stored, url), daemon=True
+        )
+        thread.start()
+
+    def _restore_session_thread(self, store, stored, url: str):
+        """Thread de vérification de la session stockée sans bloquer l'interface."""
+        try:
+            session = verify_stored_session(store, stored, url)
+        except Exception as e:
+            logger.warning(f"Session stockée non reprise: {e}")
+            session = None
+        self.root.after(0, self._update_session_restored, stored, session)
+
+    def _update_session_restored(self, stored, session):
+        """Met à jour l'interface après vérification de la session stockée."""
+        if stored.user != self.username_var.get().strip():
+            # Identifiant modifié pendant la vérification
+            self.login_status_var.set("Non connecté")
+            self.login_status_label.configure(foreground="gray")
+            return
+        if session is None:
+            self.login_status_var.set("Session expirée, reconnectez-vous")
+            self.login_status_label.configure(foreground="red")
+            return
+
+        self.session = session
+        self.cookie_text.delete(1.0, tk.END)
+        self.cookie_text.insert(1.0, stored.cookie_header())
+        self.login_status_var.set("Session restaurée ♻️")
+        self.login_status_label.configure(foreground="green")
+        logger.info(f"Session stockée reprise pour {stored.user}")
+
     def _create_widgets(self):
         """Crée tous les widgets de l'interface."""
 
@@ -112,6 +167,9 @@ class WigorViewerGUI:
         ttk.Label(main_frame, text="Identifiant:").grid(row=4, column=0, sticky=tk.W, pady=5)
         self.username_entry = ttk.Entry(main_frame, textvariable=self.username_var, width=60)
         self.username_entry.grid(row=4, column=1, sticky=(tk.W, tk.E), padx=(10, 0), pady=5)
+        # Session enregistrée de cet identifiant reprise dès la saisie
+        self.username_entry.bind("<FocusOut>", self._restore_stored_session)
+        self.username_entry.bind("<Return>", self._restore_stored_session)
 
         # Champ Mot de passe
         ttk.Label(main_frame, text="Mot de passe:").grid(row=5, column=0, sticky=tk.W, pady=5)
@@ -356,10 +414,10 @@ class WigorViewerGUI:
 
         try:
             # Importer la fonction de connexion
-            from src.wigor_api import login_with_credentials
+            from src.wigor_api import login_or_restore
 
-            # Tenter la connexion
-            result = login_with_credentials(username, password, url)
+            # Reprendre la session stockée, sinon se connecter (et la stocker)
+            result = login_or_restore(username, password, url, get_session_store())
 
             if result["success"]:
                 # Stocker la session pour réutilisation
@@ -464,7 +522,7 @@ class WigorViewerGUI:
             html_content = fetch_wigor_html(url, cookie)
 
             # Parser les cours
-            courses = parse_wigor_html(html_content)
+            courses = parse_wigor_html_cached(html_content)
 
             # Mettre à jour l'interface dans le thread principal
             self.root.after(0, self._update_ui_with_data, courses, len(html_content))
@@ -489,7 +547,7 @@ class WigorViewerGUI:
             html_content = fetch_wigor_html(url, session=self.session)
 
             # Parser les cours
-            courses = parse_wigor_html(html_content)
+            courses = parse_wigor_html_cached(html_content)
 
             # Mettre à jour l'interface dans le thread principal
             self.root.after(0, self._update_ui_with_data, courses, len(html_content))
@@ -508,23 +566,24 @@ class WigorViewerGUI:
         self._stop_loading()
         self.courses_data = courses
 
-        # Vider le Treeview
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-
-        # Ajouter les cours au Treeview
-        for course in courses:
-            self.tree.insert(
-                "",
-                tk.END,
-                values=(
-                    course.get("jour", ""),
-                    course.get("horaire", ""),
-                    course.get("titre", ""),
-                    course.get("prof", ""),
-                    course.get("salle", ""),
-                ),
-            )
+        with span("gui.populate_treeview", items=len(courses), chars=html_size):
+            # Vider le Treeview
+            for item in self.tree.get_children():
+                self.tree.delete(item)
+
+            # Ajouter les cours au Treeview
+            for course in courses:
+                self.tree.insert(
+                    "",
+                    tk.END,
+                    values=(
+                        course.get("jour", ""),
+                        course.get("horaire", ""),
+                        course.get("titre", ""),
+                        course.get("prof", ""),
+                        course.get("salle", ""),
+                    ),
+                )
 
         # Mettre à jour le statut
         self.status_var.set(f"✅ {len(courses)} cours trouvés")
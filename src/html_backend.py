@@ -0,0 +1,149 @@
+"""
+Module de sélection du backend HTML utilisé par BeautifulSoup.
+Permet de choisir entre html.parser, lxml et html5lib à l'appel, par variable
+d'environnement ou depuis la ligne de commande.
+"""
+
+import logging
+import os
+import time
+from typing import Callable, Dict, List, Optional, Sequence
+
+from bs4 import BeautifulSoup, FeatureNotFound
+
+# Configuration du logger
+logger = logging.getLogger(__name__)
+
+# Variable d'environnement pour choisir le backend par défaut
+HTML_PARSER_ENV_VAR = "WIGOR_HTML_PARSER"
+
+# Backend historique, toujours disponible (bibliothèque standard)
+DEFAULT_HTML_PARSER = "html.parser"
+
+# Backends supportés, du plus portable au plus tolérant
+SUPPORTED_HTML_PARSERS = ("html.parser", "lxml", "html5lib")
+
+# Cache de disponibilité des backends optionnels
+_availability: Dict[str, bool] = {}
+
+
+def is_html_parser_available(parser: str) -> bool:
+    """
+    Indique si un backend HTML est installé et utilisable par BeautifulSoup.
+
+    Args:
+        parser (str): Nom du backend ("html.parser", "lxml", "html5lib")
+
+    Returns:
+        bool: True si le backend est utilisable
+    """
+    if parser not in _availability:
+        try:
+            BeautifulSoup("<p></p>", parser)
+            _availability[parser] = True
+        except FeatureNotFound:
+            _availability[parser] = False
+    return _availability[parser]
+
+
+def available_html_parsers() -> List[str]:
+    """
+    Liste les backends HTML supportés et installés.
+
+    Returns:
+        List[str]: Backends disponibles, dans l'ordre de SUPPORTED_HTML_PARSERS
+    """
+    return [parser for parser in SUPPORTED_HTML_PARSERS if is_html_parser_available(parser)]
+
+
+def resolve_html_parser(parser: Optional[str] = None) -> str:
+    """
+    Détermine le backend HTML à utiliser.
+
+    Priorité: argument explicite, puis variable d'environnement WIGOR_HTML_PARSER,
+    puis html.parser. Un backend demandé explicitement mais absent lève une erreur;
+    un backend absent demandé par l'environnement retombe sur html.parser.
+
+    Args:
+        parser (Optional[str]): Backend demandé à l'appel
+
+    Returns:
+        str: Nom du backend à passer à BeautifulSoup
+
+    Raises:
+        ValueError: Si le backend explicite est inconnu ou non installé
+    """
+    if parser:
+        if parser not in SUPPORTED_HTML_PARSERS:
+            raise ValueError(
+                f"Backend HTML inconnu: '{parser}' (supportés: {', '.join(SUPPORTED_HTML_PARSERS)})"
+            )
+        if not is_html_parser_available(parser):
+            raise ValueError(f"Backend HTML non installé: '{parser}'")
+        return parser
+
+    env_parser = os.environ.get(HTML_PARSER_ENV_VAR, "").strip()
+    if env_parser:
+        if env_parser in SUPPORTED_HTML_PARSERS and is_html_parser_available(env_parser):
+            return env_parser
+        logger.warning(
+            f"Backend HTML '{env_parser}' ({HTML_PARSER_ENV_VAR}) indisponible, "
+            f"utilisation de {DEFAULT_HTML_PARSER}"
+        )
+
+    return DEFAULT_HTML_PARSER
+
+
+def make_soup(html: str, parser: Optional[str] = None) -> BeautifulSoup:
+    """
+    Construit un objet BeautifulSoup avec le backend résolu.
+
+    Args:
+        html (str): Contenu HTML
+        parser (Optional[str]): Backend demandé (voir resolve_html_parser)
+
+    Returns:
+        BeautifulSoup: Arbre HTML
+    """
+    return BeautifulSoup(html, resolve_html_parser(parser))
+
+
+def benchmark_html_parsers(
+    html: str,
+    parse_func: Callable[..., object],
+    repeat: int = 5,
+    parsers: Optional[Sequence[str]] = None,
+) -> Dict[str, Dict[str, float]]:
+    """
+    Mesure le débit de parsing d'une page pour chaque backend disponible.
+
+    Args:
+        html (str): Page HTML de référence
+        parse_func (Callable): Fonction de parsing acceptant (html, parser=...)
+        repeat (int): Nombre de parsings par backend
+        parsers (Optional[Sequence[str]]): Backends à mesurer (défaut: tous les disponibles)
+
+    Returns:
+        Dict[str, Dict[str, float]]: Par backend, {"seconds": durée moyenne,
+            "pages_per_second": ..., "mb_per_second": ...}
+    """
+    size_mb = len(html.encode("utf-8")) / (1024 * 1024)
+    results = {}
+
+    for parser in parsers or available_html_parsers():
+        # Un premier passage pour charger le backend (imports, caches)
+        parse_func(html, parser=parser)
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            parse_func(html, parser=parser)
+        seconds = (time.perf_counter() - start) / repeat
+
+        results[parser] = {
+            "seconds": seconds,
+            "pages_per_second": 1 / seconds if seconds else float("inf"),
+            "mb_per_second": size_mb / seconds if seconds else float("inf"),
+        }
+        logger.info(f"Backend {parser}: {seconds * 1000:.1f} ms/page")
+
+    return results
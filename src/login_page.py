@@ -0,0 +1,203 @@
+"""
+Module d'analyse des pages du parcours de connexion CAS.
+Chaque réponse est parsée une seule fois: formulaire de connexion, champs cachés,
+URL d'action, meta refresh et redirections JavaScript sont lus dans le même arbre.
+"""
+
+import logging
+import re
+from typing import Dict, List, Optional
+from urllib.parse import urljoin
+
+from bs4 import Tag
+
+try:
+    from .html_backend import make_soup
+    from .tracing import span
+except ImportError:
+    from src.html_backend import make_soup
+    from src.tracing import span
+
+# Configuration du logger
+logger = logging.getLogger(__name__)
+
+# Éléments utiles au parcours de connexion, relevés en un seul passage
+_LOGIN_ELEMENTS = ["form", "a", "script", "meta", "input"]
+
+_CAS_URL_RE = re.compile(r'["\']([^"\']*cas[^"\']*)["\']')
+_META_URL_RE = re.compile(r"url=(.+)", re.IGNORECASE)
+_LOCATION_HREF_RE = re.compile(r'location\.href\s*=\s*["\']([^"\']+)["\']')
+_WINDOW_LOCATION_RE = re.compile(r'window\.location\s*=\s*["\']([^"\']+)["\']')
+
+
+def _is_username_field(name: str) -> bool:
+    return "username" in name or "login" in name or "user" in name
+
+
+def _is_password_field(name: str) -> bool:
+    return "password" in name or "pwd" in name
+
+
+class LoginPage:
+    """
+    Page du parcours de connexion, analysée en un seul parsing.
+
+    Attributes:
+        url: URL de la page (base des URL relatives)
+        login_form: Premier formulaire avec un champ identifiant et un champ mot de
+            passe (None si absent)
+    """
+
+    __slots__ = ("url", "login_form", "_links", "_scripts", "_meta_refresh", "_inputs")
+
+    def __init__(self, html_content: str, url: str, parser: Optional[str] = None):
+        """
+        Parse la page et relève les éléments du parcours de connexion.
+
+        Args:
+            html_content (str): HTML de la réponse
+            url (str): URL de la réponse
+            parser (Optional[str]): Backend HTML (défaut: WIGOR_HTML_PARSER ou html.parser)
+        """
+        self.url = url
+        self.login_form: Optional[Tag] = None
+        self._links: List[str] = []
+        self._scripts: List[str] = []
+        self._meta_refresh: Optional[str] = None
+        # Premier input de la page pour chaque nom (execution, lt hors formulaire)
+        self._inputs: Dict[str, str] = {}
+
+        with span("login.parse", chars=len(html_content)):
+            soup = make_soup(html_content, parser)
+            for element in soup.find_all(_LOGIN_ELEMENTS):
+                name = element.name
+                if name == "form":
+                    if self.login_form is None and self._is_login_form(element):
+                        self.login_form = element
+                elif name == "a":
+                    if element.has_attr("href"):
+                        self._links.append(element.get("href", ""))
+                elif name == "script":
+                    self._scripts.append(element.get_text())
+                elif name == "meta":
+                    if self._meta_refresh is None and element.get("http-equiv") == "refresh":
+                        self._meta_refresh = element.get("content", "")
+                elif element.has_attr("name"):
+                    self._inputs.setdefault(element["name"], element.get("value", ""))
+
+    @staticmethod
+    def _is_login_form(form: Tag) -> bool:
+        """Indique si un formulaire contient un champ identifiant et un champ mot de passe."""
+        input_names = [field.get("name", "").lower() for field in form.find_all("input")]
+        return any(_is_username_field(name) for name in input_names) and any(
+            _is_password_field(name) for name in input_names
+        )
+
+    @property
+    def has_login_form(self) -> bool:
+        """Indique si la page contient un formulaire de connexion."""
+        return self.login_form is not None
+
+    @property
+    def action_url(self) -> str:
+        """URL absolue de soumission du formulaire (URL de la page si absente)."""
+        if self.login_form is not None:
+            action = self.login_form.get("action", "")
+            if action:
+                return urljoin(self.url, action)
+        return self.url
+
+    @property
+    def hidden_fields(self) -> Dict[str, str]:
+        """Champs cachés du formulaire de connexion (lt, execution, _eventId, ...)."""
+        if self.login_form is None:
+            return {}
+        return {
+            field.get("name"): field.get("value", "")
+            for field in self.login_form.find_all("input")
+            if field.get("name") and field.get("type", "").lower() == "hidden"
+        }
+
+    def form_data(self, username: str, password: str) -> Dict[str, str]:
+        """
+        Données à soumettre avec le formulaire de connexion.
+
+        Args:
+            username (str): Nom d'utilisateur
+            password (str): Mot de passe
+
+        Returns:
+            Dict[str, str]: Champs du formulaire (vide si aucun formulaire de connexion)
+        """
+        form_data = {}
+        if self.login_form is None:
+            return form_data
+
+        for input_field in self.login_form.find_all("input"):
+            name = input_field.get("name", "")
+            value = input_field.get("value", "")
+            input_type = input_field.get("type", "").lower()
+
+            if name:
+                if _is_username_field(name.lower()):
+                    form_data[name] = username
+                elif _is_password_field(name.lower()):
+                    form_data[name] = password
+                elif input_type == "hidden":
+                    # Inclure tous les champs cachés (lt, execution, _eventId, etc.)
+                    form_data[name] = value
+                    logger.debug(f"Champ caché ajouté: {name} = {value}")
+                elif input_type in ["text", "email"]:
+                    # Autres champs texte (peut être username avec un autre nom)
+                    if not form_data.get(name):  # Seulement si pas déjà rempli
+                        form_data[name] = username
+
+        # Champs spéciaux CAS souvent requis, éventuellement hors du formulaire
+        for special in ("execution", "lt"):
+            if special not in form_data and special in self._inputs:
+                form_data[special] = self._inputs[special]
+
+        if "_eventId" not in form_data:
+            form_data["_eventId"] = "submit"
+
+        return form_data
+
+    @property
+    def meta_refresh_url(self) -> Optional[str]:
+        """URL absolue du meta refresh (None si absent)."""
+        if self._meta_refresh:
+            url_match = _META_URL_RE.search(self._meta_refresh)
+            if url_match:
+                return urljoin(self.url, url_match.group(1).strip())
+        return None
+
+    @property
+    def js_redirect_url(self) -> Optional[str]:
+        """URL absolue de la première redirection location.href / window.location."""
+        for script_text in self._scripts:
+            for pattern in (_LOCATION_HREF_RE, _WINDOW_LOCATION_RE):
+                match = pattern.search(script_text)
+                if match:
+                    return urljoin(self.url, match.group(1))
+        return None
+
+    @property
+    def redirect_url(self) -> Optional[str]:
+        """Cible de redirection: meta refresh, sinon redirection JavaScript."""
+        return self.meta_refresh_url or self.js_redirect_url
+
+    @property
+    def cas_login_url(self) -> Optional[str]:
+        """URL absolue du lien de connexion CAS (lien, sinon redirection JavaScript)."""
+        for href in self._links:
+            lowered = href.lower()
+            if "cas" in lowered or "login" in lowered or "connexion" in lowered:
+                return urljoin(self.url, href)
+
+        for script_text in self._scripts:
+            if "location.href" in script_text or "window.location" in script_text:
+                url_match = _CAS_URL_RE.search(script_text)
+                if url_match:
+                    return urljoin(self.url, url_match.group(1))
+
+        return None
@@ -11,12 +11,16 @@ from typing import Optional
 
 try:
     from .gui import WigorViewerGUI
-    from .timetable_parser import parse_wigor_html
+    from .html_backend import SUPPORTED_HTML_PARSERS
+    from .parse_cache import parse_wigor_html_cached
+    from .tracing import dump_trace, enable_tracing, span
     from .wigor_api import fetch_wigor_html
 except ImportError:
     # Imports absolus pour exécution directe
     from src.gui import WigorViewerGUI
-    from src.timetable_parser import parse_wigor_html
+    from src.html_backend import SUPPORTED_HTML_PARSERS
+    from src.parse_cache import parse_wigor_html_cached
+    from src.tracing import dump_trace, enable_tracing, span
     from src.wigor_api import fetch_wigor_html
 
 # Configuration du logger
@@ -50,13 +54,14 @@ def setup_logging(level: str = "INFO", log_file: Optional[str] = None):
     logger.info(f"Logging configuré au niveau {level}")
 
 
-def test_mode(url: str, cookie: str) -> int:
+def test_mode(url: str, cookie: str, parser: Optional[str] = None) -> int:
     """
     Mode test : télécharge l'HTML et affiche le nombre de cours.
 
     Args:
         url (str): URL de la page Wigor
         cookie (str): Cookie d'authentification
+        parser (Optional[str]): Backend HTML (défaut: WIGOR_HTML_PARSER ou html.parser)
 
     Returns:
         int: Code de retour (0 = succès, 1 = erreur)
@@ -73,7 +78,7 @@ def test_mode(url: str, cookie: str) -> int:
 
         # Parser les cours
         print("🔍 Analyse des cours...")
-        courses = parse_wigor_html(html_content)
+        courses = parse_wigor_html_cached(html_content, parser=parser)
 
         # Afficher les résultats
         print(f"📊 Nombre de cours trouvés: {len(courses)}")
@@ -150,6 +155,9 @@ Exemples d'utilisation:
 
   # Sauvegarder les logs dans un fichier
   python -m wigor_viewer.src.main --log-file wigor.log
+
+  # Mode test avec trace des étapes (format Chrome trace-event)
+  python -m wigor_viewer.src.main --test --url "https://..." --cookie "..." --trace trace.json
         """,
     )
 
@@ -167,6 +175,12 @@ Exemples d'utilisation:
         "--cookie", type=str, help="Cookie d'authentification (requis en mode test)"
     )
 
+    parser.add_argument(
+        "--parser",
+        choices=SUPPORTED_HTML_PARSERS,
+        help="Backend HTML (défaut: variable WIGOR_HTML_PARSER, sinon html.parser)",
+    )
+
     # Options de logging
     parser.add_argument(
         "--log-level",
@@ -177,6 +191,12 @@ Exemples d'utilisation:
 
     parser.add_argument("--log-file", type=str, help="Fichier de sortie pour les logs (optionnel)")
 
+    parser.add_argument(
+        "--trace",
+        metavar="FILE",
+        help="Mode test : écrit la durée de chaque étape au format Chrome trace-event (JSON)",
+    )
+
     return parser.parse_args()
 
 
@@ -222,7 +242,14 @@ def main():
             if not validate_test_args(args):
                 sys.exit(1)
 
-            exit_code = test_mode(args.url, args.cookie)
+            if args.trace:
+                enable_tracing()
+
+            with span("main.test_mode"):
+                exit_code = test_mode(args.url, args.cookie, parser=args.parser)
+
+            if args.trace:
+                dump_trace(args.trace)
             sys.exit(exit_code)
         else:
             # Mode interface graphique (par défaut)
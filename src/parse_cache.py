@@ -0,0 +1,427 @@
+"""
+Module de cache disque des résultats de parsing Wigor.
+Les résultats sont indexés par le contenu HTML (BLAKE2b) et par la version du parser:
+une page déjà parsée est relue sans passer par BeautifulSoup.
+"""
+
+import hashlib
+import importlib
+import json
+import logging
+import marshal
+import os
+import sys
+import tempfile
+import threading
+from datetime import datetime
+from functools import lru_cache, partial
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+
+import bs4
+
+try:
+    from . import timetable_parser
+    from .course import Course
+    from .html_backend import resolve_html_parser
+    from .tracing import span
+except ImportError:
+    from src import timetable_parser
+    from src.course import Course
+    from src.html_backend import resolve_html_parser
+    from src.tracing import span
+
+# Configuration du logger
+logger = logging.getLogger(__name__)
+
+# Paquet des modules du parser ("src")
+_PACKAGE = timetable_parser.__name__.rpartition(".")[0]
+
+# Répertoire du cache (défaut: ~/.cache/wigor_viewer/parse)
+CACHE_DIR_ENV_VAR = "WIGOR_CACHE_DIR"
+
+# Désactivation du cache: WIGOR_PARSE_CACHE=0 (ou off, false, no)
+CACHE_ENABLED_ENV_VAR = "WIGOR_PARSE_CACHE"
+
+# Taille maximale du cache sur disque (octets)
+DEFAULT_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+# Version du format des fichiers de cache
+CACHE_FORMAT_VERSION = 1
+
+_CACHE_SUFFIX = ".json"
+
+# Écritures entre deux relevés complets du répertoire (écritures des autres processus)
+_RESCAN_EVERY = 64
+
+# Modules dont le code détermine le résultat du parsing (voir parser_version)
+_PARSER_MODULES = ("timetable_parser", "course", "html_backend", "fetch_result")
+
+
+def _module_code(module) -> bytes:
+    """
+    Retourne le code d'un module: son source, ou son bytecode en exécutable figé.
+
+    Args:
+        module: Module Python
+
+    Returns:
+        bytes: Contenu identifiant la version du code
+    """
+    try:
+        with open(module.__file__, "rb") as f:
+            return f.read()
+    except (OSError, TypeError, AttributeError):
+        pass
+
+    try:
+        return marshal.dumps(module.__loader__.get_code(module.__name__))
+    except Exception:
+        return module.__name__.encode("utf-8")
+
+
+@lru_cache(maxsize=1)
+def parser_version() -> str:
+    """
+    Empreinte de la version du parser.
+
+    Elle change automatiquement avec le code des modules de _PARSER_MODULES, la
+    version de BeautifulSoup, la version de Python ou le format du cache.
+
+    Returns:
+        str: Empreinte hexadécimale
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{CACHE_FORMAT_VERSION}|{bs4.__version__}|{sys.version_info[:2]}".encode())
+    for name in _PARSER_MODULES:
+        # Import tardif: fetch_result importe ce module
+        digest.update(_module_code(importlib.import_module(f"{_PACKAGE}.{name}")))
+    return digest.hexdigest()
+
+
+class ParseCache:
+    """
+    Cache disque des résultats de parsing, partagé entre processus.
+
+    Chaque entrée est un fichier JSON écrit de façon atomique (fichier temporaire
+    puis ``os.replace``). L'ordre LRU est porté par la date de modification des
+    fichiers, rafraîchie à chaque lecture; les entrées les plus anciennes sont
+    supprimées quand la taille totale dépasse ``max_bytes``. La taille est suivie
+    au fil des écritures: le répertoire n'est relu qu'au dépassement, et toutes les
+    _RESCAN_EVERY écritures pour compter celles des autres processus.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[Union[str, Path]] = None,
+        max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+    ):
+        """
+        Initialise le cache.
+
+        Args:
+            directory (Optional[Union[str, Path]]): Répertoire du cache
+                (défaut: WIGOR_CACHE_DIR, sinon ~/.cache/wigor_viewer/parse)
+            max_bytes (int): Taille maximale sur disque
+        """
+        self.directory = Path(directory) if directory else default_cache_directory()
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # Taille totale estimée (None: à relire), écritures depuis le dernier relevé
+        self._size: Optional[int] = None
+        self._writes = 0
+
+    def key(self, html: str, parser: str, kind: str = "courses") -> str:
+        """
+        Calcule la clé d'un résultat de parsing.
+
+        L'année courante fait partie de la clé: les dates des en-têtes en dépendent.
+
+        Args:
+            html (str): Code HTML de la page
+            parser (str): Backend HTML résolu
+            kind (str): Type de résultat ("courses" ou "weeks")
+
+        Returns:
+            str: Clé hexadécimale
+        """
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(f"{parser_version()}|{parser}|{kind}|{datetime.now().year}|".encode())
+        digest.update(html.encode("utf-8", "surrogatepass"))
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}{_CACHE_SUFFIX}"
+
+    def get(self, key: str) -> Optional[object]:
+        """
+        Lit une entrée du cache.
+
+        Args:
+            key (str): Clé de l'entrée
+
+        Returns:
+            Optional[object]: Valeur JSON, ou None si absente ou illisible
+        """
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                value = json.load(f)
+        except FileNotFoundError:
+            self._count(hit=False)
+            return None
+        except (OSError, ValueError) as e:
+            # Fichier corrompu: traité comme absent
+            logger.warning(f"Entrée de cache illisible supprimée ({path.name}): {e}")
+            self._unlink(path)
+            self._invalidate_size()
+            self._count(hit=False)
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        self._count(hit=True)
+        return value
+
+    def put(self, key: str, value: object):
+        """
+        Écrit une entrée du cache de façon atomique, puis applique la limite de taille.
+
+        Args:
+            key (str): Clé de l'entrée
+            value (object): Valeur sérialisable en JSON
+        """
+        path = self._path(key)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            try:
+                previous = path.stat().st_size
+            except OSError:
+                previous = 0
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(value, f, ensure_ascii=False, separators=(",", ":"))
+                written = os.path.getsize(tmp_path)
+                os.replace(tmp_path, path)
+            except BaseException:
+                self._unlink(Path(tmp_path))
+                raise
+        except OSError as e:
+            logger.warning(f"Écriture du cache de parsing impossible: {e}")
+            return
+
+        with self._lock:
+            self._writes += 1
+            if self._size is not None and self._writes % _RESCAN_EVERY:
+                self._size += written - previous
+            else:
+                self._size = None
+            over_limit = self._size is None or self._size > self.max_bytes
+        if over_limit:
+            self._evict()
+
+    def _entries(self) -> List[os.DirEntry]:
+        """Liste les fichiers d'entrées du cache."""
+        try:
+            with os.scandir(self.directory) as it:
+                return [entry for entry in it if entry.name.endswith(_CACHE_SUFFIX)]
+        except OSError:
+            return []
+
+    def _evict(self):
+        """Supprime les entrées les moins récemment utilisées au-delà de max_bytes."""
+        entries = []
+        total = 0
+        for entry in self._entries():
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+
+        if total > self.max_bytes:
+            entries.sort()
+            evicted = 0
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                self._unlink(Path(path))
+                total -= size
+                evicted += 1
+            logger.debug(f"Cache de parsing: {evicted} entrée(s) évincée(s)")
+
+        with self._lock:
+            self._size = total
+
+    def _invalidate_size(self):
+        """Oublie la taille estimée: elle sera relue à la prochaine écriture."""
+        with self._lock:
+            self._size = None
+
+    @staticmethod
+    def _unlink(path: Path):
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+    def _count(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def clear(self):
+        """Supprime toutes les entrées du cache."""
+        for entry in self._entries():
+            self._unlink(Path(entry.path))
+        self._invalidate_size()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Statistiques du cache.
+
+        Returns:
+            Dict[str, int]: {"hits", "misses", "entries", "bytes"}
+        """
+        entries = self._entries()
+        size = 0
+        for entry in entries:
+            try:
+                size += entry.stat().st_size
+            except OSError:
+                pass
+        return {"hits": self.hits, "misses": self.misses, "entries": len(entries), "bytes": size}
+
+
+def default_cache_directory() -> Path:
+    """
+    Répertoire du cache par défaut.
+
+    Returns:
+        Path: WIGOR_CACHE_DIR, sinon ~/.cache/wigor_viewer/parse
+    """
+    env_dir = os.environ.get(CACHE_DIR_ENV_VAR, "").strip()
+    if env_dir:
+        return Path(env_dir)
+    return Path.home() / ".cache" / "wigor_viewer" / "parse"
+
+
+# Caches par défaut, un par répertoire
+_default_caches: Dict[Path, ParseCache] = {}
+_default_caches_lock = threading.Lock()
+
+
+def get_parse_cache() -> Optional[ParseCache]:
+    """
+    Retourne le cache de parsing par défaut.
+
+    Returns:
+        Optional[ParseCache]: Cache du répertoire courant (voir default_cache_directory),
+            ou None si désactivé par WIGOR_PARSE_CACHE
+    """
+    if os.environ.get(CACHE_ENABLED_ENV_VAR, "").strip().lower() in ("0", "off", "false", "no"):
+        return None
+
+    directory = default_cache_directory()
+    with _default_caches_lock:
+        if directory not in _default_caches:
+            _default_caches[directory] = ParseCache(directory)
+        return _default_caches[directory]
+
+
+def parse_wigor_html_cached(
+    html: str,
+    parser: Optional[str] = None,
+    cache: Optional[ParseCache] = None,
+    compute: Optional[Callable[[], List[Course]]] = None,
+) -> List[Course]:
+    """
+    Version avec cache disque de parse_wigor_html.
+
+    Un résultat vide n'est pas conservé: parse_wigor_html retourne aussi une liste
+    vide en cas d'erreur de parsing, qui ne doit pas être figée dans le cache.
+
+    Args:
+        html (str): Code HTML de la page Wigor
+        parser (Optional[str]): Backend HTML (voir parse_wigor_html)
+        cache (Optional[ParseCache]): Cache à utiliser (défaut: get_parse_cache())
+        compute (Optional[Callable[[], List[Course]]]): Calcul du résultat si absent du
+            cache (défaut: parse_wigor_html), ex: à partir d'un arbre déjà construit
+
+    Returns:
+        List[Course]: Liste des cours, identique à parse_wigor_html
+    """
+    backend = resolve_html_parser(parser)
+    if compute is None:
+        compute = partial(timetable_parser.parse_wigor_html, html, parser=backend)
+    cache = cache or get_parse_cache()
+    if cache is None or not html:
+        return compute()
+
+    with span("parse.cache_lookup", chars=len(html)) as trace:
+        key = cache.key(html, backend)
+        cached = cache.get(key)
+        trace.set(hit=cached is not None)
+    if cached is not None:
+        logger.debug(f"Cache de parsing: résultat réutilisé ({len(cached)} cours)")
+        return [Course.from_dict(item) for item in cached]
+
+    courses = compute()
+    if courses:
+        cache.put(key, [course.to_dict() for course in courses])
+    return courses
+
+
+def parse_wigor_html_weeks_cached(
+    html: str,
+    parser: Optional[str] = None,
+    cache: Optional[ParseCache] = None,
+    compute: Optional[Callable[[], Dict[str, List[Course]]]] = None,
+) -> Dict[str, List[Course]]:
+    """
+    Version avec cache disque de parse_wigor_html_weeks.
+
+    Comme pour parse_wigor_html_cached, un résultat vide n'est pas conservé.
+
+    Args:
+        html (str): Code HTML de la page Wigor
+        parser (Optional[str]): Backend HTML (voir parse_wigor_html)
+        cache (Optional[ParseCache]): Cache à utiliser (défaut: get_parse_cache())
+        compute (Optional[Callable[[], Dict[str, List[Course]]]]): Calcul du résultat si
+            absent du cache (défaut: parse_wigor_html_weeks)
+
+    Returns:
+        Dict[str, List[Course]]: Cours par semaine ISO, identique à parse_wigor_html_weeks
+    """
+    backend = resolve_html_parser(parser)
+    if compute is None:
+        compute = partial(timetable_parser.parse_wigor_html_weeks, html, parser=backend)
+    cache = cache or get_parse_cache()
+    if cache is None or not html:
+        return compute()
+
+    with span("parse.cache_lookup", chars=len(html), kind="weeks") as trace:
+        key = cache.key(html, backend, kind="weeks")
+        cached = cache.get(key)
+        trace.set(hit=cached is not None)
+    if cached is not None:
+        return {
+            week: [Course.from_dict(item) for item in courses] for week, courses in cached.items()
+        }
+
+    weeks = compute()
+    if weeks:
+        cache.put(
+            key,
+            {week: [course.to_dict() for course in courses] for week, courses in weeks.items()},
+        )
+    return weeks
@@ -0,0 +1,375 @@
+"""
+Module de parsing des pages Wigor dans un pool de processus.
+Le parsing BeautifulSoup est du Python pur limité par le GIL: des threads
+accélèrent les téléchargements, pas le parsing. Le pool sépare les deux
+étapes: les téléchargements restent sur des threads (ou asyncio), le parsing
+est confié à des processus déjà démarrés, qui reçoivent le corps HTML brut et
+renvoient des enregistrements compacts (tuples de chaînes).
+"""
+
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import requests
+
+try:
+    from .course import Course
+    from .fetch_result import FetchResult
+    from .html_backend import is_html_parser_available, make_soup, resolve_html_parser
+    from .parse_cache import CACHE_ENABLED_ENV_VAR
+    from .tracing import span
+    from .wigor_api import fetch_wigor_page
+except ImportError:
+    from src.course import Course
+    from src.fetch_result import FetchResult
+    from src.html_backend import is_html_parser_available, make_soup, resolve_html_parser
+    from src.parse_cache import CACHE_ENABLED_ENV_VAR
+    from src.tracing import span
+    from src.wigor_api import fetch_wigor_page
+
+# Configuration du logger
+logger = logging.getLogger(__name__)
+
+# Enregistrement compact d'un cours: (titre, prof, horaire, salle, jour)
+CourseRecord = Tuple[str, str, str, str, Optional[str]]
+
+# Résultat d'un worker: (cours, semaines ou None)
+ParsedRecords = Tuple[
+    Tuple[CourseRecord, ...], Optional[Tuple[Tuple[str, Tuple[CourseRecord, ...]], ...]]
+]
+
+
+def default_parse_workers() -> int:
+    """
+    Nombre de processus de parsing par défaut.
+
+    Returns:
+        int: Nombre de cœurs disponibles (au moins 1)
+    """
+    return os.cpu_count() or 1
+
+
+def _init_worker(parser: Optional[str], use_cache: bool):
+    """
+    Prépare un processus de parsing (exécuté une fois au démarrage du processus).
+
+    Les imports, la sonde du backend HTML et ses caches internes sont chargés ici
+    plutôt qu'à la première page.
+    """
+    if not use_cache:
+        # Processus dédié: la variable ne concerne que lui
+        os.environ[CACHE_ENABLED_ENV_VAR] = "0"
+    backend = resolve_html_parser(parser)
+    is_html_parser_available(backend)
+    make_soup("<html><body><div class='Case'></div></body></html>", backend)
+
+
+def _ping() -> int:
+    """Tâche vide: force le démarrage d'un processus du pool."""
+    time.sleep(0.01)
+    return os.getpid()
+
+
+def _to_records(courses: Iterable[Course]) -> Tuple[CourseRecord, ...]:
+    """Convertit des cours en enregistrements compacts."""
+    return tuple((c.titre, c.prof, c.horaire, c.salle, c.jour) for c in courses)
+
+
+def _from_records(records: Iterable[CourseRecord]) -> List[Course]:
+    """Reconstruit les cours à partir de leurs enregistrements."""
+    return [Course(*record) for record in records]
+
+
+def _parse_records(
+    content: bytes, encoding: Optional[str], parser: Optional[str], all_weeks: bool
+) -> ParsedRecords:
+    """
+    Parse une page dans un processus du pool (fonction de module: sérialisable).
+
+    Args:
+        content (bytes): Corps HTML brut
+        encoding (Optional[str]): Encodage du corps (défaut: utf-8)
+        parser (Optional[str]): Backend HTML
+        all_weeks (bool): Extraire aussi toutes les semaines présentes dans la page
+
+    Returns:
+        ParsedRecords: (cours de la semaine principale, (semaine, cours) ou None)
+    """
+    text = content.decode(encoding or "utf-8", "replace")
+    page = FetchResult(text, content=content, encoding=encoding, parser=parser)
+    courses = _to_records(page.courses())
+    weeks = None
+    if all_weeks:
+        weeks = tuple((week, _to_records(items)) for week, items in page.weeks().items())
+    return courses, weeks
+
+
+def _from_parsed(
+    parsed: ParsedRecords,
+) -> Tuple[List[Course], Optional[Dict[str, List[Course]]]]:
+    """Reconstruit (cours, semaines) à partir du résultat d'un worker."""
+    courses, weeks = parsed
+    if weeks is None:
+        return _from_records(courses), None
+    return _from_records(courses), {week: _from_records(items) for week, items in weeks}
+
+
+class ParsePool:
+    """
+    Pool de processus de parsing, démarré une fois et réutilisé.
+
+    Exemple:
+        with ParsePool(workers=4).warm() as pool:
+            courses = pool.parse(page.content, page.encoding)
+
+    Les pages sont transmises en octets et les cours reviennent sous forme de
+    tuples: la sérialisation entre processus reste faible devant le parsing.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        parser: Optional[str] = None,
+        use_cache: bool = True,
+        mp_context=None,
+    ):
+        """
+        Initialise le pool (les processus démarrent à la première tâche ou via warm()).
+
+        Args:
+            workers (Optional[int]): Nombre de processus (défaut: nombre de cœurs)
+            parser (Optional[str]): Backend HTML par défaut (voir parse_wigor_html)
+            use_cache (bool): Utiliser le cache de parsing disque dans les processus
+            mp_context: Contexte multiprocessing (défaut: celui de la plateforme)
+
+        Raises:
+            ValueError: Si workers est inférieur à 1 ou si le backend est inconnu
+        """
+        self.workers = workers or default_parse_workers()
+        if self.workers < 1:
+            raise ValueError("Le pool de parsing doit avoir au moins un processus")
+        self.parser = resolve_html_parser(parser)
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=mp_context,
+            initializer=_init_worker,
+            initargs=(self.parser, use_cache),
+        )
+
+    def __enter__(self) -> "ParsePool":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.close()
+        return False
+
+    def close(self, wait: bool = True):
+        """
+        Arrête les processus du pool.
+
+        Args:
+            wait (bool): Attendre la fin des parsings en cours
+        """
+        self._executor.shutdown(wait=wait)
+
+    def warm(self) -> "ParsePool":
+        """
+        Démarre tous les processus avant la première page.
+
+        Returns:
+            ParsePool: Le pool lui-même (chaînable)
+        """
+        with span("parse_pool.warm", workers=self.workers):
+            futures = [self._executor.submit(_ping) for _ in range(self.workers)]
+            for future in futures:
+                future.result()
+        return self
+
+    def submit(
+        self,
+        content: bytes,
+        encoding: Optional[str] = None,
+        all_weeks: bool = False,
+        parser: Optional[str] = None,
+    ) -> "Future[ParsedRecords]":
+        """
+        Soumet une page au pool.
+
+        Args:
+            content (bytes): Corps HTML brut
+            encoding (Optional[str]): Encodage du corps (défaut: utf-8)
+            all_weeks (bool): Extraire aussi toutes les semaines présentes dans la page
+            parser (Optional[str]): Backend HTML (défaut: celui du pool)
+
+        Returns:
+            Future[ParsedRecords]: Enregistrements compacts (voir ParsedRecords)
+        """
+        return self._executor.submit(
+            _parse_records, content, encoding, parser or self.parser, all_weeks
+        )
+
+    def parse(self, content: bytes, encoding: Optional[str] = None) -> List[Course]:
+        """
+        Parse une page dans le pool.
+
+        Args:
+            content (bytes): Corps HTML brut
+            encoding (Optional[str]): Encodage du corps (défaut: utf-8)
+
+        Returns:
+            List[Course]: Cours de la semaine principale, identiques à parse_wigor_html
+        """
+        return _from_parsed(self.submit(content, encoding).result())[0]
+
+    def parse_weeks(
+        self, content: bytes, encoding: Optional[str] = None
+    ) -> Dict[str, List[Course]]:
+        """
+        Parse une page dans le pool en conservant toutes ses semaines.
+
+        Args:
+            content (bytes): Corps HTML brut
+            encoding (Optional[str]): Encodage du corps (défaut: utf-8)
+
+        Returns:
+            Dict[str, List[Course]]: Cours par semaine ISO, identiques à parse_wigor_html_weeks
+        """
+        return _from_parsed(self.submit(content, encoding, all_weeks=True).result())[1]
+
+    def map(
+        self, contents: Iterable[bytes], encoding: Optional[str] = None
+    ) -> Iterator[List[Course]]:
+        """
+        Parse plusieurs pages en parallèle.
+
+        Args:
+            contents (Iterable[bytes]): Corps HTML bruts
+            encoding (Optional[str]): Encodage commun des corps (défaut: utf-8)
+
+        Yields:
+            List[Course]: Cours de chaque page, dans l'ordre des pages
+        """
+        futures = [self.submit(content, encoding) for content in contents]
+        for future in futures:
+            yield _from_parsed(future.result())[0]
+
+    async def parse_async(
+        self,
+        content: bytes,
+        encoding: Optional[str] = None,
+        all_weeks: bool = False,
+        parser: Optional[str] = None,
+    ) -> Tuple[List[Course], Optional[Dict[str, List[Course]]]]:
+        """
+        Parse une page dans le pool sans bloquer la boucle d'événements.
+
+        Args:
+            content (bytes): Corps HTML brut
+            encoding (Optional[str]): Encodage du corps (défaut: utf-8)
+            all_weeks (bool): Extraire aussi toutes les semaines présentes dans la page
+            parser (Optional[str]): Backend HTML (défaut: celui du pool)
+
+        Returns:
+            Tuple[List[Course], Optional[Dict[str, List[Course]]]]: (cours, semaines ou None)
+        """
+        parsed = await asyncio.wrap_future(self.submit(content, encoding, all_weeks, parser))
+        return _from_parsed(parsed)
+
+    def get_timetable(
+        self,
+        url: str,
+        cookie_header: str = "",
+        session: Optional[requests.Session] = None,
+        parser: Optional[str] = None,
+        all_weeks: bool = False,
+        credentials: Optional[Tuple[str, str]] = None,
+    ) -> Dict[str, Union[str, List[Course], Dict[str, List[Course]]]]:
+        """
+        Version de get_wigor_timetable dont le parsing se fait dans le pool.
+
+        Le téléchargement reste dans le thread appelant: appelée depuis un pool de
+        threads, elle superpose réseau et parsing sur plusieurs cœurs.
+
+        Args:
+            url (str): URL de la page Wigor
+            cookie_header (str): Header cookie d'authentification (ignoré si session fournie)
+            session (Optional[requests.Session]): Session existante à réutiliser
+            parser (Optional[str]): Backend HTML (défaut: celui du pool)
+            all_weeks (bool): Extraire aussi toutes les semaines présentes dans la page
+            credentials (Optional[Tuple[str, str]]): (identifiant, mot de passe)
+
+        Returns:
+            Dict: Même structure que get_wigor_timetable ('html', 'courses', 'weeks')
+        """
+        parser = parser or self.parser
+        page = fetch_wigor_page(url, cookie_header, session, parser=parser, credentials=credentials)
+        with span("parse_pool.parse", bytes=len(page.content)):
+            parsed = self.submit(page.content, page.encoding, all_weeks, parser).result()
+        courses, weeks = _from_parsed(parsed)
+
+        result = {"html": page.text, "courses": courses}
+        if all_weeks:
+            result["weeks"] = weeks
+
+        logger.info(f"Emploi du temps récupéré ({url}): {len(courses)} cours")
+        return result
+
+
+def benchmark_parse_scaling(
+    pages: Sequence[bytes],
+    worker_counts: Optional[Sequence[int]] = None,
+    repeat: int = 3,
+    parser: Optional[str] = None,
+) -> Dict[int, Dict[str, float]]:
+    """
+    Mesure le débit de parsing du pool selon le nombre de processus.
+
+    Le cache de parsing est désactivé dans les processus, et chaque pool est démarré
+    avant la mesure: seuls le parsing et la sérialisation sont mesurés.
+
+    Args:
+        pages (Sequence[bytes]): Pages HTML de référence (une tâche par page)
+        worker_counts (Optional[Sequence[int]]): Nombres de processus à mesurer
+            (défaut: 1, 2, 4... jusqu'au nombre de cœurs)
+        repeat (int): Passages sur les pages par mesure (meilleur retenu)
+        parser (Optional[str]): Backend HTML (défaut: WIGOR_HTML_PARSER ou html.parser)
+
+    Returns:
+        Dict[int, Dict[str, float]]: Par nombre de processus, {"seconds": durée d'un
+            passage, "pages_per_second": ..., "speedup": débit relatif à 1 processus}
+    """
+    if worker_counts is None:
+        cores = default_parse_workers()
+        worker_counts = [1]
+        while worker_counts[-1] * 2 <= cores:
+            worker_counts.append(worker_counts[-1] * 2)
+        if worker_counts[-1] != cores:
+            worker_counts.append(cores)
+
+    results = {}
+    for workers in worker_counts:
+        with ParsePool(workers, parser, use_cache=False).warm() as pool:
+            # Un premier passage charge les caches internes de chaque processus
+            list(pool.map(pages))
+            best = float("inf")
+            for _ in range(repeat):
+                start = time.perf_counter()
+                list(pool.map(pages))
+                best = min(best, time.perf_counter() - start)
+
+        results[workers] = {
+            "seconds": best,
+            "pages_per_second": len(pages) / best if best else float("inf"),
+        }
+        logger.info(
+            f"Pool de {workers} processus: {results[workers]['pages_per_second']:.1f} pages/s"
+        )
+
+    reference = results[worker_counts[0]]["pages_per_second"]
+    for result in results.values():
+        result["speedup"] = result["pages_per_second"] / reference
+    return results
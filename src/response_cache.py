@@ -0,0 +1,260 @@
+"""
+Module de cache disque des réponses HTTP Wigor (requêtes conditionnelles).
+Conserve le corps des pages avec leurs validateurs ETag/Last-Modified pour
+revalider par If-None-Match/If-Modified-Since; sans validateur, une durée de
+fraîcheur (TTL) s'applique.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+try:
+    from ..auth.session_pool import cookie_fingerprint
+    from .parse_cache import ParseCache
+except ImportError:
+    from auth.session_pool import cookie_fingerprint
+    from src.parse_cache import ParseCache
+
+# Configuration du logger
+logger = logging.getLogger(__name__)
+
+# Activation du cache: WIGOR_RESPONSE_CACHE=1 (ou on, true, yes)
+RESPONSE_CACHE_ENV_VAR = "WIGOR_RESPONSE_CACHE"
+
+# Répertoire du cache (défaut: ~/.cache/wigor_viewer/http)
+RESPONSE_CACHE_DIR_ENV_VAR = "WIGOR_RESPONSE_CACHE_DIR"
+
+# Taille maximale du cache sur disque (octets)
+DEFAULT_RESPONSE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Durée de fraîcheur des réponses sans validateur (secondes)
+DEFAULT_RESPONSE_TTL = 300.0
+
+
+class CachedResponse:
+    """
+    Réponse HTTP conservée dans le cache.
+
+    Attributes:
+        body: Corps de la page (texte décodé)
+        response_url: URL finale après redirections
+        etag: Validateur ETag (None si absent)
+        last_modified: Validateur Last-Modified (None si absent)
+        stored_at: Date d'enregistrement ou de dernière revalidation (epoch)
+    """
+
+    __slots__ = ("body", "response_url", "etag", "last_modified", "stored_at")
+
+    def __init__(
+        self,
+        body: str,
+        response_url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        stored_at: Optional[float] = None,
+    ):
+        self.body = body
+        self.response_url = response_url
+        self.etag = etag
+        self.last_modified = last_modified
+        self.stored_at = time.time() if stored_at is None else stored_at
+
+    @property
+    def has_validators(self) -> bool:
+        """Indique si la réponse peut être revalidée par une requête conditionnelle."""
+        return bool(self.etag or self.last_modified)
+
+    def is_fresh(self, ttl: float, now: Optional[float] = None) -> bool:
+        """
+        Indique si la réponse peut être servie sans requête.
+
+        Seules les réponses sans validateur sont servies sur leur âge; les autres
+        sont toujours revalidées.
+
+        Args:
+            ttl (float): Durée de fraîcheur (secondes)
+            now (Optional[float]): Date courante (epoch, défaut: maintenant)
+
+        Returns:
+            bool: True si la réponse est fraîche
+        """
+        if self.has_validators:
+            return False
+        now = time.time() if now is None else now
+        return now - self.stored_at < ttl
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """
+        Headers de revalidation.
+
+        Returns:
+            Dict[str, str]: If-None-Match et/ou If-Modified-Since
+        """
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def to_dict(self) -> Dict[str, object]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> "CachedResponse":
+        return cls(**{name: data.get(name) for name in cls.__slots__})
+
+
+class ResponseCache:
+    """
+    Cache disque des pages Wigor indexé par URL et identité des cookies.
+
+    Le stockage (écriture atomique, éviction LRU par taille) est celui de
+    ParseCache. Les statistiques distinguent les réponses servies sans requête
+    (hits), les revalidations 304 et les téléchargements complets (misses).
+    """
+
+    def __init__(
+        self,
+        directory: Optional[Union[str, Path]] = None,
+        max_bytes: int = DEFAULT_RESPONSE_CACHE_MAX_BYTES,
+        ttl: float = DEFAULT_RESPONSE_TTL,
+    ):
+        """
+        Initialise le cache.
+
+        Args:
+            directory (Optional[Union[str, Path]]): Répertoire du cache
+                (défaut: WIGOR_RESPONSE_CACHE_DIR, sinon ~/.cache/wigor_viewer/http)
+            max_bytes (int): Taille maximale sur disque
+            ttl (float): Durée de fraîcheur des réponses sans validateur (secondes)
+        """
+        self.store = ParseCache(directory or default_response_cache_directory(), max_bytes)
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self._lock = threading.Lock()
+
+    @property
+    def directory(self) -> Path:
+        return self.store.directory
+
+    def key(self, url: str, cookies: Dict[str, str]) -> str:
+        """
+        Calcule la clé d'une page: la même URL peut afficher l'EDT de plusieurs utilisateurs.
+
+        Args:
+            url (str): URL demandée
+            cookies (Dict[str, str]): Cookies de la requête
+
+        Returns:
+            str: Clé hexadécimale
+        """
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(f"{url}|{cookie_fingerprint(cookies)}".encode("utf-8", "surrogatepass"))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """
+        Lit une réponse du cache.
+
+        Args:
+            key (str): Clé de la page
+
+        Returns:
+            Optional[CachedResponse]: Réponse conservée, ou None
+        """
+        data = self.store.get(key)
+        if not isinstance(data, dict):
+            return None
+        try:
+            return CachedResponse.from_dict(data)
+        except TypeError:
+            return None
+
+    def put(self, key: str, response: CachedResponse):
+        """
+        Enregistre une réponse.
+
+        Args:
+            key (str): Clé de la page
+            response (CachedResponse): Réponse à conserver
+        """
+        self.store.put(key, response.to_dict())
+
+    def record(self, outcome: str):
+        """
+        Comptabilise l'issue d'une requête.
+
+        Args:
+            outcome (str): "hit", "revalidated" ou "miss"
+        """
+        with self._lock:
+            if outcome == "hit":
+                self.hits += 1
+            elif outcome == "revalidated":
+                self.revalidations += 1
+            else:
+                self.misses += 1
+
+    def clear(self):
+        """Supprime toutes les réponses du cache."""
+        self.store.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Statistiques du cache.
+
+        Returns:
+            Dict[str, int]: {"hits", "revalidations", "misses", "entries", "bytes"}
+        """
+        disk = self.store.stats()
+        return {
+            "hits": self.hits,
+            "revalidations": self.revalidations,
+            "misses": self.misses,
+            "entries": disk["entries"],
+            "bytes": disk["bytes"],
+        }
+
+
+def default_response_cache_directory() -> Path:
+    """
+    Répertoire du cache de réponses par défaut.
+
+    Returns:
+        Path: WIGOR_RESPONSE_CACHE_DIR, sinon ~/.cache/wigor_viewer/http
+    """
+    env_dir = os.environ.get(RESPONSE_CACHE_DIR_ENV_VAR, "").strip()
+    if env_dir:
+        return Path(env_dir)
+    return Path.home() / ".cache" / "wigor_viewer" / "http"
+
+
+# Caches par défaut, un par répertoire
+_default_caches: Dict[Path, ResponseCache] = {}
+_default_caches_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """
+    Retourne le cache de réponses par défaut (désactivé par défaut).
+
+    Returns:
+        Optional[ResponseCache]: Cache du répertoire courant, ou None si
+            WIGOR_RESPONSE_CACHE n'est pas activé
+    """
+    if os.environ.get(RESPONSE_CACHE_ENV_VAR, "").strip().lower() not in ("1", "on", "true", "yes"):
+        return None
+
+    directory = default_response_cache_directory()
+    with _default_caches_lock:
+        if directory not in _default_caches:
+            _default_caches[directory] = ResponseCache(directory)
+        return _default_caches[directory]
@@ -0,0 +1,573 @@
+"""
+Module de surveillance périodique des emplois du temps Wigor.
+Chaque page enregistrée (URL et authentification) est interrogée à son propre
+rythme, avec un décalage aléatoire pour étaler les requêtes. L'intervalle
+s'adapte: plus court en début de semaine, allongé après plusieurs
+interrogations sans changement. Une page identique à la précédente (même
+empreinte) n'est pas re-parsée; les changements sont transmis aux sinks.
+"""
+
+import heapq
+import json
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, TextIO, Tuple, Union
+
+import requests
+
+try:
+    from .timetable_diff import PageFingerprint, TimetableDiff, diff_wigor_html
+    from .tracing import span
+    from .wigor_api import fetch_wigor_html
+except ImportError:
+    from src.timetable_diff import PageFingerprint, TimetableDiff, diff_wigor_html
+    from src.tracing import span
+    from src.wigor_api import fetch_wigor_html
+
+# Configuration du logger
+logger = logging.getLogger(__name__)
+
+# Intervalle de base entre deux interrogations d'une page (secondes)
+DEFAULT_POLL_INTERVAL = 900.0
+
+# Bornes de l'intervalle adaptatif (secondes)
+DEFAULT_MIN_INTERVAL = 120.0
+DEFAULT_MAX_INTERVAL = 6 * 3600.0
+
+# Allongement de l'intervalle après chaque interrogation sans changement
+DEFAULT_BACKOFF = 1.5
+
+# Facteur appliqué à l'intervalle en début de semaine (lundi, dimanche soir)
+DEFAULT_WEEK_START_FACTOR = 0.5
+
+# Décalage aléatoire relatif de chaque intervalle (±10 %)
+DEFAULT_JITTER = 0.1
+
+# Interrogations simultanées
+DEFAULT_POLL_WORKERS = 4
+
+# Type d'un sink: reçoit chaque événement de changement
+ChangeSink = Callable[["ChangeEvent"], None]
+
+
+class PollTarget:
+    """
+    Page surveillée et état de sa surveillance.
+
+    Attributes:
+        name: Nom de la page (clé d'enregistrement)
+        url: URL Wigor de l'emploi du temps
+        cookie: Header cookie d'authentification
+        session: Session HTTP à réutiliser (prioritaire sur le cookie)
+        credentials: (identifiant, mot de passe), utilisés sans cookie ni session
+        interval: Intervalle de base propre à la page (None = celui du scheduler)
+        fingerprint: Empreinte de la dernière page parsée
+        unchanged: Interrogations consécutives sans changement
+        next_due: Échéance de la prochaine interrogation (horloge du scheduler)
+        polls: Nombre d'interrogations réussies
+        changes: Nombre de changements détectés
+        failures: Nombre d'interrogations en échec
+        last_error: Dernière erreur, None après une interrogation réussie
+    """
+
+    __slots__ = (
+        "name",
+        "url",
+        "cookie",
+        "session",
+        "credentials",
+        "interval",
+        "fingerprint",
+        "unchanged",
+        "next_due",
+        "polls",
+        "changes",
+        "failures",
+        "last_error",
+        "running",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        url: str,
+        cookie: str = "",
+        session: Optional[requests.Session] = None,
+        credentials: Optional[Tuple[str, str]] = None,
+        interval: Optional[float] = None,
+    ):
+        self.name = name
+        self.url = url
+        self.cookie = cookie
+        self.session = session
+        self.credentials = credentials
+        self.interval = interval
+        self.fingerprint: Optional[PageFingerprint] = None
+        self.unchanged = 0
+        self.next_due = 0.0
+        self.polls = 0
+        self.changes = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+        self.running = False
+
+
+class ChangeEvent:
+    """
+    Changement détecté sur une page surveillée.
+
+    Attributes:
+        target: Nom de la page
+        url: URL Wigor de la page
+        diff: Cours ajoutés, supprimés et modifiés (liste complète dans diff.courses)
+        detected_at: Date de détection
+        initial: True pour la première lecture de la page (tous les cours sont « ajoutés »)
+    """
+
+    __slots__ = ("target", "url", "diff", "detected_at", "initial")
+
+    def __init__(
+        self, target: str, url: str, diff: TimetableDiff, detected_at: datetime, initial: bool
+    ):
+        self.target = target
+        self.url = url
+        self.diff = diff
+        self.detected_at = detected_at
+        self.initial = initial
+
+    def to_dict(self) -> Dict[str, object]:
+        """
+        Représentation sérialisable en JSON.
+
+        Returns:
+            Dict[str, object]: {"target", "url", "detected_at", "initial", "added",
+                "removed", "modified"}
+        """
+        return {
+            "target": self.target,
+            "url": self.url,
+            "detected_at": self.detected_at.isoformat(),
+            "initial": self.initial,
+            "added": [dict(course) for course in self.diff.added],
+            "removed": [dict(course) for course in self.diff.removed],
+            "modified": [
+                {"before": dict(before), "after": dict(after)}
+                for before, after in self.diff.modified
+            ],
+        }
+
+    def __repr__(self) -> str:
+        return f"ChangeEvent(target={self.target!r}, initial={self.initial}, diff={self.diff!r})"
+
+
+def log_sink(event: ChangeEvent):
+    """
+    Sink qui journalise chaque changement.
+
+    Args:
+        event (ChangeEvent): Changement détecté
+    """
+    diff = event.diff
+    logger.info(
+        f"📣 {event.target}: +{len(diff.added)} / -{len(diff.removed)} / "
+        f"~{len(diff.modified)} cours{' (lecture initiale)' if event.initial else ''}"
+    )
+
+
+class JsonLinesSink:
+    """
+    Sink qui écrit chaque changement sur une ligne JSON (fichier ou flux texte).
+    """
+
+    def __init__(self, output: Union[str, Path, TextIO]):
+        """
+        Initialise le sink.
+
+        Args:
+            output (Union[str, Path, TextIO]): Fichier (ouvert en ajout) ou flux texte
+        """
+        self._output = output
+        self._lock = threading.Lock()
+
+    def __call__(self, event: ChangeEvent):
+        line = json.dumps(event.to_dict(), ensure_ascii=False) + "\n"
+        with self._lock:
+            if isinstance(self._output, (str, Path)):
+                with open(self._output, "a", encoding="utf-8") as f:
+                    f.write(line)
+            else:
+                self._output.write(line)
+                self._output.flush()
+
+
+def is_week_start(moment: datetime) -> bool:
+    """
+    Indique si un instant est en début de semaine (dimanche soir ou lundi).
+
+    C'est la période où les emplois du temps de la semaine sont publiés et corrigés.
+
+    Args:
+        moment (datetime): Instant à tester
+
+    Returns:
+        bool: True le dimanche à partir de 18h et le lundi
+    """
+    weekday = moment.weekday()
+    return weekday == 0 or (weekday == 6 and moment.hour >= 18)
+
+
+class PollingScheduler:
+    """
+    Surveillance périodique de nombreuses pages Wigor.
+
+    Chaque page a sa propre échéance. Les pages échues sont interrogées par un pool
+    de threads (une seule interrogation à la fois par page). Après chaque
+    interrogation, l'intervalle suivant vaut:
+
+        min(intervalle de base × backoff^(interrogations sans changement), max_interval)
+        × facteur de début de semaine, au moins min_interval,
+        puis décalé aléatoirement de ±jitter.
+
+    Une page dont l'empreinte n'a pas changé n'est pas re-parsée; sinon seuls les
+    blocs de cours modifiés le sont (voir diff_wigor_html). Les sinks reçoivent un
+    ChangeEvent pour chaque page dont les cours ont changé; une erreur de sink est
+    journalisée sans interrompre la surveillance.
+    """
+
+    def __init__(
+        self,
+        sinks: Optional[List[ChangeSink]] = None,
+        interval: float = DEFAULT_POLL_INTERVAL,
+        min_interval: float = DEFAULT_MIN_INTERVAL,
+        max_interval: float = DEFAULT_MAX_INTERVAL,
+        backoff: float = DEFAULT_BACKOFF,
+        week_start_factor: float = DEFAULT_WEEK_START_FACTOR,
+        jitter: float = DEFAULT_JITTER,
+        max_workers: int = DEFAULT_POLL_WORKERS,
+        parser: Optional[str] = None,
+        emit_initial: bool = False,
+        fetch: Callable[..., str] = fetch_wigor_html,
+        clock: Callable[[], float] = time.monotonic,
+        now: Callable[[], datetime] = datetime.now,
+        rng: Optional[random.Random] = None,
+    ):
+        """
+        Initialise le scheduler.
+
+        Args:
+            sinks (Optional[List[ChangeSink]]): Destinataires des changements
+                (défaut: journalisation)
+            interval (float): Intervalle de base entre deux interrogations (secondes)
+            min_interval (float): Intervalle minimal (secondes)
+            max_interval (float): Intervalle maximal (secondes)
+            backoff (float): Allongement après chaque interrogation sans changement
+            week_start_factor (float): Facteur de l'intervalle en début de semaine
+            jitter (float): Décalage aléatoire relatif de chaque intervalle
+            max_workers (int): Interrogations simultanées
+            parser (Optional[str]): Backend HTML (voir parse_wigor_html)
+            emit_initial (bool): Émettre un événement pour la première lecture d'une page
+            fetch (Callable): Téléchargement d'une page (signature de fetch_wigor_html)
+            clock (Callable[[], float]): Horloge monotone des échéances
+            now (Callable[[], datetime]): Date courante (début de semaine, événements)
+            rng (Optional[random.Random]): Générateur aléatoire du décalage
+        """
+        self.sinks: List[ChangeSink] = list(sinks) if sinks is not None else [log_sink]
+        self.interval = interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.week_start_factor = week_start_factor
+        self.jitter = jitter
+        self.parser = parser
+        self.emit_initial = emit_initial
+        self._fetch = fetch
+        self._clock = clock
+        self._now = now
+        self._rng = rng or random.Random()
+        self._targets: Dict[str, PollTarget] = {}
+        self._queue: List[Tuple[float, int, str]] = []
+        self._sequence = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="wigor-poll"
+        )
+        self.skipped_parses = 0
+        self.sink_failures = 0
+
+    def register(
+        self,
+        name: str,
+        url: str,
+        cookie_header: str = "",
+        session: Optional[requests.Session] = None,
+        credentials: Optional[Tuple[str, str]] = None,
+        interval: Optional[float] = None,
+    ) -> PollTarget:
+        """
+        Enregistre une page à surveiller (remplace une page de même nom).
+
+        La première interrogation est décalée aléatoirement dans la fenêtre de
+        jitter, pour que des centaines de pages enregistrées ensemble ne soient
+        pas interrogées en rafale.
+
+        Args:
+            name (str): Nom de la page
+            url (str): URL Wigor de l'emploi du temps
+            cookie_header (str): Header cookie d'authentification
+            session (Optional[requests.Session]): Session HTTP à réutiliser
+            credentials (Optional[Tuple[str, str]]): (identifiant, mot de passe)
+            interval (Optional[float]): Intervalle de base propre à la page (secondes)
+
+        Returns:
+            PollTarget: Page enregistrée
+
+        Raises:
+            ValueError: Si l'URL est vide
+        """
+        if not url:
+            raise ValueError("L'URL ne peut pas être vide")
+
+        target = PollTarget(name, url, cookie_header, session, credentials, interval)
+        base = interval if interval is not None else self.interval
+        with self._lock:
+            self._targets[name] = target
+            self._schedule(target, self._clock() + self._rng.uniform(0, base * self.jitter))
+        self._wake.set()
+        return target
+
+    def unregister(self, name: str) -> bool:
+        """
+        Arrête la surveillance d'une page.
+
+        Args:
+            name (str): Nom de la page
+
+        Returns:
+            bool: True si la page était enregistrée
+        """
+        with self._lock:
+            return self._targets.pop(name, None) is not None
+
+    def targets(self) -> List[PollTarget]:
+        """
+        Pages enregistrées.
+
+        Returns:
+            List[PollTarget]: Pages, dans l'ordre d'enregistrement
+        """
+        with self._lock:
+            return list(self._targets.values())
+
+    def next_interval(self, target: PollTarget) -> float:
+        """
+        Calcule le délai avant la prochaine interrogation d'une page.
+
+        Args:
+            target (PollTarget): Page surveillée
+
+        Returns:
+            float: Délai (secondes), décalage aléatoire compris
+        """
+        base = target.interval if target.interval is not None else self.interval
+        # Borne de l'exposant: au-delà, l'intervalle est de toute façon plafonné
+        delay = min(base * self.backoff ** min(target.unchanged, 32), self.max_interval)
+        # Après le plafond: même une page stable est interrogée plus souvent en début de semaine
+        if is_week_start(self._now()):
+            delay *= self.week_start_factor
+        delay = max(delay, self.min_interval)
+        return delay * (1 + self._rng.uniform(-self.jitter, self.jitter))
+
+    def poll(self, name: str) -> Optional[ChangeEvent]:
+        """
+        Interroge une page immédiatement et transmet un éventuel changement aux sinks.
+
+        Args:
+            name (str): Nom de la page
+
+        Returns:
+            Optional[ChangeEvent]: Changement détecté, None sinon
+
+        Raises:
+            KeyError: Si la page n'est pas enregistrée
+            requests.RequestException: En cas d'erreur de téléchargement
+            ValueError: En cas d'échec de connexion ou de backend HTML inconnu
+        """
+        with self._lock:
+            target = self._targets[name]
+        return self._poll_target(target)
+
+    def _poll_target(self, target: PollTarget) -> Optional[ChangeEvent]:
+        """Corps de poll() pour une page déjà résolue."""
+        with span("scheduler.poll", target=target.name) as trace:
+            html = self._fetch(
+                target.url, target.cookie, session=target.session, credentials=target.credentials
+            )
+            previous = target.fingerprint
+            diff = diff_wigor_html(previous, html, self.parser)
+            target.fingerprint = diff.fingerprint
+            target.polls += 1
+            target.last_error = None
+
+            parsed = diff.fingerprint is not previous
+            trace.set(parsed=parsed, changed=diff.changed)
+            if not parsed:
+                with self._lock:
+                    self.skipped_parses += 1
+
+            if previous is not None and not diff.changed:
+                target.unchanged += 1
+                return None
+
+            target.unchanged = 0
+            if previous is None and not self.emit_initial:
+                return None
+
+            if previous is not None:
+                target.changes += 1
+            event = ChangeEvent(target.name, target.url, diff, self._now(), previous is None)
+
+        self._emit(event)
+        return event
+
+    def run_pending(self) -> int:
+        """
+        Lance l'interrogation des pages échues (dans le pool de threads).
+
+        Returns:
+            int: Nombre d'interrogations lancées (0 après close)
+        """
+        if self._stopped.is_set():
+            return 0
+        now = self._clock()
+        due = []
+        with self._lock:
+            while self._queue and self._queue[0][0] <= now:
+                due_at, _, name = heapq.heappop(self._queue)
+                target = self._targets.get(name)
+                # Entrée périmée: page désenregistrée, remplacée ou replanifiée
+                if target is None or target.running or target.next_due != due_at:
+                    continue
+                target.running = True
+                due.append(target)
+
+        for launched, target in enumerate(due):
+            try:
+                self._executor.submit(self._run_poll, target)
+            except RuntimeError:
+                # Pool arrêté par close() entre-temps: plus aucune interrogation
+                with self._lock:
+                    for pending in due[launched:]:
+                        pending.running = False
+                return launched
+        return len(due)
+
+    def seconds_until_next(self) -> Optional[float]:
+        """
+        Délai avant la prochaine échéance.
+
+        Returns:
+            Optional[float]: Délai (secondes, 0 si une page est échue), None sans page
+        """
+        with self._lock:
+            if not self._queue:
+                return None
+            return max(0.0, self._queue[0][0] - self._clock())
+
+    def start(self):
+        """Lance la surveillance en arrière-plan (thread dédié)."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._loop, name="wigor-scheduler", daemon=True)
+        self._thread.start()
+
+    def run_forever(self):
+        """Surveille les pages jusqu'à l'arrêt (close) ou une interruption clavier."""
+        self.start()
+        try:
+            while not self._stopped.wait(1.0):
+                pass
+        finally:
+            self.close()
+
+    def close(self, wait: bool = True):
+        """
+        Arrête la surveillance.
+
+        Args:
+            wait (bool): Attendre la fin des interrogations en cours
+        """
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=5)
+        self._executor.shutdown(wait=wait)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Statistiques de la surveillance.
+
+        Returns:
+            Dict[str, int]: {"targets", "polls", "changes", "failures", "skipped_parses",
+                "sink_failures"}
+        """
+        with self._lock:
+            targets = list(self._targets.values())
+            return {
+                "targets": len(targets),
+                "polls": sum(target.polls for target in targets),
+                "changes": sum(target.changes for target in targets),
+                "failures": sum(target.failures for target in targets),
+                "skipped_parses": self.skipped_parses,
+                "sink_failures": self.sink_failures,
+            }
+
+    def _schedule(self, target: PollTarget, due_at: float):
+        """Planifie la prochaine interrogation d'une page (verrou détenu)."""
+        target.next_due = due_at
+        self._sequence += 1
+        heapq.heappush(self._queue, (due_at, self._sequence, target.name))
+
+    def _run_poll(self, target: PollTarget):
+        """Interroge une page dans le pool, puis la replanifie."""
+        try:
+            with self._lock:
+                registered = self._targets.get(target.name) is target
+            if registered:
+                self._poll_target(target)
+        except Exception as e:
+            target.failures += 1
+            target.last_error = str(e)
+            logger.warning(f"⚠️ Interrogation de '{target.name}' impossible: {e}")
+        finally:
+            delay = self.next_interval(target)
+            with self._lock:
+                target.running = False
+                if self._targets.get(target.name) is target:
+                    self._schedule(target, self._clock() + delay)
+            self._wake.set()
+
+    def _emit(self, event: ChangeEvent):
+        """Transmet un événement à chaque sink, sans propager leurs erreurs."""
+        for sink in list(self.sinks):
+            try:
+                sink(event)
+            except Exception as e:
+                with self._lock:
+                    self.sink_failures += 1
+                logger.error(f"Sink en échec pour '{event.target}': {e}")
+
+    def _loop(self):
+        """Boucle du thread de surveillance: lance les pages échues, puis attend."""
+        while not self._stopped.is_set():
+            self._wake.clear()
+            self.run_pending()
+            delay = self.seconds_until_next()
+            self._wake.wait(1.0 if delay is None else min(delay, 1.0))
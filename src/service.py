@@ -0,0 +1,545 @@
+"""
+Module du service local d'emplois du temps (HTTP, JSON).
+Le service est seul à interroger Wigor: chaque groupe est conservé en mémoire,
+déjà sérialisé en JSON, avec une durée de fraîcheur (TTL). Une entrée expirée
+reste servie pendant son rafraîchissement en arrière-plan
+(stale-while-revalidate): les lectures sont répondues depuis la mémoire.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import unquote, urlparse
+
+try:
+    from .tracing import span
+    from .wigor_api import get_wigor_timetable
+except ImportError:
+    from src.tracing import span
+    from src.wigor_api import get_wigor_timetable
+
+# Configuration du logger
+logger = logging.getLogger(__name__)
+
+# Port publié par docker-compose.yml
+DEFAULT_SERVICE_PORT = 8080
+
+# Durée de fraîcheur d'un emploi du temps (secondes)
+DEFAULT_SERVICE_TTL = 300.0
+
+# Durée pendant laquelle une entrée expirée reste servie pendant son rafraîchissement
+DEFAULT_STALE_TTL = 3600.0
+
+# Rafraîchissements simultanés en arrière-plan
+DEFAULT_REFRESH_WORKERS = 2
+
+
+class TimetableGroup:
+    """
+    Groupe servi par le service: une page Wigor et son authentification.
+
+    Attributes:
+        name: Nom du groupe (chemin /timetable/<name>)
+        url: URL Wigor de l'emploi du temps
+        cookie: Header cookie d'authentification
+        credentials: (identifiant, mot de passe), utilisés sans cookie
+    """
+
+    __slots__ = ("name", "url", "cookie", "credentials")
+
+    def __init__(
+        self,
+        name: str,
+        url: str,
+        cookie: str = "",
+        credentials: Optional[Tuple[str, str]] = None,
+    ):
+        self.name = name
+        self.url = url
+        self.cookie = cookie
+        self.credentials = credentials
+
+    @classmethod
+    def from_dict(cls, name: str, data: Dict[str, str]) -> "TimetableGroup":
+        """
+        Construit un groupe depuis sa configuration.
+
+        Les secrets peuvent être référencés plutôt qu'écrits dans le fichier:
+        "cookie_env" et "password_env" donnent le nom de la variable d'environnement
+        qui les contient.
+
+        Args:
+            name (str): Nom du groupe
+            data (Dict[str, str]): {"url", "cookie" | "cookie_env"} ou
+                {"url", "username", "password" | "password_env"}
+
+        Returns:
+            TimetableGroup: Groupe
+
+        Raises:
+            ValueError: Si l'URL ou l'authentification manque
+        """
+        if not data.get("url"):
+            raise ValueError(f"Groupe '{name}': url manquante")
+        cookie = data.get("cookie") or _secret_from_env(name, data.get("cookie_env"))
+        password = data.get("password") or _secret_from_env(name, data.get("password_env"))
+        credentials = None
+        if data.get("username") and password:
+            credentials = (data["username"], password)
+        if not cookie and credentials is None:
+            raise ValueError(f"Groupe '{name}': cookie ou username/password requis")
+        return cls(name, data["url"], cookie, credentials)
+
+
+def _secret_from_env(name: str, variable: Optional[str]) -> str:
+    """Lit un secret référencé par nom de variable d'environnement ("" sans référence)."""
+    if not variable:
+        return ""
+    value = os.environ.get(variable)
+    if not value:
+        raise ValueError(f"Groupe '{name}': variable d'environnement {variable} absente")
+    return value
+
+
+def load_groups(path: Union[str, Path]) -> Dict[str, TimetableGroup]:
+    """
+    Lit la configuration des groupes.
+
+    Deux formats sont acceptés:
+        - JSON: {"nom": {"url": ..., "cookie": ...}, ...}
+        - JSON lines (extension .jsonl): une ligne {"group": "nom", "url": ..., ...}
+          par groupe, pratique pour les manifestes générés de plusieurs centaines de groupes
+
+    Args:
+        path (Union[str, Path]): Fichier de configuration
+
+    Returns:
+        Dict[str, TimetableGroup]: Groupes par nom, dans l'ordre du fichier
+
+    Raises:
+        ValueError: Si le fichier est invalide
+    """
+    path = Path(path)
+    try:
+        text = path.read_text(encoding="utf-8")
+        if path.suffix == ".jsonl":
+            data = _groups_from_json_lines(text)
+        else:
+            data = json.loads(text)
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValueError(f"Configuration des groupes illisible ({path}): {e}") from e
+    if not isinstance(data, dict) or not data:
+        raise ValueError("La configuration doit associer au moins un nom de groupe à sa page")
+    return {name: TimetableGroup.from_dict(name, config) for name, config in data.items()}
+
+
+def _groups_from_json_lines(text: str) -> Dict[str, Dict[str, str]]:
+    """
+    Convertit un manifeste JSON lines en configuration {"nom": {...}}.
+
+    Raises:
+        json.JSONDecodeError: Si une ligne n'est pas du JSON
+        ValueError: Si une ligne n'a pas de nom de groupe ou répète un nom
+    """
+    data = {}
+    for number, line in enumerate(text.splitlines(), 1):
+        if not line.strip():
+            continue
+        entry = json.loads(line)
+        name = entry.pop("group", None) if isinstance(entry, dict) else None
+        if not name:
+            raise ValueError(f"Ligne {number}: champ 'group' manquant")
+        if name in data:
+            raise ValueError(f"Ligne {number}: groupe '{name}' en double")
+        data[name] = entry
+    return data
+
+
+class CacheEntry:
+    """
+    Emploi du temps d'un groupe conservé en mémoire, prêt à être envoyé.
+
+    Attributes:
+        body: Réponse JSON encodée
+        etag: Empreinte du corps (header ETag)
+        fetched_at: Date de récupération (epoch)
+        courses: Nombre de cours
+    """
+
+    __slots__ = ("body", "etag", "fetched_at", "courses")
+
+    def __init__(self, body: bytes, etag: str, fetched_at: float, courses: int):
+        self.body = body
+        self.etag = etag
+        self.fetched_at = fetched_at
+        self.courses = courses
+
+    def age(self, now: Optional[float] = None) -> float:
+        """Âge de l'entrée (secondes)."""
+        return (time.time() if now is None else now) - self.fetched_at
+
+
+class TimetableService:
+    """
+    Cache mémoire des emplois du temps, par groupe, rafraîchi en arrière-plan.
+
+    - entrée fraîche (âge < ttl): servie telle quelle;
+    - entrée expirée (âge < ttl + stale_ttl): servie, et rafraîchie en arrière-plan
+      (un seul rafraîchissement à la fois par groupe);
+    - pas d'entrée, ou trop ancienne: récupération immédiate.
+
+    Si un rafraîchissement échoue, l'entrée précédente reste servie jusqu'à la fin
+    de sa période de grâce.
+    """
+
+    def __init__(
+        self,
+        groups: Dict[str, TimetableGroup],
+        ttl: float = DEFAULT_SERVICE_TTL,
+        stale_ttl: float = DEFAULT_STALE_TTL,
+        refresh_workers: int = DEFAULT_REFRESH_WORKERS,
+        fetch: Callable[..., Dict[str, object]] = get_wigor_timetable,
+    ):
+        """
+        Initialise le service.
+
+        Args:
+            groups (Dict[str, TimetableGroup]): Groupes servis
+            ttl (float): Durée de fraîcheur (secondes)
+            stale_ttl (float): Période de grâce d'une entrée expirée (secondes)
+            refresh_workers (int): Rafraîchissements simultanés en arrière-plan
+            fetch (Callable): Récupération d'un emploi du temps (signature de
+                get_wigor_timetable)
+        """
+        self.groups = groups
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._fetch = fetch
+        self._entries: Dict[str, CacheEntry] = {}
+        self._errors: Dict[str, str] = {}
+        self._refreshing: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=refresh_workers, thread_name_prefix="wigor-refresh"
+        )
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+
+    def close(self):
+        """Arrête les rafraîchissements en arrière-plan."""
+        self._executor.shutdown(wait=False)
+
+    def get(self, name: str) -> Tuple[CacheEntry, str]:
+        """
+        Retourne l'emploi du temps d'un groupe.
+
+        Args:
+            name (str): Nom du groupe
+
+        Returns:
+            Tuple[CacheEntry, str]: (entrée, état: "hit", "stale" ou "miss")
+
+        Raises:
+            KeyError: Si le groupe est inconnu
+            Exception: L'erreur de récupération, si aucune entrée n'est utilisable
+        """
+        if name not in self.groups:
+            raise KeyError(name)
+
+        now = time.time()
+        entry = self._entries.get(name)
+        if entry is not None:
+            age = entry.age(now)
+            if age < self.ttl:
+                self._count("hits")
+                return entry, "hit"
+            if age < self.ttl + self.stale_ttl:
+                self._count("stale_hits")
+                self.refresh_async(name)
+                return entry, "stale"
+
+        self._count("misses")
+        return self.refresh(name), "miss"
+
+    def _count(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def refresh(self, name: str) -> CacheEntry:
+        """
+        Récupère l'emploi du temps d'un groupe et remplace son entrée.
+
+        Un rafraîchissement déjà en cours pour le groupe est attendu plutôt que relancé.
+
+        Args:
+            name (str): Nom du groupe
+
+        Returns:
+            CacheEntry: Nouvelle entrée
+
+        Raises:
+            Exception: L'erreur de récupération
+        """
+        with self._lock:
+            running = self._refreshing.get(name)
+            if running is None:
+                running = self._refreshing[name] = threading.Event()
+                leader = True
+            else:
+                leader = False
+
+        if not leader:
+            running.wait()
+            entry = self._entries.get(name)
+            if entry is None or name in self._errors:
+                raise RuntimeError(self._errors.get(name, "Récupération impossible"))
+            return entry
+
+        try:
+            return self._refresh(name)
+        finally:
+            with self._lock:
+                del self._refreshing[name]
+            running.set()
+
+    def refresh_async(self, name: str) -> bool:
+        """
+        Lance le rafraîchissement d'un groupe en arrière-plan, sauf s'il est en cours.
+
+        Args:
+            name (str): Nom du groupe
+
+        Returns:
+            bool: True si un rafraîchissement a été lancé
+        """
+        with self._lock:
+            if name in self._refreshing:
+                return False
+            self._refreshing[name] = running = threading.Event()
+
+        def run():
+            try:
+                self._refresh(name)
+            except Exception:
+                pass  # déjà journalisé, l'entrée précédente reste servie
+            finally:
+                with self._lock:
+                    del self._refreshing[name]
+                running.set()
+
+        try:
+            self._executor.submit(run)
+        except RuntimeError:
+            # Service arrêté
+            with self._lock:
+                del self._refreshing[name]
+            running.set()
+            return False
+        return True
+
+    def warm(self):
+        """Lance en arrière-plan la récupération de tous les groupes."""
+        for name in self.groups:
+            self.refresh_async(name)
+
+    def _refresh(self, name: str) -> CacheEntry:
+        group = self.groups[name]
+        with span("service.refresh", group=name) as trace:
+            try:
+                result = self._fetch(
+                    group.url, group.cookie, all_weeks=True, credentials=group.credentials
+                )
+            except Exception as e:
+                self._count("refresh_failures")
+                self._errors[name] = str(e)
+                logger.error(f"❌ Rafraîchissement du groupe {name} en échec: {e}")
+                raise
+            entry = _make_entry(name, result)
+            trace.set(courses=entry.courses, bytes=len(entry.body))
+
+        self._entries[name] = entry
+        self._errors.pop(name, None)
+        self._count("refreshes")
+        logger.info(f"🔄 Groupe {name} rafraîchi: {entry.courses} cours")
+        return entry
+
+    def status(self) -> List[Dict[str, object]]:
+        """
+        État du cache de chaque groupe.
+
+        Returns:
+            List[Dict[str, object]]: {"group", "cached", "age", "courses", "refreshing", "error"}
+        """
+        now = time.time()
+        states = []
+        for name in self.groups:
+            entry = self._entries.get(name)
+            states.append(
+                {
+                    "group": name,
+                    "cached": entry is not None,
+                    "age": round(entry.age(now), 3) if entry else None,
+                    "courses": entry.courses if entry else None,
+                    "refreshing": name in self._refreshing,
+                    "error": self._errors.get(name),
+                }
+            )
+        return states
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Statistiques du service.
+
+        Returns:
+            Dict[str, int]: {"hits", "stale_hits", "misses", "refreshes", "refresh_failures"}
+        """
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "refresh_failures": self.refresh_failures,
+        }
+
+
+def _make_entry(name: str, result: Dict[str, object]) -> CacheEntry:
+    """Sérialise un emploi du temps une fois pour toutes les lectures."""
+    fetched_at = time.time()
+    courses = [dict(course) for course in result.get("courses", [])]
+    weeks = {
+        week: [dict(course) for course in week_courses]
+        for week, week_courses in (result.get("weeks") or {}).items()
+    }
+    payload = {
+        "group": name,
+        "fetched_at": datetime.fromtimestamp(fetched_at, timezone.utc).isoformat(),
+        "courses": courses,
+        "weeks": weeks,
+    }
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+    return CacheEntry(body, etag, fetched_at, len(courses))
+
+
+class TimetableRequestHandler(BaseHTTPRequestHandler):
+    """
+    Routes du service:
+        GET /health             état du service
+        GET /groups             état du cache de chaque groupe
+        GET /stats              compteurs du cache
+        GET /timetable/<group>  emploi du temps JSON (ETag, If-None-Match)
+    """
+
+    server_version = "WigorService"
+
+    def do_GET(self):
+        path = urlparse(self.path).path.rstrip("/")
+        service: TimetableService = self.server.service
+
+        if path == "/health":
+            self._send_json({"status": "ok", "groups": len(service.groups)})
+        elif path == "/groups":
+            self._send_json(service.status())
+        elif path == "/stats":
+            self._send_json(service.stats())
+        elif path.startswith("/timetable/"):
+            self._send_timetable(service, unquote(path[len("/timetable/") :]))
+        else:
+            self._send_json({"error": "Route inconnue"}, 404)
+
+    def _send_timetable(self, service: TimetableService, name: str):
+        try:
+            entry, state = service.get(name)
+        except KeyError:
+            self._send_json({"error": f"Groupe inconnu: {name}"}, 404)
+            return
+        except Exception as e:
+            self._send_json({"error": f"Wigor indisponible: {e}"}, 502)
+            return
+
+        headers = {
+            "ETag": entry.etag,
+            "Age": str(int(entry.age())),
+            "X-Cache": state.upper(),
+            "Cache-Control": f"max-age={max(0, int(service.ttl - entry.age()))}",
+        }
+        if self.headers.get("If-None-Match") == entry.etag:
+            self._send(304, b"", headers)
+        else:
+            self._send(200, entry.body, headers)
+
+    def _send_json(self, payload, status: int = 200):
+        self._send(status, json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+
+    def _send(self, status: int, body: bytes, headers: Optional[Dict[str, str]] = None):
+        self.send_response(status)
+        if status != 304:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if status != 304:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} - {format % args}")
+
+
+def make_server(
+    service: TimetableService, host: str = "0.0.0.0", port: int = DEFAULT_SERVICE_PORT
+) -> ThreadingHTTPServer:
+    """
+    Crée le serveur HTTP du service (sans le démarrer).
+
+    Args:
+        service (TimetableService): Service à exposer
+        host (str): Adresse d'écoute
+        port (int): Port d'écoute (0: port libre)
+
+    Returns:
+        ThreadingHTTPServer: Serveur (serve_forever pour le démarrer)
+    """
+    server = ThreadingHTTPServer((host, port), TimetableRequestHandler)
+    server.daemon_threads = True
+    server.service = service
+    return server
+
+
+def serve(
+    groups: Dict[str, TimetableGroup],
+    host: str = "0.0.0.0",
+    port: int = DEFAULT_SERVICE_PORT,
+    ttl: float = DEFAULT_SERVICE_TTL,
+    stale_ttl: float = DEFAULT_STALE_TTL,
+):
+    """
+    Démarre le service et répond aux requêtes jusqu'à l'interruption.
+
+    Args:
+        groups (Dict[str, TimetableGroup]): Groupes servis
+        host (str): Adresse d'écoute
+        port (int): Port d'écoute
+        ttl (float): Durée de fraîcheur (secondes)
+        stale_ttl (float): Période de grâce d'une entrée expirée (secondes)
+    """
+    service = TimetableService(groups, ttl=ttl, stale_ttl=stale_ttl)
+    server = make_server(service, host, port)
+    service.warm()
+    logger.info(f"🚀 Service d'emplois du temps sur http://{host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        service.close()
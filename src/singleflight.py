@@ -0,0 +1,150 @@
+"""
+Module de regroupement des requêtes identiques simultanées (single-flight).
+Tant qu'un appel est en cours pour une clé, les appels identiques attendent son
+issue au lieu de le relancer: une seule requête réseau et un seul parsing, et
+chacun reçoit le même résultat ou la même exception.
+"""
+
+import logging
+import os
+import threading
+from typing import Callable, Dict, Hashable, Optional, TypeVar
+
+# Configuration du logger
+logger = logging.getLogger(__name__)
+
+# Désactivation du regroupement: WIGOR_SINGLE_FLIGHT=0 (ou off, false, no)
+SINGLE_FLIGHT_ENV_VAR = "WIGOR_SINGLE_FLIGHT"
+
+T = TypeVar("T")
+
+
+class _Call:
+    """Appel en cours: résultat ou exception, publiés à la fin."""
+
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Groupe d'appels regroupés par clé.
+
+    Seuls les appels simultanés sont regroupés: dès que l'appel se termine, la clé
+    est libérée et l'appel suivant est exécuté à nouveau (ce n'est pas un cache).
+    Le résultat est partagé entre les appelants et ne doit pas être modifié.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable[..., T], *args, **kwargs) -> T:
+        """
+        Exécute fn(*args, **kwargs), ou attend l'appel identique déjà en cours.
+
+        Args:
+            key (Hashable): Clé de l'appel (deux appels de même clé sont identiques)
+            fn (Callable): Fonction à exécuter
+            *args: Arguments positionnels de fn
+            **kwargs: Arguments nommés de fn
+
+        Returns:
+            T: Résultat de fn, celui de l'appel en cours le cas échéant
+
+        Raises:
+            BaseException: L'exception levée par fn, pour chaque appelant
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+                leader = True
+            else:
+                call.waiters += 1
+                self.shared += 1
+                leader = False
+
+        if not leader:
+            logger.debug("Requête identique en cours, attente de son résultat")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+            if call.waiters:
+                logger.info(f"🔗 Résultat partagé avec {call.waiters} requête(s) identique(s)")
+
+    def in_flight(self) -> int:
+        """
+        Nombre d'appels en cours.
+
+        Returns:
+            int: Clés en cours d'exécution
+        """
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Statistiques du groupe.
+
+        Returns:
+            Dict[str, int]: {"executed", "shared", "in_flight"}
+        """
+        with self._lock:
+            return {"executed": self.executed, "shared": self.shared, "in_flight": len(self._calls)}
+
+
+# Groupe par défaut du processus
+_default_group = SingleFlight()
+
+
+def get_single_flight() -> Optional[SingleFlight]:
+    """
+    Retourne le groupe par défaut.
+
+    Returns:
+        Optional[SingleFlight]: Groupe du processus, ou None si WIGOR_SINGLE_FLIGHT
+            le désactive
+    """
+    if os.environ.get(SINGLE_FLIGHT_ENV_VAR, "").strip().lower() in ("0", "off", "false", "no"):
+        return None
+    return _default_group
+
+
+def single_flight(key: Hashable, fn: Callable[..., T], *args, **kwargs) -> T:
+    """
+    Exécute fn dans le groupe par défaut (directement s'il est désactivé).
+
+    Args:
+        key (Hashable): Clé de l'appel
+        fn (Callable): Fonction à exécuter
+        *args: Arguments positionnels de fn
+        **kwargs: Arguments nommés de fn
+
+    Returns:
+        T: Résultat de fn
+    """
+    group = get_single_flight()
+    if group is None:
+        return fn(*args, **kwargs)
+    return group.do(key, fn, *args, **kwargs)
@@ -0,0 +1,334 @@
+"""
+Module de parsing incrémental des pages Wigor.
+Un tokeniseur HTML (html.parser de la bibliothèque standard) reçoit la page par
+morceaux et produit le même parcours que _scan_document, sans construire d'arbre
+ni garder la page entière en mémoire; chaque cours est émis dès la fermeture de
+son div.Case.
+"""
+
+import logging
+from html.parser import HTMLParser
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    from .course import Course
+    from .timetable_parser import (
+        _COURSE_CELL_FIELDS,
+        _course_info_from_cells,
+        _courses_from_scan,
+        _DayIndex,
+        _left_from_style,
+        _PageScan,
+    )
+    from .tracing import span
+except ImportError:
+    from src.course import Course
+    from src.timetable_parser import (
+        _COURSE_CELL_FIELDS,
+        _course_info_from_cells,
+        _courses_from_scan,
+        _DayIndex,
+        _left_from_style,
+        _PageScan,
+    )
+    from src.tracing import span
+
+# Configuration du logger
+logger = logging.getLogger(__name__)
+
+# Éléments vides (jamais de contenu ni de balise fermante), comme dans BeautifulSoup
+_VOID_ELEMENTS = frozenset(
+    (
+        "area base basefont bgsound br col command embed frame hr image img input "
+        "isindex keygen link menuitem meta nextid param source spacer track wbr"
+    ).split()
+)
+
+# Éléments dont le texte est exclu de get_text()
+_SCRIPT_ELEMENTS = frozenset(("script", "style", "template"))
+
+# Valeur réservée d'une cellule dont le td est encore ouvert
+_PENDING = object()
+
+
+class _TextCapture:
+    """Texte d'un td en cours de lecture et emplacements à remplir à sa fermeture."""
+
+    __slots__ = ("pieces", "targets")
+
+    def __init__(self):
+        self.pieces: List[str] = []
+        # (conteneur, clé): column[1], cells[champ] ou scan.day_cells[index]
+        self.targets: List[Tuple[object, object]] = []
+
+
+class _OpenElement:
+    """Élément ouvert de la pile du tokeniseur."""
+
+    __slots__ = ("name", "open_days", "open_cases", "capture", "block", "is_title")
+
+    def __init__(self, name, open_days, open_cases, capture=None, block=None, is_title=False):
+        self.name = name
+        self.open_days = open_days
+        self.open_cases = open_cases
+        self.capture = capture
+        self.block = block
+        self.is_title = is_title
+
+
+class StreamingWigorParser(HTMLParser):
+    """
+    Parser incrémental d'une page Wigor.
+
+    ``feed()`` accepte des morceaux de page de taille quelconque et retourne les cours
+    dont le div.Case vient de se fermer. Leur jour est provisoire: la colonne la plus
+    proche parmi celles déjà lues. ``close()`` termine le parcours; la liste définitive
+    (semaine principale, triée) est ``courses()``, identique à parse_wigor_html avec le
+    backend html.parser.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.scan = _PageScan()
+        self.title: Optional[str] = None
+        self.contains_inner_case = False
+        self.chars = 0
+        self._stack: List[_OpenElement] = []
+        self._captures: List[_TextCapture] = []
+        self._text: List[str] = []
+        self._title_pieces: Optional[List[str]] = None
+        self._script_depth = 0
+        self._days_seen: List[Tuple[float, str]] = []
+        # Index des jours déjà lus, reconstruit seulement à l'arrivée d'un nouveau jour
+        self._day_index: Optional[_DayIndex] = None
+        self._emitted: List[Course] = []
+        self._closed = False
+
+    # ------------------------------------------------------------------ API
+
+    def feed(self, data: str) -> List[Course]:
+        """
+        Ajoute un morceau de page.
+
+        Args:
+            data (str): Morceau de HTML
+
+        Returns:
+            List[Course]: Cours dont le bloc s'est fermé dans ce morceau (jour provisoire)
+        """
+        self.chars += len(data)
+        super().feed(data)
+        emitted, self._emitted = self._emitted, []
+        return emitted
+
+    def close(self) -> _PageScan:
+        """
+        Termine le parcours: les éléments encore ouverts sont fermés comme en fin de document.
+
+        Returns:
+            _PageScan: Parcours complet de la page
+        """
+        if not self._closed:
+            super().close()
+            self._flush_text()
+            self._pop_to(0)
+            self._closed = True
+        return self.scan
+
+    def courses(self) -> List[Course]:
+        """
+        Liste définitive des cours (semaine principale, triés), après close().
+
+        Returns:
+            List[Course]: Cours, identiques à parse_wigor_html
+        """
+        return _courses_from_scan(self.close())
+
+    def drain(self) -> List[Course]:
+        """Retourne les cours émis depuis le dernier appel (ex: par close())."""
+        emitted, self._emitted = self._emitted, []
+        return emitted
+
+    # ------------------------------------------------------------ Événements
+
+    def handle_starttag(self, tag, attrs):
+        self._flush_text()
+        self._open(tag, attrs)
+        if tag in _VOID_ELEMENTS:
+            self._pop_to(len(self._stack) - 1)
+
+    def handle_startendtag(self, tag, attrs):
+        self._flush_text()
+        self._open(tag, attrs)
+        self._pop_to(len(self._stack) - 1)
+
+    def handle_endtag(self, tag):
+        self._flush_text()
+        for index in range(len(self._stack) - 1, -1, -1):
+            if self._stack[index].name == tag:
+                self._pop_to(index)
+                break
+
+    def handle_data(self, data):
+        self._text.append(data)
+
+    def unknown_decl(self, data):
+        # Section CDATA: texte inclus par get_text()
+        self._flush_text()
+        if data.startswith("CDATA["):
+            self._text.append(data[6:])
+            self._flush_text()
+
+    def handle_comment(self, data):
+        self._flush_text()
+
+    def handle_decl(self, decl):
+        self._flush_text()
+
+    def handle_pi(self, data):
+        self._flush_text()
+
+    # ------------------------------------------------------------- Interne
+
+    def _flush_text(self):
+        """Transmet un nœud texte complet aux td ouverts (et au titre)."""
+        if not self._text:
+            return
+        text = "".join(self._text)
+        self._text = []
+        if self._script_depth:
+            return
+        if self._title_pieces is not None:
+            self._title_pieces.append(text)
+        if self._captures:
+            stripped = text.strip()
+            if stripped:
+                for capture in self._captures:
+                    capture.pieces.append(stripped)
+
+    def _open(self, tag: str, attrs: List[Tuple[str, Optional[str]]]):
+        """Ouvre un élément: même logique que le parcours de _scan_document."""
+        parent = self._stack[-1] if self._stack else None
+        open_days = parent.open_days if parent else ()
+        open_cases = parent.open_cases if parent else ()
+        element = _OpenElement(tag, open_days, open_cases)
+
+        if tag in _SCRIPT_ELEMENTS:
+            self._script_depth += 1
+        elif tag == "title" and self.title is None and self._title_pieces is None:
+            self._title_pieces = []
+            element.is_title = True
+
+        attributes = dict(attrs)
+        classes = (attributes.get("class") or "").split()
+        if classes:
+            style = attributes.get("style") or ""
+            if "innerCase" in classes:
+                self.contains_inner_case = self.scan.inner_case = True
+            if tag == "div":
+                if "Jour" in classes:
+                    column = [style, None]
+                    self.scan.day_columns.append(column)
+                    element.open_days = open_days + (column,)
+                if "Case" in classes:
+                    block = (style, {})
+                    self.scan.course_blocks.append(block)
+                    element.open_cases = open_cases + (block,)
+                    element.block = block
+            elif tag == "td":
+                capture = _TextCapture()
+                if "TCJour" in classes:
+                    self.scan.day_cells.append(("", style))
+                    capture.targets.append((self.scan.day_cells, len(self.scan.day_cells) - 1))
+                    for column in open_days:
+                        if column[1] is None:
+                            column[1] = _PENDING
+                            capture.targets.append((column, 1))
+                if open_cases:
+                    for css_class in classes:
+                        field = _COURSE_CELL_FIELDS.get(css_class)
+                        if field is None:
+                            continue
+                        for _, cells in open_cases:
+                            if field not in cells:
+                                cells[field] = _PENDING
+                                capture.targets.append((cells, field))
+                if capture.targets:
+                    element.capture = capture
+                    self._captures.append(capture)
+
+        self._stack.append(element)
+
+    def _pop_to(self, index: int):
+        """Ferme les éléments de la pile à partir de index (le plus interne d'abord)."""
+        while len(self._stack) > index:
+            element = self._stack.pop()
+            if element.name in _SCRIPT_ELEMENTS:
+                self._script_depth -= 1
+            if element.is_title:
+                self.title = self.scan.title = "".join(self._title_pieces).strip()
+                self._title_pieces = None
+            if element.capture is not None:
+                self._close_capture(element.capture)
+            if element.block is not None:
+                self._emit(element.block)
+
+    def _close_capture(self, capture: _TextCapture):
+        """Écrit le texte d'un td fermé dans les emplacements qu'il a réservés."""
+        self._captures.remove(capture)
+        text = "".join(capture.pieces)
+        for container, key in capture.targets:
+            if container is self.scan.day_cells:
+                container[key] = (text, container[key][1])
+            else:
+                container[key] = text
+                if key == 1 and isinstance(container, list) and text:
+                    left = _left_from_style(container[0])
+                    if left is not None:
+                        self._days_seen.append((left, text))
+                        self._day_index = None
+
+    def _emit(self, block: Tuple[str, Dict[str, str]]):
+        """Émet le cours d'un div.Case fermé, avec le jour le plus proche déjà connu."""
+        style, cells = block
+        if not isinstance(cells.get("titre"), str) or not cells["titre"]:
+            return
+        course = _course_info_from_cells(cells)
+        left = _left_from_style(style)
+        if left is not None and self._days_seen:
+            if self._day_index is None:
+                self._day_index = _DayIndex(sorted(self._days_seen, key=lambda d: d[0]))
+            course["jour"] = self._day_index.closest(left)
+        self._emitted.append(course)
+
+
+def parse_wigor_stream(
+    chunks: Iterable[str], on_course: Optional[Callable[[Course], None]] = None
+) -> List[Course]:
+    """
+    Parse une page Wigor reçue par morceaux.
+
+    Args:
+        chunks (Iterable[str]): Morceaux successifs de la page
+        on_course (Optional[Callable[[Course], None]]): Appelé pour chaque cours dès la
+            fermeture de son bloc (jour provisoire, sans filtre de semaine)
+
+    Returns:
+        List[Course]: Liste définitive, identique à parse_wigor_html(html, "html.parser")
+    """
+    parser = StreamingWigorParser()
+    with span("parse.stream") as trace:
+        for chunk in chunks:
+            for course in parser.feed(chunk):
+                if on_course is not None:
+                    on_course(course)
+        parser.close()
+        for course in parser.drain():
+            if on_course is not None:
+                on_course(course)
+        trace.set(
+            chars=parser.chars,
+            days=len(parser.scan.day_columns),
+            blocks=len(parser.scan.course_blocks),
+        )
+    return parser.courses()
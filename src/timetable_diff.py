@@ -0,0 +1,424 @@
+"""
+Module de re-parsing incrémental des pages Wigor.
+Compare une nouvelle page à la précédente (ou à son empreinte) bloc par bloc:
+seuls les div.Case dont le contenu a changé sont re-parsés.
+"""
+
+import hashlib
+import logging
+import re
+from typing import Dict, List, Optional, Tuple, Union
+
+try:
+    from .course import Course
+    from .html_backend import make_soup, resolve_html_parser
+    from .timetable_parser import _courses_from_scan, _PageScan, _scan_document
+except ImportError:
+    from src.course import Course
+    from src.html_backend import make_soup, resolve_html_parser
+    from src.timetable_parser import _courses_from_scan, _PageScan, _scan_document
+
+# Configuration du logger
+logger = logging.getLogger(__name__)
+
+# Ouverture d'un bloc de cours: <div ... class="... Case ..."> (pas innerCase)
+_CASE_START_PATTERN = re.compile(
+    r"<(?i:div)\b[^>]*?\bclass\s*=\s*([\"'])(?:[^\"']*\s)?Case(?:\s[^\"']*)?\1[^>]*>"
+)
+
+# Balises div ouvrantes ou fermantes, pour trouver la fin d'un bloc
+_DIV_TAG_PATTERN = re.compile(r"<(/?)(?i:div)\b[^>]*>")
+
+# Colonne ou en-tête de jour: un bloc qui en contient ne peut pas être isolé
+_DAY_CLASS_PATTERN = re.compile(r"\bclass\s*=\s*[\"'](?:[^\"']*\s)?(?:TC)?Jour\b")
+
+
+def _digest(text: str) -> str:
+    """Empreinte courte (BLAKE2b 128 bits) d'un fragment HTML."""
+    return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).hexdigest()
+
+
+def _split_course_blocks(html: str) -> Optional[Tuple[str, List[str]]]:
+    """
+    Découpe la page en blocs div.Case et en « squelette » (tout le reste).
+
+    Le découpage est purement textuel (aucun arbre construit). Il est refusé
+    (None) dès que la structure sort du cas simple: div non fermé, div auto-fermant,
+    div.Case imbriqués ou en-têtes de jours à l'intérieur d'un bloc.
+
+    Args:
+        html (str): Code HTML de la page Wigor
+
+    Returns:
+        Optional[Tuple[str, List[str]]]: (squelette, blocs dans l'ordre du document),
+            ou None si la page doit être parsée entièrement
+    """
+    layout_parts = []
+    blocks = []
+    position = 0
+
+    while True:
+        start_match = _CASE_START_PATTERN.search(html, position)
+        if start_match is None:
+            break
+
+        depth = 1
+        end = None
+        for tag in _DIV_TAG_PATTERN.finditer(html, start_match.end()):
+            if tag.group(0).endswith("/>"):
+                return None
+            if tag.group(1):
+                depth -= 1
+                if depth == 0:
+                    end = tag.end()
+                    break
+            else:
+                if _CASE_START_PATTERN.match(html, tag.start()):
+                    return None
+                depth += 1
+
+        if end is None:
+            return None
+
+        block = html[start_match.start() : end]
+        if _DAY_CLASS_PATTERN.search(block):
+            return None
+
+        layout_parts.append(html[position : start_match.start()])
+        blocks.append(block)
+        position = end
+
+    layout_parts.append(html[position:])
+    return "".join(layout_parts), blocks
+
+
+class PageFingerprint:
+    """
+    Empreinte d'une page Wigor parsée, réutilisable pour le prochain diff.
+
+    Attributes:
+        parser: Backend HTML utilisé pour le parsing
+        page_digest: Empreinte de la page complète
+        layout_digest: Empreinte du squelette (page sans les div.Case), None si non découpable
+        day_columns: Colonnes de jours extraites du squelette
+        day_cells: En-têtes td.TCJour extraits du squelette
+        blocks: Empreinte de bloc -> (style, cellules), None si la page n'est pas découpable
+        courses: Cours extraits de la page
+    """
+
+    __slots__ = (
+        "parser",
+        "page_digest",
+        "layout_digest",
+        "day_columns",
+        "day_cells",
+        "blocks",
+        "courses",
+    )
+
+    def __init__(
+        self,
+        parser: str,
+        page_digest: str,
+        layout_digest: Optional[str],
+        day_columns: List[List[Optional[str]]],
+        day_cells: List[Tuple[str, str]],
+        blocks: Optional[Dict[str, Tuple[str, Dict[str, str]]]],
+        courses: List[Course],
+    ):
+        self.parser = parser
+        self.page_digest = page_digest
+        self.layout_digest = layout_digest
+        self.day_columns = day_columns
+        self.day_cells = day_cells
+        self.blocks = blocks
+        self.courses = courses
+
+
+class TimetableDiff:
+    """
+    Différences entre deux versions d'une page Wigor.
+
+    Attributes:
+        added: Cours apparus
+        removed: Cours disparus
+        modified: Paires (ancien, nouveau) pour un même créneau (jour, horaire)
+        courses: Liste complète des cours de la nouvelle page (identique à parse_wigor_html)
+        fingerprint: Empreinte de la nouvelle page, à passer au prochain diff
+        reparsed_blocks: Nombre de div.Case re-parsés (tous en cas de parsing complet)
+        full_reparse: True si la page a été parsée entièrement
+    """
+
+    __slots__ = (
+        "added",
+        "removed",
+        "modified",
+        "courses",
+        "fingerprint",
+        "reparsed_blocks",
+        "full_reparse",
+    )
+
+    def __init__(
+        self,
+        added: List[Course],
+        removed: List[Course],
+        modified: List[Tuple[Course, Course]],
+        courses: List[Course],
+        fingerprint: PageFingerprint,
+        reparsed_blocks: int = 0,
+        full_reparse: bool = False,
+    ):
+        self.added = added
+        self.removed = removed
+        self.modified = modified
+        self.courses = courses
+        self.fingerprint = fingerprint
+        self.reparsed_blocks = reparsed_blocks
+        self.full_reparse = full_reparse
+
+    @property
+    def changed(self) -> bool:
+        """True si au moins un cours a été ajouté, supprimé ou modifié."""
+        return bool(self.added or self.removed or self.modified)
+
+    def __repr__(self) -> str:
+        return (
+            f"TimetableDiff(added={len(self.added)}, removed={len(self.removed)}, "
+            f"modified={len(self.modified)}, reparsed_blocks={self.reparsed_blocks}, "
+            f"full_reparse={self.full_reparse})"
+        )
+
+
+def _full_fingerprint(html: str, parser: str, page_digest: str) -> Tuple[PageFingerprint, int]:
+    """
+    Parse la page entière et construit son empreinte.
+
+    Args:
+        html (str): Code HTML de la page
+        parser (str): Backend HTML résolu
+        page_digest (str): Empreinte de la page complète
+
+    Returns:
+        Tuple[PageFingerprint, int]: (empreinte, nombre de div.Case parsés); l'empreinte
+            contient les blocs si la page est découpable
+    """
+    try:
+        scan = _scan_document(make_soup(html, parser))
+        courses = _courses_from_scan(scan)
+    except Exception as e:
+        logger.error(f"Erreur lors du parsing HTML: {e}")
+        return PageFingerprint(parser, page_digest, None, [], [], None, []), 0
+
+    layout_digest = None
+    blocks = None
+    split = _split_course_blocks(html)
+    # Le découpage textuel doit retrouver exactement les blocs de l'arbre
+    if split is not None and len(split[1]) == len(scan.course_blocks):
+        layout, block_texts = split
+        layout_digest = _digest(layout)
+        blocks = {_digest(block): record for block, record in zip(block_texts, scan.course_blocks)}
+    else:
+        logger.debug("Page non découpable en blocs, les prochains diffs la re-parseront entière")
+
+    fingerprint = PageFingerprint(
+        parser, page_digest, layout_digest, scan.day_columns, scan.day_cells, blocks, courses
+    )
+    return fingerprint, len(scan.course_blocks)
+
+
+def _incremental_fingerprint(
+    html: str, parser: str, page_digest: str, previous: PageFingerprint
+) -> Optional[Tuple[PageFingerprint, int]]:
+    """
+    Construit l'empreinte de la nouvelle page en ne re-parsant que les blocs modifiés.
+
+    Args:
+        html (str): Code HTML de la nouvelle page
+        parser (str): Backend HTML résolu
+        page_digest (str): Empreinte de la nouvelle page
+        previous (PageFingerprint): Empreinte de la page précédente
+
+    Returns:
+        Optional[Tuple[PageFingerprint, int]]: (empreinte, blocs re-parsés), ou None si
+            un parsing complet est nécessaire
+    """
+    if previous.blocks is None or previous.parser != parser:
+        return None
+
+    split = _split_course_blocks(html)
+    if split is None:
+        return None
+    layout, block_texts = split
+
+    layout_digest = _digest(layout)
+    if layout_digest == previous.layout_digest:
+        day_columns, day_cells = previous.day_columns, previous.day_cells
+    else:
+        # En-têtes de jours modifiés: seul le squelette est re-parsé
+        layout_scan = _scan_document(make_soup(layout, parser))
+        if layout_scan.course_blocks:
+            return None
+        day_columns, day_cells = layout_scan.day_columns, layout_scan.day_cells
+
+    blocks = {}
+    course_blocks = []
+    reparsed_blocks = 0
+    for block in block_texts:
+        block_digest = _digest(block)
+        record = previous.blocks.get(block_digest) or blocks.get(block_digest)
+        if record is None:
+            block_scan = _scan_document(make_soup(block, parser))
+            if len(block_scan.course_blocks) != 1 or block_scan.day_cells:
+                return None
+            record = block_scan.course_blocks[0]
+            reparsed_blocks += 1
+        blocks[block_digest] = record
+        course_blocks.append(record)
+
+    scan = _PageScan()
+    scan.day_columns = day_columns
+    scan.day_cells = day_cells
+    scan.course_blocks = course_blocks
+    courses = _courses_from_scan(scan)
+
+    fingerprint = PageFingerprint(
+        parser, page_digest, layout_digest, day_columns, day_cells, blocks, courses
+    )
+    return fingerprint, reparsed_blocks
+
+
+def _course_key(course: Course) -> Tuple[str, ...]:
+    """Clé de comparaison complète d'un cours."""
+    return tuple(course.get(field, "") for field in ("jour", "horaire", "titre", "salle", "prof"))
+
+
+def _compare_courses(
+    old_courses: List[Course], new_courses: List[Course]
+) -> Tuple[List[Course], List[Course], List[Tuple[Course, Course]]]:
+    """
+    Compare deux listes de cours.
+
+    Un cours retiré et un cours ajouté sur le même créneau (jour, horaire) forment
+    une modification.
+
+    Args:
+        old_courses (List[Course]): Cours de la page précédente
+        new_courses (List[Course]): Cours de la nouvelle page
+
+    Returns:
+        Tuple: (ajoutés, supprimés, modifiés)
+    """
+    remaining: Dict[Tuple[str, ...], List[Course]] = {}
+    for course in old_courses:
+        remaining.setdefault(_course_key(course), []).append(course)
+
+    candidates = []
+    for course in new_courses:
+        same = remaining.get(_course_key(course))
+        if same:
+            same.pop()
+        else:
+            candidates.append(course)
+
+    removed_by_slot: Dict[Tuple[str, str], List[Course]] = {}
+    for courses in remaining.values():
+        for course in courses:
+            slot = (course.get("jour", ""), course.get("horaire", ""))
+            removed_by_slot.setdefault(slot, []).append(course)
+
+    added = []
+    modified = []
+    for course in candidates:
+        slot = (course.get("jour", ""), course.get("horaire", ""))
+        previous = removed_by_slot.get(slot)
+        if previous:
+            modified.append((previous.pop(0), course))
+        else:
+            added.append(course)
+
+    removed_ids = {id(course) for courses in removed_by_slot.values() for course in courses}
+    removed = [course for course in old_courses if id(course) in removed_ids]
+    return added, removed, modified
+
+
+def fingerprint_wigor_html(html: str, parser: Optional[str] = None) -> PageFingerprint:
+    """
+    Parse une page Wigor et retourne son empreinte (cours compris).
+
+    Args:
+        html (str): Code HTML de la page Wigor
+        parser (Optional[str]): Backend HTML (voir parse_wigor_html)
+
+    Returns:
+        PageFingerprint: Empreinte à conserver pour le prochain diff_wigor_html
+
+    Raises:
+        ValueError: Si le backend demandé est inconnu ou non installé
+    """
+    backend = resolve_html_parser(parser)
+    html = html or ""
+    fingerprint, _ = _full_fingerprint(html, backend, _digest(html))
+    return fingerprint
+
+
+def diff_wigor_html(
+    previous: Union[str, PageFingerprint, None],
+    html: str,
+    parser: Optional[str] = None,
+) -> TimetableDiff:
+    """
+    Compare une nouvelle page Wigor à la précédente et retourne les cours modifiés.
+
+    Une page identique n'est pas re-parsée (comparaison d'empreintes). Sinon, seuls
+    les div.Case dont l'empreinte a changé sont re-parsés; les autres réutilisent
+    les cellules extraites précédemment. Si la structure de la page ne permet pas ce
+    découpage, la page est parsée entièrement.
+
+    Args:
+        previous (Union[str, PageFingerprint, None]): Page précédente (HTML ou empreinte)
+        html (str): Code HTML de la nouvelle page
+        parser (Optional[str]): Backend HTML (voir parse_wigor_html)
+
+    Returns:
+        TimetableDiff: Cours ajoutés, supprimés, modifiés et nouvelle empreinte
+
+    Raises:
+        ValueError: Si le backend demandé est inconnu ou non installé
+    """
+    backend = resolve_html_parser(parser)
+    html = html or ""
+
+    if isinstance(previous, str):
+        previous = fingerprint_wigor_html(previous, backend)
+
+    page_digest = _digest(html)
+    if previous is not None and previous.parser == backend and previous.page_digest == page_digest:
+        logger.debug("Page Wigor inchangée, aucun re-parsing")
+        return TimetableDiff([], [], [], previous.courses, previous)
+
+    result = None
+    if previous is not None:
+        try:
+            result = _incremental_fingerprint(html, backend, page_digest, previous)
+        except Exception as e:
+            logger.warning(f"Re-parsing incrémental impossible, parsing complet: {e}")
+
+    if result is None:
+        fingerprint, reparsed_blocks = _full_fingerprint(html, backend, page_digest)
+        full_reparse = True
+    else:
+        fingerprint, reparsed_blocks = result
+        full_reparse = False
+
+    old_courses = previous.courses if previous is not None else []
+    added, removed, modified = _compare_courses(old_courses, fingerprint.courses)
+
+    logger.info(
+        f"🔄 Diff Wigor: +{len(added)} / -{len(removed)} / ~{len(modified)} cours "
+        f"({reparsed_blocks} bloc(s) re-parsé(s){', parsing complet' if full_reparse else ''})"
+    )
+
+    return TimetableDiff(
+        added, removed, modified, fingerprint.courses, fingerprint, reparsed_blocks, full_reparse
+    )
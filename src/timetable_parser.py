@@ -3,12 +3,33 @@ Module pour parser les données HTML de Wigor et extraire l'emploi du temps.
 Transforme le HTML brut en liste structurée de cours.
 """
 
+import hashlib
 import logging
 import re
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
-
-from bs4 import BeautifulSoup
+from bisect import bisect_left
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, TextIO, Tuple
+
+from bs4 import BeautifulSoup, Tag
+
+# NumPy est optionnel: il accélère l'attribution des jours sur les gros lots
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+try:
+    from .course import Course, parse_horaire
+    from .html_backend import make_soup, resolve_html_parser
+    from .tracing import span
+except ImportError:
+    from src.course import Course, parse_horaire
+    from src.html_backend import make_soup, resolve_html_parser
+    from src.tracing import span
 
 # Configuration du logger
 logger = logging.getLogger(__name__)
@@ -30,12 +51,34 @@ MONTH_NAMES = {
 }
 
 
-def _parse_date_from_header(header: str) -> Optional[datetime]:
+# Préfixe de 3 lettres -> numéro de mois, construit une seule fois.
+# En cas de préfixe partagé ("jui"), le premier mois de MONTH_NAMES l'emporte,
+# comme avec l'ancien parcours séquentiel.
+_MONTH_PREFIXES: Dict[str, int] = {}
+for _month_name, _month_num in MONTH_NAMES.items():
+    _MONTH_PREFIXES.setdefault(_month_name[:3], _month_num)
+
+# Jour et mois dans un en-tête ("lundi 13 octobre")
+_HEADER_DATE_PATTERN = re.compile(r"(\d{1,2})\s+([a-zéèêàâôûç]+)")
+
+# Heure de début en tête d'horaire ("08:00 - 12:00")
+_START_TIME_PATTERN = re.compile(r"^(\d{1,2}:\d{2})")
+
+# Nombre maximal d'en-têtes distincts mémorisés
+DATE_CACHE_SIZE = 1024
+
+# Taille de lot à partir de laquelle l'attribution des jours passe par NumPy
+NUMPY_MIN_BATCH = 256
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _resolve_header_date(header: str, year: int) -> Optional[datetime]:
     """
-    Parse une date depuis un en-tête de jour (ex: "Lundi 13 Octobre").
+    Résout (avec mémoïsation) la date d'un en-tête de jour pour une année donnée.
 
     Args:
         header (str): En-tête du jour (ex: "Lundi 13 Octobre")
+        year (int): Année à utiliser
 
     Returns:
         Optional[datetime]: Date parsée ou None si échec
@@ -46,30 +89,22 @@ def _parse_date_from_header(header: str) -> Optional[datetime]:
 
         # Patterns possibles: "Lundi 13 Octobre", "Lundi 13 Oct", "13 Octobre", etc.
         # Extraire le jour et le mois
-        match = re.search(r"(\d{1,2})\s+([a-zéèêàâôûç]+)", header)
+        match = _HEADER_DATE_PATTERN.search(header)
         if not match:
             logger.debug(f"Impossible d'extraire jour/mois de: '{header}'")
             return None
 
         day = int(match.group(1))
-        month_str = match.group(2).lower()
-
-        # Trouver le mois correspondant
-        month = None
-        for french_month, month_num in MONTH_NAMES.items():
-            if month_str.startswith(french_month[:3]):  # Match avec les 3 premières lettres
-                month = month_num
-                break
+        month_str = match.group(2)
 
+        # Trouver le mois correspondant (match avec les 3 premières lettres)
+        month = _MONTH_PREFIXES.get(month_str[:3])
         if month is None:
             logger.debug(f"Mois non reconnu: '{month_str}' dans '{header}'")
             return None
 
-        # Utiliser l'année courante par défaut
-        current_year = datetime.now().year
-
         # Créer la date
-        date = datetime(current_year, month, day)
+        date = datetime(year, month, day)
         logger.debug(f"Date parsée: {header} -> {date.strftime('%Y-%m-%d')}")
         return date
 
@@ -78,8 +113,81 @@ def _parse_date_from_header(header: str) -> Optional[datetime]:
         return None
 
 
+def _parse_date_from_header(header: str, year: Optional[int] = None) -> Optional[datetime]:
+    """
+    Parse une date depuis un en-tête de jour (ex: "Lundi 13 Octobre").
+
+    Les résultats sont mémorisés par (en-tête, année): chaque en-tête distinct
+    n'est analysé qu'une fois (voir get_date_cache_stats).
+
+    Args:
+        header (str): En-tête du jour (ex: "Lundi 13 Octobre")
+        year (Optional[int]): Année à utiliser (défaut: année courante)
+
+    Returns:
+        Optional[datetime]: Date parsée ou None si échec
+    """
+    if not isinstance(header, str):
+        return None
+
+    if year is None:
+        # Utiliser l'année courante par défaut
+        year = datetime.now().year
+
+    return _resolve_header_date(header, year)
+
+
+def _parse_date_near(header: str, reference: datetime) -> Optional[datetime]:
+    """
+    Parse une date d'en-tête en choisissant l'année la plus proche d'une référence.
+
+    Les en-têtes Wigor ("Lundi 29 Décembre") n'ont pas d'année: autour du nouvel an,
+    une même page affiche des jours de décembre et de janvier.
+
+    Args:
+        header (str): En-tête du jour (ex: "Jeudi 1 Janvier")
+        reference (datetime): Date de référence (ex: premier jour de la page)
+
+    Returns:
+        Optional[datetime]: Date parsée ou None si échec
+    """
+    candidates = [
+        parsed
+        for parsed in (
+            _parse_date_from_header(header, year)
+            for year in (reference.year - 1, reference.year, reference.year + 1)
+        )
+        if parsed is not None
+    ]
+    if not candidates:
+        return None
+    return min(candidates, key=lambda candidate: abs(candidate - reference))
+
+
+def get_date_cache_stats() -> Dict[str, int]:
+    """
+    Retourne les compteurs du cache de résolution des en-têtes de jours.
+
+    Returns:
+        Dict[str, int]: {"hits": ..., "misses": ..., "size": ..., "maxsize": ...}
+    """
+    info = _resolve_header_date.cache_info()
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "size": info.currsize,
+        "maxsize": info.maxsize,
+    }
+
+
+def clear_date_cache():
+    """Vide le cache de résolution des en-têtes de jours et remet ses compteurs à zéro."""
+    _resolve_header_date.cache_clear()
+
+
 def _extract_week_date_range(
     day_headers: List[str],
+    year: Optional[int] = None,
 ) -> Tuple[Optional[datetime], Optional[datetime]]:
     """
     Extrait la plage de dates de la semaine principale à partir des en-têtes de jours.
@@ -87,6 +195,7 @@ def _extract_week_date_range(
 
     Args:
         day_headers (List[str]): Liste des en-têtes de jours
+        year (Optional[int]): Année des dates (défaut: année courante)
 
     Returns:
         Tuple[Optional[datetime], Optional[datetime]]: (date_debut, date_fin) ou (None, None)
@@ -95,7 +204,7 @@ def _extract_week_date_range(
 
     # Parser toutes les dates valides
     for header in day_headers:
-        date = _parse_date_from_header(header)
+        date = _parse_date_from_header(header, year)
         if date:
             parsed_dates.append((date, header))
 
@@ -149,7 +258,10 @@ def _extract_week_date_range(
 
 
 def _is_course_in_week_range(
-    course_day_header: str, start_date: Optional[datetime], end_date: Optional[datetime]
+    course_day_header: str,
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+    year: Optional[int] = None,
 ) -> bool:
     """
     Vérifie si un cours appartient à la plage de dates de la semaine courante.
@@ -158,6 +270,7 @@ def _is_course_in_week_range(
         course_day_header (str): En-tête du jour du cours
         start_date (Optional[datetime]): Date de début de la semaine
         end_date (Optional[datetime]): Date de fin de la semaine
+        year (Optional[int]): Année des dates (défaut: année courante)
 
     Returns:
         bool: True si le cours est dans la plage, False sinon
@@ -166,7 +279,7 @@ def _is_course_in_week_range(
         # Si pas de plage détectée, accepter tous les cours
         return True
 
-    course_date = _parse_date_from_header(course_day_header)
+    course_date = _parse_date_from_header(course_day_header, year)
     if course_date is None:
         # Si impossible de parser la date du cours, l'accepter par défaut
         logger.debug(f"Date non parsable pour cours: '{course_day_header}', accepté par défaut")
@@ -182,12 +295,19 @@ def _is_course_in_week_range(
     return is_in_range
 
 
-def _sort_courses_by_date_and_time(courses: List[Dict[str, str]]) -> List[Dict[str, str]]:
+def _sort_courses_by_date_and_time(
+    courses: List[Dict[str, str]],
+    year: Optional[int] = None,
+    reference: Optional[datetime] = None,
+) -> List[Dict[str, str]]:
     """
     Trie les cours par date puis par heure de début.
 
     Args:
         courses (List[Dict[str, str]]): Liste des cours à trier
+        year (Optional[int]): Année des dates (défaut: année courante)
+        reference (Optional[datetime]): Si fournie, l'année de chaque date est la plus
+            proche de cette référence (voir _parse_date_near) et year est ignoré
 
     Returns:
         List[Dict[str, str]]: Liste des cours triés
@@ -196,7 +316,10 @@ def _sort_courses_by_date_and_time(courses: List[Dict[str, str]]) -> List[Dict[s
     def get_sort_key(course: Dict[str, str]) -> Tuple[Optional[datetime], str]:
         """Génère une clé de tri pour un cours (date, heure_debut)."""
         # Parser la date du jour
-        date = _parse_date_from_header(course.get("jour", ""))
+        if reference is not None:
+            date = _parse_date_near(course.get("jour", ""), reference)
+        else:
+            date = _parse_date_from_header(course.get("jour", ""), year)
 
         # Parser l'heure de début depuis l'horaire (format "08:00-12:00" ou "08:00 - 12:00")
         horaire = course.get("horaire", "")
@@ -205,7 +328,7 @@ def _sort_courses_by_date_and_time(courses: List[Dict[str, str]]) -> List[Dict[s
         # Extraire l'heure de début
         if horaire:
             # Chercher le pattern HH:MM au début
-            time_match = re.search(r"^(\d{1,2}:\d{2})", horaire.strip())
+            time_match = _START_TIME_PATTERN.search(horaire.strip())
             if time_match:
                 heure_debut = time_match.group(1)
 
@@ -223,148 +346,525 @@ def _sort_courses_by_date_and_time(courses: List[Dict[str, str]]) -> List[Dict[s
         return courses
 
 
-def parse_wigor_html(html: str) -> List[Dict[str, str]]:
+# Colonnes td du bloc de cours -> clé du dictionnaire de cours
+_COURSE_CELL_FIELDS = {
+    "TCase": "titre",
+    "TChdeb": "horaire",
+    "TCSalle": "salle",
+    "TCProf": "prof",
+}
+
+
+class _PageScan:
+    """
+    Résultat d'un parcours unique de l'arbre HTML d'une page Wigor.
+
+    Attributes:
+        day_columns: Pour chaque div.Jour (ordre du document), une liste
+            [style, texte du premier td.TCJour ou None]
+        day_cells: Pour chaque td.TCJour (ordre du document), un tuple (texte, style)
+        course_blocks: Pour chaque div.Case (ordre du document), un tuple
+            (style, {champ: texte du premier td correspondant})
+        title: Texte du premier élément <title> (None si absent)
+        inner_case: True si un élément porte la classe innerCase
+    """
+
+    __slots__ = ("day_columns", "day_cells", "course_blocks", "title", "inner_case")
+
+    def __init__(self):
+        self.day_columns: List[List[Optional[str]]] = []
+        self.day_cells: List[Tuple[str, str]] = []
+        self.course_blocks: List[Tuple[str, Dict[str, str]]] = []
+        self.title: Optional[str] = None
+        self.inner_case = False
+
+
+def _scan_document(soup: BeautifulSoup) -> _PageScan:
+    """
+    Parcourt l'arbre HTML une seule fois et collecte en-têtes de jours, positions et cours.
+
+    Remplace les multiples ``select``/``find`` successifs : chaque élément n'est visité
+    qu'une fois, en conservant l'ordre du document et la sémantique « premier descendant »
+    des anciens ``find``. Le titre de la page et la présence de blocs innerCase sont
+    relevés au passage.
+
+    Args:
+        soup (BeautifulSoup): Objet BeautifulSoup du HTML
+
+    Returns:
+        _PageScan: Données brutes extraites de la page
+    """
+    scan = _PageScan()
+
+    # Pile explicite: (itérateur des enfants, div.Jour ouverts, div.Case ouverts)
+    stack = [(iter(soup.contents), (), ())]
+    while stack:
+        children, open_days, open_cases = stack[-1]
+        node = next(children, None)
+        if node is None:
+            stack.pop()
+            continue
+        if not isinstance(node, Tag):
+            continue
+
+        name = node.name
+        if name == "title" and scan.title is None:
+            scan.title = node.get_text().strip()
+        classes = node.get("class")
+        if classes:
+            if "innerCase" in classes:
+                scan.inner_case = True
+            if name == "div":
+                if "Jour" in classes:
+                    column = [node.get("style", ""), None]
+                    scan.day_columns.append(column)
+                    open_days = open_days + (column,)
+                if "Case" in classes:
+                    block = (node.get("style", ""), {})
+                    scan.course_blocks.append(block)
+                    open_cases = open_cases + (block,)
+            elif name == "td":
+                if "TCJour" in classes:
+                    day_text = node.get_text(strip=True)
+                    scan.day_cells.append((day_text, node.get("style", "")))
+                    for column in open_days:
+                        if column[1] is None:
+                            column[1] = day_text
+                if open_cases:
+                    for css_class in classes:
+                        field = _COURSE_CELL_FIELDS.get(css_class)
+                        if field is None:
+                            continue
+                        for _, cells in open_cases:
+                            if field not in cells:
+                                cells[field] = node.get_text(strip=True)
+
+        if node.contents:
+            stack.append((iter(node.contents), open_days, open_cases))
+
+    logger.debug(
+        f"Parcours unique: {len(scan.day_columns)} div.Jour, "
+        f"{len(scan.day_cells)} td.TCJour, {len(scan.course_blocks)} div.Case"
+    )
+    return scan
+
+
+def _main_week_headers(scan: _PageScan) -> List[str]:
+    """
+    Extrait les en-têtes de jours de la semaine principale visible.
+
+    La semaine principale a des positions CSS left entre 100% et 200% environ.
+
+    Args:
+        scan (_PageScan): Données extraites de la page
+
+    Returns:
+        List[str]: En-têtes de jours de la semaine principale
+    """
+    day_headers = []
+
+    for style, day_text in scan.day_columns:
+        left_match = re.search(r"left:([0-9.]+)%", style)
+        if left_match:
+            left_percent = float(left_match.group(1))
+
+            # Ne garder que les jours de la semaine principale visible (left entre 100% et 200%)
+            if 100 <= left_percent <= 200 and day_text:
+                day_headers.append(day_text)
+                logger.debug(f"Jour de la semaine principale: {day_text} (left: {left_percent}%)")
+
+    # Fallback si aucun jour trouvé avec la méthode position CSS
+    if not day_headers:
+        logger.warning("Aucun jour trouvé avec les positions CSS, utilisation du fallback")
+        day_headers = list(dict.fromkeys(day_text for day_text, _ in scan.day_cells))
+
+        # Limiter aux 7 premiers pour éviter les dates parasites
+        if len(day_headers) > 7:
+            day_headers = day_headers[:7]
+
+    return day_headers
+
+
+def _map_days_from_scan(scan: _PageScan) -> List[Tuple[float, str]]:
+    """
+    Construit la liste des jours avec leurs positions left depuis un parcours de page.
+
+    Args:
+        scan (_PageScan): Données extraites de la page
+
+    Returns:
+        List[Tuple[float, str]]: Liste de tuples (left, "Mardi 14 Octobre") triée par position
+    """
+    days = []
+
+    # Méthode 1: les div.Jour qui contiennent un td.TCJour
+    for style, day_text in scan.day_columns:
+        if day_text:
+            # Extraire la position depuis le div.Jour parent (plus fiable)
+            left_position = _left_from_style(style)
+            if left_position is not None:
+                days.append((left_position, day_text))
+                logger.debug(f"Jour mappé: {day_text} à {left_position}%")
+
+    # Méthode 2: Fallback - directement les td.TCJour
+    if not days:
+        logger.debug(f"Fallback: Nombre d'éléments td.TCJour trouvés: {len(scan.day_cells)}")
+
+        for day_text, style in scan.day_cells:
+            if not day_text:
+                continue
+
+            left_position = _left_from_style(style)
+            if left_position is not None:
+                days.append((left_position, day_text))
+                logger.debug(f"Jour mappé (fallback): {day_text} à la position {left_position}")
+            else:
+                # Position factice basée sur l'index
+                column_index = len(days) * 200  # Espacement plus large
+                days.append((column_index, day_text))
+                logger.debug(f"Jour mappé sans position: {day_text} à {column_index}px (factice)")
+
+    # Trier par position left
+    days.sort(key=lambda x: x[0])
+    logger.info(f"Mapping final des jours: {[(pos, jour) for pos, jour in days]}")
+
+    return days
+
+
+def _course_info_from_cells(cells: Dict[str, str]) -> Optional[Course]:
+    """
+    Construit le cours à partir des textes de ses cellules.
+
+    Args:
+        cells (Dict[str, str]): Textes des cellules trouvées ({"titre": ..., "salle": ...})
+
+    Returns:
+        Optional[Course]: Cours (sans jour) ou None si pas de titre
+    """
+    # Vérifier qu'au moins le titre est présent
+    if not cells.get("titre"):
+        logger.warning("Cours sans titre trouvé, ignoré")
+        return None
+
+    # Horaire: valeur brute, jamais extrapolée
+    return Course(
+        cells["titre"],
+        cells.get("prof", ""),
+        cells.get("horaire", ""),
+        cells.get("salle", ""),
+    )
+
+
+def _courses_from_scan(scan: _PageScan) -> List[Course]:
+    """
+    Transforme le parcours d'une page en liste de cours filtrée et triée.
+
+    Args:
+        scan (_PageScan): Données extraites de la page
+
+    Returns:
+        List[Course]: Liste des cours de la semaine principale
+    """
+    # 1. En-têtes de jours de la semaine principale visible
+    day_headers = _main_week_headers(scan)
+    logger.info(f"En-têtes de jours bruts trouvés: {day_headers}")
+
+    # Année courante résolue une seule fois pour toute la page
+    year = datetime.now().year
+
+    # 2. Analyser la plage de dates de la semaine courante
+    start_date, end_date = _extract_week_date_range(day_headers, year)
+    if start_date and end_date:
+        logger.info(
+            f"📅 Plage de dates détectée: {start_date.strftime('%A %d %B %Y')} → {end_date.strftime('%A %d %B %Y')}"
+        )
+    else:
+        logger.warning(
+            "⚠️ Impossible de déterminer la plage de dates, tous les cours seront conservés"
+        )
+
+    # 3. Blocs de cours dans l'ordre d'apparition (div.Case, pas les div.innerCase)
+    course_blocks = scan.course_blocks
+    logger.info(f"Nombre de blocs de cours trouvés: {len(course_blocks)}")
+
+    # Liste pour stocker tous les cours
+    courses = []
+
+    # Si aucun jour trouvé, utiliser fallback
+    if not day_headers:
+        logger.warning("Aucun en-tête de jour trouvé, utilisation du fallback")
+        for _, cells in course_blocks:
+            course_info = _course_info_from_cells(cells)
+            if course_info:
+                course_info["jour"] = "Jour inconnu"
+                courses.append(course_info)
+        return courses
+
+    # 3. Créer un mapping des jours basé sur les positions géographiques
+    with span("parse.map_days") as trace:
+        days_map = _map_days_from_scan(scan)
+        trace.set(items=len(days_map))
+    logger.debug(f"Mapping des jours: {days_map}")
+
+    # 4. Assigner les jours basé sur la position géographique (left) et filtrage par date
+    courses_before_filter = 0
+    courses_filtered = 0
+
+    # Extraire les informations et positions de tous les cours
+    with span("parse.extract_courses", blocks=len(course_blocks)) as trace:
+        entries = []
+        for i, (style, cells) in enumerate(course_blocks):
+            course_info = _course_info_from_cells(cells)
+            if course_info:
+                entries.append((i, course_info, _left_from_style(style)))
+        trace.set(items=len(entries))
+
+    # Attribution géographique de toutes les positions connues en un seul appel
+    with span("parse.assign_days", items=len(entries)):
+        positioned_days = iter(
+            assign_days_to_positions([left for _, _, left in entries if left is not None], days_map)
+            if days_map
+            else ()
+        )
+
+    with span("parse.week_filter", items=len(entries)) as trace:
+        for i, course_info, left_position in entries:
+            try:
+                courses_before_filter += 1
+
+                # Attribution basée sur la position géographique
+                if left_position is not None and days_map:
+                    day_name = next(positioned_days)
+                else:
+                    # Fallback : attribution cyclique si position non trouvée
+                    day_index = i % len(day_headers)
+                    day_name = day_headers[day_index]
+                    logger.debug(f"Fallback attribution cyclique pour cours {i+1}")
+
+                course_info["jour"] = day_name
+
+                # Filtrer par plage de dates de la semaine courante
+                if _is_course_in_week_range(day_name, start_date, end_date, year):
+                    courses.append(course_info)
+                    logger.debug(
+                        f"Cours {i+1}: {course_info['titre']} assigné à {day_name} (pos: {left_position}) ✅"
+                    )
+                else:
+                    courses_filtered += 1
+                    logger.debug(f"Cours {i+1}: {course_info['titre']} filtré (hors période) ❌")
+
+            except Exception as e:
+                logger.warning(f"Erreur lors du parsing d'un cours: {e}")
+                continue
+
+        trace.set(kept=len(courses))
+
+    # 5. Trier les cours par date puis par heure
+    with span("parse.sort", items=len(courses)):
+        courses_sorted = _sort_courses_by_date_and_time(courses, year)
+
+    # 6. Afficher les statistiques de filtrage
+    logger.info("📊 Statistiques de parsing:")
+    logger.info(f"   • Cours trouvés avant filtrage: {courses_before_filter}")
+    logger.info(f"   • Cours filtrés (hors période): {courses_filtered}")
+    logger.info(f"   • Cours conservés (période courante): {len(courses_sorted)}")
+
+    return courses_sorted
+
+
+def iso_week_key(date: datetime) -> str:
+    """
+    Retourne la clé de semaine ISO d'une date.
+
+    Args:
+        date (datetime): Date d'un jour de cours
+
+    Returns:
+        str: Semaine ISO au format "AAAA-Www" (ex: "2025-W42")
+    """
+    iso_year, iso_week, _ = date.isocalendar()
+    return f"{iso_year}-W{iso_week:02d}"
+
+
+def iso_week_start(week_key: str) -> datetime:
+    """
+    Retourne le lundi d'une semaine ISO (inverse de iso_week_key).
+
+    Args:
+        week_key (str): Semaine ISO au format "AAAA-Www" (ex: "2025-W42")
+
+    Returns:
+        datetime: Lundi de la semaine, à minuit
+
+    Raises:
+        ValueError: Si la clé n'est pas au format attendu
+    """
+    return datetime.strptime(f"{week_key}-1", "%G-W%V-%u")
+
+
+def _courses_by_week_from_scan(
+    scan: _PageScan, year: Optional[int] = None
+) -> Dict[str, List[Course]]:
+    """
+    Transforme le parcours d'une page en cours regroupés par semaine ISO.
+
+    Contrairement à ``_courses_from_scan``, toutes les colonnes de jours de la page
+    sont conservées (semaines voisines comprises), sans filtre de plage de dates.
+    Une page peut couvrir le nouvel an: l'année de chaque jour est celle qui le
+    rapproche du premier jour de la page.
+
+    Args:
+        scan (_PageScan): Données extraites de la page
+        year (Optional[int]): Année du premier jour de la page (défaut: année qui
+            le rapproche le plus d'aujourd'hui)
+
+    Returns:
+        Dict[str, List[Course]]: Cours triés par date et heure, par semaine ISO croissante
+    """
+    # Toutes les colonnes de jours, quelle que soit leur position
+    days_map = _map_days_from_scan(scan)
+    if not days_map:
+        logger.warning("Aucun jour trouvé dans la page, aucune semaine extraite")
+        return {}
+
+    day_headers = [day_name for _, day_name in days_map]
+
+    # Date de référence: premier jour daté de la page
+    reference = None
+    for _, day_name in sorted(days_map, key=lambda day: day[0]):
+        if year is not None:
+            reference = _parse_date_from_header(day_name, year)
+        else:
+            reference = _parse_date_near(day_name, datetime.now())
+        if reference is not None:
+            break
+
+    entries = []
+    for i, (style, cells) in enumerate(scan.course_blocks):
+        course_info = _course_info_from_cells(cells)
+        if course_info:
+            entries.append((i, course_info, _left_from_style(style)))
+
+    positioned_days = iter(
+        assign_days_to_positions([left for _, _, left in entries if left is not None], days_map)
+    )
+
+    weeks: Dict[str, List[Course]] = {}
+    courses_undated = 0
+
+    for i, course_info, left_position in entries:
+        if left_position is not None:
+            day_name = next(positioned_days)
+        else:
+            # Fallback : attribution cyclique si position non trouvée
+            day_name = day_headers[i % len(day_headers)]
+            logger.debug(f"Fallback attribution cyclique pour cours {i+1}")
+
+        course_info["jour"] = day_name
+
+        date = _parse_date_near(day_name, reference) if reference is not None else None
+        if date is None:
+            courses_undated += 1
+            logger.debug(f"Cours {i+1}: {course_info['titre']} ignoré (date non parsable)")
+            continue
+
+        weeks.setdefault(iso_week_key(date), []).append(course_info)
+
+    result = {
+        week: _sort_courses_by_date_and_time(courses, reference=reference)
+        for week, courses in sorted(weeks.items())
+    }
+
+    logger.info(
+        f"📅 {len(result)} semaine(s) extraite(s): "
+        f"{', '.join(f'{week} ({len(courses)} cours)' for week, courses in result.items())}"
+    )
+    if courses_undated:
+        logger.warning(f"⚠️ {courses_undated} cours ignoré(s): date du jour non parsable")
+
+    return result
+
+
+def parse_wigor_html(html: str, parser: Optional[str] = None) -> List[Course]:
     """
     Parse le HTML de l'emploi du temps Wigor et extrait les cours.
 
+    L'arbre HTML n'est parcouru qu'une seule fois (voir ``_scan_document``).
+
     Args:
         html (str): Code HTML de la page Wigor
+        parser (Optional[str]): Backend HTML ("html.parser", "lxml", "html5lib").
+            Par défaut: variable WIGOR_HTML_PARSER, sinon html.parser
 
     Returns:
-        List[Dict[str, str]]: Liste des cours avec leurs informations
+        List[Course]: Liste des cours avec leurs informations, accessibles comme des dict
             Format: [{"jour": ..., "titre": ..., "prof": ..., "horaire": ..., "salle": ...}, ...]
+
+    Raises:
+        ValueError: Si le backend demandé est inconnu ou non installé
     """
     if not html:
         logger.warning("HTML vide fourni au parser")
         return []
 
+    backend = resolve_html_parser(parser)
+
     try:
-        soup = BeautifulSoup(html, "html.parser")
-
-        # 1. Extraire uniquement les en-têtes de jours de la semaine principale visible
-        # La semaine principale a des positions CSS left entre 100% et 200% environ
-        day_headers = []
-
-        # Chercher tous les div.Jour qui contiennent les en-têtes de jours
-        day_divs = soup.select("div.Jour")
-        logger.debug(f"Nombre de div.Jour trouvés: {len(day_divs)}")
-
-        for day_div in day_divs:
-            # Extraire la position left depuis le style
-            style = day_div.get("style", "")
-            left_match = re.search(r"left:([0-9.]+)%", style)
-
-            if left_match:
-                left_percent = float(left_match.group(1))
-
-                # Ne garder que les jours de la semaine principale visible (left entre 100% et 200%)
-                if 100 <= left_percent <= 200:
-                    td_jour = day_div.select_one("td.TCJour")
-                    if td_jour:
-                        day_text = td_jour.get_text(strip=True)
-                        if day_text:
-                            day_headers.append(day_text)
-                            logger.debug(
-                                f"Jour de la semaine principale: {day_text} (left: {left_percent}%)"
-                            )
-
-        # Fallback si aucun jour trouvé avec la méthode position CSS
-        if not day_headers:
-            logger.warning("Aucun jour trouvé avec les positions CSS, utilisation du fallback")
-            all_day_cells = [td.get_text(strip=True) for td in soup.select("td.TCJour")]
-            day_headers = list(dict.fromkeys(all_day_cells))
-
-            # Limiter aux 7 premiers pour éviter les dates parasites
-            if len(day_headers) > 7:
-                day_headers = day_headers[:7]
-
-        logger.info(f"En-têtes de jours bruts trouvés: {day_headers}")
-
-        # 2. Analyser la plage de dates de la semaine courante
-        start_date, end_date = _extract_week_date_range(day_headers)
-        if start_date and end_date:
-            logger.info(
-                f"📅 Plage de dates détectée: {start_date.strftime('%A %d %B %Y')} → {end_date.strftime('%A %d %B %Y')}"
-            )
-        else:
-            logger.warning(
-                "⚠️ Impossible de déterminer la plage de dates, tous les cours seront conservés"
-            )
+        with span("parse.soup", parser=backend, chars=len(html)):
+            soup = make_soup(html, backend)
+        with span("parse.scan") as trace:
+            scan = _scan_document(soup)
+            trace.set(days=len(scan.day_columns), blocks=len(scan.course_blocks))
+        return _courses_from_scan(scan)
 
-        # 3. Extraire tous les blocs de cours dans l'ordre d'apparition
-        # Seulement les div.Case principaux, pas les div.innerCase qui sont à l'intérieur
-        course_blocks = soup.select("div.Case")
-        logger.info(f"Nombre de blocs de cours trouvés: {len(course_blocks)}")
-
-        # Liste pour stocker tous les cours
-        courses = []
-
-        # Si aucun jour trouvé, utiliser fallback
-        if not day_headers:
-            logger.warning("Aucun en-tête de jour trouvé, utilisation du fallback")
-            for course_block in course_blocks:
-                course_info = _extract_course_info(course_block)
-                if course_info:
-                    course_info["jour"] = "Jour inconnu"
-                    courses.append(course_info)
-            return courses
+    except Exception as e:
+        logger.error(f"Erreur lors du parsing HTML: {e}")
+        return []
 
-        # 3. Créer un mapping des jours basé sur les positions géographiques
-        days_map = _map_days(soup)
-        logger.debug(f"Mapping des jours: {days_map}")
 
-        # 4. Assigner les jours basé sur la position géographique (left) et filtrage par date
-        courses_before_filter = 0
-        courses_filtered = 0
+def parse_wigor_html_weeks(
+    html: str, parser: Optional[str] = None, year: Optional[int] = None
+) -> Dict[str, List[Course]]:
+    """
+    Parse le HTML Wigor en conservant toutes les semaines présentes dans la page.
 
-        for i, course_block in enumerate(course_blocks):
-            try:
-                # Extraire les informations du cours
-                course_info = _extract_course_info(course_block)
-
-                if course_info:
-                    courses_before_filter += 1
-
-                    # Attribution basée sur la position géographique
-                    left_position = _extract_left_position(course_block)
-                    if left_position is not None and days_map:
-                        day_name = _closest_day(left_position, days_map)
-                    else:
-                        # Fallback : attribution cyclique si position non trouvée
-                        day_index = i % len(day_headers)
-                        day_name = day_headers[day_index]
-                        logger.debug(f"Fallback attribution cyclique pour cours {i+1}")
-
-                    course_info["jour"] = day_name
-
-                    # Filtrer par plage de dates de la semaine courante
-                    if _is_course_in_week_range(day_name, start_date, end_date):
-                        courses.append(course_info)
-                        logger.debug(
-                            f"Cours {i+1}: {course_info['titre']} assigné à {day_name} (pos: {left_position}) ✅"
-                        )
-                    else:
-                        courses_filtered += 1
-                        logger.debug(f"Cours {i+1}: {course_info['titre']} filtré (hors période) ❌")
+    La page Wigor contient déjà les semaines voisines de la semaine affichée:
+    ce mode les retourne toutes, regroupées par semaine ISO, au lieu de ne garder
+    que la semaine principale comme ``parse_wigor_html``.
 
-            except Exception as e:
-                logger.warning(f"Erreur lors du parsing d'un cours: {e}")
-                continue
+    Args:
+        html (str): Code HTML de la page Wigor
+        parser (Optional[str]): Backend HTML (voir parse_wigor_html)
+        year (Optional[int]): Année du premier jour de la page (défaut: année qui le
+            rapproche le plus d'aujourd'hui); les jours suivants peuvent passer à
+            l'année suivante
 
-        # 5. Trier les cours par date puis par heure
-        courses_sorted = _sort_courses_by_date_and_time(courses)
+    Returns:
+        Dict[str, List[Course]]: Cours par semaine ISO, ex: {"2025-W42": [...], ...}
 
-        # 6. Afficher les statistiques de filtrage
-        logger.info("📊 Statistiques de parsing:")
-        logger.info(f"   • Cours trouvés avant filtrage: {courses_before_filter}")
-        logger.info(f"   • Cours filtrés (hors période): {courses_filtered}")
-        logger.info(f"   • Cours conservés (période courante): {len(courses_sorted)}")
+    Raises:
+        ValueError: Si le backend demandé est inconnu ou non installé
+    """
+    if not html:
+        logger.warning("HTML vide fourni au parser")
+        return {}
+
+    backend = resolve_html_parser(parser)
 
-        return courses_sorted
+    try:
+        with span("parse.soup", parser=backend, chars=len(html)):
+            soup = make_soup(html, backend)
+        with span("parse.scan") as trace:
+            scan = _scan_document(soup)
+            trace.set(days=len(scan.day_columns), blocks=len(scan.course_blocks))
+        with span("parse.weeks") as trace:
+            weeks = _courses_by_week_from_scan(scan, year)
+            trace.set(weeks=len(weeks), items=sum(len(courses) for courses in weeks.values()))
+        return weeks
 
     except Exception as e:
-        logger.error(f"Erreur lors du parsing HTML: {e}")
-        return []
+        logger.error(f"Erreur lors du parsing HTML multi-semaines: {e}")
+        return {}
 
 
 def _map_days(soup: BeautifulSoup) -> List[Tuple[float, str]]:
@@ -377,56 +877,32 @@ def _map_days(soup: BeautifulSoup) -> List[Tuple[float, str]]:
     Returns:
         List[Tuple[float, str]]: Liste de tuples (left, "Mardi 14 Octobre")
     """
-    days = []
-
     try:
-        # Méthode 1: Chercher d'abord les div.Jour qui contiennent les td.TCJour
-        jour_divs = soup.select("div.Jour")
-        logger.debug(f"Nombre de div.Jour trouvés: {len(jour_divs)}")
-
-        for jour_div in jour_divs:
-            # Chercher td.TCJour à l'intérieur du div.Jour
-            td_jour = jour_div.find("td", class_="TCJour")
-            if td_jour:
-                day_text = td_jour.get_text(strip=True)
-                if day_text:
-                    # Extraire la position depuis le div.Jour parent (plus fiable)
-                    left_position = _extract_left_position(jour_div)
-                    if left_position is not None:
-                        # Garder directement la position en pourcentage (plus fiable)
-                        days.append((left_position, day_text))
-                        logger.debug(f"Jour mappé: {day_text} à {left_position}%")
-
-        # Méthode 2: Fallback - chercher directement les td.TCJour
-        if not days:
-            day_cells = soup.find_all("td", class_="TCJour")
-            logger.debug(f"Fallback: Nombre d'éléments td.TCJour trouvés: {len(day_cells)}")
-
-            for day_cell in day_cells:
-                day_text = day_cell.get_text(strip=True)
-                if not day_text:
-                    continue
-
-                left_position = _extract_left_position(day_cell)
-                if left_position is not None:
-                    days.append((left_position, day_text))
-                    logger.debug(f"Jour mappé (fallback): {day_text} à la position {left_position}")
-                else:
-                    # Position factice basée sur l'index
-                    column_index = len(days) * 200  # Espacement plus large
-                    days.append((column_index, day_text))
-                    logger.debug(
-                        f"Jour mappé sans position: {day_text} à {column_index}px (factice)"
-                    )
-
-        # Trier par position left
-        days.sort(key=lambda x: x[0])
-        logger.info(f"Mapping final des jours: {[(pos, jour) for pos, jour in days]}")
-
+        return _map_days_from_scan(_scan_document(soup))
     except Exception as e:
         logger.error(f"Erreur lors du mapping des jours: {e}")
+        return []
 
-    return days
+
+def _left_from_style(style: str) -> Optional[float]:
+    """
+    Extrait la position left d'une valeur d'attribut style.
+
+    Args:
+        style (str): Valeur de l'attribut style (ex: "left: 125px; top: 100px;")
+
+    Returns:
+        Optional[float]: Position left ou None si non trouvée
+    """
+    if style:
+        # Chercher left: XXXpx ou left:XXX%
+        left_match = re.search(r"left\s*:\s*([0-9.]+)(?:px|%)?", style)
+        if left_match:
+            try:
+                return float(left_match.group(1))
+            except ValueError as e:
+                logger.debug(f"Erreur extraction position left: {e}")
+    return None
 
 
 def _extract_left_position(element) -> Optional[float]:
@@ -440,22 +916,116 @@ def _extract_left_position(element) -> Optional[float]:
         Optional[float]: Position left en pixels ou None si non trouvée
     """
     try:
-        style = element.get("style", "")
-        if style:
-            # Chercher left: XXXpx ou left:XXX%
-            left_match = re.search(r"left\s*:\s*([0-9.]+)(?:px|%)?", style)
-            if left_match:
-                return float(left_match.group(1))
+        return _left_from_style(element.get("style", ""))
     except Exception as e:
         logger.debug(f"Erreur extraction position left: {e}")
 
     return None
 
 
+class _DayIndex:
+    """
+    Index trié des colonnes de jours pour retrouver le jour le plus proche par bisection.
+
+    Reproduit exactement ``min(days_map, key=distance)``: à distance égale, le jour
+    apparaissant en premier dans ``days_map`` l'emporte.
+    """
+
+    __slots__ = ("positions", "names", "ranks")
+
+    def __init__(self, days_map: List[Tuple[float, str]]):
+        # Une entrée par position distincte: la première occurrence gagne
+        first_by_position: Dict[float, Tuple[int, str]] = {}
+        for rank, (position, name) in enumerate(days_map):
+            if position not in first_by_position:
+                first_by_position[position] = (rank, name)
+
+        self.positions = sorted(first_by_position)
+        self.ranks = [first_by_position[position][0] for position in self.positions]
+        self.names = [first_by_position[position][1] for position in self.positions]
+
+    def closest(self, left_position: float) -> str:
+        """Retourne le nom du jour le plus proche de la position donnée."""
+        positions = self.positions
+        i = bisect_left(positions, left_position)
+        if i == 0:
+            return self.names[0]
+        if i == len(positions):
+            return self.names[-1]
+
+        # Seuls les voisins immédiats peuvent être les plus proches
+        distance_before = abs(positions[i - 1] - left_position)
+        distance_after = abs(positions[i] - left_position)
+        if distance_before < distance_after or (
+            distance_before == distance_after and self.ranks[i - 1] < self.ranks[i]
+        ):
+            return self.names[i - 1]
+        return self.names[i]
+
+    def closest_many_numpy(self, left_positions: Sequence[float]) -> List[str]:
+        """Version vectorisée de closest() avec NumPy."""
+        positions = np.asarray(self.positions, dtype=float)
+        ranks = np.asarray(self.ranks)
+        lefts = np.asarray(left_positions, dtype=float)
+
+        last = len(self.positions) - 1
+        after = np.searchsorted(positions, lefts, side="left")
+        before = np.clip(after - 1, 0, last)
+        after = np.clip(after, 0, last)
+
+        distance_before = np.abs(positions[before] - lefts)
+        distance_after = np.abs(positions[after] - lefts)
+        pick_before = (distance_before < distance_after) | (
+            (distance_before == distance_after) & (ranks[before] <= ranks[after])
+        )
+        chosen = np.where(pick_before, before, after)
+
+        names = self.names
+        return [names[k] for k in chosen.tolist()]
+
+
+def assign_days_to_positions(
+    left_positions: Sequence[float],
+    days_map: List[Tuple[float, str]],
+    use_numpy: Optional[bool] = None,
+) -> List[str]:
+    """
+    Associe en un seul appel chaque position left au jour le plus proche.
+
+    Le résultat est identique à un appel de _closest_day par position, y compris
+    en cas d'égalité de distance entre deux jours.
+
+    Args:
+        left_positions (Sequence[float]): Positions left des cours
+        days_map (List[Tuple[float, str]]): Liste des jours mappés (left, nom)
+        use_numpy (Optional[bool]): Forcer (True) ou désactiver (False) NumPy.
+            Par défaut, NumPy est utilisé s'il est installé et le lot assez grand.
+
+    Returns:
+        List[str]: Nom du jour pour chaque position, dans le même ordre
+    """
+    if not days_map:
+        return ["Jour inconnu"] * len(left_positions)
+
+    index = _DayIndex(days_map)
+
+    if use_numpy is None:
+        use_numpy = NUMPY_AVAILABLE and len(left_positions) >= NUMPY_MIN_BATCH
+    if use_numpy:
+        if not NUMPY_AVAILABLE:
+            raise ImportError("NumPy n'est pas installé")
+        return index.closest_many_numpy(left_positions)
+
+    return [index.closest(left_position) for left_position in left_positions]
+
+
 def _closest_day(left_position: float, days_map: List[Tuple[float, str]]) -> str:
     """
     Trouve le jour le plus proche d'une position left donnée.
 
+    Pour une recherche isolée, un parcours linéaire est moins coûteux que la
+    construction d'un _DayIndex; les lots passent par assign_days_to_positions.
+
     Args:
         left_position (float): Position left à associer
         days_map (List[Tuple[float, str]]): Liste des jours mappés
@@ -466,12 +1036,10 @@ def _closest_day(left_position: float, days_map: List[Tuple[float, str]]) -> str
     if not days_map:
         return "Jour inconnu"
 
-    # Trouver le jour avec la distance minimale
-    closest_day = min(days_map, key=lambda day: abs(day[0] - left_position))
-    return closest_day[1]
+    return min(days_map, key=lambda day: abs(day[0] - left_position))[1]
 
 
-def _extract_course_info(course_div) -> Optional[Dict[str, str]]:
+def _extract_course_info(course_div) -> Optional[Course]:
     """
     Extrait les informations d'un cours depuis un div.Case.
 
@@ -479,39 +1047,16 @@ def _extract_course_info(course_div) -> Optional[Dict[str, str]]:
         course_div: Élément BeautifulSoup du cours
 
     Returns:
-        Optional[Dict[str, str]]: Informations du cours ou None si erreur
+        Optional[Course]: Informations du cours ou None si erreur
     """
     try:
-        course_info = {"titre": "", "prof": "", "horaire": "", "salle": ""}
-
-        # Extraire le titre (td.TCase)
-        title_elem = course_div.find("td", class_="TCase")
-        if title_elem:
-            course_info["titre"] = title_elem.get_text(strip=True)
-
-        # Extraire l'horaire (td.TChdeb) - valeur brute, jamais extrapolée
-        time_elem = course_div.find("td", class_="TChdeb")
-        if time_elem:
-            horaire_brut = time_elem.get_text(strip=True)
-            # Correction : ne jamais extrapoler, prendre la valeur brute
-            course_info["horaire"] = horaire_brut
-
-        # Extraire la salle (td.TCSalle)
-        room_elem = course_div.find("td", class_="TCSalle")
-        if room_elem:
-            course_info["salle"] = room_elem.get_text(strip=True)
-
-        # Extraire prof + groupe (td.TCProf)
-        prof_elem = course_div.find("td", class_="TCProf")
-        if prof_elem:
-            course_info["prof"] = prof_elem.get_text(strip=True)
-
-        # Vérifier qu'au moins le titre est présent
-        if course_info["titre"]:
-            return course_info
-        else:
-            logger.warning("Cours sans titre trouvé, ignoré")
-            return None
+        cells = {}
+        for css_class, field in _COURSE_CELL_FIELDS.items():
+            cell = course_div.find("td", class_=css_class)
+            if cell:
+                cells[field] = cell.get_text(strip=True)
+
+        return _course_info_from_cells(cells)
 
     except Exception as e:
         logger.warning(f"Erreur extraction info cours: {e}")
@@ -553,6 +1098,217 @@ def format_courses_for_display(courses: List[Dict[str, str]]) -> str:
     return "\n".join(formatted_text)
 
 
+# Fuseau horaire des emplois du temps Wigor (heures locales des cours)
+ICS_TIMEZONE = "Europe/Paris"
+
+# Définition du fuseau Europe/Paris (règles de l'heure d'été de l'UE)
+_ICS_VTIMEZONE = (
+    "BEGIN:VTIMEZONE",
+    f"TZID:{ICS_TIMEZONE}",
+    "BEGIN:DAYLIGHT",
+    "TZOFFSETFROM:+0100",
+    "TZOFFSETTO:+0200",
+    "TZNAME:CEST",
+    "DTSTART:19700329T020000",
+    "RRULE:FREQ=YEARLY;BYMONTH=3;BYDAY=-1SU",
+    "END:DAYLIGHT",
+    "BEGIN:STANDARD",
+    "TZOFFSETFROM:+0200",
+    "TZOFFSETTO:+0100",
+    "TZNAME:CET",
+    "DTSTART:19701025T030000",
+    "RRULE:FREQ=YEARLY;BYMONTH=10;BYDAY=-1SU",
+    "END:STANDARD",
+    "END:VTIMEZONE",
+)
+
+
+def _ics_escape(text: str) -> str:
+    """Échappe une valeur texte iCalendar (RFC 5545, 3.3.11)."""
+    return (
+        text.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def _ics_fold(line: str) -> str:
+    """Replie une ligne à 75 octets (RFC 5545, 3.1), terminée par CRLF."""
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        return line + "\r\n"
+
+    parts = []
+    start = 0
+    limit = 75
+    while start < len(encoded):
+        end = min(start + limit, len(encoded))
+        # Ne pas couper un caractère UTF-8 multi-octets
+        while end < len(encoded) and (encoded[end] & 0xC0) == 0x80:
+            end -= 1
+        parts.append(encoded[start:end].decode("utf-8"))
+        start = end
+        limit = 74  # les lignes de continuation commencent par une espace
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def course_uid(day: datetime, course: Mapping[str, str]) -> str:
+    """
+    Identifiant stable d'un cours dans un calendrier.
+
+    L'identifiant ne dépend que du jour, de l'horaire et du titre: un changement de
+    salle ou de professeur met à jour l'événement au lieu d'en créer un nouveau.
+
+    Args:
+        day (datetime): Date du cours
+        course (Mapping[str, str]): Cours (clés horaire et titre)
+
+    Returns:
+        str: UID iCalendar (ex: "3f2a...@wigor-viewer")
+    """
+    content = f"{day:%Y%m%d}|{course.get('horaire', '')}|{course.get('titre', '')}"
+    digest = hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+    return f"{digest}@wigor-viewer"
+
+
+def iter_courses_ics(
+    courses: Iterable[Mapping[str, str]],
+    year: Optional[int] = None,
+    calendar_name: str = "Emploi du temps Wigor",
+    dtstamp: Optional[datetime] = None,
+    reference: Optional[datetime] = None,
+) -> Iterator[str]:
+    """
+    Produit un calendrier iCalendar (RFC 5545) ligne par ligne.
+
+    Les événements sont générés au fil des cours: le calendrier n'est jamais
+    construit en entier en mémoire, ``courses`` peut être un itérateur.
+
+    Les en-têtes de jours n'ont pas d'année: chaque date prend l'année qui la
+    rapproche de la date de référence, comme parse_wigor_html_weeks, pour qu'une
+    page à cheval sur le nouvel an garde des dates (et des UID) exactes.
+
+    Args:
+        courses (Iterable[Mapping[str, str]]): Cours (titre, prof, horaire, salle, jour)
+        year (Optional[int]): Année du premier cours daté, sans référence (défaut:
+            année qui le rapproche le plus d'aujourd'hui)
+        calendar_name (str): Nom affiché du calendrier
+        dtstamp (Optional[datetime]): Date de génération (défaut: maintenant, UTC)
+        reference (Optional[datetime]): Date de référence, ex: premier jour de la page
+            (défaut: date du premier cours daté)
+
+    Yields:
+        str: Lignes repliées terminées par CRLF
+    """
+    stamp = (dtstamp or datetime.now(timezone.utc)).astimezone(timezone.utc)
+    stamp_value = stamp.strftime("%Y%m%dT%H%M%SZ")
+
+    header = (
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        "PRODID:-//Wigor Viewer//Emploi du temps//FR",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{_ics_escape(calendar_name)}",
+        f"X-WR-TIMEZONE:{ICS_TIMEZONE}",
+    ) + _ICS_VTIMEZONE
+    for line in header:
+        yield _ics_fold(line)
+
+    seen_uids: Dict[str, int] = {}
+    events = 0
+    skipped = 0
+    for course in courses:
+        header = course.get("jour", "")
+        if reference is not None:
+            day = _parse_date_near(header, reference)
+        elif year is not None:
+            day = reference = _parse_date_from_header(header, year)
+        else:
+            day = reference = _parse_date_near(header, datetime.now())
+        if day is None:
+            skipped += 1
+            continue
+
+        uid = course_uid(day, course)
+        # Même titre au même horaire (groupes dédoublés): suffixe dans l'ordre de la page
+        occurrence = seen_uids.get(uid, 0) + 1
+        seen_uids[uid] = occurrence
+        if occurrence > 1:
+            uid = uid.replace("@", f"-{occurrence}@", 1)
+
+        start, end = parse_horaire(course.get("horaire", ""))
+        if start is None:
+            timing = (
+                f"DTSTART;VALUE=DATE:{day:%Y%m%d}",
+                f"DTEND;VALUE=DATE:{day + timedelta(days=1):%Y%m%d}",
+            )
+        else:
+            begin = day.replace(hour=start.hour, minute=start.minute)
+            finish = day.replace(hour=end.hour, minute=end.minute) if end else begin
+            timing = (
+                f"DTSTART;TZID={ICS_TIMEZONE}:{begin:%Y%m%dT%H%M%S}",
+                f"DTEND;TZID={ICS_TIMEZONE}:{max(begin, finish):%Y%m%dT%H%M%S}",
+            )
+
+        event = [
+            "BEGIN:VEVENT",
+            f"UID:{uid}",
+            f"DTSTAMP:{stamp_value}",
+            *timing,
+            f"SUMMARY:{_ics_escape(course.get('titre', ''))}",
+        ]
+        if course.get("salle"):
+            event.append(f"LOCATION:{_ics_escape(course['salle'])}")
+        if course.get("prof"):
+            event.append(f"DESCRIPTION:{_ics_escape('Prof: ' + course['prof'])}")
+        event.append("END:VEVENT")
+
+        for line in event:
+            yield _ics_fold(line)
+        events += 1
+
+    yield _ics_fold("END:VCALENDAR")
+
+    logger.info(f"📆 Export iCalendar: {events} événement(s)")
+    if skipped:
+        logger.warning(f"⚠️ {skipped} cours ignoré(s) à l'export: date du jour non parsable")
+
+
+def write_courses_ics(
+    courses: Iterable[Mapping[str, str]],
+    output: TextIO,
+    year: Optional[int] = None,
+    calendar_name: str = "Emploi du temps Wigor",
+    dtstamp: Optional[datetime] = None,
+    reference: Optional[datetime] = None,
+) -> int:
+    """
+    Écrit les cours au format iCalendar dans un fichier ouvert, événement par événement.
+
+    Le fichier doit être ouvert avec newline="" pour conserver les fins de ligne CRLF.
+
+    Args:
+        courses (Iterable[Mapping[str, str]]): Cours à exporter
+        output (TextIO): Fichier texte de destination
+        year (Optional[int]): Année du premier cours daté (voir iter_courses_ics)
+        calendar_name (str): Nom affiché du calendrier
+        dtstamp (Optional[datetime]): Date de génération (défaut: maintenant, UTC)
+        reference (Optional[datetime]): Date de référence des années (voir iter_courses_ics)
+
+    Returns:
+        int: Nombre d'événements écrits
+    """
+    events = 0
+    for line in iter_courses_ics(courses, year, calendar_name, dtstamp, reference):
+        if line == "BEGIN:VEVENT\r\n":
+            events += 1
+        output.write(line)
+    return events
+
+
 def get_courses_by_day(courses: List[Dict[str, str]], day_name: str) -> List[Dict[str, str]]:
     """
     Filtre les cours par jour.
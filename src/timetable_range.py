@@ -0,0 +1,467 @@
+"""
+Module de récupération de l'emploi du temps Wigor sur une plage de dates.
+Les URL des semaines sont calculées à partir de l'URL Wigor (paramètre date),
+téléchargées en parallèle avec une même session, puis fusionnées sans doublons.
+Les semaines qui encadrent la plage sont préchargées en arrière-plan: la
+navigation semaine par semaine trouve la page suivante déjà téléchargée.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qsl, quote, urlencode, urlparse, urlunparse
+
+import requests
+
+try:
+    from ..auth.session_pool import cookie_fingerprint, pooled_session
+    from .course import Course
+    from .fetch_result import FetchResult
+    from .timetable_parser import _parse_date_near, iso_week_key
+    from .tracing import span
+    from .wigor_api import fetch_wigor_page, parse_cookie_header
+except ImportError:
+    from auth.session_pool import cookie_fingerprint, pooled_session
+    from src.course import Course
+    from src.fetch_result import FetchResult
+    from src.timetable_parser import _parse_date_near, iso_week_key
+    from src.tracing import span
+    from src.wigor_api import fetch_wigor_page, parse_cookie_header
+
+# Configuration du logger
+logger = logging.getLogger(__name__)
+
+# Téléchargements simultanés (<= pool_maxsize des sessions mutualisées)
+DEFAULT_RANGE_WORKERS = 4
+
+# Semaines préchargées de part et d'autre de la plage demandée
+DEFAULT_PREFETCH_WEEKS = 1
+
+# Durée de conservation des pages de semaine téléchargées (secondes)
+DEFAULT_WEEK_PAGE_TTL = 300.0
+
+# Nombre maximal de pages de semaine conservées
+DEFAULT_WEEK_PAGE_CACHE_SIZE = 32
+
+# Paramètre de l'URL Wigor qui sélectionne la semaine affichée (format MM/JJ/AAAA)
+WIGOR_DATE_PARAM = "date"
+
+DateLike = Union[date, datetime, str]
+
+
+def _as_date(value: DateLike) -> date:
+    """
+    Convertit une date, un datetime ou une chaîne ISO (AAAA-MM-JJ) en date.
+
+    Raises:
+        ValueError: Si la chaîne n'est pas une date ISO
+    """
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(value)
+
+
+def week_start(day: DateLike) -> date:
+    """
+    Retourne le lundi de la semaine d'une date.
+
+    Args:
+        day (DateLike): Date, datetime ou chaîne ISO
+
+    Returns:
+        date: Lundi de la semaine
+    """
+    day = _as_date(day)
+    return day - timedelta(days=day.weekday())
+
+
+def weeks_between(start: DateLike, end: DateLike) -> List[date]:
+    """
+    Lundis des semaines couvrant une plage de dates (bornes incluses).
+
+    Args:
+        start (DateLike): Premier jour de la plage
+        end (DateLike): Dernier jour de la plage
+
+    Returns:
+        List[date]: Lundis croissants
+
+    Raises:
+        ValueError: Si la fin précède le début
+    """
+    first, last = week_start(start), week_start(end)
+    if last < first:
+        raise ValueError("La fin de la plage précède son début")
+    return [first + timedelta(weeks=i) for i in range((last - first).days // 7 + 1)]
+
+
+def week_url(url: str, day: DateLike) -> str:
+    """
+    URL Wigor de la semaine d'une date.
+
+    Le paramètre date (MM/JJ/AAAA) est remplacé, ou ajouté s'il est absent; les
+    autres paramètres et leur ordre sont conservés.
+
+    Args:
+        url (str): URL Wigor de l'emploi du temps
+        day (DateLike): Jour de la semaine voulue
+
+    Returns:
+        str: URL de la semaine
+    """
+    parts = urlparse(url)
+    value = _as_date(day).strftime("%m/%d/%Y")
+    query, replaced = [], False
+    for name, current in parse_qsl(parts.query, keep_blank_values=True):
+        if name.lower() == WIGOR_DATE_PARAM:
+            if replaced:
+                continue
+            current, replaced = value, True
+        query.append((name, current))
+    if not replaced:
+        query.append((WIGOR_DATE_PARAM, value))
+    return urlunparse(parts._replace(query=urlencode(query, safe="/", quote_via=quote)))
+
+
+def course_date(course: Course, near: date) -> Optional[date]:
+    """
+    Date d'un cours, l'année étant celle qui rapproche le jour de la semaine affichée.
+
+    Les en-têtes Wigor ("Lundi 29 Décembre") n'ont pas d'année: autour du nouvel an,
+    la semaine affichée choisit la bonne.
+
+    Args:
+        course (Course): Cours (clé jour)
+        near (date): Lundi de la semaine de la page
+
+    Returns:
+        Optional[date]: Date du cours, ou None si l'en-tête n'est pas une date
+    """
+    parsed = _parse_date_near(course.get("jour", ""), datetime.combine(near, datetime.min.time()))
+    return parsed.date() if parsed is not None else None
+
+
+class WeekPageCache:
+    """
+    Pages de semaine récemment téléchargées (ou en cours), en mémoire.
+
+    Les entrées sont des Future: une semaine en cours de préchargement n'est pas
+    téléchargée une seconde fois, la demande attend le préchargement. Les
+    téléchargements en échec ne sont pas conservés.
+    """
+
+    def __init__(
+        self, ttl: float = DEFAULT_WEEK_PAGE_TTL, max_entries: int = DEFAULT_WEEK_PAGE_CACHE_SIZE
+    ):
+        """
+        Initialise le cache.
+
+        Args:
+            ttl (float): Durée de conservation d'une page (secondes)
+            max_entries (int): Nombre maximal de pages conservées (LRU)
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, Future]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_submit(self, key: Tuple[str, str], submit) -> Tuple["Future[FetchResult]", bool]:
+        """
+        Retourne la page d'une semaine, ou lance son téléchargement.
+
+        Args:
+            key (Tuple[str, str]): (URL de la semaine, empreinte des cookies)
+            submit: Fonction sans argument qui lance le téléchargement et retourne son Future
+
+        Returns:
+            Tuple[Future, bool]: (téléchargement, True s'il était déjà en cache)
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, future = entry
+                failed = future.done() and (future.cancelled() or future.exception() is not None)
+                if not failed and now - stored_at < self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return future, True
+                del self._entries[key]
+
+            self.misses += 1
+            future = submit()
+            self._entries[key] = (now, future)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        future.add_done_callback(lambda done: self._forget_failure(key, done))
+        return future, False
+
+    def _forget_failure(self, key: Tuple[str, str], future: Future):
+        if future.cancelled() or future.exception() is not None:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry[1] is future:
+                    del self._entries[key]
+
+    def clear(self):
+        """Oublie toutes les pages."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Statistiques du cache.
+
+        Returns:
+            Dict[str, int]: {"hits", "misses", "entries"}
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+
+class TimetableRangeFetcher:
+    """
+    Récupère l'emploi du temps d'une plage de dates, semaine par semaine.
+
+    Exemple:
+        fetcher = TimetableRangeFetcher()
+        result = fetcher.get_range(url, "2025-10-13", "2025-10-31", cookie_header=cookie)
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_RANGE_WORKERS,
+        prefetch_weeks: int = DEFAULT_PREFETCH_WEEKS,
+        cache: Optional[WeekPageCache] = None,
+    ):
+        """
+        Initialise le moteur.
+
+        Args:
+            max_workers (int): Téléchargements simultanés
+            prefetch_weeks (int): Semaines préchargées avant et après la plage (0: aucune)
+            cache (Optional[WeekPageCache]): Cache des pages (défaut: nouveau cache)
+
+        Raises:
+            ValueError: Si max_workers < 1 ou prefetch_weeks < 0
+        """
+        if max_workers < 1 or prefetch_weeks < 0:
+            raise ValueError("max_workers doit être au moins 1 et prefetch_weeks positif")
+
+        self.prefetch_weeks = prefetch_weeks
+        self.cache = cache if cache is not None else WeekPageCache()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="wigor-range"
+        )
+
+    def close(self, wait: bool = False):
+        """
+        Libère le pool de threads.
+
+        Args:
+            wait (bool): Attendre la fin des préchargements en cours
+        """
+        self._executor.shutdown(wait=wait)
+
+    def __enter__(self) -> "TimetableRangeFetcher":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.close()
+        return False
+
+    def _week_page(
+        self, url: str, monday: date, session: requests.Session, identity: str, parser
+    ) -> Tuple["Future[FetchResult]", bool]:
+        target = week_url(url, monday)
+        return self.cache.get_or_submit(
+            (target, identity),
+            lambda: self._executor.submit(fetch_wigor_page, target, "", session, parser=parser),
+        )
+
+    def get_range(
+        self,
+        url: str,
+        start: DateLike,
+        end: DateLike,
+        cookie_header: str = "",
+        session: Optional[requests.Session] = None,
+        parser: Optional[str] = None,
+    ) -> Dict[str, Union[List[Course], Dict[str, List[Course]]]]:
+        """
+        Récupère les cours d'une plage de dates.
+
+        Les semaines de la plage sont téléchargées en parallèle; chaque page contient
+        aussi les semaines voisines, les cours vus sur plusieurs pages ne sont gardés
+        qu'une fois. Les semaines encadrant la plage sont ensuite préchargées sans
+        attendre.
+
+        Args:
+            url (str): URL Wigor de l'emploi du temps (n'importe quelle semaine)
+            start (DateLike): Premier jour de la plage
+            end (DateLike): Dernier jour de la plage (inclus)
+            cookie_header (str): Header cookie d'authentification (ignoré si session fournie)
+            session (Optional[requests.Session]): Session existante à réutiliser
+            parser (Optional[str]): Backend HTML (défaut: WIGOR_HTML_PARSER ou html.parser)
+
+        Returns:
+            Dict contenant:
+                - courses (List[Course]): Cours de la plage, triés par date et heure
+                - weeks (Dict[str, List[Course]]): Les mêmes cours par semaine ISO
+
+        Raises:
+            requests.RequestException: Si le téléchargement d'une semaine échoue
+            ValueError: En cas d'URL ou de plage invalide
+        """
+        if not url:
+            raise ValueError("L'URL ne peut pas être vide")
+
+        first, last = _as_date(start), _as_date(end)
+        mondays = weeks_between(first, last)
+
+        if session is None:
+            # Une seule session pour toutes les semaines (connexions keep-alive partagées)
+            cookies = parse_cookie_header(cookie_header)
+            session = pooled_session(cookies)
+        else:
+            cookies = requests.utils.dict_from_cookiejar(session.cookies)
+        identity = cookie_fingerprint(cookies)
+
+        with span("range.get", weeks=len(mondays)) as trace:
+            pending = [
+                (monday, self._week_page(url, monday, session, identity, parser))
+                for monday in mondays
+            ]
+            trace.set(cached=sum(cached for _, (_, cached) in pending))
+
+            seen = set()
+            dated: List[Tuple[date, Course]] = []
+            for monday, (future, _) in pending:
+                page = future.result()
+                for courses in page.weeks().values():
+                    for course in courses:
+                        day = course_date(course, monday)
+                        if day is None or not first <= day <= last:
+                            continue
+                        key = (day, *(course.get(field, "") for field in _IDENTITY_FIELDS))
+                        if key not in seen:
+                            seen.add(key)
+                            dated.append((day, course))
+
+            dated.sort(key=lambda item: (item[0], item[1].get("horaire", "")))
+            trace.set(items=len(dated))
+
+        self.prefetch(url, mondays[0], mondays[-1], session, identity, parser)
+
+        weeks: Dict[str, List[Course]] = {}
+        for day, course in dated:
+            weeks.setdefault(iso_week_key(day), []).append(course)
+
+        logger.info(
+            f"📅 Plage {first.isoformat()} → {last.isoformat()}: "
+            f"{len(dated)} cours sur {len(mondays)} semaine(s)"
+        )
+        return {"courses": [course for _, course in dated], "weeks": weeks}
+
+    def prefetch(
+        self,
+        url: str,
+        first_monday: date,
+        last_monday: date,
+        session: requests.Session,
+        identity: str,
+        parser: Optional[str] = None,
+    ):
+        """
+        Lance le téléchargement des semaines encadrant une plage, sans attendre.
+
+        Args:
+            url (str): URL Wigor de l'emploi du temps
+            first_monday (date): Lundi de la première semaine de la plage
+            last_monday (date): Lundi de la dernière semaine de la plage
+            session (requests.Session): Session des téléchargements
+            identity (str): Empreinte des cookies de la session
+            parser (Optional[str]): Backend HTML
+        """
+        for offset in range(1, self.prefetch_weeks + 1):
+            for monday in (
+                first_monday - timedelta(weeks=offset),
+                last_monday + timedelta(weeks=offset),
+            ):
+                future, cached = self._week_page(url, monday, session, identity, parser)
+                if not cached:
+                    logger.debug(f"Préchargement de la semaine du {monday.isoformat()}")
+                    future.add_done_callback(_log_prefetch_failure)
+
+
+# Champs qui identifient un cours dans une journée (doublons entre pages voisines)
+_IDENTITY_FIELDS = ("horaire", "titre", "prof", "salle")
+
+
+def _log_prefetch_failure(future: Future):
+    if not future.cancelled() and future.exception() is not None:
+        logger.warning(f"⚠️ Préchargement d'une semaine en échec: {future.exception()}")
+
+
+# Moteur par défaut (cache et pool de threads partagés par les appels successifs)
+_default_fetcher: Optional[TimetableRangeFetcher] = None
+_default_fetcher_lock = threading.Lock()
+
+
+def get_range_fetcher() -> TimetableRangeFetcher:
+    """
+    Retourne le moteur de plages par défaut.
+
+    Returns:
+        TimetableRangeFetcher: Moteur partagé du processus
+    """
+    global _default_fetcher
+    with _default_fetcher_lock:
+        if _default_fetcher is None:
+            _default_fetcher = TimetableRangeFetcher()
+        return _default_fetcher
+
+
+def reset_range_fetcher():
+    """Ferme le moteur par défaut et oublie ses pages."""
+    global _default_fetcher
+    with _default_fetcher_lock:
+        previous, _default_fetcher = _default_fetcher, None
+    if previous is not None:
+        previous.close()
+
+
+def get_wigor_timetable_range(
+    url: str,
+    start: DateLike,
+    end: DateLike,
+    cookie_header: str = "",
+    session: Optional[requests.Session] = None,
+    parser: Optional[str] = None,
+) -> Dict[str, Union[List[Course], Dict[str, List[Course]]]]:
+    """
+    Récupère les cours d'une plage de dates avec le moteur par défaut.
+
+    Voir TimetableRangeFetcher.get_range.
+
+    Args:
+        url (str): URL Wigor de l'emploi du temps (n'importe quelle semaine)
+        start (DateLike): Premier jour de la plage
+        end (DateLike): Dernier jour de la plage (inclus)
+        cookie_header (str): Header cookie d'authentification (ignoré si session fournie)
+        session (Optional[requests.Session]): Session existante à réutiliser
+        parser (Optional[str]): Backend HTML (défaut: WIGOR_HTML_PARSER ou html.parser)
+
+    Returns:
+        Dict: {"courses": [...], "weeks": {"AAAA-Www": [...]}}
+    """
+    return get_range_fetcher().get_range(url, start, end, cookie_header, session, parser)
@@ -0,0 +1,260 @@
+"""
+Module de traçage des étapes du pipeline téléchargement → parsing → affichage.
+Enregistre des spans (durée, taille, nombre d'éléments) exportables au format
+Chrome trace-event (chrome://tracing, Perfetto). Quasi gratuit quand il est désactivé.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+# Configuration du logger
+logger = logging.getLogger(__name__)
+
+# Catégorie des événements dans la trace Chrome
+TRACE_CATEGORY = "wigor"
+
+
+class _NullSpan:
+    """Span inactif partagé: aucune mesure, aucune allocation."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+    def set(self, **args):
+        """Ignore les attributs (traçage désactivé)."""
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """
+    Étape mesurée du pipeline.
+
+    Utilisé comme context manager; ``set()`` ajoute des attributs (taille, nombre
+    d'éléments) connus seulement en cours d'étape.
+    """
+
+    __slots__ = ("tracer", "name", "args", "start_ns")
+
+    def __init__(self, tracer: "Tracer", name: str, args: Dict[str, object]):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+        self.start_ns = 0
+
+    def __enter__(self) -> "Span":
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        end_ns = time.perf_counter_ns()
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.tracer._record(self.name, self.start_ns, end_ns, self.args)
+        return False
+
+    def set(self, **args):
+        """
+        Ajoute des attributs au span.
+
+        Args:
+            **args: Attributs (ex: chars=..., items=...)
+        """
+        self.args.update(args)
+
+
+class Tracer:
+    """Collecteur de spans, partagé entre threads."""
+
+    def __init__(self):
+        self.origin_ns = time.perf_counter_ns()
+        self.pid = os.getpid()
+        self._events: List[Dict[str, object]] = []
+        self._lock = threading.Lock()
+
+    def _record(self, name: str, start_ns: int, end_ns: int, args: Dict[str, object]):
+        event = {
+            "name": name,
+            "cat": TRACE_CATEGORY,
+            "ph": "X",
+            "ts": (start_ns - self.origin_ns) / 1000,
+            "dur": (end_ns - start_ns) / 1000,
+            "pid": self.pid,
+            "tid": threading.get_ident(),
+            "args": args,
+        }
+        with self._lock:
+            self._events.append(event)
+
+    def events(self) -> List[Dict[str, object]]:
+        """Retourne une copie des événements enregistrés."""
+        with self._lock:
+            return list(self._events)
+
+
+# Traceur actif (None = traçage désactivé)
+_tracer: Optional[Tracer] = None
+
+
+def span(name: str, **args) -> object:
+    """
+    Ouvre un span pour une étape du pipeline.
+
+    Sans traceur actif, retourne un span inactif partagé (aucune mesure).
+
+    Args:
+        name (str): Nom de l'étape (ex: "http.get", "parse.soup")
+        **args: Attributs initiaux (ex: chars=..., url=...)
+
+    Returns:
+        Span: Context manager du span
+    """
+    tracer = _tracer
+    if tracer is None:
+        return _NULL_SPAN
+    return Span(tracer, name, args)
+
+
+def enable_tracing() -> Tracer:
+    """
+    Active le traçage avec un nouveau collecteur (les spans précédents sont oubliés).
+
+    Returns:
+        Tracer: Collecteur actif
+    """
+    global _tracer
+    _tracer = Tracer()
+    logger.debug("Traçage activé")
+    return _tracer
+
+
+def disable_tracing():
+    """Désactive le traçage."""
+    global _tracer
+    _tracer = None
+
+
+def is_tracing_enabled() -> bool:
+    """Indique si le traçage est actif."""
+    return _tracer is not None
+
+
+def get_spans() -> List[Dict[str, object]]:
+    """
+    Retourne les spans enregistrés par le traceur actif.
+
+    Returns:
+        List[Dict[str, object]]: Événements au format Chrome trace-event ("ph": "X")
+    """
+    return _tracer.events() if _tracer is not None else []
+
+
+def to_chrome_trace(events: Optional[List[Dict[str, object]]] = None) -> Dict[str, object]:
+    """
+    Construit un document Chrome trace-event.
+
+    Args:
+        events (Optional[List[Dict[str, object]]]): Événements (défaut: get_spans())
+
+    Returns:
+        Dict[str, object]: Document JSON ({"traceEvents": [...], ...})
+    """
+    return {
+        "traceEvents": get_spans() if events is None else events,
+        "displayTimeUnit": "ms",
+    }
+
+
+def write_chrome_trace(path: str) -> int:
+    """
+    Écrit les spans enregistrés dans un fichier Chrome trace-event.
+
+    Args:
+        path (str): Fichier de sortie (.json)
+
+    Returns:
+        int: Nombre de spans écrits
+    """
+    document = to_chrome_trace()
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(document, f, ensure_ascii=False, default=str)
+    logger.info(f"Trace écrite dans {path} ({len(document['traceEvents'])} spans)")
+    return len(document["traceEvents"])
+
+
+def summarize_spans(
+    events: Optional[List[Dict[str, object]]] = None,
+) -> Dict[str, Dict[str, float]]:
+    """
+    Agrège les durées par étape.
+
+    Args:
+        events (Optional[List[Dict[str, object]]]): Événements (défaut: get_spans())
+
+    Returns:
+        Dict[str, Dict[str, float]]: Par étape, {"count", "total_ms", "p50_ms",
+            "p99_ms", "max_ms"}, trié par durée totale décroissante
+    """
+    durations: Dict[str, List[float]] = {}
+    for event in get_spans() if events is None else events:
+        durations.setdefault(event["name"], []).append(event["dur"] / 1000)
+
+    summary = {}
+    for name, values in durations.items():
+        values.sort()
+        summary[name] = {
+            "count": len(values),
+            "total_ms": sum(values),
+            "p50_ms": values[(len(values) - 1) // 2],
+            "p99_ms": values[min(len(values) - 1, int(len(values) * 0.99))],
+            "max_ms": values[-1],
+        }
+
+    return dict(sorted(summary.items(), key=lambda item: -item[1]["total_ms"]))
+
+
+def format_span_summary(summary: Dict[str, Dict[str, float]]) -> str:
+    """
+    Formate le résumé des étapes pour l'affichage console.
+
+    Args:
+        summary (Dict[str, Dict[str, float]]): Résultat de summarize_spans()
+
+    Returns:
+        str: Tableau texte (une ligne par étape)
+    """
+    lines = [f"  {'Étape':<24} {'n':>4} {'total ms':>10} {'p50 ms':>9} {'p99 ms':>9}"]
+    for name, stats in summary.items():
+        lines.append(
+            f"  {name:<24} {stats['count']:>4} {stats['total_ms']:>10.2f} "
+            f"{stats['p50_ms']:>9.2f} {stats['p99_ms']:>9.2f}"
+        )
+    return "\n".join(lines)
+
+
+def dump_trace(path: str) -> int:
+    """
+    Écrit la trace Chrome et affiche le résumé des étapes.
+
+    Args:
+        path (str): Fichier de sortie (.json)
+
+    Returns:
+        int: Nombre de spans écrits
+    """
+    summary = summarize_spans()
+    count = write_chrome_trace(path)
+    print(f"\n⏱️  Trace écrite dans {path} ({count} spans, chrome://tracing ou Perfetto)")
+    if summary:
+        print(format_span_summary(summary))
+    return count
@@ -3,24 +3,47 @@ Module pour interagir avec l'API Wigor.
 Contient les fonctions pour l'authentification et la récupération des données d'emploi du temps.
 """
 
+import codecs
 import logging
-import os
-import re
-from datetime import datetime
-from typing import Dict, List, Optional, Union
-from urllib.parse import urljoin, urlparse
+import time
+from typing import Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import urlparse
 
 import requests
-from bs4 import BeautifulSoup
 
 try:
-    from .timetable_parser import parse_wigor_html
+    from ..auth.cookies_auth import is_authenticated
+    from ..auth.session_pool import cookie_fingerprint, pooled_session
+    from ..auth.session_store import SessionStore, StoredSession, get_session_store
+    from .course import Course
+    from .debug_archive import get_debug_archive
+    from .fetch_result import FetchResult
+    from .html_backend import make_soup
+    from .login_page import LoginPage
+    from .response_cache import CachedResponse, ResponseCache, get_response_cache
+    from .singleflight import single_flight
+    from .stream_parser import StreamingWigorParser
+    from .tracing import is_tracing_enabled, span
 except ImportError:
-    from src.timetable_parser import parse_wigor_html
+    from auth.cookies_auth import is_authenticated
+    from auth.session_pool import cookie_fingerprint, pooled_session
+    from auth.session_store import SessionStore, StoredSession, get_session_store
+    from src.course import Course
+    from src.debug_archive import get_debug_archive
+    from src.fetch_result import FetchResult
+    from src.html_backend import make_soup
+    from src.login_page import LoginPage
+    from src.response_cache import CachedResponse, ResponseCache, get_response_cache
+    from src.singleflight import single_flight
+    from src.stream_parser import StreamingWigorParser
+    from src.tracing import is_tracing_enabled, span
 
 # Configuration du logger
 logger = logging.getLogger(__name__)
 
+# Taille des morceaux lus en mode streaming (octets)
+STREAM_CHUNK_SIZE = 16 * 1024
+
 
 def parse_cookie_header(cookie_header: str) -> Dict[str, str]:
     """
@@ -44,71 +67,199 @@ def parse_cookie_header(cookie_header: str) -> Dict[str, str]:
 
 
 def fetch_wigor_html(
-    url: str, cookie_header: str = "", session: Optional[requests.Session] = None
+    url: str,
+    cookie_header: str = "",
+    session: Optional[requests.Session] = None,
+    response_cache: Optional[ResponseCache] = None,
+    credentials: Optional[Tuple[str, str]] = None,
 ) -> str:
     """
     Télécharge la page de l'emploi du temps Wigor.
 
+    Sans session fournie, la session est prise dans le registre partagé
+    (auth.session_pool): les appels répétés avec les mêmes cookies réutilisent
+    les mêmes connexions. Avec un cache de réponses (argument ou
+    WIGOR_RESPONSE_CACHE=1), la page est revalidée par requête conditionnelle.
+
     Args:
         url (str): URL de la page Wigor à télécharger
         cookie_header (str): Header cookie au format "k=v; k2=v2" (ignoré si session fournie)
         session (Optional[requests.Session]): Session existante à réutiliser
+        response_cache (Optional[ResponseCache]): Cache de réponses HTTP
+            (défaut: get_response_cache(), désactivé sauf WIGOR_RESPONSE_CACHE=1)
+        credentials (Optional[Tuple[str, str]]): (identifiant, mot de passe), utilisés sans
+            cookie ni session: session stockée réutilisée, sinon connexion CAS
 
     Returns:
         str: Contenu HTML de la page
 
     Raises:
         requests.RequestException: En cas d'erreur lors de la requête
-        ValueError: En cas d'URL invalide
+        ValueError: En cas d'URL invalide ou d'échec de connexion
+    """
+    return fetch_wigor_page(
+        url, cookie_header, session, response_cache, credentials=credentials
+    ).text
+
+
+def fetch_wigor_page(
+    url: str,
+    cookie_header: str = "",
+    session: Optional[requests.Session] = None,
+    response_cache: Optional[ResponseCache] = None,
+    parser: Optional[str] = None,
+    credentials: Optional[Tuple[str, str]] = None,
+) -> FetchResult:
+    """
+    Télécharge la page de l'emploi du temps Wigor sans la parser.
+
+    Même téléchargement que fetch_wigor_html; le résultat conserve le corps brut et
+    le texte décodé, et construit l'arbre HTML une seule fois à la première demande
+    (titre, innerCase, cours).
+
+    Avec des identifiants (et sans cookie ni session), la session stockée de
+    l'utilisateur est réutilisée sans connexion; si la page obtenue n'est pas un
+    emploi du temps (session expirée), une connexion CAS est faite et la page
+    téléchargée à nouveau.
+
+    Les appels identiques simultanés (même URL, mêmes cookies) partagent un seul
+    téléchargement et reçoivent le même résultat (voir singleflight).
+
+    Args:
+        url (str): URL de la page Wigor à télécharger
+        cookie_header (str): Header cookie au format "k=v; k2=v2" (ignoré si session fournie)
+        session (Optional[requests.Session]): Session existante à réutiliser
+        response_cache (Optional[ResponseCache]): Cache de réponses HTTP
+            (défaut: get_response_cache(), désactivé sauf WIGOR_RESPONSE_CACHE=1)
+        parser (Optional[str]): Backend HTML (défaut: WIGOR_HTML_PARSER ou html.parser)
+        credentials (Optional[Tuple[str, str]]): (identifiant, mot de passe)
+
+    Returns:
+        FetchResult: Page téléchargée
+
+    Raises:
+        requests.RequestException: En cas d'erreur lors de la requête
+        ValueError: En cas d'URL invalide, de backend HTML inconnu ou d'échec de connexion
     """
     if not url:
         raise ValueError("L'URL ne peut pas être vide")
 
+    key = ("page", url, _request_identity(cookie_header, session, credentials), parser)
+    return single_flight(
+        key, _fetch_wigor_page, url, cookie_header, session, response_cache, parser, credentials
+    )
+
+
+def _request_identity(
+    cookie_header: str,
+    session: Optional[requests.Session],
+    credentials: Optional[Tuple[str, str]],
+) -> str:
+    """
+    Empreinte de l'identité d'une requête (clé de regroupement des appels identiques).
+
+    Args:
+        cookie_header (str): Header cookie
+        session (Optional[requests.Session]): Session fournie (prioritaire)
+        credentials (Optional[Tuple[str, str]]): Identifiants, utilisés sans cookie ni session
+
+    Returns:
+        str: Session fournie (les sessions mutualisées sont uniques par jeu de cookies),
+            sinon empreinte des cookies, ou de l'utilisateur et du mot de passe
+    """
+    if session is not None:
+        # La session ne peut pas être libérée tant que l'appel est en cours
+        return f"session:{id(session)}"
+    if credentials is not None and not cookie_header:
+        return "credentials:" + cookie_fingerprint(dict([credentials]))
+    return cookie_fingerprint(parse_cookie_header(cookie_header))
+
+
+def _fetch_wigor_page(
+    url: str,
+    cookie_header: str,
+    session: Optional[requests.Session],
+    response_cache: Optional[ResponseCache],
+    parser: Optional[str],
+    credentials: Optional[Tuple[str, str]],
+) -> FetchResult:
+    """Corps de fetch_wigor_page, exécuté une fois par groupe d'appels identiques."""
+    if credentials is None or session is not None or cookie_header:
+        return _fetch_page(url, cookie_header, session, response_cache, parser)
+
+    username, password = credentials
+    store = get_session_store()
+    # La page elle-même sert de vérification: pas de requête de test supplémentaire
+    login = _login_or_raise(username, password, url, store, verify=False)
+    page = _fetch_page(url, "", login["session"], response_cache, parser)
+
+    if login["restored"] and not page.is_timetable:
+        # Session stockée refusée par Wigor: nouvelle connexion CAS
+        logger.warning("Session stockée expirée, nouvelle connexion")
+        store.delete(username, url)
+        login = _login_or_raise(username, password, url, store)
+        page = _fetch_page(url, "", login["session"], response_cache, parser)
+
+    return page
+
+
+def _login_or_raise(
+    username: str, password: str, url: str, store: Optional[SessionStore], verify: bool = True
+) -> Dict[str, Union[bool, str, requests.Session, int]]:
+    """login_or_restore, avec ValueError en cas d'échec de connexion."""
+    login = login_or_restore(username, password, url, store, verify=verify)
+    if not login["success"]:
+        raise ValueError(f"Échec de connexion: {login.get('error', 'erreur inconnue')}")
+    return login
+
+
+def _fetch_page(
+    url: str,
+    cookie_header: str,
+    session: Optional[requests.Session],
+    response_cache: Optional[ResponseCache],
+    parser: Optional[str],
+) -> FetchResult:
+    """Téléchargement de fetch_wigor_page, avec cookies ou session existante."""
+
     # Utiliser la session fournie ou en créer une nouvelle
     if session is not None:
         # Réutiliser exactement la session fournie
         current_session = session
+        cookies = None
         logger.debug("Utilisation de la session fournie")
     else:
-        # Créer une nouvelle session avec cookies
+        # Session mutualisée pour ces cookies (connexions keep-alive réutilisées)
         cookies = parse_cookie_header(cookie_header)
-        current_session = requests.Session()
-        current_session.headers.update(
-            {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
-                "Accept-Language": "fr-FR,fr;q=0.9",
-                "Accept-Encoding": "gzip, deflate, br",
-            }
-        )
-        # Ajouter les cookies à la session
-        for name, value in cookies.items():
-            current_session.cookies.set(name, value)
-        logger.debug(f"Nouvelle session créée avec cookies: {list(cookies.keys())}")
+        current_session = pooled_session(cookies)
+        logger.debug(f"Session pour les cookies: {list(cookies.keys())}")
 
     try:
         logger.info(f"Requête vers: {url}")
 
-        # Effectuer la requête GET avec allow_redirects=True et conservation des headers
-        response = current_session.get(url, allow_redirects=True)
-        response.raise_for_status()  # Lever une exception si erreur HTTP
-
-        # Extraction du titre de la page pour le logging
-        title = extract_page_title(response.text)
-
-        # Vérifier si la page contient 'innerCase'
-        contains_inner_case = "innerCase" in response.text.lower()
-
-        # Logging des informations de la réponse
-        logger.info(f"Status code: {response.status_code}")
-        logger.info(f"Taille du HTML: {len(response.text)} caractères")
-        logger.info(f"Response URL: {response.url}")
-        logger.info(f"Titre de la page: {title}")
-        logger.info(f"Contient innerCase: {contains_inner_case}")
+        cache = response_cache if response_cache is not None else get_response_cache()
+        if cache is not None:
+            if cookies is None:
+                cookies = requests.utils.dict_from_cookiejar(current_session.cookies)
+            page = _get_with_response_cache(current_session, url, cookies, cache, parser)
+        else:
+            # Effectuer la requête GET avec allow_redirects=True et conservation des headers
+            with span("http.get", url=url) as trace:
+                response = current_session.get(url, allow_redirects=True)
+                if is_tracing_enabled():
+                    trace.set(status=response.status_code, bytes=len(response.content))
+            response.raise_for_status()  # Lever une exception si erreur HTTP
+            page = FetchResult.from_response(response, parser)
+
+        # Logging des informations de la réponse (titre et innerCase: au parsing)
+        logger.info(f"Status code: {page.status_code}")
+        logger.info(f"Taille du HTML: {len(page.text)} caractères")
+        logger.info(f"Response URL: {page.url}")
 
         # Sauvegarder le contenu dans un fichier de debug
-        _save_debug_html(response.text, response.url)
+        _save_debug_html(page.text, page.url)
 
-        return response.text
+        return page
 
     except requests.exceptions.RequestException as e:
         logger.error(f"Erreur lors de la requête vers {url}: {e}")
@@ -118,19 +269,166 @@ def fetch_wigor_html(
         raise
 
 
-def extract_page_title(html_content: str) -> Optional[str]:
+def fetch_wigor_courses_streaming(
+    url: str,
+    cookie_header: str = "",
+    session: Optional[requests.Session] = None,
+    on_course: Optional[Callable[[Course], None]] = None,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+) -> List[Course]:
+    """
+    Télécharge la page Wigor par morceaux et la parse au fil de l'eau.
+
+    Chaque morceau est décodé puis transmis au parser incrémental: la page n'est
+    jamais conservée en entier (ni copie en minuscules, ni arbre BeautifulSoup) et
+    les cours sont disponibles dès la fermeture de leur bloc. Pas de fichier de
+    debug ni de cache de réponses dans ce mode.
+
+    Args:
+        url (str): URL de la page Wigor à télécharger
+        cookie_header (str): Header cookie au format "k=v; k2=v2" (ignoré si session fournie)
+        session (Optional[requests.Session]): Session existante à réutiliser
+        on_course (Optional[Callable[[Course], None]]): Appelé pour chaque cours dès
+            la fermeture de son div.Case (jour provisoire, sans filtre de semaine)
+        chunk_size (int): Taille des morceaux lus (octets)
+
+    Returns:
+        List[Course]: Cours de la semaine principale, identiques à parse_wigor_html
+            avec le backend html.parser
+
+    Raises:
+        requests.RequestException: En cas d'erreur lors de la requête
+        ValueError: En cas d'URL invalide
+    """
+    if not url:
+        raise ValueError("L'URL ne peut pas être vide")
+
+    current_session = session or pooled_session(parse_cookie_header(cookie_header))
+    parser = StreamingWigorParser()
+
+    logger.info(f"Requête (streaming) vers: {url}")
+    with span("http.stream", url=url) as trace:
+        response = current_session.get(url, allow_redirects=True, stream=True)
+        try:
+            response.raise_for_status()
+
+            # Même décodage que response.text, mais incrémental
+            decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                courses = parser.feed(decoder.decode(chunk))
+                if on_course is not None:
+                    for course in courses:
+                        on_course(course)
+            parser.feed(decoder.decode(b"", final=True))
+        finally:
+            response.close()
+
+        parser.close()
+        if on_course is not None:
+            for course in parser.drain():
+                on_course(course)
+        trace.set(status=response.status_code, chars=parser.chars)
+
+    logger.info(f"Status code: {response.status_code}")
+    logger.info(f"Taille du HTML: {parser.chars} caractères")
+    logger.info(f"Response URL: {response.url}")
+    logger.info(f"Titre de la page: {parser.title or 'Titre non trouvé'}")
+    logger.info(f"Contient innerCase: {parser.contains_inner_case}")
+
+    return parser.courses()
+
+
+def _get_with_response_cache(
+    session: requests.Session,
+    url: str,
+    cookies: Dict[str, str],
+    cache: ResponseCache,
+    parser: Optional[str] = None,
+) -> FetchResult:
+    """
+    Télécharge une page en s'appuyant sur le cache de réponses.
+
+    Une réponse sans validateur encore fraîche est servie sans requête; sinon la
+    requête porte If-None-Match/If-Modified-Since et un 304 sert le corps conservé.
+    Seules les pages d'emploi du temps sont conservées (pas les pages de connexion).
+
+    Args:
+        session (requests.Session): Session HTTP
+        url (str): URL de la page
+        cookies (Dict[str, str]): Cookies de la requête (identité de l'utilisateur)
+        cache (ResponseCache): Cache de réponses
+        parser (Optional[str]): Backend HTML du résultat
+
+    Returns:
+        FetchResult: Page (corps servi depuis le cache ou téléchargé)
+
+    Raises:
+        requests.RequestException: En cas d'erreur lors de la requête, ou d'une
+            réponse 304 sans page en cache
+    """
+    key = cache.key(url, cookies)
+    cached = cache.get(key)
+
+    if cached is not None and cached.is_fresh(cache.ttl):
+        cache.record("hit")
+        logger.info("📦 Page servie depuis le cache HTTP (sans requête)")
+        return FetchResult(cached.body, cached.response_url, 200, parser=parser)
+
+    headers = cached.conditional_headers() if cached is not None else {}
+    with span("http.get", url=url, conditional=bool(headers)) as trace:
+        response = session.get(url, allow_redirects=True, headers=headers)
+        if is_tracing_enabled():
+            trace.set(status=response.status_code, bytes=len(response.content))
+
+    if response.status_code == 304 and cached is not None:
+        # Page inchangée: validateurs éventuellement mis à jour, corps conservé
+        cached.etag = response.headers.get("ETag") or cached.etag
+        cached.last_modified = response.headers.get("Last-Modified") or cached.last_modified
+        cached.stored_at = time.time()
+        cache.put(key, cached)
+        cache.record("revalidated")
+        logger.info("📦 Page inchangée (304), corps servi depuis le cache HTTP")
+        return FetchResult(cached.body, cached.response_url, response.status_code, parser=parser)
+
+    if response.status_code == 304:
+        # 304 sans corps conservé (requête non conditionnelle): rien à servir
+        raise requests.HTTPError(f"Réponse 304 sans page en cache pour {url}", response=response)
+
+    response.raise_for_status()  # Lever une exception si erreur HTTP
+    # Corps décodé une seule fois: le même texte sert au cache et au résultat
+    page = FetchResult.from_response(response, parser)
+    if page.is_timetable:
+        cache.put(
+            key,
+            CachedResponse(
+                page.text,
+                page.url,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            ),
+        )
+    else:
+        # Page de connexion ou session expirée: ne pas la servir pendant tout le TTL
+        logger.info("Page reçue sans emploi du temps, non conservée dans le cache HTTP")
+    cache.record("miss")
+    return page
+
+
+def extract_page_title(html_content: str, parser: Optional[str] = None) -> Optional[str]:
     """
     Extrait le titre d'une page HTML.
 
     Args:
         html_content (str): Contenu HTML de la page
+        parser (Optional[str]): Backend HTML (défaut: WIGOR_HTML_PARSER ou html.parser)
 
     Returns:
         Optional[str]: Titre de la page ou None si non trouvé
     """
     try:
-        soup = BeautifulSoup(html_content, "html.parser")
-        title_tag = soup.find("title")
+        with span("page.title", chars=len(html_content)):
+            soup = make_soup(html_content, parser)
+            title_tag = soup.find("title")
         if title_tag:
             return title_tag.get_text().strip()
         return "Titre non trouvé"
@@ -140,8 +438,13 @@ def extract_page_title(html_content: str) -> Optional[str]:
 
 
 def get_wigor_timetable(
-    url: str, cookie_header: str = "", session: Optional[requests.Session] = None
-) -> Dict[str, Union[str, List[Dict[str, str]]]]:
+    url: str,
+    cookie_header: str = "",
+    session: Optional[requests.Session] = None,
+    parser: Optional[str] = None,
+    all_weeks: bool = False,
+    credentials: Optional[Tuple[str, str]] = None,
+) -> Dict[str, Union[str, List[Course], Dict[str, List[Course]]]]:
     """
     Fonction principale pour récupérer et parser l'emploi du temps Wigor.
 
@@ -149,22 +452,58 @@ def get_wigor_timetable(
         url (str): URL de la page Wigor
         cookie_header (str): Header cookie d'authentification (ignoré si session fournie)
         session (Optional[requests.Session]): Session existante à réutiliser
+        parser (Optional[str]): Backend HTML (défaut: WIGOR_HTML_PARSER ou html.parser)
+        all_weeks (bool): Extraire aussi toutes les semaines présentes dans la page
+        credentials (Optional[Tuple[str, str]]): (identifiant, mot de passe), voir
+            fetch_wigor_page
 
     Returns:
-        Dict[str, Union[str, List[Dict[str, str]]]]: Dictionnaire contenant:
+        Dict: Dictionnaire contenant:
             - 'html': HTML brut de la page
-            - 'courses': Liste des cours parsés
+            - 'courses': Liste des cours parsés (semaine principale)
+            - 'weeks': Cours par semaine ISO (uniquement si all_weeks=True)
+            Les appels identiques simultanés partagent le téléchargement, le parsing et
+            ce dictionnaire (à ne pas modifier).
     """
+    key = ("timetable", url, _request_identity(cookie_header, session, credentials), parser)
+    return single_flight(
+        key + (all_weeks,),
+        _get_wigor_timetable,
+        url,
+        cookie_header,
+        session,
+        parser,
+        all_weeks,
+        credentials,
+    )
+
+
+def _get_wigor_timetable(
+    url: str,
+    cookie_header: str,
+    session: Optional[requests.Session],
+    parser: Optional[str],
+    all_weeks: bool,
+    credentials: Optional[Tuple[str, str]],
+) -> Dict[str, Union[str, List[Course], Dict[str, List[Course]]]]:
+    """Corps de get_wigor_timetable, exécuté une fois par groupe d'appels identiques."""
     try:
-        # Récupérer le HTML
-        html_content = fetch_wigor_html(url, cookie_header, session)
+        # Récupérer la page (l'arbre HTML est construit une seule fois, au parsing)
+        page = fetch_wigor_page(url, cookie_header, session, parser=parser, credentials=credentials)
 
         # Parser les cours
-        parsed_courses = parse_wigor_html(html_content)
+        parsed_courses = page.courses()
 
         logger.info(f"Emploi du temps récupéré avec succès: {len(parsed_courses)} cours trouvés")
 
-        return {"html": html_content, "courses": parsed_courses}
+        result = {"html": page.text, "courses": parsed_courses}
+
+        if all_weeks:
+            # Une seule requête remplit plusieurs semaines, à partir du même arbre
+            result["weeks"] = page.weeks()
+            logger.info(f"Semaines présentes dans la page: {', '.join(result['weeks'])}")
+
+        return result
 
     except Exception as e:
         logger.error(f"Échec de récupération de l'emploi du temps: {e}")
@@ -194,33 +533,19 @@ def get_wigor_timetable_legacy(url: str, cookie_header: str) -> str:
 
 def _save_debug_html(html_content: str, response_url: str):
     """
-    Sauvegarde le contenu HTML dans un fichier de debug.
+    Archive le contenu HTML pour le debug, sans attendre l'écriture.
+
+    La page est compressée et écrite par le thread de l'archive de debug
+    (voir src.debug_archive); WIGOR_DEBUG_ARCHIVE=0 désactive l'archive.
 
     Args:
         html_content (str): Contenu HTML à sauvegarder
         response_url (str): URL de la réponse
     """
     try:
-        # Créer le dossier _debug s'il n'existe pas
-        debug_dir = "_debug"
-        if not os.path.exists(debug_dir):
-            os.makedirs(debug_dir)
-            logger.info(f"Dossier de debug créé: {debug_dir}")
-
-        # Générer le nom de fichier avec la date
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"edt_{timestamp}.html"
-        filepath = os.path.join(debug_dir, filename)
-
-        # Sauvegarder le fichier
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(f"<!-- URL: {response_url} -->\n")
-            f.write(f"<!-- Timestamp: {datetime.now().isoformat()} -->\n")
-            f.write(f"<!-- Size: {len(html_content)} characters -->\n")
-            f.write(html_content)
-
-        logger.info(f"HTML sauvegardé dans: {filepath}")
-
+        archive = get_debug_archive()
+        if archive is not None:
+            archive.submit(html_content, response_url)
     except Exception as e:
         logger.warning(f"Erreur lors de la sauvegarde debug: {e}")
 
@@ -293,17 +618,18 @@ def login_with_credentials(
             }
 
         # Vérifier si on est déjà sur une page de login ou si on a besoin de redirection
-        login_form = _find_login_form(response.text)
+        # (chaque réponse n'est parsée qu'une fois, voir LoginPage)
+        page = LoginPage(response.text, response.url)
 
-        if not login_form:
+        if not page.has_login_form:
             # Chercher un lien de connexion ou forcer une redirection
             logger.info("Aucun formulaire de login trouvé, recherche de redirection CAS")
-            cas_url = _find_cas_login_url(response.text, response.url)
+            cas_url = page.cas_login_url
 
             if cas_url:
                 logger.info(f"URL CAS trouvée: {cas_url}")
                 response = session.get(cas_url, allow_redirects=True)
-                login_form = _find_login_form(response.text)
+                page = LoginPage(response.text, response.url)
             else:
                 return {
                     "success": False,
@@ -311,7 +637,7 @@ def login_with_credentials(
                     "status_code": response.status_code,
                 }
 
-        if not login_form:
+        if not page.has_login_form:
             return {
                 "success": False,
                 "error": "Formulaire de connexion non trouvé",
@@ -320,8 +646,8 @@ def login_with_credentials(
 
         # Étape 2: Extraire les champs du formulaire et préparer le POST
         logger.info("Étape 2: Extraction des champs du formulaire de connexion")
-        form_data = _extract_form_data(response.text, username, password)
-        form_action = _get_form_action(response.text, response.url)
+        form_data = page.form_data(username, password)
+        form_action = page.action_url
 
         logger.info(f"Action du formulaire: {form_action}")
         logger.info(f"Champs du formulaire: {list(form_data.keys())}")
@@ -350,7 +676,7 @@ def login_with_credentials(
                 break
 
             # Chercher des redirections JavaScript ou meta refresh
-            next_url = _find_redirect_url(response.text, response.url)
+            next_url = LoginPage(response.text, response.url).redirect_url
             if next_url:
                 logger.info(f"Redirection détectée vers: {next_url}")
                 response = session.get(next_url, allow_redirects=True)
@@ -402,33 +728,96 @@ def login_with_credentials(
         return {"success": False, "error": f"Erreur inattendue: {str(e)}", "status_code": 0}
 
 
-def _find_login_form(html_content: str) -> bool:
+def verify_stored_session(
+    store: SessionStore, stored: StoredSession, url: str
+) -> Optional[requests.Session]:
     """
-    Cherche un formulaire de connexion dans le HTML.
+    Vérifie auprès du serveur une session stockée avant de la réutiliser.
+
+    Le stockage ne connaît que son expiration locale: le serveur peut avoir expiré
+    la session avant. Une session refusée est supprimée du stockage.
 
     Args:
-        html_content (str): Contenu HTML à analyser
+        store (SessionStore): Stockage des sessions
+        stored (StoredSession): Session stockée
+        url (str): URL Wigor de test (voir cookies_auth.is_authenticated)
 
     Returns:
-        bool: True si un formulaire de login est trouvé
+        Optional[requests.Session]: Session authentifiée, ou None si refusée
     """
-    soup = BeautifulSoup(html_content, "html.parser")
+    session = pooled_session(stored.cookies)
+    if is_authenticated(session, url):
+        return session
 
-    # Chercher des formulaires contenant des champs username/password
-    forms = soup.find_all("form")
-    for form in forms:
-        inputs = form.find_all("input")
-        input_names = [input.get("name", "").lower() for input in inputs]
+    logger.info(f"Session stockée refusée par le serveur pour {stored.user}, supprimée")
+    store.delete(stored.user, url)
+    return None
 
-        has_username = any(
-            "username" in name or "login" in name or "user" in name for name in input_names
-        )
-        has_password = any("password" in name or "pwd" in name for name in input_names)
 
-        if has_username and has_password:
-            return True
+def login_or_restore(
+    username: str,
+    password: str,
+    url: str,
+    store: Optional[SessionStore] = None,
+    verify: bool = True,
+) -> Dict[str, Union[bool, str, requests.Session, int]]:
+    """
+    Réutilise la session stockée de l'utilisateur, sinon se connecte et la stocke.
+
+    Par défaut, la session stockée n'est réutilisée qu'après vérification auprès du
+    serveur (voir verify_stored_session): une session expirée côté serveur est remplacée
+    par une nouvelle connexion. Sans vérification, l'appelant doit contrôler la page
+    obtenue et supprimer la session refusée (voir fetch_wigor_page).
+
+    Args:
+        username (str): Identifiant utilisateur
+        password (str): Mot de passe
+        url (str): URL Wigor de base
+        store (Optional[SessionStore]): Stockage des sessions (None: connexion seule)
+        verify (bool): Vérifier la session stockée par une requête au serveur
+
+    Returns:
+        Dict: Même contenu que login_with_credentials, plus restored (bool): True si la
+            session provient du stockage (pas de status_code dans ce cas)
+    """
+    if store is not None:
+        stored = store.load(username, url)
+        if stored is None:
+            session = None
+        elif verify:
+            session = verify_stored_session(store, stored, url)
+        else:
+            session = pooled_session(stored.cookies)
+        if session is not None:
+            logger.info(f"♻️ Session stockée réutilisée pour {username}")
+            return {
+                "success": True,
+                "session": session,
+                "cookies_string": stored.cookie_header(),
+                "restored": True,
+            }
+
+    result = login_with_credentials(username, password, url)
+    result["restored"] = False
+    if result["success"] and store is not None:
+        try:
+            store.save(username, url, result["session"].cookies)
+        except OSError as e:
+            logger.warning(f"Session non enregistrée: {e}")
+    return result
+
+
+def _find_login_form(html_content: str) -> bool:
+    """
+    Cherche un formulaire de connexion dans le HTML.
+
+    Args:
+        html_content (str): Contenu HTML à analyser
 
-    return False
+    Returns:
+        bool: True si un formulaire de login est trouvé
+    """
+    return LoginPage(html_content, "").has_login_form
 
 
 def _find_cas_login_url(html_content: str, current_url: str) -> Optional[str]:
@@ -442,26 +831,7 @@ def _find_cas_login_url(html_content: str, current_url: str) -> Optional[str]:
     Returns:
         Optional[str]: URL CAS ou None
     """
-    soup = BeautifulSoup(html_content, "html.parser")
-
-    # Chercher des liens vers CAS
-    links = soup.find_all("a", href=True)
-    for link in links:
-        href = link.get("href", "")
-        if "cas" in href.lower() or "login" in href.lower() or "connexion" in href.lower():
-            return urljoin(current_url, href)
-
-    # Chercher des redirections JavaScript
-    scripts = soup.find_all("script")
-    for script in scripts:
-        script_text = script.get_text()
-        if "location.href" in script_text or "window.location" in script_text:
-            # Extraire l'URL avec regex simple
-            url_match = re.search(r'["\']([^"\']*cas[^"\']*)["\']', script_text)
-            if url_match:
-                return urljoin(current_url, url_match.group(1))
-
-    return None
+    return LoginPage(html_content, current_url).cas_login_url
 
 
 def _extract_form_data(html_content: str, username: str, password: str) -> Dict[str, str]:
@@ -476,66 +846,7 @@ def _extract_form_data(html_content: str, username: str, password: str) -> Dict[
     Returns:
         Dict[str, str]: Données du formulaire
     """
-    soup = BeautifulSoup(html_content, "html.parser")
-    form_data = {}
-
-    # Trouver le formulaire de login
-    forms = soup.find_all("form")
-    login_form = None
-
-    for form in forms:
-        inputs = form.find_all("input")
-        input_names = [input.get("name", "").lower() for input in inputs]
-
-        has_username = any(
-            "username" in name or "login" in name or "user" in name for name in input_names
-        )
-        has_password = any("password" in name or "pwd" in name for name in input_names)
-
-        if has_username and has_password:
-            login_form = form
-            break
-
-    if not login_form:
-        return form_data
-
-    # Extraire tous les champs du formulaire
-    inputs = login_form.find_all("input")
-
-    for input_field in inputs:
-        name = input_field.get("name", "")
-        value = input_field.get("value", "")
-        input_type = input_field.get("type", "").lower()
-
-        if name:
-            if "username" in name.lower() or "login" in name.lower() or "user" in name.lower():
-                form_data[name] = username
-            elif "password" in name.lower() or "pwd" in name.lower():
-                form_data[name] = password
-            elif input_type == "hidden":
-                # Inclure tous les champs cachés (lt, execution, _eventId, etc.)
-                form_data[name] = value
-                logger.debug(f"Champ caché ajouté: {name} = {value}")
-            elif input_type in ["text", "email"]:
-                # Autres champs texte (peut être username avec un autre nom)
-                if not form_data.get(name):  # Seulement si pas déjà rempli
-                    form_data[name] = username if "mail" not in name.lower() else username
-
-    # Champs spéciaux CAS souvent requis
-    if "execution" not in form_data:
-        execution_input = soup.find("input", {"name": "execution"})
-        if execution_input:
-            form_data["execution"] = execution_input.get("value", "")
-
-    if "lt" not in form_data:
-        lt_input = soup.find("input", {"name": "lt"})
-        if lt_input:
-            form_data["lt"] = lt_input.get("value", "")
-
-    if "_eventId" not in form_data:
-        form_data["_eventId"] = "submit"
-
-    return form_data
+    return LoginPage(html_content, "").form_data(username, password)
 
 
 def _get_form_action(html_content: str, current_url: str) -> str:
@@ -549,27 +860,7 @@ def _get_form_action(html_content: str, current_url: str) -> str:
     Returns:
         str: URL d'action du formulaire
     """
-    soup = BeautifulSoup(html_content, "html.parser")
-
-    # Trouver le formulaire de login
-    forms = soup.find_all("form")
-    for form in forms:
-        inputs = form.find_all("input")
-        input_names = [input.get("name", "").lower() for input in inputs]
-
-        has_username = any(
-            "username" in name or "login" in name or "user" in name for name in input_names
-        )
-        has_password = any("password" in name or "pwd" in name for name in input_names)
-
-        if has_username and has_password:
-            action = form.get("action", "")
-            if action:
-                return urljoin(current_url, action)
-            else:
-                return current_url
-
-    return current_url
+    return LoginPage(html_content, current_url).action_url
 
 
 def _find_redirect_url(html_content: str, current_url: str) -> Optional[str]:
@@ -583,32 +874,7 @@ def _find_redirect_url(html_content: str, current_url: str) -> Optional[str]:
     Returns:
         Optional[str]: URL de redirection ou None
     """
-    soup = BeautifulSoup(html_content, "html.parser")
-
-    # Chercher meta refresh
-    meta_refresh = soup.find("meta", {"http-equiv": "refresh"})
-    if meta_refresh:
-        content = meta_refresh.get("content", "")
-        url_match = re.search(r"url=(.+)", content, re.IGNORECASE)
-        if url_match:
-            return urljoin(current_url, url_match.group(1).strip())
-
-    # Chercher redirection JavaScript
-    scripts = soup.find_all("script")
-    for script in scripts:
-        script_text = script.get_text()
-
-        # location.href = "url"
-        href_match = re.search(r'location\.href\s*=\s*["\']([^"\']+)["\']', script_text)
-        if href_match:
-            return urljoin(current_url, href_match.group(1))
-
-        # window.location = "url"
-        location_match = re.search(r'window\.location\s*=\s*["\']([^"\']+)["\']', script_text)
-        if location_match:
-            return urljoin(current_url, location_match.group(1))
-
-    return None
+    return LoginPage(html_content, current_url).redirect_url
 
 
 def _extract_cookies_string(session: requests.Session) -> str:
@@ -0,0 +1,38 @@
+"""
+Configuration commune des tests.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from auth.session_pool import reset_session_pool
+
+
+@pytest.fixture(autouse=True)
+def _isolated_session_pool():
+    """Chaque test part d'un registre de sessions vide (les tests remplacent requests.Session)."""
+    reset_session_pool()
+    yield
+    reset_session_pool()
+
+
+@pytest.fixture(autouse=True)
+def _no_persistent_sessions(monkeypatch):
+    """Les tests n'écrivent jamais dans le stockage de sessions de l'utilisateur."""
+    monkeypatch.setenv("WIGOR_SESSION_STORE", "0")
+
+
+@pytest.fixture(autouse=True)
+def _isolated_parse_cache(monkeypatch, tmp_path):
+    """Le cache de parsing des tests vit dans un répertoire temporaire, jamais dans ~/.cache."""
+    monkeypatch.setenv("WIGOR_CACHE_DIR", str(tmp_path / "parse-cache"))
+
+
+@pytest.fixture(autouse=True)
+def _no_debug_archive(monkeypatch):
+    """Les tests n'archivent pas les pages téléchargées dans _debug/."""
+    monkeypatch.setenv("WIGOR_DEBUG_ARCHIVE", "0")
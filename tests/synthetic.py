@@ -0,0 +1,204 @@
+"""
+Générateur de pages Wigor synthétiques pour les tests de montée en charge.
+
+Produit un balisage réaliste (div.Jour/td.TCJour, div.Case avec TCase/TChdeb/
+TCSalle/TCProf, semaines voisines leurres) ainsi que les cours attendus.
+"""
+
+import random
+from datetime import date, timedelta
+from html import escape
+from typing import Dict, List, Optional
+
+DAY_NAMES = ("Lundi", "Mardi", "Mercredi", "Jeudi", "Vendredi", "Samedi", "Dimanche")
+
+MONTH_NAMES = (
+    "Janvier",
+    "Février",
+    "Mars",
+    "Avril",
+    "Mai",
+    "Juin",
+    "Juillet",
+    "Août",
+    "Septembre",
+    "Octobre",
+    "Novembre",
+    "Décembre",
+)
+
+TITLES = (
+    "DEVOPS & CI/CD",
+    "ARCHITECTURE LOGICIELLE",
+    "ANGLAIS",
+    "BASE DE DONNÉES AVANCÉES",
+    "SÉCURITÉ DES SI",
+    "INTELLIGENCE ARTIFICIELLE",
+    "GESTION DE PROJET",
+    "CLOUD COMPUTING",
+)
+
+PROFS = ("DUPONT Jean", "MARTIN Claire", "SMITH John", "BERNARD Luc", "PETIT Sarah")
+
+ROOMS = ("Salle:B204(EPSI)", "Salle:A101(EPSI)", "Salle:C12(WIS)", "Salle:Distanciel")
+
+GROUP = "B3 DEV IA 2025-2026"
+
+_PAGE_HEADER = """<!DOCTYPE html PUBLIC "-//W3C//DTD XHTML 1.0 Transitional//EN" \
+"http://www.w3.org/TR/xhtml1/DTD/xhtml1-transitional.dtd">
+<html xmlns="http://www.w3.org/1999/xhtml">
+<head>
+<meta http-equiv="Content-Type" content="text/html; charset=utf-8" />
+<title>EDT - SYNTHETIQUE</title>
+</head>
+<body>
+<form method="post" action="./WebPsDyn.aspx?action=posEDTLMS" id="form1">
+<div id="DivBody">
+"""
+
+_PAGE_FOOTER = """</div>
+</form>
+</body>
+</html>
+"""
+
+_DAY_COLUMN = (
+    '<div class="Jour" style="top:0px;left:{left:.2f}%;width:{width:.1f}%;height:37px;">'
+    '<table class="TCJour"><tr><td class="TCJour" style="width:100%;">{header}</td></tr>'
+    "</table></div>\n"
+)
+
+_COURSE_BLOCK = (
+    '<div class="Case" style="top:{top}px;left:{left:.2f}%;width:{width:.1f}%;height:161px;">'
+    '<div class="innerCase" style="background-color:#AAD5FF;"><div class="BackGroundCase">'
+    '<table class="TCase" cellspacing="0" cellpadding="0"><tr><td class="TCase">{titre}</td></tr>'
+    '<tr><td class="TCProf">{prof}<br/>{group}</td></tr></table>'
+    '<table class="TChdeb"><tr><td class="TChdeb">{horaire}</td>'
+    '<td class="TCSalle">{salle}</td></tr></table></div></div></div>\n'
+)
+
+
+def day_header(day: date) -> str:
+    """En-tête Wigor d'un jour (ex: "Lundi 13 Octobre")."""
+    return f"{DAY_NAMES[day.weekday()]} {day.day} {MONTH_NAMES[day.month - 1]}"
+
+
+class SyntheticPage:
+    """
+    Page Wigor synthétique et cours attendus.
+
+    Attributes:
+        html: Balisage de la page
+        main_week_courses: Cours attendus de parse_wigor_html (semaine principale, triés)
+        all_courses: Tous les cours de la page, semaines leurres comprises
+        day_headers: En-têtes de toutes les colonnes de jours
+    """
+
+    __slots__ = ("html", "main_week_courses", "all_courses", "day_headers")
+
+    def __init__(
+        self,
+        html: str,
+        main_week_courses: List[Dict[str, str]],
+        all_courses: List[Dict[str, str]],
+        day_headers: List[str],
+    ):
+        self.html = html
+        self.main_week_courses = main_week_courses
+        self.all_courses = all_courses
+        self.day_headers = day_headers
+
+
+def generate_wigor_page(
+    weeks: int = 3,
+    days_per_week: int = 5,
+    courses_per_day: int = 2,
+    seed: int = 0,
+    start: Optional[date] = None,
+) -> SyntheticPage:
+    """
+    Génère une page Wigor synthétique.
+
+    La semaine principale est placée entre left:100% et left:200% comme sur Wigor;
+    la première semaine (si weeks >= 2) et les suivantes sont des leurres.
+
+    Args:
+        weeks (int): Nombre de semaines dans la page
+        days_per_week (int): Jours affichés par semaine (1 à 7)
+        courses_per_day (int): Cours par jour
+        seed (int): Graine du tirage des titres, salles et professeurs
+        start (Optional[date]): Lundi de la première semaine (défaut: début mars de
+            l'année courante, pour rester dans l'année que suppose le parser)
+
+    Returns:
+        SyntheticPage: Page et cours attendus
+    """
+    if not 1 <= days_per_week <= 7:
+        raise ValueError("days_per_week doit être entre 1 et 7")
+
+    rng = random.Random(seed)
+    if start is None:
+        march_first = date(date.today().year, 3, 1)
+        start = march_first - timedelta(days=march_first.weekday())
+
+    main_week = 1 if weeks >= 2 else 0
+    pitch = 99.5 / days_per_week
+    width = pitch - 0.3
+    # Créneaux sur une journée de 10h à partir de 8h, heures de début distinctes
+    slot_minutes = max(1, 600 // max(1, courses_per_day))
+
+    parts = []
+    all_courses = []
+    main_week_courses = []
+    day_headers = []
+
+    for week in range(weeks):
+        offset = (week - main_week + 1) * 100
+        columns = []
+        blocks = []
+        for day_index in range(days_per_week):
+            day = start + timedelta(weeks=week, days=day_index)
+            header = day_header(day)
+            left = offset + 0.12 + day_index * pitch
+            day_headers.append(header)
+            columns.append(_DAY_COLUMN.format(left=left, width=width, header=escape(header)))
+
+            for slot in range(courses_per_day):
+                begin = 8 * 60 + slot * slot_minutes
+                end = begin + slot_minutes
+                course = {
+                    "titre": rng.choice(TITLES),
+                    "prof": rng.choice(PROFS),
+                    "horaire": f"{begin // 60:02d}:{begin % 60:02d} - {end // 60:02d}:{end % 60:02d}",
+                    "salle": rng.choice(ROOMS),
+                }
+                blocks.append(
+                    _COURSE_BLOCK.format(
+                        top=204 + slot * 170,
+                        left=left,
+                        width=width,
+                        titre=escape(course["titre"]),
+                        prof=escape(course["prof"]),
+                        group=GROUP,
+                        horaire=course["horaire"],
+                        salle=escape(course["salle"]),
+                    )
+                )
+
+                expected = {
+                    "titre": course["titre"],
+                    "prof": course["prof"] + GROUP,
+                    "horaire": course["horaire"],
+                    "salle": course["salle"],
+                    "jour": header,
+                }
+                all_courses.append(expected)
+                if week == main_week:
+                    main_week_courses.append(expected)
+
+        # Comme sur Wigor: en-têtes de la semaine puis ses blocs de cours
+        parts.extend(columns)
+        parts.extend(blocks)
+
+    html = _PAGE_HEADER + "".join(parts) + _PAGE_FOOTER
+    return SyntheticPage(html, main_week_courses, all_courses, day_headers)
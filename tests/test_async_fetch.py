@@ -0,0 +1,173 @@
+"""
+Tests du moteur asynchrone de récupération des emplois du temps.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src import async_fetch
+from src.async_fetch import AsyncWigorFetcher, fetch_timetables, get_wigor_timetable_async
+from src.timetable_parser import parse_wigor_html
+
+FIXTURE = Path(__file__).parent / "fixtures" / "wigor_multi_week.html"
+
+# Latence simulée de Wigor par requête (secondes)
+DELAY = 0.05
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    """Wigor de substitution: page fixe, latence simulée, suivi des requêtes en cours."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        host = self.headers.get("Host", "")
+        with server.lock:
+            server.in_flight[host] = server.in_flight.get(host, 0) + 1
+            server.total_in_flight += 1
+            server.max_in_flight[host] = max(
+                server.max_in_flight.get(host, 0), server.in_flight[host]
+            )
+            server.max_total = max(server.max_total, server.total_in_flight)
+        try:
+            time.sleep(DELAY)
+            if self.path.startswith("/missing"):
+                self.send_response(404)
+                body = b"not found"
+            else:
+                self.send_response(200)
+                body = server.page
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with server.lock:
+                server.in_flight[host] -= 1
+                server.total_in_flight -= 1
+
+    def log_message(self, format, *args):
+        pass
+
+
+@patch("src.wigor_api._save_debug_html")
+class TestAsyncWigorFetcher(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInHandler)
+        cls.server.daemon_threads = True
+        cls.server.page = FIXTURE.read_bytes()
+        cls.port = cls.server.server_address[1]
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.expected = parse_wigor_html(FIXTURE.read_text(encoding="utf-8"))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.server.lock = threading.Lock()
+        self.server.in_flight = {}
+        self.server.max_in_flight = {}
+        self.server.total_in_flight = 0
+        self.server.max_total = 0
+        # Pas de cache disque: chaque page est réellement parsée
+        patcher = patch.dict(os.environ, {"WIGOR_PARSE_CACHE": "0"})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _url(self, host: str, group: int) -> str:
+        return f"http://{host}:{self.port}/edt?groupe={group}"
+
+    def test_results_match_sync_parser_in_order(self, _):
+        targets = [(self._url("127.0.0.1", i), f"sid=g{i}") for i in range(6)]
+        results = fetch_timetables(targets, max_concurrency=6, per_host_limit=6, all_weeks=True)
+
+        self.assertEqual(len(results), 6)
+        for result in results:
+            self.assertEqual(result["courses"], self.expected)
+            self.assertEqual(sum(len(week) for week in result["weeks"].values()), 25)
+
+    def test_concurrency_is_bounded_and_faster_than_serial(self, _):
+        targets = [(self._url("127.0.0.1", i), "sid=a") for i in range(12)]
+        start = time.perf_counter()
+        results = fetch_timetables(targets, max_concurrency=4, per_host_limit=4)
+        elapsed = time.perf_counter() - start
+
+        self.assertTrue(all(isinstance(result, dict) for result in results))
+        self.assertLessEqual(self.server.max_total, 4)
+        self.assertGreater(self.server.max_total, 1)
+        self.assertLess(elapsed, 12 * DELAY)
+
+    def test_per_host_limit(self, _):
+        targets = [
+            (self._url(host, i), "sid=a") for i in range(6) for host in ("127.0.0.1", "localhost")
+        ]
+        fetch_timetables(targets, max_concurrency=8, per_host_limit=2)
+
+        self.assertEqual(len(self.server.max_in_flight), 2)
+        for host, peak in self.server.max_in_flight.items():
+            self.assertLessEqual(peak, 2, host)
+        self.assertLessEqual(self.server.max_total, 4)
+
+    def test_errors_are_returned_in_place(self, _):
+        targets = [
+            (self._url("127.0.0.1", 1), "sid=a"),
+            (f"http://127.0.0.1:{self.port}/missing", "sid=a"),
+        ]
+        results = fetch_timetables(targets)
+        self.assertEqual(results[0]["courses"], self.expected)
+        self.assertIsInstance(results[1], Exception)
+
+        async def strict():
+            async with AsyncWigorFetcher() as fetcher:
+                await fetcher.get_timetables(targets, return_exceptions=False)
+
+        with self.assertRaises(Exception):
+            asyncio.run(strict())
+
+    def test_parsing_runs_off_the_event_loop(self, _):
+        threads = []
+        real_parse = async_fetch._parse_page
+
+        def recording_parse(page, all_weeks):
+            threads.append(threading.get_ident())
+            return real_parse(page, all_weeks)
+
+        async def run():
+            loop_thread = threading.get_ident()
+            with patch("src.async_fetch._parse_page", recording_parse):
+                result = await get_wigor_timetable_async(self._url("127.0.0.1", 1), "sid=a")
+            return loop_thread, result
+
+        loop_thread, result = asyncio.run(run())
+        self.assertEqual(result["courses"], self.expected)
+        self.assertEqual(len(threads), 1)
+        self.assertNotEqual(threads[0], loop_thread)
+
+    def test_invalid_arguments(self, _):
+        with self.assertRaises(ValueError):
+            AsyncWigorFetcher(max_concurrency=0)
+
+        async def empty_url():
+            async with AsyncWigorFetcher() as fetcher:
+                await fetcher.fetch_html("")
+
+        with self.assertRaises(ValueError):
+            asyncio.run(empty_url())
+
+
+if __name__ == "__main__":
+    unittest.main()
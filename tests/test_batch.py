@@ -0,0 +1,246 @@
+"""
+Tests de la récupération en lot (pool borné, lignes JSON au fil de l'eau, bilan)
+et des manifestes de groupes (JSON lines, secrets référencés).
+"""
+
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src import cli
+from src.batch import BatchSummary, run_batch
+from src.course import Course
+from src.service import TimetableGroup, load_groups
+
+FIXTURE = Path(__file__).parent / "fixtures" / "wigor_multi_week.html"
+
+
+class _LineRecorder(io.StringIO):
+    """Flux de sortie qui signale chaque ligne écrite."""
+
+    def __init__(self):
+        super().__init__()
+        self.first_line = threading.Event()
+
+    def write(self, text):
+        result = super().write(text)
+        self.first_line.set()
+        return result
+
+
+class _FakeWigor:
+    """Récupération de test: mesure la concurrence, peut bloquer ou échouer par groupe."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+        self.gates = {}
+        self.errors = {}
+        self.calls = []
+
+    def __call__(self, url, cookie_header="", parser=None, all_weeks=False, credentials=None):
+        with self.lock:
+            self.calls.append((url, cookie_header, credentials))
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            gate = self.gates.get(url)
+            if gate is not None:
+                gate.wait(5)
+            if url in self.errors:
+                raise self.errors[url]
+            course = Course("DEVOPS", "DUPONT", "09:00 - 12:00", "B204", "Lundi 13 Octobre")
+            return {"html": "", "courses": [course], "weeks": {"2025-W42": [course]}}
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+def _groups(count):
+    return [TimetableGroup(f"g{i}", f"https://wigor.example/{i}", "sid=a") for i in range(count)]
+
+
+class TestRunBatch(unittest.TestCase):
+    def setUp(self):
+        self.wigor = _FakeWigor()
+
+    def test_results_are_streamed_as_groups_finish(self):
+        output = _LineRecorder()
+        slow = self.wigor.gates["https://wigor.example/0"] = threading.Event()
+        # Le premier groupe ne se termine qu'après l'écriture d'une autre ligne
+        threading.Thread(target=lambda: output.first_line.wait(5) and slow.set()).start()
+
+        summary = run_batch(_groups(3), output, max_workers=2, fetch=self.wigor)
+
+        records = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(len(records), 3)
+        self.assertEqual(records[-1]["group"], "g0")
+        self.assertTrue(all(record["ok"] for record in records))
+        self.assertEqual(records[0]["courses"][0]["titre"], "DEVOPS")
+        self.assertNotIn("weeks", records[0])
+        self.assertEqual((summary.total, summary.succeeded), (3, 3))
+
+    def test_worker_pool_is_bounded(self):
+        run_batch(_groups(12), io.StringIO(), max_workers=3, fetch=self.wigor)
+        self.assertEqual(len(self.wigor.calls), 12)
+        self.assertLessEqual(self.wigor.max_active, 3)
+
+    def test_failures_do_not_stop_the_batch(self):
+        self.wigor.errors["https://wigor.example/1"] = ConnectionError("Wigor indisponible")
+        output = io.StringIO()
+        with self.assertLogs("src.batch", level="WARNING"):
+            summary = run_batch(_groups(3), output, all_weeks=True, fetch=self.wigor)
+
+        records = {
+            record["group"]: record for record in map(json.loads, output.getvalue().splitlines())
+        }
+        self.assertFalse(records["g1"]["ok"])
+        self.assertEqual(records["g1"]["error"], "Wigor indisponible")
+        self.assertEqual(records["g1"]["error_type"], "ConnectionError")
+        self.assertEqual(len(records["g0"]["weeks"]["2025-W42"]), 1)
+        self.assertEqual(summary.failures, [("g1", "Wigor indisponible")])
+        self.assertEqual(summary.to_dict()["failed"], 1)
+
+    def test_credentials_are_passed_through(self):
+        group = TimetableGroup("m1", "https://wigor.example/m1", credentials=("u", "p"))
+        run_batch([group], io.StringIO(), fetch=self.wigor)
+        self.assertEqual(self.wigor.calls, [("https://wigor.example/m1", "", ("u", "p"))])
+
+
+class TestBatchSummary(unittest.TestCase):
+    def test_latency_statistics(self):
+        summary = BatchSummary()
+        summary.latencies = [i / 1000 for i in range(1, 101)]
+        summary.failures = [("g9", "timeout")]
+        summary.elapsed = 1.5
+
+        data = summary.to_dict()
+        self.assertEqual(
+            data["latency_ms"], {"min": 1.0, "mean": 50.5, "p50": 50.0, "p95": 95.0, "max": 100.0}
+        )
+        self.assertEqual((data["total"], data["succeeded"], data["failed"]), (101, 100, 1))
+        self.assertIn("❌ g9: timeout", summary.format())
+
+    def test_empty_summary(self):
+        summary = BatchSummary()
+        self.assertIsNone(summary.percentile(0.5))
+        self.assertIsNone(summary.to_dict()["latency_ms"])
+        self.assertIn("0/0", summary.format())
+
+
+class TestManifest(unittest.TestCase):
+    def _write(self, text, suffix=".jsonl"):
+        tmp = tempfile.NamedTemporaryFile("w", suffix=suffix, delete=False, encoding="utf-8")
+        self.addCleanup(os.unlink, tmp.name)
+        with tmp:
+            tmp.write(text)
+        return tmp.name
+
+    def test_json_lines_manifest_with_secret_references(self):
+        lines = [
+            {"group": "b3", "url": "https://wigor.example/b3", "cookie_env": "B3_COOKIE"},
+            {
+                "group": "m1",
+                "url": "https://wigor.example/m1",
+                "username": "u",
+                "password_env": "M1_PASSWORD",
+            },
+        ]
+        path = self._write("\n".join(json.dumps(line) for line in lines) + "\n\n")
+        with patch.dict(os.environ, {"B3_COOKIE": "sid=b3", "M1_PASSWORD": "secret"}):
+            groups = load_groups(path)
+
+        self.assertEqual(list(groups), ["b3", "m1"])
+        self.assertEqual(groups["b3"].cookie, "sid=b3")
+        self.assertEqual(groups["m1"].credentials, ("u", "secret"))
+
+    def test_invalid_manifests(self):
+        url = "https://wigor.example/b3"
+        cases = [
+            json.dumps({"url": url, "cookie": "a"}),
+            json.dumps({"group": "b3", "url": url, "cookie": "a"}) * 2,
+            "\n".join([json.dumps({"group": "b3", "url": url, "cookie": "a"})] * 2),
+            json.dumps({"group": "b3", "url": url, "cookie_env": "ABSENT_WIGOR_COOKIE"}),
+        ]
+        for text in cases:
+            with self.subTest(text=text), self.assertRaises(ValueError):
+                load_groups(self._write(text))
+
+
+class _WigorHandler(BaseHTTPRequestHandler):
+    """Wigor de test: la page d'exemple, ou une erreur 404 pour /absent."""
+
+    def do_GET(self):
+        if self.path.startswith("/absent"):
+            self.send_error(404)
+            return
+        data = FIXTURE.read_bytes()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@patch("src.wigor_api._save_debug_html")
+class TestBatchCli(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _WigorHandler)
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def _run(self, *args):
+        stderr = io.StringIO()
+        with patch.object(sys, "argv", ["wigor-cli", *args]), patch("sys.stderr", stderr):
+            code = cli.main()
+        return code, stderr.getvalue()
+
+    def test_batch_to_file(self, _):
+        with tempfile.TemporaryDirectory() as tmp:
+            manifest = Path(tmp) / "groups.jsonl"
+            manifest.write_text(
+                "\n".join(
+                    json.dumps({"group": name, "url": f"{self.base}/{path}", "cookie": "sid=a"})
+                    for name, path in (("b3", "edt?g=b3"), ("m1", "edt?g=m1"), ("x", "absent"))
+                ),
+                encoding="utf-8",
+            )
+            target = Path(tmp) / "edt.jsonl"
+            code, stderr = self._run("--batch", str(manifest), "-o", str(target), "--workers", "2")
+            records = {
+                record["group"]: record
+                for record in map(json.loads, target.read_text(encoding="utf-8").splitlines())
+            }
+
+        self.assertEqual(code, 1)
+        self.assertEqual(len(records["b3"]["courses"]), 9)
+        self.assertTrue(records["m1"]["ok"])
+        self.assertFalse(records["x"]["ok"])
+        self.assertIn("2/3 groupe(s)", stderr)
+        self.assertIn("p95", stderr)
+
+    def test_batch_with_invalid_manifest(self, _):
+        self.assertEqual(self._run("--batch", "absent-manifest.jsonl")[0], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
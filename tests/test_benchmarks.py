@@ -0,0 +1,261 @@
+"""
+Benchmarks du parser sur pages synthétiques (débit et pic mémoire).
+
+Les mesures sont comparées à une référence enregistrée dans
+tests/snapshots/benchmark_baseline.json. Les durées sont normalisées par une
+charge de calibration pour rester comparables d'une machine à l'autre.
+
+Mettre à jour la référence:
+    WIGOR_BENCH_UPDATE=1 python -m pytest tests/test_benchmarks.py --no-cov -s
+"""
+
+import json
+import os
+import sys
+import time
+import tracemalloc
+import unittest
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.parse_pool import benchmark_parse_scaling
+from src.timetable_parser import (
+    _extract_week_date_range,
+    format_courses_for_display,
+    parse_wigor_html,
+    parse_wigor_html_weeks,
+)
+from tests.synthetic import generate_wigor_page
+
+BASELINE_FILE = Path(__file__).parent / "snapshots" / "benchmark_baseline.json"
+
+# Variable d'environnement pour réécrire la référence
+UPDATE_ENV_VAR = "WIGOR_BENCH_UPDATE"
+
+# Régression tolérée par rapport à la référence (les durées d'une machine
+# partagée varient de ±50 % d'une exécution à l'autre)
+TIME_TOLERANCE = 3.0
+MEMORY_TOLERANCE = 1.3
+# Marge absolue pour les petits scénarios (Kio)
+MEMORY_SLACK_KIB = 64
+
+# Tours par benchmark pytest-benchmark (durée bornée de la suite)
+BENCH_ROUNDS = 5
+
+# Accélération minimale du pool de parsing multi-processus (par rapport à 1 processus)
+MIN_POOL_SPEEDUP = 1.2
+
+# Variable d'environnement activant la mesure de mise à l'échelle (dépend de la charge
+# de la machine: hors de la suite par défaut)
+SCALING_ENV_VAR = "WIGOR_BENCH_SCALING"
+
+# Tailles de pages: (semaines, jours par semaine, cours par jour)
+MEDIUM_PAGE = (3, 5, 4)
+LARGE_PAGE = (9, 6, 8)
+
+
+def _calibrate() -> float:
+    """Durée (meilleure de 5) d'une charge Python pure de référence."""
+
+    def workload():
+        data = [str(i * 7919 % 10007) * 3 for i in range(20000)]
+        data.sort()
+        return sum(len(item) for item in data)
+
+    return _best_time(workload, repeat=9)
+
+
+def _best_time(func, repeat: int = 5) -> float:
+    """Meilleure durée d'exécution de func sur repeat essais (secondes)."""
+    func()
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _peak_memory(func) -> int:
+    """Pic mémoire Python (octets) alloué pendant func."""
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def _build_scenarios():
+    """
+    Construit les scénarios mesurés.
+
+    Returns:
+        dict: nom -> (fonction, unités traitées par appel, libellé d'unité)
+    """
+    medium = generate_wigor_page(*MEDIUM_PAGE, seed=1)
+    large = generate_wigor_page(*LARGE_PAGE, seed=2)
+    large_courses = [c for week in parse_wigor_html_weeks(large.html).values() for c in week]
+
+    def week_range():
+        for _ in range(100):
+            _extract_week_date_range(large.day_headers)
+
+    return {
+        "parse_medium": (lambda: parse_wigor_html(medium.html), 1, "pages"),
+        "parse_large": (lambda: parse_wigor_html(large.html), 1, "pages"),
+        "week_range_large": (week_range, 100 * len(large.day_headers), "en-têtes"),
+        "format_display_large": (
+            lambda: format_courses_for_display(large_courses),
+            len(large_courses),
+            "cours",
+        ),
+    }
+
+
+class TestSyntheticGenerator(unittest.TestCase):
+    """Le générateur produit des pages dont les cours attendus sont connus."""
+
+    def test_parser_finds_expected_courses(self):
+        for shape in [(1, 5, 2), MEDIUM_PAGE, (5, 7, 3), (2, 1, 1)]:
+            with self.subTest(shape=shape):
+                page = generate_wigor_page(*shape, seed=3)
+                courses = parse_wigor_html(page.html)
+                self.assertEqual(courses, page.main_week_courses)
+                self.assertEqual(len(courses), shape[1] * shape[2])
+
+    def test_decoy_weeks_are_present(self):
+        page = generate_wigor_page(*MEDIUM_PAGE)
+        self.assertEqual(len(page.day_headers), 15)
+        self.assertEqual(len(page.all_courses), 60)
+        weeks = parse_wigor_html_weeks(page.html)
+        self.assertEqual([c for week in weeks.values() for c in week], page.all_courses)
+
+    def test_generation_is_deterministic(self):
+        self.assertEqual(generate_wigor_page(seed=5).html, generate_wigor_page(seed=5).html)
+        self.assertNotEqual(generate_wigor_page(seed=5).html, generate_wigor_page(seed=6).html)
+
+
+class TestBenchmarkBaseline(unittest.TestCase):
+    """Débit et pic mémoire comparés à la référence enregistrée."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.scenarios = _build_scenarios()
+        cls.calibration = _calibrate()
+        cls.results = {}
+        for name, (func, units, _) in cls.scenarios.items():
+            seconds = _best_time(func, repeat=5)
+            cls.results[name] = {
+                "ms": round(seconds * 1000, 3),
+                "normalized_time": round(seconds / cls.calibration, 4),
+                "peak_kib": round(_peak_memory(func) / 1024, 1),
+                "throughput": round(units / seconds, 1),
+            }
+
+    def test_report_and_compare_with_baseline(self):
+        print(f"\nBenchmarks (calibration: {self.calibration * 1000:.2f} ms)")
+        for name, result in self.results.items():
+            unit = self.scenarios[name][2]
+            print(
+                f"  {name:<22} {result['ms']:9.2f} ms  {result['throughput']:>12,.0f} {unit}/s"
+                f"  pic {result['peak_kib']:9.1f} Kio"
+            )
+
+        if os.environ.get(UPDATE_ENV_VAR):
+            with open(BASELINE_FILE, "w", encoding="utf-8") as f:
+                json.dump(self.results, f, indent=2, sort_keys=True)
+                f.write("\n")
+            print(f"  Référence mise à jour: {BASELINE_FILE}")
+            return
+
+        with open(BASELINE_FILE, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+        # Sous un traceur (coverage, débogueur), les durées ne sont pas comparables
+        check_time = sys.gettrace() is None
+
+        for name, result in self.results.items():
+            with self.subTest(scenario=name):
+                self.assertIn(
+                    name, baseline, f"Scénario absent de la référence ({UPDATE_ENV_VAR}=1)"
+                )
+                reference = baseline[name]
+                self.assertLessEqual(
+                    result["peak_kib"],
+                    reference["peak_kib"] * MEMORY_TOLERANCE + MEMORY_SLACK_KIB,
+                    f"Régression mémoire sur {name}",
+                )
+                if check_time:
+                    self.assertLessEqual(
+                        result["normalized_time"],
+                        reference["normalized_time"] * TIME_TOLERANCE,
+                        f"Régression de débit sur {name}",
+                    )
+
+
+@pytest.mark.slow
+@unittest.skipUnless(os.environ.get(SCALING_ENV_VAR), f"mesure activée par {SCALING_ENV_VAR}=1")
+class TestParsePoolScaling(unittest.TestCase):
+    """Le débit du pool de parsing croît avec le nombre de cœurs."""
+
+    def test_throughput_scales_with_core_count(self):
+        cores = os.cpu_count() or 1
+        counts = sorted({1, min(cores, 4)})
+        pages = [
+            generate_wigor_page(*MEDIUM_PAGE, seed=seed).html.encode("utf-8") for seed in range(8)
+        ]
+        results = benchmark_parse_scaling(pages, counts, repeat=2)
+
+        print(f"\nPool de parsing ({cores} cœur(s), {len(pages)} pages par mesure)")
+        for workers, result in results.items():
+            print(
+                f"  {workers:>2} processus  {result['pages_per_second']:8.1f} pages/s"
+                f"  x{result['speedup']:.2f}"
+            )
+
+        if len(counts) < 2:
+            self.skipTest("Un seul cœur: pas de mise à l'échelle à mesurer")
+        if sys.gettrace() is not None:
+            self.skipTest("Durées non comparables sous un traceur")
+        self.assertGreaterEqual(results[counts[-1]]["speedup"], MIN_POOL_SPEEDUP)
+
+
+# Benchmarks pytest-benchmark (make benchmark: pytest --benchmark-only)
+@pytest.fixture
+def bench(request):
+    """Fixture benchmark de pytest-benchmark; test ignoré si le plugin est absent."""
+    try:
+        return request.getfixturevalue("benchmark")
+    except pytest.FixtureLookupError:
+        pytest.skip("pytest-benchmark non installé")
+
+
+@pytest.fixture(scope="module")
+def scenarios():
+    return _build_scenarios()
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("name", ["parse_medium", "parse_large"])
+def test_bench_parse_wigor_html(bench, scenarios, name):
+    bench.pedantic(scenarios[name][0], rounds=BENCH_ROUNDS, warmup_rounds=1)
+
+
+@pytest.mark.slow
+def test_bench_extract_week_date_range(bench, scenarios):
+    bench.pedantic(scenarios["week_range_large"][0], rounds=BENCH_ROUNDS, warmup_rounds=1)
+
+
+@pytest.mark.slow
+def test_bench_format_courses_for_display(bench, scenarios):
+    bench.pedantic(scenarios["format_display_large"][0], rounds=BENCH_ROUNDS, warmup_rounds=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,7 +5,7 @@ import os
 import sys
 import unittest
 from datetime import datetime
-from unittest.mock import Mock, mock_open, patch
+from unittest.mock import Mock, patch
 
 # Ajout du chemin source
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
@@ -150,21 +150,22 @@ class TestWigorApiSimple(unittest.TestCase):
             result = wigor_api._find_login_form(html)
             self.assertIsInstance(result, bool)
 
-    @patch("builtins.open", mock_open())
-    @patch("os.path.exists")
-    @patch("os.makedirs")
-    def test_save_debug_html_scenarios(self, mock_makedirs, mock_exists):
+    @patch("src.wigor_api.get_debug_archive")
+    def test_save_debug_html_scenarios(self, mock_get_archive):
         """Test _save_debug_html avec différents scénarios."""
-        # Répertoire existe
-        mock_exists.return_value = True
+        # Archive active: la page est mise en file
         wigor_api._save_debug_html("<html>Test</html>", "https://test.com")
-        mock_makedirs.assert_not_called()
+        mock_get_archive.return_value.submit.assert_called_once_with(
+            "<html>Test</html>", "https://test.com"
+        )
 
-        # Répertoire n'existe pas
-        mock_exists.return_value = False
-        mock_makedirs.reset_mock()
+        # Archive désactivée
+        mock_get_archive.return_value = None
+        wigor_api._save_debug_html("<html>Test</html>", "https://test.com")
+
+        # Une erreur de l'archive n'interrompt pas la requête
+        mock_get_archive.side_effect = OSError("disque plein")
         wigor_api._save_debug_html("<html>Test</html>", "https://test.com")
-        mock_makedirs.assert_called()
 
     def test_extract_cookies_string_cases(self):
         """Test _extract_cookies_string avec différents cas."""
@@ -0,0 +1,105 @@
+"""
+Tests du cours Course (dict aux chaînes internées, sérialisation).
+"""
+
+import json
+import os
+import pickle
+import sys
+import unittest
+from datetime import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.course import Course, parse_horaire
+from src.timetable_parser import format_courses_for_display, get_courses_by_day
+
+
+class TestCourseDictCompatibility(unittest.TestCase):
+    """Le Course remplace le Dict[str, str] sans changer les appelants."""
+
+    def setUp(self):
+        self.course = Course("Maths", "M. Dupont", "08:00 - 10:00", "A101", "Lundi 13 Octobre")
+
+    def test_item_access(self):
+        self.assertEqual(self.course["titre"], "Maths")
+        self.assertEqual(self.course.get("salle"), "A101")
+        self.assertEqual(self.course.get("inconnu", "N/A"), "N/A")
+        with self.assertRaises(KeyError):
+            self.course["inconnu"]
+
+    def test_equals_plain_dict(self):
+        expected = {
+            "titre": "Maths",
+            "prof": "M. Dupont",
+            "horaire": "08:00 - 10:00",
+            "salle": "A101",
+            "jour": "Lundi 13 Octobre",
+        }
+        self.assertEqual(self.course, expected)
+        self.assertEqual(expected, self.course)
+        self.assertEqual(dict(self.course), expected)
+        self.assertEqual(list(self.course), list(expected))
+        self.assertEqual(Course.from_dict(expected), self.course)
+
+    def test_jour_absent_until_assigned(self):
+        course = Course("Maths")
+        self.assertNotIn("jour", course)
+        self.assertEqual(len(course), 4)
+
+        course["jour"] = "Mardi 14 Octobre"
+        self.assertIn("jour", course)
+        self.assertEqual(len(course), 5)
+
+        del course["jour"]
+        self.assertNotIn("jour", course)
+
+    def test_unknown_field_rejected(self):
+        with self.assertRaises(KeyError):
+            self.course["date"] = "2025-10-13"
+
+    def test_typed_start_and_end(self):
+        self.assertEqual(self.course.debut, time(8, 0))
+        self.assertEqual(self.course.fin, time(10, 0))
+
+        self.course["horaire"] = "13:30-17:45"
+        self.assertEqual((self.course.debut, self.course.fin), (time(13, 30), time(17, 45)))
+
+        self.assertEqual(parse_horaire(""), (None, None))
+        self.assertEqual(parse_horaire("25:00 - 26:00"), (None, None))
+        self.assertEqual(parse_horaire("09:00"), (time(9, 0), None))
+
+    def test_strings_are_interned(self):
+        other = Course("".join(["Ma", "ths"]), "".join(["M. ", "Dupont"]))
+        self.assertIs(other.titre, self.course.titre)
+        self.assertIs(other.prof, self.course.prof)
+
+    def test_json_serialisation(self):
+        self.assertEqual(json.loads(json.dumps([self.course])), [dict(self.course)])
+        self.assertIsInstance(self.course, dict)
+
+    def test_dict_methods_keep_fields_valid(self):
+        course = self.course.copy()
+        course.update(salle="".join(["B", "204"]))
+        self.assertIs(course.salle, sys.intern("B204"))
+        with self.assertRaises(KeyError):
+            course.update(date="2025-10-13")
+        with self.assertRaises(KeyError):
+            course.pop("titre")
+        self.assertEqual(course.pop("jour"), "Lundi 13 Octobre")
+        self.assertIsNone(course.jour)
+        self.assertEqual(self.course.salle, "A101")
+
+    def test_pickle_round_trip(self):
+        restored = pickle.loads(pickle.dumps(self.course))
+        self.assertEqual(restored, self.course)
+        self.assertEqual(restored.debut, time(8, 0))
+
+    def test_display_helpers_accept_courses(self):
+        text = format_courses_for_display([self.course])
+        self.assertIn("=== Lundi 13 Octobre ===", text)
+        self.assertEqual(get_courses_by_day([self.course], "lundi"), [self.course])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,169 @@
+"""
+Tests de l'archive des pages HTML de debug.
+"""
+
+import gzip
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.debug_archive import (
+    DEBUG_ARCHIVE_ENV_VAR,
+    DEBUG_DIR_ENV_VAR,
+    DEBUG_SAMPLE_ENV_VAR,
+    DebugArchive,
+    configure_debug_archive,
+    get_debug_archive,
+)
+
+
+def _page(index: int, size: int = 200) -> str:
+    return f"<html><head><title>EDT {index}</title></head><body>{'x' * size}</body></html>"
+
+
+class TestDebugArchive(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.directory = Path(self.tmp.name) / "_debug"
+
+    def _files(self):
+        return sorted(self.directory.glob("edt_*"))
+
+    def test_page_is_stored_compressed_with_header(self):
+        archive = DebugArchive(self.directory)
+        self.assertTrue(archive.submit(_page(1), "https://wigor/edt"))
+        archive.flush()
+
+        (path,) = self._files()
+        self.assertTrue(path.name.endswith(".html.gz"))
+        content = gzip.decompress(path.read_bytes()).decode("utf-8")
+        self.assertTrue(content.startswith("<!-- URL: https://wigor/edt -->\n"))
+        self.assertIn(f"<!-- Size: {len(_page(1))} characters -->", content)
+        self.assertTrue(content.endswith(_page(1)))
+        self.assertLess(path.stat().st_size, len(_page(1)))
+        self.assertEqual(archive.stats()["written"], 1)
+
+    def test_identical_pages_are_deduplicated(self):
+        archive = DebugArchive(self.directory)
+        for _ in range(3):
+            archive.submit(_page(1), "https://wigor/edt")
+        archive.submit(_page(2), "https://wigor/edt")
+        archive.flush()
+
+        self.assertEqual(len(self._files()), 2)
+        stats = archive.stats()
+        self.assertEqual((stats["written"], stats["deduplicated"]), (2, 2))
+
+        # L'index est reconstruit depuis le répertoire par une nouvelle archive
+        other = DebugArchive(self.directory)
+        other.submit(_page(1), "https://wigor/edt")
+        other.flush()
+        self.assertEqual(other.stats()["deduplicated"], 1)
+
+    def test_distinct_pages_in_the_same_second_are_all_kept(self):
+        archive = DebugArchive(self.directory)
+        for index in range(5):
+            archive.submit(_page(index), "https://wigor/edt")
+        archive.flush()
+        self.assertEqual(len(self._files()), 5)
+
+    def test_retention_by_count_removes_oldest(self):
+        self.directory.mkdir()
+        legacy = self.directory / "edt_20200101_000000.html"
+        legacy.write_text("ancien dump", encoding="utf-8")
+        os.utime(legacy, (0, 0))
+
+        archive = DebugArchive(self.directory, max_files=3)
+        for index in range(4):
+            archive.submit(_page(index), "https://wigor/edt")
+            archive.flush()
+            newest = max(self._files(), key=lambda path: path.stat().st_mtime)
+            os.utime(newest, (1000 + index, 1000 + index))
+
+        files = self._files()
+        self.assertEqual(len(files), 3)
+        self.assertFalse(legacy.exists())
+        self.assertEqual(archive.stats()["evicted"], 2)
+
+    def test_retention_by_bytes(self):
+        archive = DebugArchive(self.directory, max_bytes=1)
+        archive.submit(_page(1), "https://wigor/edt")
+        archive.flush()
+        self.assertEqual(self._files(), [])
+        self.assertEqual(archive.stats()["evicted"], 1)
+
+    def test_sampling(self):
+        archive = DebugArchive(self.directory, sample_rate=0.0)
+        self.assertFalse(archive.submit(_page(1), "https://wigor/edt"))
+        archive.flush()
+        self.assertFalse(self.directory.exists())
+        self.assertEqual(archive.stats()["sampled_out"], 1)
+
+        with self.assertRaises(ValueError):
+            DebugArchive(self.directory, sample_rate=2.0)
+
+    def test_full_queue_drops_pages_without_blocking(self):
+        archive = DebugArchive(self.directory, queue_size=1)
+        release = threading.Event()
+        original_write = archive._write
+
+        def slow_write(*args):
+            release.wait(5)
+            original_write(*args)
+
+        with patch.object(archive, "_write", side_effect=slow_write):
+            accepted = [archive.submit(_page(index), "https://wigor/edt") for index in range(5)]
+            release.set()
+            archive.flush()
+
+        self.assertTrue(accepted[0])
+        self.assertFalse(accepted[-1])
+        self.assertGreaterEqual(archive.stats()["dropped"], 3)
+        self.assertEqual(archive.stats()["pending"], 0)
+
+    def test_write_errors_are_logged(self):
+        self.directory.parent.joinpath("fichier").write_text("x")
+        archive = DebugArchive(self.directory.parent / "fichier")
+        with self.assertLogs("src.debug_archive", level="WARNING"):
+            archive.submit(_page(1), "https://wigor/edt")
+            archive.flush()
+
+
+class TestDebugArchiveConfiguration(unittest.TestCase):
+    def setUp(self):
+        default = patch("src.debug_archive._default_archive", None)
+        default.start()
+        self.addCleanup(default.stop)
+
+    def test_disabled_by_environment(self):
+        with patch.dict(os.environ, {DEBUG_ARCHIVE_ENV_VAR: "off"}):
+            self.assertIsNone(get_debug_archive())
+
+    def test_environment_directory_and_sampling(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with patch.dict(
+                os.environ,
+                {DEBUG_ARCHIVE_ENV_VAR: "", DEBUG_DIR_ENV_VAR: tmp, DEBUG_SAMPLE_ENV_VAR: "0.25"},
+            ):
+                archive = get_debug_archive()
+                self.assertEqual(archive.directory, Path(tmp))
+                self.assertEqual(archive.sample_rate, 0.25)
+                self.assertIs(get_debug_archive(), archive)
+
+    def test_configure_replaces_default_archive(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            archive = configure_debug_archive(directory=tmp, max_files=5)
+            with patch.dict(os.environ, {DEBUG_ARCHIVE_ENV_VAR: ""}):
+                self.assertIs(get_debug_archive(), archive)
+            self.assertEqual(archive.max_files, 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+"""
+Tests du résultat de téléchargement (page tokenisée une seule fois).
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src import fetch_result
+from src.fetch_result import FetchResult
+from src.parse_cache import ParseCache
+from src.timetable_parser import parse_wigor_html, parse_wigor_html_weeks
+from src.wigor_api import fetch_wigor_page, get_wigor_timetable
+
+FIXTURE = Path(__file__).parent / "fixtures" / "wigor_multi_week.html"
+
+
+class TestFetchResult(unittest.TestCase):
+    def setUp(self):
+        self.html = FIXTURE.read_text(encoding="utf-8")
+        patcher = patch.dict(os.environ, {"WIGOR_PARSE_CACHE": "0"})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_title_inner_case_and_courses_share_one_tree(self):
+        page = FetchResult(self.html)
+        with patch.object(fetch_result, "make_soup", wraps=fetch_result.make_soup) as soup:
+            self.assertTrue(page.title.startswith("EDT"))
+            self.assertTrue(page.contains_inner_case)
+            self.assertTrue(page.is_timetable)
+            self.assertEqual(page.courses(), parse_wigor_html(self.html))
+            self.assertEqual(page.weeks(), parse_wigor_html_weeks(self.html))
+        self.assertEqual(soup.call_count, 1)
+
+    def test_shared_result_builds_one_tree_across_threads(self):
+        page = FetchResult(self.html)
+        make_soup = fetch_result.make_soup
+
+        def slow_make_soup(*args):
+            time.sleep(0.05)  # élargit la fenêtre de course
+            return make_soup(*args)
+
+        start = threading.Barrier(4)
+        results = []
+
+        def worker():
+            start.wait()
+            results.append(page.courses())
+
+        with patch.object(fetch_result, "make_soup", side_effect=slow_make_soup) as soup:
+            threads = [threading.Thread(target=worker) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(soup.call_count, 1)
+        self.assertEqual(results, [parse_wigor_html(self.html)] * 4)
+
+    def test_tree_is_not_built_before_it_is_needed(self):
+        with patch.object(fetch_result, "make_soup") as soup:
+            page = FetchResult(self.html, "https://wigor/edt", encoding="utf-8")
+            self.assertEqual(page.content, self.html.encode("utf-8"))
+        soup.assert_not_called()
+
+    def test_parse_cache_hit_skips_tokenization(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ParseCache(tmp)
+            expected = FetchResult(self.html).courses(cache=cache)
+
+            page = FetchResult(self.html)
+            with patch.object(fetch_result, "make_soup") as soup:
+                self.assertEqual(page.courses(cache=cache), expected)
+            soup.assert_not_called()
+
+    def test_login_page_and_missing_title(self):
+        page = FetchResult('<html><body><form><input name="username"></form></body></html>')
+        self.assertEqual(page.title, "Titre non trouvé")
+        self.assertFalse(page.contains_inner_case)
+        self.assertFalse(page.is_timetable)
+        self.assertEqual(page.courses(), [])
+
+    def test_empty_page(self):
+        page = FetchResult("")
+        self.assertEqual(page.courses(), [])
+        self.assertEqual(page.weeks(), {})
+
+
+@patch("src.wigor_api._save_debug_html")
+class TestTimetableTokenizedOnce(unittest.TestCase):
+    def setUp(self):
+        self.html = FIXTURE.read_text(encoding="utf-8")
+        patcher = patch.dict(os.environ, {"WIGOR_PARSE_CACHE": "0"})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _response(self):
+        return Mock(
+            status_code=200,
+            text=self.html,
+            content=self.html.encode("utf-8"),
+            encoding="utf-8",
+            url="https://wigor/edt",
+        )
+
+    def test_get_wigor_timetable_builds_a_single_tree(self, _):
+        real_init = BeautifulSoup.__init__
+        with patch("requests.Session.get", return_value=self._response()), patch.object(
+            BeautifulSoup, "__init__", autospec=True, side_effect=real_init
+        ) as init:
+            result = get_wigor_timetable("https://wigor/edt", "sid=a", all_weeks=True)
+
+        self.assertEqual(init.call_count, 1)
+        self.assertEqual(result["courses"], parse_wigor_html(self.html))
+        self.assertEqual(result["weeks"], parse_wigor_html_weeks(self.html))
+
+    def test_fetch_wigor_page_keeps_raw_body(self, _):
+        with patch("requests.Session.get", return_value=self._response()):
+            page = fetch_wigor_page("https://wigor/edt", "sid=a")
+
+        self.assertEqual(page.content, self.html.encode("utf-8"))
+        self.assertEqual(page.text, self.html)
+        self.assertEqual((page.status_code, page.url), (200, "https://wigor/edt"))
+
+
+if __name__ == "__main__":
+    unittest.main()
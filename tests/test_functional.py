@@ -173,7 +173,7 @@ class TestGuiModuleFunctional(unittest.TestCase):
             self.skipTest(f"Erreur GUI en environnement headless: {e}")
 
     @patch("src.gui.fetch_wigor_html")
-    @patch("src.gui.parse_wigor_html")
+    @patch("src.gui.parse_wigor_html_cached")
     def test_gui_functions_importable(self, mock_parse, mock_fetch):
         """Test que les fonctions GUI sont importables."""
         import os
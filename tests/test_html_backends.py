@@ -0,0 +1,108 @@
+"""
+Tests de parité des backends HTML (html.parser / lxml / html5lib).
+Chaque backend installé doit produire exactement les cours des snapshots.
+"""
+
+import json
+import os
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.html_backend import (
+    DEFAULT_HTML_PARSER,
+    HTML_PARSER_ENV_VAR,
+    SUPPORTED_HTML_PARSERS,
+    available_html_parsers,
+    benchmark_html_parsers,
+    resolve_html_parser,
+)
+from src.timetable_parser import parse_wigor_html
+from src.wigor_api import extract_page_title
+
+TESTS_DIR = Path(__file__).parent
+
+# Fixture HTML -> snapshot JSON attendu
+SNAPSHOT_CASES = {
+    "sample_timetable.html": "expected_timetable.json",
+    "wigor_multi_week.html": "wigor_multi_week.json",
+}
+
+
+def _load_case(fixture_name, snapshot_name):
+    """Charge une fixture HTML et son snapshot."""
+    with open(TESTS_DIR / "fixtures" / fixture_name, "r", encoding="utf-8") as f:
+        html = f.read()
+    with open(TESTS_DIR / "snapshots" / snapshot_name, "r", encoding="utf-8") as f:
+        expected = json.load(f)
+    return html, expected
+
+
+class TestBackendParity(unittest.TestCase):
+    """Parité des cours extraits entre backends."""
+
+    def test_every_backend_matches_snapshots(self):
+        """Chaque backend disponible retourne les cours du snapshot."""
+        for fixture_name, snapshot_name in SNAPSHOT_CASES.items():
+            html, expected = _load_case(fixture_name, snapshot_name)
+            for parser in available_html_parsers():
+                with self.subTest(fixture=fixture_name, parser=parser):
+                    self.assertEqual(parse_wigor_html(html, parser=parser), expected)
+
+    def test_every_backend_extracts_same_title(self):
+        """Le titre de page est identique pour tous les backends."""
+        html, _ = _load_case("wigor_multi_week.html", "wigor_multi_week.json")
+        for parser in available_html_parsers():
+            with self.subTest(parser=parser):
+                self.assertEqual(extract_page_title(html, parser=parser), "EDT - DUPONT Alice")
+
+    def test_report_parse_throughput(self):
+        """Rapport du débit de parsing par backend (pages/s)."""
+        html, _ = _load_case("wigor_multi_week.html", "wigor_multi_week.json")
+        results = benchmark_html_parsers(html, parse_wigor_html, repeat=2)
+
+        self.assertEqual(sorted(results), sorted(available_html_parsers()))
+        print("\nDébit de parsing par backend:")
+        for parser, stats in sorted(results.items(), key=lambda item: item[1]["seconds"]):
+            self.assertGreater(stats["pages_per_second"], 0)
+            print(f"  {parser:<12} {stats['seconds'] * 1000:7.1f} ms/page")
+
+
+class TestResolveHtmlParser(unittest.TestCase):
+    """Résolution du backend: argument, environnement, défaut."""
+
+    def test_default_backend(self):
+        with patch.dict(os.environ, {}, clear=False):
+            os.environ.pop(HTML_PARSER_ENV_VAR, None)
+            self.assertEqual(resolve_html_parser(), DEFAULT_HTML_PARSER)
+
+    def test_explicit_backend_wins(self):
+        with patch.dict(os.environ, {HTML_PARSER_ENV_VAR: "not-a-parser"}):
+            self.assertEqual(resolve_html_parser("html.parser"), "html.parser")
+
+    def test_environment_backend(self):
+        for parser in available_html_parsers():
+            with patch.dict(os.environ, {HTML_PARSER_ENV_VAR: parser}):
+                self.assertEqual(resolve_html_parser(), parser)
+
+    def test_unknown_environment_backend_falls_back(self):
+        with patch.dict(os.environ, {HTML_PARSER_ENV_VAR: "not-a-parser"}):
+            self.assertEqual(resolve_html_parser(), DEFAULT_HTML_PARSER)
+
+    def test_unknown_explicit_backend_raises(self):
+        with self.assertRaises(ValueError):
+            resolve_html_parser("not-a-parser")
+        with self.assertRaises(ValueError):
+            parse_wigor_html("<html></html>", parser="not-a-parser")
+
+    def test_missing_explicit_backend_raises(self):
+        with patch("src.html_backend.is_html_parser_available", return_value=False):
+            with self.assertRaises(ValueError):
+                resolve_html_parser(SUPPORTED_HTML_PARSERS[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
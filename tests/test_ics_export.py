@@ -0,0 +1,182 @@
+"""
+Tests de l'export iCalendar (flux d'événements, UID stables, format RFC 5545).
+"""
+
+import io
+import os
+import sys
+import tempfile
+import unittest
+from datetime import date, datetime, timezone
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src import cli
+from src.course import Course
+from src.timetable_parser import course_uid, iter_courses_ics, write_courses_ics
+from tests.synthetic import generate_wigor_page
+
+FIXTURE = Path(__file__).parent / "fixtures" / "wigor_multi_week.html"
+STAMP = datetime(2025, 10, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _export(courses, **kwargs):
+    return "".join(iter_courses_ics(courses, year=2025, dtstamp=STAMP, **kwargs))
+
+
+def _events(calendar):
+    """Découpe un calendrier déplié en dictionnaires de propriétés par événement."""
+    unfolded = calendar.replace("\r\n ", "")
+    events = []
+    for block in unfolded.split("BEGIN:VEVENT\r\n")[1:]:
+        body = block.split("END:VEVENT\r\n")[0]
+        events.append(dict(line.split(":", 1) for line in body.split("\r\n") if line))
+    return events
+
+
+class TestIcsExport(unittest.TestCase):
+    def setUp(self):
+        self.course = Course("DEVOPS", "DUPONT", "09:00 - 12:30", "B204", "Lundi 06 Octobre")
+
+    def test_timed_event(self):
+        calendar = _export([self.course])
+        self.assertTrue(calendar.startswith("BEGIN:VCALENDAR\r\nVERSION:2.0\r\n"))
+        self.assertTrue(calendar.endswith("END:VCALENDAR\r\n"))
+        self.assertIn("TZID:Europe/Paris\r\n", calendar)
+
+        (event,) = _events(calendar)
+        self.assertEqual(event["DTSTART;TZID=Europe/Paris"], "20251006T090000")
+        self.assertEqual(event["DTEND;TZID=Europe/Paris"], "20251006T123000")
+        self.assertEqual(event["DTSTAMP"], "20251001T120000Z")
+        self.assertEqual(event["SUMMARY"], "DEVOPS")
+        self.assertEqual(event["LOCATION"], "B204")
+        self.assertEqual(event["DESCRIPTION"], "Prof: DUPONT")
+
+    def test_uid_is_stable_and_ignores_room_and_teacher(self):
+        moved = Course("DEVOPS", "MARTIN", "09:00 - 12:30", "A101", "Lundi 06 Octobre")
+        first = _events(_export([self.course]))[0]["UID"]
+        self.assertEqual(first, _events(_export([self.course]))[0]["UID"])
+        self.assertEqual(first, _events(_export([moved]))[0]["UID"])
+        self.assertEqual(first, course_uid(datetime(2025, 10, 6), self.course))
+
+        other_day = Course("DEVOPS", "DUPONT", "09:00 - 12:30", "B204", "Mardi 07 Octobre")
+        self.assertNotEqual(first, _events(_export([other_day]))[0]["UID"])
+
+    def test_duplicate_courses_get_distinct_uids(self):
+        uids = [event["UID"] for event in _events(_export([self.course] * 3))]
+        self.assertEqual(len(set(uids)), 3)
+        self.assertEqual(uids[1], uids[0].replace("@", "-2@"))
+
+    def test_escaping_and_folding(self):
+        course = Course("A" * 90 + "; é, \\ x", "", "09:00 - 10:00", "", "Lundi 06 Octobre")
+        calendar = _export([course])
+        for line in calendar.split("\r\n"):
+            self.assertLessEqual(len(line.encode("utf-8")), 75)
+        self.assertEqual(_events(calendar)[0]["SUMMARY"], "A" * 90 + "\\; é\\, \\\\ x")
+        self.assertNotIn("LOCATION", _events(calendar)[0])
+
+    def test_all_day_fallback_and_unparsable_dates(self):
+        courses = [
+            Course("PROJET", "", "", "", "Mercredi 08 Octobre"),
+            Course("INCONNU", "", "09:00 - 10:00", "", "Jour inconnu"),
+        ]
+        with self.assertLogs("src.timetable_parser", level="WARNING"):
+            (event,) = _events(_export(courses))
+        self.assertEqual(event["DTSTART;VALUE=DATE"], "20251008")
+        self.assertEqual(event["DTEND;VALUE=DATE"], "20251009")
+
+    def test_dates_across_new_year(self):
+        courses = [
+            Course("DEVOPS", "", "09:00 - 10:00", "", "Lundi 29 Décembre"),
+            Course("DEVOPS", "", "09:00 - 10:00", "", "Jeudi 1 Janvier"),
+        ]
+        events = _events(_export(courses))
+        self.assertEqual(
+            [event["DTSTART;TZID=Europe/Paris"] for event in events],
+            ["20251229T090000", "20260101T090000"],
+        )
+        self.assertEqual(events[1]["UID"], course_uid(datetime(2026, 1, 1), courses[1]))
+
+        # Avec une référence explicite, l'année du premier cours n'est plus supposée
+        calendar = "".join(
+            iter_courses_ics(courses[1:], dtstamp=STAMP, reference=datetime(2025, 12, 22))
+        )
+        self.assertEqual(_events(calendar)[0]["DTSTART;TZID=Europe/Paris"], "20260101T090000")
+
+    def test_events_are_streamed(self):
+        consumed = []
+
+        def courses():
+            for day in ("Lundi 06 Octobre", "Mardi 07 Octobre"):
+                consumed.append(day)
+                yield Course("DEVOPS", "", "09:00 - 10:00", "", day)
+
+        lines = iter_courses_ics(courses(), year=2025, dtstamp=STAMP)
+        while next(lines) != "BEGIN:VEVENT\r\n":
+            pass
+        self.assertEqual(consumed, ["Lundi 06 Octobre"])
+
+        output = io.StringIO(newline="")
+        self.assertEqual(write_courses_ics(courses(), output, year=2025), 2)
+        self.assertEqual(output.getvalue().count("END:VEVENT\r\n"), 2)
+
+
+class TestIcsCli(unittest.TestCase):
+    def test_export_saved_page_to_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            target = Path(tmp) / "edt.ics"
+            argv = ["wigor-cli", "--export-ics", str(FIXTURE), "-o", str(target), "--year", "2025"]
+            with patch.object(sys, "argv", argv), patch("sys.stderr", new_callable=io.StringIO):
+                self.assertEqual(cli.main(), 0)
+            data = target.read_bytes()
+
+        self.assertTrue(data.startswith(b"BEGIN:VCALENDAR\r\n"))
+        self.assertNotIn(b"\r\r\n", data)
+        events = _events(data.decode("utf-8"))
+        self.assertGreater(len(events), 5)
+        self.assertEqual(len({event["UID"] for event in events}), len(events))
+
+    def _export_page(self, html, *args):
+        with tempfile.TemporaryDirectory() as tmp:
+            page = Path(tmp) / "edt.html"
+            page.write_text(html, encoding="utf-8")
+            target = Path(tmp) / "edt.ics"
+            argv = ["wigor-cli", "--export-ics", str(page), "-o", str(target), *args]
+            with patch.object(sys, "argv", argv), patch("sys.stderr", new_callable=io.StringIO):
+                code = cli.main()
+            return code, target.read_bytes().decode("utf-8")
+
+    def test_page_across_new_year_keeps_exact_dates(self):
+        page = generate_wigor_page(3, 5, 1, start=date(2025, 12, 22))
+        code, calendar = self._export_page(page.html, "--year", "2025")
+
+        self.assertEqual(code, 0)
+        events = _events(calendar)
+        starts = [event["DTSTART;TZID=Europe/Paris"][:8] for event in events]
+        self.assertEqual(starts[0], "20251222")
+        self.assertIn("20260102", starts)
+        self.assertEqual(starts[-1], "20260109")
+        self.assertFalse(any(start.startswith("2025010") for start in starts))
+
+        # UID stables: calculés sur la date exacte de chaque cours
+        by_start = {event["DTSTART;TZID=Europe/Paris"][:8]: event for event in events}
+        january = next(course for course in page.all_courses if course["jour"] == "Jeudi 1 Janvier")
+        self.assertEqual(by_start["20260101"]["UID"], course_uid(datetime(2026, 1, 1), january))
+
+    def test_page_without_courses_exports_an_empty_calendar(self):
+        code, calendar = self._export_page("<html><body></body></html>")
+        self.assertEqual(code, 0)
+        self.assertTrue(calendar.startswith("BEGIN:VCALENDAR\r\n"))
+        self.assertTrue(calendar.endswith("END:VCALENDAR\r\n"))
+        self.assertEqual(_events(calendar), [])
+
+    def test_missing_file(self):
+        argv = ["wigor-cli", "--export-ics", "absent.html"]
+        with patch.object(sys, "argv", argv), patch("sys.stderr", new_callable=io.StringIO):
+            self.assertEqual(cli.main(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
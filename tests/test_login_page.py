@@ -0,0 +1,150 @@
+"""
+Tests de l'analyse des pages du parcours de connexion CAS.
+"""
+
+import os
+import sys
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+from urllib.parse import parse_qs
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.login_page import LoginPage
+from src.wigor_api import login_with_credentials
+
+CAS_FORM = (
+    '<html><body><form id="search" action="/search"><input name="q"></form>'
+    '<form action="/cas/login?service=edt" method="post">'
+    '<input type="text" name="username"><input type="password" name="password">'
+    '<input type="hidden" name="lt" value="LT-1"><input type="hidden" name="execution" value="e1s1">'
+    '<input type="checkbox" name="remember" value="on"></form></body></html>'
+)
+
+
+class TestLoginPage(unittest.TestCase):
+    def test_login_form(self):
+        page = LoginPage(CAS_FORM, "https://cas.example/cas/login")
+
+        self.assertTrue(page.has_login_form)
+        self.assertEqual(page.login_form.get("action"), "/cas/login?service=edt")
+        self.assertEqual(page.action_url, "https://cas.example/cas/login?service=edt")
+        self.assertEqual(page.hidden_fields, {"lt": "LT-1", "execution": "e1s1"})
+        self.assertEqual(
+            page.form_data("alice", "secret"),
+            {
+                "username": "alice",
+                "password": "secret",
+                "lt": "LT-1",
+                "execution": "e1s1",
+                "_eventId": "submit",
+            },
+        )
+
+    def test_cas_fields_outside_the_form(self):
+        html = (
+            '<form><input name="user"><input name="pwd"></form>'
+            '<input name="execution" value="outside"><input name="lt" value="lt-out">'
+        )
+        data = LoginPage(html, "https://cas.example/").form_data("u", "p")
+        self.assertEqual((data["execution"], data["lt"]), ("outside", "lt-out"))
+
+    def test_redirect_targets(self):
+        meta = LoginPage(
+            '<meta http-equiv="refresh" content="0; url=/next">'
+            '<script>window.location = "/js"</script>',
+            "https://wigor.example/a/b",
+        )
+        self.assertEqual(meta.meta_refresh_url, "https://wigor.example/next")
+        self.assertEqual(meta.js_redirect_url, "https://wigor.example/js")
+        self.assertEqual(meta.redirect_url, "https://wigor.example/next")
+
+        script = LoginPage('<script>location.href = "step2"</script>', "https://x.example/a/b")
+        self.assertEqual(script.redirect_url, "https://x.example/a/step2")
+
+    def test_cas_login_url(self):
+        link = LoginPage(
+            '<a href="/about">?</a><a href="/cas/login">Login</a>', "https://x.example"
+        )
+        self.assertEqual(link.cas_login_url, "https://x.example/cas/login")
+
+        script = LoginPage(
+            '<script>window.location = "https://cas.example/login";</script>', "https://x.example"
+        )
+        self.assertEqual(script.cas_login_url, "https://cas.example/login")
+
+    def test_page_without_login_elements(self):
+        page = LoginPage("", "https://x.example/page")
+        self.assertFalse(page.has_login_form)
+        self.assertEqual(page.action_url, "https://x.example/page")
+        self.assertEqual(page.form_data("u", "p"), {})
+        self.assertIsNone(page.redirect_url)
+        self.assertIsNone(page.cas_login_url)
+
+
+class _CasHandler(BaseHTTPRequestHandler):
+    """CAS de test: / -> lien CAS, formulaire, POST -> meta refresh -> JS -> EDT."""
+
+    PAGES = {
+        "/": '<html><body><a href="/cas/login">Connexion</a></body></html>',
+        "/cas/login": CAS_FORM,
+        "/relay": '<html><head><meta http-equiv="refresh" content="0; url=/relay2"></head></html>',
+        "/relay2": '<html><script>window.location.href = "/edt";</script></html>',
+        "/edt": "<html><head><title>EDT - Test</title></head><body></body></html>",
+    }
+
+    def do_GET(self):
+        self._send(self.PAGES.get(self.path.split("?")[0], "<html></html>"))
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.server.posted = parse_qs(self.rfile.read(length).decode("utf-8"))
+        self.send_response(302)
+        self.send_header("Location", "/relay")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _send(self, body):
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@patch("src.wigor_api._save_debug_html")
+class TestLoginFlowParsesEachResponseOnce(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _CasHandler)
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}/"
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def test_login_flow(self, _):
+        real_init = BeautifulSoup.__init__
+        with patch.object(BeautifulSoup, "__init__", autospec=True, side_effect=real_init) as init:
+            result = login_with_credentials("alice", "secret", self.url)
+
+        self.assertTrue(result["success"])
+        self.assertEqual(self.server.posted["username"], ["alice"])
+        self.assertEqual(self.server.posted["execution"], ["e1s1"])
+        # Réponses: accueil, formulaire CAS, meta refresh, redirection JS, EDT
+        self.assertEqual(init.call_count, 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
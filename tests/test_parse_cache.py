@@ -0,0 +1,169 @@
+"""
+Tests du cache disque des résultats de parsing.
+"""
+
+import os
+import sys
+import tempfile
+import time
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src import parse_cache
+from src.parse_cache import (
+    CACHE_DIR_ENV_VAR,
+    CACHE_ENABLED_ENV_VAR,
+    ParseCache,
+    get_parse_cache,
+    parse_wigor_html_cached,
+    parse_wigor_html_weeks_cached,
+)
+from src.timetable_parser import parse_wigor_html, parse_wigor_html_weeks
+
+FIXTURE = Path(__file__).parent / "fixtures" / "wigor_multi_week.html"
+
+
+def _parse_in_process(args):
+    """Parse une page avec un cache partagé (exécuté dans un processus fils)."""
+    directory, html = args
+    cache = ParseCache(directory, max_bytes=64 * 1024)
+    return [dict(course) for course in parse_wigor_html_cached(html, cache=cache)]
+
+
+class TestParseCache(unittest.TestCase):
+    """Cache indexé par contenu HTML et version du parser."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = ParseCache(self.tmp.name)
+        with open(FIXTURE, "r", encoding="utf-8") as f:
+            self.html = f.read()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_hit_returns_same_courses_without_beautifulsoup(self):
+        expected = parse_wigor_html(self.html)
+        self.assertEqual(parse_wigor_html_cached(self.html, cache=self.cache), expected)
+
+        with patch("src.timetable_parser.make_soup", side_effect=AssertionError("parsing")):
+            courses = parse_wigor_html_cached(self.html, cache=self.cache)
+
+        self.assertEqual(courses, expected)
+        self.assertEqual(courses[0].debut, expected[0].debut)
+        self.assertEqual(self.cache.stats()["hits"], 1)
+        self.assertEqual(self.cache.stats()["entries"], 1)
+
+    def test_weeks_are_cached_separately(self):
+        parse_wigor_html_cached(self.html, cache=self.cache)
+        weeks = parse_wigor_html_weeks_cached(self.html, cache=self.cache)
+        self.assertEqual(self.cache.stats()["entries"], 2)
+
+        with patch("src.timetable_parser.make_soup", side_effect=AssertionError("parsing")):
+            self.assertEqual(parse_wigor_html_weeks_cached(self.html, cache=self.cache), weeks)
+        self.assertEqual(weeks, parse_wigor_html_weeks(self.html))
+
+    def test_key_depends_on_html_parser_and_code_version(self):
+        key = self.cache.key(self.html, "html.parser")
+        self.assertEqual(key, self.cache.key(self.html, "html.parser"))
+        self.assertNotEqual(key, self.cache.key(self.html + " ", "html.parser"))
+        self.assertNotEqual(key, self.cache.key(self.html, "lxml"))
+        self.assertNotEqual(key, self.cache.key(self.html, "html.parser", kind="weeks"))
+
+        # Une modification du code du parser invalide les entrées existantes
+        with patch("src.parse_cache.parser_version", return_value="autre-version"):
+            self.assertNotEqual(key, self.cache.key(self.html, "html.parser"))
+
+    def test_lru_eviction_keeps_recently_used_entries(self):
+        cache = ParseCache(self.tmp.name, max_bytes=2500)
+        payload = ["x" * 1000]
+        for name in ("a", "b"):
+            cache.put(name, payload)
+        # Rendre "a" plus récent que "b"
+        old = time.time() - 100
+        os.utime(cache._path("a"), (old, old))
+        os.utime(cache._path("b"), (old - 10, old - 10))
+        cache.get("a")
+
+        cache.put("c", payload)
+
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("c"))
+        self.assertLessEqual(cache.stats()["bytes"], 2500)
+
+    def test_failed_parse_is_not_cached(self):
+        # parse_wigor_html retourne [] quand le parsing échoue
+        with patch("src.timetable_parser._scan_document", side_effect=RuntimeError("boom")):
+            self.assertEqual(parse_wigor_html_cached(self.html, cache=self.cache), [])
+            self.assertEqual(parse_wigor_html_weeks_cached(self.html, cache=self.cache), {})
+        self.assertEqual(self.cache.stats()["entries"], 0)
+
+        self.assertEqual(
+            parse_wigor_html_cached(self.html, cache=self.cache), parse_wigor_html(self.html)
+        )
+
+    def test_writes_do_not_rescan_the_directory(self):
+        with patch.object(self.cache, "_entries", wraps=self.cache._entries) as entries:
+            for i in range(10):
+                self.cache.put(f"k{i}", ["x" * 100])
+        self.assertEqual(entries.call_count, 1)
+        self.assertEqual(self.cache.stats()["entries"], 10)
+
+    def test_corrupted_entry_is_a_miss(self):
+        self.cache.put("k", [1, 2])
+        self.cache._path("k").write_text("{pas du json", encoding="utf-8")
+
+        self.assertIsNone(self.cache.get("k"))
+        self.assertFalse(self.cache._path("k").exists())
+
+    def test_default_cache_follows_environment(self):
+        with patch.dict(os.environ, {CACHE_DIR_ENV_VAR: self.tmp.name}):
+            os.environ.pop(CACHE_ENABLED_ENV_VAR, None)
+            self.assertEqual(get_parse_cache().directory, Path(self.tmp.name))
+            self.assertIs(get_parse_cache(), get_parse_cache())
+
+        with patch.dict(os.environ, {CACHE_ENABLED_ENV_VAR: "0"}):
+            self.assertIsNone(get_parse_cache())
+
+    def test_unwritable_directory_still_parses(self):
+        blocker = Path(self.tmp.name) / "fichier"
+        blocker.write_text("", encoding="utf-8")
+        cache = ParseCache(blocker / "cache")
+
+        self.assertEqual(
+            parse_wigor_html_cached(self.html, cache=cache), parse_wigor_html(self.html)
+        )
+
+    def test_concurrent_processes(self):
+        """Plusieurs processus partagent le même répertoire sans conflit."""
+        pages = [self.html.replace("ANGLAIS", f"ANGLAIS {i}") for i in range(6)] * 3
+        expected = [[dict(c) for c in parse_wigor_html(page)] for page in pages]
+
+        with ProcessPoolExecutor(max_workers=3) as pool:
+            results = list(pool.map(_parse_in_process, [(self.tmp.name, p) for p in pages]))
+
+        self.assertEqual(results, expected)
+        leftovers = [p for p in os.listdir(self.tmp.name) if p.endswith(".tmp")]
+        self.assertEqual(leftovers, [])
+        self.assertLessEqual(ParseCache(self.tmp.name).stats()["bytes"], 64 * 1024)
+
+    def test_parser_version_is_stable(self):
+        self.assertEqual(parse_cache.parser_version(), parse_cache.parser_version())
+        self.assertEqual(len(parse_cache.parser_version()), 32)
+
+    def test_parser_version_covers_html_backend_and_fetch_result(self):
+        parse_cache.parser_version.cache_clear()
+        self.addCleanup(parse_cache.parser_version.cache_clear)
+        with patch("src.parse_cache._module_code", return_value=b"") as module_code:
+            parse_cache.parser_version()
+        names = {call.args[0].__name__ for call in module_code.call_args_list}
+        self.assertLessEqual({"src.html_backend", "src.fetch_result"}, names)
+
+
+if __name__ == "__main__":
+    unittest.main()
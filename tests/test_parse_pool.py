@@ -0,0 +1,141 @@
+"""
+Tests du parsing dans un pool de processus (résultats identiques au parsing
+direct, enregistrements compacts, intégration threads et asyncio).
+"""
+
+import asyncio
+import io
+import json
+import os
+import pickle
+import sys
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src import cli
+from src.async_fetch import fetch_timetables
+from src.parse_pool import ParsePool, _parse_records
+from src.timetable_parser import parse_wigor_html, parse_wigor_html_weeks
+from tests.synthetic import generate_wigor_page
+
+FIXTURE = Path(__file__).parent / "fixtures" / "wigor_multi_week.html"
+
+
+class TestParsePool(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.pool = ParsePool(workers=2, use_cache=False).warm()
+        cls.pages = [generate_wigor_page(3, 5, 3, seed=seed).html for seed in range(4)]
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.close()
+
+    def test_results_match_direct_parsing(self):
+        for html in self.pages:
+            content = html.encode("utf-8")
+            self.assertEqual(self.pool.parse(content), parse_wigor_html(html))
+            self.assertEqual(self.pool.parse_weeks(content), parse_wigor_html_weeks(html))
+
+    def test_map_keeps_page_order(self):
+        results = list(self.pool.map(html.encode("utf-8") for html in self.pages))
+        self.assertEqual(results, [parse_wigor_html(html) for html in self.pages])
+
+    def test_declared_encoding_is_used(self):
+        html = FIXTURE.read_text(encoding="utf-8")
+        courses = self.pool.parse(html.encode("latin-1", "replace"), "latin-1")
+        self.assertEqual(
+            [course["titre"] for course in courses],
+            [course["titre"] for course in parse_wigor_html(html)],
+        )
+
+    def test_async_parsing(self):
+        content = self.pages[0].encode("utf-8")
+
+        async def run():
+            return await asyncio.gather(*(self.pool.parse_async(content) for _ in range(3)))
+
+        results = asyncio.run(run())
+        self.assertTrue(all(courses == parse_wigor_html(self.pages[0]) for courses, _ in results))
+
+    def test_records_are_compact(self):
+        with patch.dict(os.environ, {"WIGOR_PARSE_CACHE": "0"}):
+            courses, weeks = _parse_records(self.pages[0].encode("utf-8"), None, None, False)
+        self.assertIsNone(weeks)
+        self.assertTrue(all(type(record) is tuple and len(record) == 5 for record in courses))
+        # Tuples de chaînes: plus légers à sérialiser que les objets Course
+        self.assertLess(
+            len(pickle.dumps(courses)), len(pickle.dumps(parse_wigor_html(self.pages[0])))
+        )
+
+    def test_invalid_pool_size(self):
+        with self.assertRaises(ValueError):
+            ParsePool(workers=-1)
+
+
+class _WigorHandler(BaseHTTPRequestHandler):
+    """Wigor de test: sert la page d'exemple."""
+
+    def do_GET(self):
+        data = FIXTURE.read_bytes()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@patch("src.wigor_api._save_debug_html")
+class TestFetchThenParseInPool(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _WigorHandler)
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}/edt"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.pool = ParsePool(workers=2, use_cache=False).warm()
+        cls.expected = parse_wigor_html(FIXTURE.read_text(encoding="utf-8"))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.close()
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def test_get_timetable(self, _):
+        result = self.pool.get_timetable(self.url, "sid=a", all_weeks=True)
+        self.assertEqual(result["courses"], self.expected)
+        self.assertIn("EDT", result["html"])
+        self.assertEqual(sum(map(len, result["weeks"].values())), 25)
+
+    def test_async_fetcher_with_pool(self, _):
+        results = fetch_timetables([(self.url, f"sid={i}") for i in range(3)], parse_pool=self.pool)
+        self.assertTrue(all(result["courses"] == self.expected for result in results))
+
+    def test_batch_cli_with_parse_processes(self, _):
+        with tempfile.TemporaryDirectory() as tmp:
+            manifest = Path(tmp) / "groups.json"
+            manifest.write_text(
+                json.dumps({name: {"url": self.url, "cookie": f"sid={name}"} for name in "abc"})
+            )
+            target = Path(tmp) / "edt.jsonl"
+            argv = ["wigor-cli", "--batch", str(manifest), "-o", str(target)]
+            argv += ["--parse-processes", "2"]
+            with patch.object(sys, "argv", argv), patch("sys.stderr", new_callable=io.StringIO):
+                self.assertEqual(cli.main(), 0)
+            records = [json.loads(line) for line in target.read_text().splitlines()]
+
+        self.assertEqual(len(records), 3)
+        self.assertTrue(all(len(record["courses"]) == len(self.expected) for record in records))
+
+
+if __name__ == "__main__":
+    unittest.main()
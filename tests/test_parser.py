@@ -5,19 +5,31 @@ Tests unitaires pour les fonctions de timetable_parser.py et wigor_api.py
 import os
 import sys
 import unittest
+from datetime import date
 from unittest.mock import Mock, patch
 
 # Ajouter le chemin du module parent pour les imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
+from src.fetch_result import FetchResult
 from src.timetable_parser import (
+    NUMPY_AVAILABLE,
     _closest_day,
     _extract_course_info,
     _extract_left_position,
     _map_days,
+    _parse_date_from_header,
+    _scan_document,
+    assign_days_to_positions,
+    clear_date_cache,
+    get_date_cache_stats,
+    iso_week_key,
+    iso_week_start,
     parse_wigor_html,
+    parse_wigor_html_weeks,
 )
-from src.wigor_api import fetch_wigor_html, parse_cookie_header
+from src.wigor_api import fetch_wigor_html, get_wigor_timetable, parse_cookie_header
+from tests.synthetic import generate_wigor_page
 
 
 class TestTimetableParser(unittest.TestCase):
@@ -190,6 +202,50 @@ class TestTimetableParser(unittest.TestCase):
         self.assertEqual(days[1][0], 240.0)
         self.assertEqual(days[2][0], 360.0)
 
+    def test_scan_document_single_pass(self):
+        """Test du parcours unique : jours, cellules et cours collectés ensemble."""
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(self.sample_html, "html.parser")
+        scan = _scan_document(soup)
+
+        # Un seul div.Jour, dont le premier td.TCJour est Lundi
+        self.assertEqual(len(scan.day_columns), 1)
+        self.assertEqual(scan.day_columns[0][1], "Lundi 14 Octobre")
+
+        # Tous les td.TCJour avec leur style
+        self.assertEqual(
+            [text for text, _ in scan.day_cells],
+            ["Lundi 14 Octobre", "Mardi 15 Octobre", "Mercredi 16 Octobre"],
+        )
+        self.assertIn("left: 240px", scan.day_cells[1][1])
+
+        # Les trois div.Case avec leurs cellules
+        self.assertEqual(len(scan.course_blocks), 3)
+        style, cells = scan.course_blocks[0]
+        self.assertIn("left: 125px", style)
+        self.assertEqual(cells["titre"], "Mathématiques Avancées")
+        self.assertEqual(cells["horaire"], "08:00 - 10:00")
+        self.assertEqual(cells["salle"], "Salle A101")
+        self.assertEqual(cells["prof"], "M. Dupont - Groupe A")
+
+    def test_scan_document_nested_case_keeps_first_cells(self):
+        """Test que chaque div.Case garde le premier td de chaque type de son sous-arbre."""
+        from bs4 import BeautifulSoup
+
+        html = """
+        <div class="Case"><table><tr><td class="TCase">Externe</td></tr></table>
+            <div class="Case"><table><tr>
+                <td class="TCase">Interne</td><td class="TCSalle">B12</td>
+            </tr></table></div>
+        </div>
+        """
+        scan = _scan_document(BeautifulSoup(html, "html.parser"))
+
+        self.assertEqual(len(scan.course_blocks), 2)
+        self.assertEqual(scan.course_blocks[0][1], {"titre": "Externe", "salle": "B12"})
+        self.assertEqual(scan.course_blocks[1][1], {"titre": "Interne", "salle": "B12"})
+
     def test_extract_left_position(self):
         """Test de l'extraction de position left."""
         from bs4 import BeautifulSoup
@@ -261,6 +317,166 @@ class TestTimetableParser(unittest.TestCase):
         self.assertEqual(course_info["prof"], "Prof Test")
 
 
+class TestDateHeaderCache(unittest.TestCase):
+    """Tests du cache de résolution des en-têtes de jours."""
+
+    def setUp(self):
+        clear_date_cache()
+
+    def test_each_header_resolved_once(self):
+        """Un en-tête répété n'est analysé qu'une fois."""
+        for _ in range(5):
+            date = _parse_date_from_header("Lundi 13 Octobre", 2025)
+        self.assertEqual((date.year, date.month, date.day), (2025, 10, 13))
+
+        stats = get_date_cache_stats()
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["hits"], 4)
+        self.assertEqual(stats["size"], 1)
+
+    def test_year_is_part_of_the_key(self):
+        """La même date résolue pour deux années donne deux entrées."""
+        self.assertEqual(_parse_date_from_header("Mardi 14 Oct", 2024).year, 2024)
+        self.assertEqual(_parse_date_from_header("Mardi 14 Oct", 2025).year, 2025)
+        self.assertEqual(get_date_cache_stats()["misses"], 2)
+
+    def test_month_prefix_lookup(self):
+        """Les mois sont reconnus par leurs 3 premières lettres."""
+        self.assertEqual(_parse_date_from_header("3 déc.", 2025).month, 12)
+        self.assertEqual(_parse_date_from_header("Jeudi 5 Fevrier", 2025), None)
+        self.assertIsNone(_parse_date_from_header("Vendredi 31 Février", 2025))
+        self.assertIsNone(_parse_date_from_header(None))
+
+    def test_parse_page_resolves_distinct_headers_once(self):
+        """Une page complète ne résout chaque en-tête distinct qu'une seule fois."""
+        fixture = os.path.join(os.path.dirname(__file__), "fixtures", "wigor_multi_week.html")
+        with open(fixture, "r", encoding="utf-8") as f:
+            html = f.read()
+
+        courses = parse_wigor_html(html)
+
+        # 3 semaines de 5 jours dans la page: 15 en-têtes distincts
+        self.assertEqual(len(courses), 9)
+        stats = get_date_cache_stats()
+        self.assertEqual(stats["misses"], 15)
+        self.assertGreater(stats["hits"], stats["misses"])
+
+
+class TestDayAssignment(unittest.TestCase):
+    """Tests de l'attribution des jours par bisection et par lot."""
+
+    @staticmethod
+    def linear_closest_day(left_position, days_map):
+        """Référence: l'ancienne recherche linéaire."""
+        return min(days_map, key=lambda day: abs(day[0] - left_position))[1]
+
+    def setUp(self):
+        import random
+
+        rng = random.Random(42)
+        # Colonnes sur 3 semaines, avec doublons de position et ordre mélangé
+        self.days_map = [(round(i * 19.9 + 0.12, 2), f"Jour {i}") for i in range(15)]
+        self.days_map += [(self.days_map[3][0], "Doublon 3"), (200, "Entier 200")]
+        rng.shuffle(self.days_map)
+        self.positions = [round(rng.uniform(-20, 320), 2) for _ in range(500)]
+        # Positions exactement à mi-chemin entre deux colonnes (égalités)
+        self.positions += [10.07, 50.0, 100.0, 199.0, 300.0]
+
+    def test_closest_day_tie_keeps_first_day(self):
+        """À distance égale, le premier jour de days_map l'emporte."""
+        self.assertEqual(_closest_day(150.0, [(100.0, "Lundi"), (200.0, "Mardi")]), "Lundi")
+        self.assertEqual(_closest_day(150.0, [(200.0, "Mardi"), (100.0, "Lundi")]), "Mardi")
+        self.assertEqual(_closest_day(100.0, [(100.0, "A"), (100.0, "B")]), "A")
+
+    def test_closest_day_matches_linear_search(self):
+        for position in self.positions:
+            self.assertEqual(
+                _closest_day(position, self.days_map),
+                self.linear_closest_day(position, self.days_map),
+            )
+
+    def test_batch_matches_linear_search(self):
+        expected = [self.linear_closest_day(p, self.days_map) for p in self.positions]
+        self.assertEqual(
+            assign_days_to_positions(self.positions, self.days_map, use_numpy=False), expected
+        )
+
+    @unittest.skipUnless(NUMPY_AVAILABLE, "NumPy non installé")
+    def test_numpy_batch_matches_linear_search(self):
+        expected = [self.linear_closest_day(p, self.days_map) for p in self.positions]
+        self.assertEqual(
+            assign_days_to_positions(self.positions, self.days_map, use_numpy=True), expected
+        )
+
+    def test_batch_without_days(self):
+        self.assertEqual(assign_days_to_positions([1.0, 2.0], []), ["Jour inconnu"] * 2)
+        self.assertEqual(assign_days_to_positions([], self.days_map), [])
+
+
+class TestMultiWeekExtraction(unittest.TestCase):
+    """Tests du mode multi-semaines (toutes les semaines de la page)."""
+
+    def setUp(self):
+        fixture = os.path.join(os.path.dirname(__file__), "fixtures", "wigor_multi_week.html")
+        with open(fixture, "r", encoding="utf-8") as f:
+            self.html = f.read()
+
+    def test_every_week_of_the_page_is_kept(self):
+        weeks = parse_wigor_html_weeks(self.html, year=2025)
+
+        self.assertEqual(list(weeks), ["2025-W41", "2025-W42", "2025-W43"])
+        self.assertEqual([len(courses) for courses in weeks.values()], [8, 9, 8])
+        self.assertEqual(weeks["2025-W41"][0]["jour"], "Lundi 6 Octobre")
+        self.assertEqual(weeks["2025-W43"][-1]["jour"], "Vendredi 24 Octobre")
+
+    def test_main_week_matches_single_week_mode(self):
+        """La semaine principale est identique au mode historique."""
+        weeks = parse_wigor_html_weeks(self.html)
+        main_week = parse_wigor_html(self.html)
+
+        self.assertIn(main_week, list(weeks.values()))
+
+    def test_weeks_across_new_year(self):
+        """Les jours de janvier d'une page de décembre passent à l'année suivante."""
+        page = generate_wigor_page(3, 5, 1, start=date(2025, 12, 15))
+        weeks = parse_wigor_html_weeks(page.html, year=2025)
+
+        self.assertEqual(list(weeks), ["2025-W51", "2025-W52", "2026-W01"])
+        self.assertEqual(
+            [course["jour"] for course in weeks["2026-W01"]],
+            [
+                "Lundi 29 Décembre",
+                "Mardi 30 Décembre",
+                "Mercredi 31 Décembre",
+                "Jeudi 1 Janvier",
+                "Vendredi 2 Janvier",
+            ],
+        )
+
+    def test_iso_week_key(self):
+        from datetime import datetime
+
+        self.assertEqual(iso_week_key(datetime(2025, 10, 13)), "2025-W42")
+        # Le 29 décembre 2025 appartient à la semaine 1 de 2026
+        self.assertEqual(iso_week_key(datetime(2025, 12, 29)), "2026-W01")
+        self.assertEqual(iso_week_start("2026-W01"), datetime(2025, 12, 29))
+
+    def test_empty_html(self):
+        self.assertEqual(parse_wigor_html_weeks(""), {})
+        self.assertEqual(parse_wigor_html_weeks("<html><body></body></html>"), {})
+
+    @patch("src.wigor_api.fetch_wigor_page")
+    def test_get_wigor_timetable_all_weeks(self, mock_fetch):
+        mock_fetch.side_effect = lambda *args, **kwargs: FetchResult(self.html)
+
+        result = get_wigor_timetable("https://example.com/edt", all_weeks=True)
+        self.assertEqual(len(result["weeks"]), 3)
+        self.assertIn(result["courses"], list(result["weeks"].values()))
+
+        # Mode par défaut inchangé
+        self.assertNotIn("weeks", get_wigor_timetable("https://example.com/edt"))
+
+
 class TestWigorAPI(unittest.TestCase):
     """Tests pour l'API Wigor."""
 
@@ -0,0 +1,199 @@
+"""
+Tests du cache de réponses HTTP (requêtes conditionnelles).
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.response_cache import (
+    RESPONSE_CACHE_DIR_ENV_VAR,
+    RESPONSE_CACHE_ENV_VAR,
+    CachedResponse,
+    ResponseCache,
+    get_response_cache,
+)
+from src.wigor_api import fetch_wigor_html
+
+LAST_MODIFIED = "Mon, 13 Oct 2025 08:00:00 GMT"
+
+
+class _ValidatorHandler(BaseHTTPRequestHandler):
+    """Serveur de test: /etag, /lastmod (validateurs), /plain (sans validateur), /304."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append((self.path, dict(self.headers)))
+        body = server.page.encode("utf-8")
+        path = self.path.split("?")[0]
+
+        not_modified = (
+            path == "/304"
+            or (path == "/etag" and self.headers.get("If-None-Match") == server.etag)
+            or (path == "/lastmod" and self.headers.get("If-Modified-Since") == LAST_MODIFIED)
+        )
+        if not_modified:
+            self.send_response(304)
+            if path == "/etag":
+                self.send_header("ETag", server.etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        if path == "/etag":
+            self.send_header("ETag", server.etag)
+        elif path == "/lastmod":
+            self.send_header("Last-Modified", LAST_MODIFIED)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@patch("src.wigor_api._save_debug_html")
+class TestConditionalFetch(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _ValidatorHandler)
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.cache = ResponseCache(self.tmp.name, ttl=60)
+        self.server.requests = []
+        self.server.page = "<html><head><title>EDT - v1</title></head></html>"
+        self.server.etag = '"v1"'
+
+    def test_etag_revalidation_serves_body_from_disk(self, _):
+        url = f"{self.base}/etag"
+        first = fetch_wigor_html(url, "sid=a", response_cache=self.cache)
+        second = fetch_wigor_html(url, "sid=a", response_cache=self.cache)
+
+        self.assertEqual(first, second)
+        self.assertNotIn("If-None-Match", self.server.requests[0][1])
+        self.assertEqual(self.server.requests[1][1]["If-None-Match"], '"v1"')
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["revalidations"], stats["misses"]), (0, 1, 1))
+        self.assertEqual(stats["entries"], 1)
+
+    def test_changed_page_is_downloaded_again(self, _):
+        url = f"{self.base}/etag"
+        fetch_wigor_html(url, "sid=a", response_cache=self.cache)
+        self.server.page = "<html><head><title>EDT - v2</title></head></html>"
+        self.server.etag = '"v2"'
+
+        self.assertIn("v2", fetch_wigor_html(url, "sid=a", response_cache=self.cache))
+        self.assertEqual(self.cache.stats()["misses"], 2)
+        # Le nouvel ETag est utilisé à la revalidation suivante
+        fetch_wigor_html(url, "sid=a", response_cache=self.cache)
+        self.assertEqual(self.server.requests[-1][1]["If-None-Match"], '"v2"')
+        self.assertEqual(self.cache.stats()["revalidations"], 1)
+
+    def test_last_modified_revalidation(self, _):
+        url = f"{self.base}/lastmod"
+        fetch_wigor_html(url, "sid=a", response_cache=self.cache)
+        html = fetch_wigor_html(url, "sid=a", response_cache=self.cache)
+
+        self.assertIn("EDT - v1", html)
+        self.assertEqual(self.server.requests[1][1]["If-Modified-Since"], LAST_MODIFIED)
+        self.assertEqual(self.cache.stats()["revalidations"], 1)
+
+    def test_ttl_fallback_without_validators(self, _):
+        url = f"{self.base}/plain"
+        fetch_wigor_html(url, "sid=a", response_cache=self.cache)
+        fetch_wigor_html(url, "sid=a", response_cache=self.cache)
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertEqual(self.cache.stats()["hits"], 1)
+
+        # Au-delà du TTL, la page est téléchargée à nouveau
+        with patch("src.response_cache.time.time", return_value=time.time() + 120):
+            fetch_wigor_html(url, "sid=a", response_cache=self.cache)
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertEqual(self.cache.stats()["misses"], 2)
+
+    def test_pages_are_keyed_by_cookie_identity(self, _):
+        url = f"{self.base}/plain"
+        fetch_wigor_html(url, "sid=a", response_cache=self.cache)
+        fetch_wigor_html(url, "sid=b", response_cache=self.cache)
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertEqual(self.cache.stats()["misses"], 2)
+
+    def test_login_pages_are_not_cached(self, _):
+        self.server.page = (
+            '<html><body><form action="/cas/login" method="post">'
+            '<input type="password" name="password"></form></body></html>'
+        )
+        url = f"{self.base}/plain"
+        fetch_wigor_html(url, "sid=a", response_cache=self.cache)
+        fetch_wigor_html(url, "sid=a", response_cache=self.cache)
+
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertEqual(self.cache.stats()["entries"], 0)
+
+    def test_unexpected_not_modified_is_an_error(self, _):
+        with self.assertRaises(requests.HTTPError):
+            fetch_wigor_html(f"{self.base}/304", "sid=a", response_cache=self.cache)
+        self.assertEqual(self.cache.stats()["entries"], 0)
+
+    def test_errors_are_not_cached(self, _):
+        with patch("src.wigor_api.pooled_session") as pooled:
+            pooled.return_value.get.return_value.status_code = 500
+            pooled.return_value.get.return_value.text = "erreur"
+            pooled.return_value.get.return_value.raise_for_status.side_effect = ValueError("500")
+            with self.assertRaises(ValueError):
+                fetch_wigor_html(f"{self.base}/plain", "sid=a", response_cache=self.cache)
+        self.assertEqual(self.cache.stats()["entries"], 0)
+
+
+class TestResponseCacheConfiguration(unittest.TestCase):
+    def test_disabled_by_default(self):
+        with patch.dict(os.environ, {RESPONSE_CACHE_ENV_VAR: ""}):
+            self.assertIsNone(get_response_cache())
+
+    def test_enabled_by_environment(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with patch.dict(
+                os.environ, {RESPONSE_CACHE_ENV_VAR: "1", RESPONSE_CACHE_DIR_ENV_VAR: tmp}
+            ):
+                cache = get_response_cache()
+                self.assertIsNotNone(cache)
+                self.assertEqual(str(cache.directory), tmp)
+                self.assertIs(get_response_cache(), cache)
+
+    def test_entry_round_trip_and_freshness(self):
+        entry = CachedResponse("<html/>", "https://x", etag='"e"', stored_at=100.0)
+        self.assertEqual(CachedResponse.from_dict(entry.to_dict()).to_dict(), entry.to_dict())
+        self.assertFalse(entry.is_fresh(60, now=101.0))
+        self.assertEqual(entry.conditional_headers(), {"If-None-Match": '"e"'})
+
+        plain = CachedResponse("<html/>", "https://x", stored_at=100.0)
+        self.assertTrue(plain.is_fresh(60, now=159.0))
+        self.assertFalse(plain.is_fresh(60, now=161.0))
+        self.assertEqual(plain.conditional_headers(), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,288 @@
+"""
+Tests du scheduler de surveillance des emplois du temps (intervalles adaptatifs,
+détection de changements par empreinte, sinks).
+"""
+
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import unittest
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src import cli
+from src.scheduler import JsonLinesSink, PollingScheduler, is_week_start
+
+FIXTURE = Path(__file__).parent / "fixtures" / "wigor_multi_week.html"
+WEDNESDAY = datetime(2025, 10, 8, 10, 0)
+MONDAY = datetime(2025, 10, 6, 10, 0)
+
+
+class _FakeWigor:
+    """Téléchargement de test: page modifiable, compte les appels, peut échouer."""
+
+    def __init__(self):
+        self.html = FIXTURE.read_text(encoding="utf-8")
+        self.calls = []
+        self.error = None
+
+    def __call__(self, url, cookie_header="", session=None, credentials=None):
+        self.calls.append((url, cookie_header))
+        if self.error is not None:
+            raise self.error
+        return self.html
+
+
+class _Clock:
+    def __init__(self):
+        self.value = 1000.0
+
+    def __call__(self):
+        return self.value
+
+
+def _wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition non atteinte")
+        time.sleep(0.005)
+
+
+class TestAdaptiveInterval(unittest.TestCase):
+    def _scheduler(self, now=WEDNESDAY, jitter=0.0):
+        scheduler = PollingScheduler(
+            interval=600,
+            min_interval=120,
+            max_interval=3600,
+            backoff=2.0,
+            week_start_factor=0.25,
+            jitter=jitter,
+            fetch=_FakeWigor(),
+            now=lambda: now,
+            rng=random.Random(42),
+        )
+        self.addCleanup(scheduler.close)
+        return scheduler
+
+    def test_backoff_after_unchanged_polls_is_capped(self):
+        scheduler = self._scheduler()
+        target = scheduler.register("b3", "https://wigor.example/edt")
+        delays = []
+        for unchanged in range(5):
+            target.unchanged = unchanged
+            delays.append(scheduler.next_interval(target))
+        self.assertEqual(delays, [600, 1200, 2400, 3600, 3600])
+
+        target.unchanged = 10_000
+        self.assertEqual(scheduler.next_interval(target), 3600)
+
+    def test_week_start_polls_more_often(self):
+        scheduler = self._scheduler(now=MONDAY)
+        target = scheduler.register("b3", "https://wigor.example/edt")
+        self.assertEqual(scheduler.next_interval(target), 150)
+        target.unchanged = 10
+        self.assertEqual(scheduler.next_interval(target), 900)
+
+        fast = scheduler.register("m1", "https://wigor.example/m1", interval=60)
+        self.assertEqual(scheduler.next_interval(fast), 120)
+
+    def test_week_start_window(self):
+        self.assertTrue(is_week_start(MONDAY))
+        self.assertTrue(is_week_start(datetime(2025, 10, 5, 20, 0)))
+        self.assertFalse(is_week_start(datetime(2025, 10, 5, 12, 0)))
+        self.assertFalse(is_week_start(WEDNESDAY))
+
+    def test_jitter_spreads_polls(self):
+        scheduler = self._scheduler(jitter=0.1)
+        targets = [scheduler.register(f"g{i}", "https://wigor.example/edt") for i in range(50)]
+        delays = [scheduler.next_interval(target) for target in targets]
+        self.assertTrue(all(540 <= delay <= 660 for delay in delays))
+        self.assertGreater(len(set(delays)), 40)
+
+        first_polls = [target.next_due - targets[0].next_due for target in targets]
+        self.assertLessEqual(max(first_polls) - min(first_polls), 60)
+        self.assertGreater(len(set(first_polls)), 40)
+
+
+class TestChangeDetection(unittest.TestCase):
+    def setUp(self):
+        self.wigor = _FakeWigor()
+        self.events = []
+        self.scheduler = PollingScheduler(
+            [self.events.append], fetch=self.wigor, now=lambda: WEDNESDAY
+        )
+        self.addCleanup(self.scheduler.close)
+        self.scheduler.register("b3", "https://wigor.example/edt", "sid=a")
+
+    def test_unchanged_page_is_not_parsed(self):
+        self.assertIsNone(self.scheduler.poll("b3"))
+        with patch("src.timetable_diff.make_soup") as make_soup:
+            self.assertIsNone(self.scheduler.poll("b3"))
+            self.assertIsNone(self.scheduler.poll("b3"))
+        make_soup.assert_not_called()
+
+        (target,) = self.scheduler.targets()
+        self.assertEqual((target.polls, target.unchanged), (3, 2))
+        self.assertEqual(self.scheduler.stats()["skipped_parses"], 2)
+        self.assertEqual(self.events, [])
+        self.assertEqual(self.wigor.calls[0], ("https://wigor.example/edt", "sid=a"))
+
+    def test_changed_page_emits_event(self):
+        self.scheduler.poll("b3")
+        self.scheduler.poll("b3")
+        self.wigor.html = self.wigor.html.replace("C12", "C14")
+
+        event = self.scheduler.poll("b3")
+        self.assertEqual(self.events, [event])
+        self.assertFalse(event.initial)
+        (before, after) = event.diff.modified[0]
+        self.assertEqual((before["salle"], after["salle"]), ("Salle:C12(WIS)", "Salle:C14(WIS)"))
+
+        (target,) = self.scheduler.targets()
+        self.assertEqual((target.unchanged, target.changes), (0, 1))
+        payload = json.loads(json.dumps(event.to_dict()))
+        self.assertEqual(payload["target"], "b3")
+        self.assertEqual(payload["modified"][0]["after"]["salle"], "Salle:C14(WIS)")
+
+    def test_initial_event_on_request(self):
+        self.scheduler.emit_initial = True
+        event = self.scheduler.poll("b3")
+        self.assertTrue(event.initial)
+        self.assertEqual(event.diff.added, event.diff.courses)
+        self.assertEqual(self.scheduler.stats()["changes"], 0)
+
+    def test_failing_sink_does_not_stop_others(self):
+        def broken(event):
+            raise RuntimeError("sink indisponible")
+
+        self.scheduler.sinks.insert(0, broken)
+        self.scheduler.emit_initial = True
+        with self.assertLogs("src.scheduler", level="ERROR"):
+            self.scheduler.poll("b3")
+        self.assertEqual(len(self.events), 1)
+        self.assertEqual(self.scheduler.stats()["sink_failures"], 1)
+
+    def test_json_lines_sink(self):
+        self.scheduler.emit_initial = True
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "changes.jsonl"
+            self.scheduler.sinks = [JsonLinesSink(path)]
+            self.scheduler.poll("b3")
+            self.wigor.html = self.wigor.html.replace("C12", "C14")
+            self.scheduler.poll("b3")
+            lines = path.read_text(encoding="utf-8").splitlines()
+
+        self.assertEqual([json.loads(line)["initial"] for line in lines], [True, False])
+
+
+class TestScheduling(unittest.TestCase):
+    def setUp(self):
+        self.wigor = _FakeWigor()
+        self.clock = _Clock()
+        self.scheduler = PollingScheduler(
+            interval=600,
+            jitter=0.1,
+            fetch=self.wigor,
+            clock=self.clock,
+            now=lambda: WEDNESDAY,
+            rng=random.Random(1),
+        )
+        self.addCleanup(self.scheduler.close)
+
+    def test_due_targets_are_polled_and_rescheduled(self):
+        targets = [self.scheduler.register(f"g{i}", "https://wigor.example/edt") for i in range(3)]
+        self.assertEqual(self.scheduler.run_pending(), 0)
+        self.assertLessEqual(self.scheduler.seconds_until_next(), 60)
+
+        self.clock.value += 60
+        self.assertEqual(self.scheduler.run_pending(), 3)
+        _wait_until(lambda: self.scheduler.stats()["polls"] == 3)
+        _wait_until(lambda: not any(target.running for target in targets))
+
+        for target in targets:
+            self.assertGreaterEqual(target.next_due, self.clock.value + 540)
+        self.assertEqual(self.scheduler.run_pending(), 0)
+
+    def test_failed_poll_is_retried_later(self):
+        target = self.scheduler.register("b3", "https://wigor.example/edt")
+        self.wigor.error = ConnectionError("Wigor indisponible")
+        self.clock.value += 60
+        with self.assertLogs("src.scheduler", level="WARNING"):
+            self.scheduler.run_pending()
+            _wait_until(lambda: target.failures == 1 and not target.running)
+        self.assertEqual(target.last_error, "Wigor indisponible")
+        self.assertGreater(target.next_due, self.clock.value)
+
+    def test_unregistered_target_is_dropped(self):
+        self.scheduler.register("b3", "https://wigor.example/edt")
+        self.assertTrue(self.scheduler.unregister("b3"))
+        self.clock.value += 60
+        self.assertEqual(self.scheduler.run_pending(), 0)
+        self.assertEqual(self.wigor.calls, [])
+
+    def test_no_poll_after_close(self):
+        target = self.scheduler.register("b3", "https://wigor.example/edt")
+        self.clock.value += 60
+        self.scheduler.close()
+
+        self.assertEqual(self.scheduler.run_pending(), 0)
+        self.assertFalse(target.running)
+        self.assertEqual(self.wigor.calls, [])
+
+    def test_executor_shut_down_during_run_pending(self):
+        targets = [self.scheduler.register(f"g{i}", "https://wigor.example/edt") for i in range(2)]
+        self.clock.value += 60
+        # close() arrive après le contrôle d'arrêt, avant la soumission
+        self.scheduler._executor.shutdown()
+
+        self.assertEqual(self.scheduler.run_pending(), 0)
+        self.assertFalse(any(target.running for target in targets))
+
+    def test_background_loop(self):
+        scheduler = PollingScheduler(
+            interval=0.01, min_interval=0.01, jitter=0.0, fetch=self.wigor, now=lambda: WEDNESDAY
+        )
+        scheduler.register("b3", "https://wigor.example/edt")
+        scheduler.start()
+        try:
+            _wait_until(lambda: scheduler.stats()["polls"] >= 3)
+        finally:
+            scheduler.close()
+        self.assertGreaterEqual(scheduler.stats()["skipped_parses"], 2)
+
+
+class TestWatchCli(unittest.TestCase):
+    def test_watch_registers_groups(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "groups.json"
+            path.write_text(json.dumps({"b3": {"url": "https://wigor.example/a", "cookie": "s"}}))
+            registered = []
+
+            def run_forever(scheduler):
+                registered.extend(target.name for target in scheduler.targets())
+                scheduler.close()
+
+            argv = ["wigor-cli", "--watch", str(path), "--interval", "300"]
+            with patch.object(sys, "argv", argv), patch(
+                "src.cli.PollingScheduler.run_forever", run_forever
+            ), patch("sys.stderr", new_callable=io.StringIO):
+                self.assertEqual(cli.main(), 0)
+
+        self.assertEqual(registered, ["b3"])
+
+    def test_watch_with_invalid_configuration(self):
+        argv = ["wigor-cli", "--watch", "absent-groups.json"]
+        with patch.object(sys, "argv", argv), patch("sys.stderr", new_callable=io.StringIO):
+            self.assertEqual(cli.main(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
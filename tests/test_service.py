@@ -0,0 +1,235 @@
+"""
+Tests du service local d'emplois du temps (cache mémoire, rafraîchissement, HTTP).
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+import urllib.error
+import urllib.request
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src import cli
+from src.course import Course
+from src.service import TimetableGroup, TimetableService, load_groups, make_server
+
+GROUPS = {"b3": TimetableGroup("b3", "https://wigor.example/edt", "sid=a")}
+
+
+class _FakeWigor:
+    """Récupération de test: compte les appels, peut bloquer ou échouer."""
+
+    def __init__(self):
+        self.calls = 0
+        self.error = None
+        self.gate = threading.Event()
+        self.gate.set()
+        self.lock = threading.Lock()
+
+    def __call__(self, url, cookie_header="", all_weeks=False, credentials=None):
+        with self.lock:
+            self.calls += 1
+            version = self.calls
+        self.gate.wait(5)
+        if self.error is not None:
+            raise self.error
+        course = Course("DEVOPS", "DUPONT", "09:00 - 12:00", "B204", f"Lundi {version} Mars")
+        return {"html": "", "courses": [course], "weeks": {"2026-W10": [course]}}
+
+
+def _wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition non atteinte")
+        time.sleep(0.005)
+
+
+class TestTimetableService(unittest.TestCase):
+    def setUp(self):
+        self.wigor = _FakeWigor()
+        self.service = TimetableService(GROUPS, ttl=60, stale_ttl=60, fetch=self.wigor)
+        self.addCleanup(self.service.close)
+
+    def test_miss_then_memory_hit(self):
+        entry, state = self.service.get("b3")
+        self.assertEqual(state, "miss")
+        payload = json.loads(entry.body)
+        self.assertEqual(payload["group"], "b3")
+        self.assertEqual(payload["courses"][0]["titre"], "DEVOPS")
+        self.assertEqual(payload["weeks"]["2026-W10"][0]["jour"], "Lundi 1 Mars")
+
+        again, state = self.service.get("b3")
+        self.assertEqual(state, "hit")
+        self.assertIs(again, entry)
+        self.assertEqual(self.wigor.calls, 1)
+
+    def test_stale_entry_is_served_while_refreshing(self):
+        first, _ = self.service.get("b3")
+        first.fetched_at -= 90  # expirée, encore dans la période de grâce
+
+        self.wigor.gate.clear()
+        entry, state = self.service.get("b3")
+        self.assertEqual(state, "stale")
+        self.assertIs(entry, first)
+        # Un seul rafraîchissement à la fois par groupe
+        self.assertEqual(self.service.get("b3")[1], "stale")
+        self.assertFalse(self.service.refresh_async("b3"))
+
+        self.wigor.gate.set()
+        _wait_until(lambda: self.service.get("b3")[1] == "hit")
+        self.assertEqual(self.wigor.calls, 2)
+        self.assertIn(b"Lundi 2 Mars", self.service.get("b3")[0].body)
+
+    def test_failed_refresh_keeps_previous_entry(self):
+        first, _ = self.service.get("b3")
+        first.fetched_at -= 90
+        self.wigor.error = ConnectionError("Wigor indisponible")
+
+        self.assertIs(self.service.get("b3")[0], first)
+        _wait_until(lambda: self.service.stats()["refresh_failures"] == 1)
+        (status,) = self.service.status()
+        self.assertEqual(status["error"], "Wigor indisponible")
+        self.assertTrue(status["cached"])
+        self.assertIs(self.service.get("b3")[0], first)
+
+    def test_entry_beyond_grace_is_fetched_synchronously(self):
+        first, _ = self.service.get("b3")
+        first.fetched_at -= 200
+        entry, state = self.service.get("b3")
+        self.assertEqual(state, "miss")
+        self.assertIsNot(entry, first)
+
+    def test_concurrent_misses_fetch_once(self):
+        self.wigor.gate.clear()
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(self.service.get("b3")))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        _wait_until(lambda: self.wigor.calls == 1)
+        time.sleep(0.05)
+        self.wigor.gate.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.wigor.calls, 1)
+        self.assertEqual(len({id(entry) for entry, _ in results}), 1)
+
+    def test_unknown_group(self):
+        with self.assertRaises(KeyError):
+            self.service.get("inconnu")
+
+    def test_warm_fetches_every_group(self):
+        self.service.warm()
+        _wait_until(lambda: self.service.status()[0]["cached"])
+        self.assertEqual(self.service.get("b3")[1], "hit")
+
+
+class TestServiceHttp(unittest.TestCase):
+    def setUp(self):
+        self.wigor = _FakeWigor()
+        self.service = TimetableService(GROUPS, ttl=60, fetch=self.wigor)
+        self.server = make_server(self.service, "127.0.0.1", 0)
+        self.base = f"http://127.0.0.1:{self.server.server_port}"
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.service.close)
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+    def _get(self, path, headers=None):
+        request = urllib.request.Request(self.base + path, headers=headers or {})
+        try:
+            with urllib.request.urlopen(request, timeout=5) as response:
+                return response.status, dict(response.headers), response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, dict(e.headers), e.read()
+
+    def test_timetable_json_and_etag(self):
+        status, headers, body = self._get("/timetable/b3")
+        self.assertEqual(status, 200)
+        self.assertEqual(headers["X-Cache"], "MISS")
+        self.assertEqual(json.loads(body)["courses"][0]["salle"], "B204")
+
+        status, headers, again = self._get("/timetable/b3")
+        self.assertEqual((status, headers["X-Cache"]), (200, "HIT"))
+        self.assertEqual(again, body)
+
+        status, _, empty = self._get("/timetable/b3", {"If-None-Match": headers["ETag"]})
+        self.assertEqual((status, empty), (304, b""))
+        self.assertEqual(self.wigor.calls, 1)
+
+    def test_routes(self):
+        self.assertEqual(self._get("/health")[0], 200)
+        self.assertEqual(self._get("/timetable/inconnu")[0], 404)
+        self.assertEqual(self._get("/autre")[0], 404)
+
+        self._get("/timetable/b3")
+        status, _, body = self._get("/groups")
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(body)[0]["courses"], 1)
+        self.assertEqual(json.loads(self._get("/stats")[2])["misses"], 1)
+
+    def test_wigor_failure_without_entry(self):
+        self.wigor.error = ConnectionError("Wigor indisponible")
+        status, _, body = self._get("/timetable/b3")
+        self.assertEqual(status, 502)
+        self.assertIn("Wigor indisponible", json.loads(body)["error"])
+
+
+class TestServiceConfiguration(unittest.TestCase):
+    def _write(self, data):
+        tmp = tempfile.NamedTemporaryFile("w", suffix=".json", delete=False)
+        self.addCleanup(os.unlink, tmp.name)
+        with tmp:
+            json.dump(data, tmp)
+        return tmp.name
+
+    def test_load_groups(self):
+        path = self._write(
+            {
+                "b3": {"url": "https://wigor.example/a", "cookie": "sid=a"},
+                "m1": {"url": "https://wigor.example/b", "username": "u", "password": "p"},
+            }
+        )
+        groups = load_groups(path)
+        self.assertEqual(groups["b3"].cookie, "sid=a")
+        self.assertEqual(groups["m1"].credentials, ("u", "p"))
+
+    def test_invalid_configuration(self):
+        for data in ({}, {"b3": {"cookie": "sid=a"}}, {"b3": {"url": "https://wigor.example"}}):
+            with self.subTest(data=data), self.assertRaises(ValueError):
+                load_groups(self._write(data))
+        with self.assertRaises(ValueError):
+            load_groups(Path(tempfile.gettempdir()) / "absent-groups.json")
+
+    def test_cli_serve_with_invalid_configuration(self):
+        with patch.object(sys, "argv", ["wigor-cli", "--serve", self._write([])]), patch(
+            "builtins.print"
+        ):
+            self.assertEqual(cli.main(), 1)
+
+    def test_cli_serve(self):
+        path = self._write({"b3": {"url": "https://wigor.example/a", "cookie": "sid=a"}})
+        argv = ["wigor-cli", "--serve", path, "--port", "9999", "--ttl", "30"]
+        with patch.object(sys, "argv", argv), patch("src.cli.serve") as serve, patch(
+            "builtins.print"
+        ):
+            self.assertEqual(cli.main(), 0)
+        groups, host, port = serve.call_args.args
+        self.assertEqual((list(groups), host, port), (["b3"], "0.0.0.0", 9999))
+        self.assertEqual(serve.call_args.kwargs, {"ttl": 30.0})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+"""
+Tests du registre de sessions HTTP mutualisées.
+"""
+
+import os
+import sys
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from auth.cookies_auth import build_session_from_cookie_header
+from auth.session_pool import (
+    SESSION_POOL_ENV_VAR,
+    SessionPool,
+    configure_session_pool,
+    cookie_fingerprint,
+    get_session_pool,
+)
+from src.wigor_api import fetch_wigor_html
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    """Page EDT minimale; note le port client de chaque requête (une connexion = un port)."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.client_ports.append(self.client_address[1])
+        self.server.cookies.append(self.headers.get("Cookie", ""))
+        body = b"<html><head><title>EDT - Test</title></head><body></body></html>"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestCookieFingerprint(unittest.TestCase):
+    def test_order_independent_and_value_sensitive(self):
+        a = cookie_fingerprint({"ASP.NET_SessionId": "x", ".DotNetCasClientAuth": "y"})
+        b = cookie_fingerprint({".DotNetCasClientAuth": "y", "ASP.NET_SessionId": "x"})
+        c = cookie_fingerprint({"ASP.NET_SessionId": "x", ".DotNetCasClientAuth": "z"})
+        self.assertEqual(a, b)
+        self.assertNotEqual(a, c)
+        self.assertEqual(len(a), 64)
+
+
+class TestSessionPool(unittest.TestCase):
+    def test_same_cookies_share_a_session(self):
+        pool = SessionPool()
+        first = pool.get({"a": "1"})
+        self.assertIs(pool.get({"a": "1"}), first)
+        self.assertIsNot(pool.get({"a": "2"}), first)
+        self.assertEqual(pool.stats(), {"sessions": 2, "hits": 1, "misses": 2, "evictions": 0})
+        self.assertEqual(first.cookies.get("a"), "1")
+        self.assertEqual(first.get_adapter("https://x").max_retries.total, 3)
+
+    def test_lru_eviction_leaves_sessions_open(self):
+        pool = SessionPool(max_sessions=2)
+        first = pool.get({"a": "1"})
+        pool.get({"a": "2"})
+        pool.get({"a": "1"})  # "1" redevient la plus récente
+        # La session évincée peut encore servir à un autre thread: pas de close()
+        with patch.object(type(first), "close", autospec=True) as close:
+            pool.get({"a": "3"})
+        self.assertEqual(len(pool), 2)
+        close.assert_not_called()
+        self.assertIs(pool.get({"a": "1"}), first)
+        self.assertEqual(pool.stats()["evictions"], 1)
+
+    def test_idle_sessions_expire(self):
+        pool = SessionPool(idle_ttl=10)
+        with patch("auth.session_pool.time.monotonic", return_value=100.0):
+            first = pool.get({"a": "1"})
+        with patch("auth.session_pool.time.monotonic", return_value=105.0):
+            self.assertIs(pool.get({"a": "1"}), first)
+        with patch("auth.session_pool.time.monotonic", return_value=120.0):
+            self.assertIsNot(pool.get({"a": "1"}), first)
+        self.assertEqual(pool.stats()["evictions"], 1)
+
+    def test_invalid_configuration(self):
+        with self.assertRaises(ValueError):
+            SessionPool(max_sessions=0)
+        with self.assertRaises(ValueError):
+            SessionPool(idle_ttl=0)
+
+    def test_configure_and_disable_default_pool(self):
+        pool = configure_session_pool(max_sessions=3, idle_ttl=30)
+        self.assertIs(get_session_pool(), pool)
+        self.assertEqual(pool.max_sessions, 3)
+        with patch.dict(os.environ, {SESSION_POOL_ENV_VAR: "0"}):
+            self.assertIsNone(get_session_pool())
+
+    def test_cookies_auth_shares_the_registry(self):
+        cookie = "ASP.NET_SessionId=abc; .DotNetCasClientAuth=xyz"
+        session = build_session_from_cookie_header(cookie, pooled=True)
+        self.assertIs(build_session_from_cookie_header(cookie, pooled=True), session)
+        # Par défaut: session indépendante, modifiable sans effet sur les autres
+        self.assertIsNot(build_session_from_cookie_header(cookie), session)
+        self.assertIs(
+            get_session_pool().get({"ASP.NET_SessionId": "abc", ".DotNetCasClientAuth": "xyz"}),
+            session,
+        )
+
+
+@patch("src.wigor_api._save_debug_html")
+class TestFetchReusesConnections(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}/edt"
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.server.client_ports = []
+        self.server.cookies = []
+
+    def test_repeated_fetches_use_one_connection(self, _):
+        for _ in range(3):
+            self.assertIn("EDT - Test", fetch_wigor_html(self.url, "sid=user1"))
+
+        self.assertEqual(len(self.server.client_ports), 3)
+        self.assertEqual(len(set(self.server.client_ports)), 1)
+        self.assertEqual(self.server.cookies, ["sid=user1"] * 3)
+
+    def test_other_cookies_get_their_own_session(self, _):
+        fetch_wigor_html(self.url, "sid=user1")
+        fetch_wigor_html(self.url, "sid=user2")
+        fetch_wigor_html(self.url, "sid=user1")
+
+        self.assertEqual(self.server.cookies, ["sid=user1", "sid=user2", "sid=user1"])
+        self.assertEqual(len(set(self.server.client_ports)), 2)
+        self.assertEqual(self.server.client_ports[0], self.server.client_ports[2])
+
+    def test_disabled_pool_opens_new_connections(self, _):
+        with patch.dict(os.environ, {SESSION_POOL_ENV_VAR: "off"}):
+            fetch_wigor_html(self.url, "sid=user1")
+            fetch_wigor_html(self.url, "sid=user1")
+        self.assertEqual(len(self.server.client_ports), 2)
+        self.assertEqual(len(set(self.server.client_ports)), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,333 @@
+"""
+Tests du stockage chiffré des sessions authentifiées.
+"""
+
+import base64
+import hashlib
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from http.cookiejar import Cookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import patch
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from auth import session_store
+from auth.session_store import (
+    CRYPTOGRAPHY_AVAILABLE,
+    SessionStore,
+    StoredSession,
+    get_session_store,
+    wigor_host,
+)
+from src.wigor_api import fetch_wigor_page, login_or_restore, verify_stored_session
+
+WIGOR_URL = "https://ws-edt-cd.wigorservices.net/WebPsDyn.aspx?Action=posEDTLMS"
+
+
+class _XorCipher:
+    """Chiffrement de test réversible (la logique du stockage ne dépend pas de Fernet)."""
+
+    MAGIC = b"xor1:"
+
+    def encrypt(self, data: bytes) -> bytes:
+        return self.MAGIC + base64.urlsafe_b64encode(bytes(b ^ 0x5A for b in data))
+
+    def decrypt(self, token: bytes) -> bytes:
+        if not token.startswith(self.MAGIC):
+            raise ValueError("jeton invalide")
+        return bytes(b ^ 0x5A for b in base64.urlsafe_b64decode(token[len(self.MAGIC) :]))
+
+
+def _cookie(name, value, expires=None):
+    return Cookie(
+        0, name, value, None, False, "wigor.example", False, False, "/", True, False,
+        expires, expires is None, None, None, {},
+    )  # fmt: skip
+
+
+class TestSessionStore(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.directory = Path(tmp.name)
+        self.store = SessionStore(self.directory, cipher=_XorCipher())
+
+    def test_round_trip_is_encrypted(self):
+        self.store.save("alice", WIGOR_URL, {"ASP.NET_SessionId": "abc", ".DotNetCasClient": "t"})
+
+        stored = self.store.load("alice", "https://WS-EDT-CD.wigorservices.net/autre")
+        self.assertEqual(stored.user, "alice")
+        self.assertEqual(stored.host, "ws-edt-cd.wigorservices.net")
+        self.assertEqual(stored.cookie_header(), "ASP.NET_SessionId=abc; .DotNetCasClient=t")
+        self.assertIsNone(self.store.load("bob", WIGOR_URL))
+
+        (path,) = self.directory.glob("*.session")
+        raw = path.read_bytes()
+        self.assertNotIn(b"alice", raw)
+        self.assertNotIn(b"abc", raw)
+        self.assertNotIn("alice", path.name)
+
+    def test_expired_session_is_deleted(self):
+        self.store.save("alice", WIGOR_URL, {"sid": "1"}, expires_at=time.time() - 1)
+        self.assertIsNone(self.store.load("alice", WIGOR_URL))
+        self.assertEqual(list(self.directory.glob("*.session")), [])
+
+    def test_ttl_and_cookie_expiry(self):
+        store = SessionStore(self.directory, cipher=_XorCipher(), ttl=60)
+        stored = store.save("alice", WIGOR_URL, {"sid": "1"})
+        self.assertAlmostEqual(stored.expires_at - stored.stored_at, 60, delta=1)
+
+        jar = requests.cookies.RequestsCookieJar()
+        jar.set_cookie(_cookie("sid", "1"))
+        jar.set_cookie(_cookie("cas", "2", expires=int(time.time()) + 10))
+        stored = store.save("alice", WIGOR_URL, jar)
+        self.assertEqual(stored.cookies, {"sid": "1", "cas": "2"})
+        self.assertLess(stored.expires_at, time.time() + 11)
+
+    def test_unreadable_session_is_deleted(self):
+        self.store.save("alice", WIGOR_URL, {"sid": "1"})
+        (path,) = self.directory.glob("*.session")
+        path.write_bytes(b"corrompu")
+
+        self.assertIsNone(self.store.load("alice", WIGOR_URL))
+        self.assertFalse(path.exists())
+
+    def test_sessions_are_keyed_by_user_delete_and_clear(self):
+        self.store.save("alice", WIGOR_URL, {"sid": "a"})
+        self.store.save("bob", WIGOR_URL, {"sid": "b"})
+        self.store.save("carol", "https://autre.example/", {"sid": "c"})
+
+        self.assertEqual(self.store.load("alice", WIGOR_URL).cookies, {"sid": "a"})
+        self.store.delete("bob", WIGOR_URL)
+        self.assertIsNone(self.store.load("bob", WIGOR_URL))
+        self.assertEqual(self.store.load("alice", WIGOR_URL).cookies, {"sid": "a"})
+        self.assertIsNone(self.store.load("carol", WIGOR_URL))
+
+        self.store.clear()
+        self.assertIsNone(self.store.load("alice", WIGOR_URL))
+        self.assertIsNone(self.store.load("carol", "autre.example"))
+
+    def test_stored_session_dict(self):
+        stored = StoredSession("alice", "wigor.example", {"sid": "1"}, 1.0, 2.0)
+        copy = StoredSession.from_dict(stored.to_dict())
+        self.assertEqual(copy.to_dict(), stored.to_dict())
+        self.assertTrue(copy.is_expired(now=2.0))
+        self.assertFalse(copy.is_expired(now=1.5))
+
+    def test_wigor_host(self):
+        self.assertEqual(wigor_host(WIGOR_URL), "ws-edt-cd.wigorservices.net")
+        self.assertEqual(wigor_host("Wigor.Example"), "wigor.example")
+
+    def test_disabled_store(self):
+        with patch.dict(os.environ, {"WIGOR_SESSION_STORE": "off"}):
+            self.assertIsNone(get_session_store())
+
+    def test_missing_cryptography_is_reported_once(self):
+        with patch.object(session_store, "CRYPTOGRAPHY_AVAILABLE", False), patch.object(
+            session_store, "_missing_cryptography_warned", False
+        ), patch.dict(os.environ, {"WIGOR_SESSION_STORE": "1"}):
+            with self.assertLogs("auth.session_store", level="WARNING") as logs:
+                self.assertIsNone(get_session_store())
+                self.assertIsNone(get_session_store())
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn("cryptography", logs.output[0])
+
+    @unittest.skipIf(CRYPTOGRAPHY_AVAILABLE, "cryptography installé")
+    def test_default_cipher_requires_cryptography(self):
+        with self.assertRaises(RuntimeError):
+            SessionStore(self.directory)
+        with patch.dict(os.environ, {"WIGOR_SESSION_STORE": "1"}):
+            self.assertIsNone(get_session_store())
+
+
+@unittest.skipUnless(CRYPTOGRAPHY_AVAILABLE, "cryptography non installé")
+class TestFernetSessionStore(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.directory = Path(tmp.name)
+
+    def test_key_file_is_created_once_and_private(self):
+        SessionStore(self.directory).save("alice", WIGOR_URL, {"sid": "1"})
+        key_path = self.directory / "store.key"
+        self.assertEqual(key_path.stat().st_mode & 0o777, 0o600)
+
+        # Une nouvelle instance relit la même clé
+        self.assertEqual(SessionStore(self.directory).load("alice", WIGOR_URL).cookies["sid"], "1")
+
+    def test_other_key_cannot_read_sessions(self):
+        SessionStore(self.directory).save("alice", WIGOR_URL, {"sid": "1"})
+        other_key = session_store.Fernet.generate_key().decode("ascii")
+        with patch.dict(os.environ, {"WIGOR_SESSION_KEY": other_key}):
+            self.assertIsNone(SessionStore(self.directory).load("alice", WIGOR_URL))
+
+    def test_default_store_follows_directory_env(self):
+        env = {"WIGOR_SESSION_STORE": "1", "WIGOR_SESSION_STORE_DIR": str(self.directory)}
+        with patch.dict(os.environ, env):
+            store = get_session_store()
+            self.assertIs(get_session_store(), store)
+            self.assertEqual(store.directory, self.directory)
+
+
+TIMETABLE = (
+    "<html><head><title>EDT - Test</title></head><body>"
+    '<div class="Jour"><td class="TCJour">Lundi 15 Janvier</td></div>'
+    '<div class="Case"><div class="innerCase">Cours</div></div></body></html>'
+)
+CAS_FORM = (
+    '<html><body><form action="/cas/login" method="post">'
+    '<input type="text" name="username"><input type="password" name="password">'
+    '<input type="hidden" name="execution" value="e1s1"></form></body></html>'
+)
+
+
+class _WigorHandler(BaseHTTPRequestHandler):
+    """Wigor de test: /edt exige un cookie de session valide, délivré par le CAS."""
+
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        if path == "/cas/login":
+            self._send(CAS_FORM)
+        elif self._cookie_sid() in self.server.valid_sids:
+            self.server.timetable_hits += 1
+            self._send(TIMETABLE)
+        else:
+            self._send('<html><body><a href="/cas/login">Connexion</a></body></html>')
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        self.server.logins += 1
+        sid = f"sid{self.server.logins}"
+        self.server.valid_sids.add(sid)
+        self.send_response(302)
+        self.send_header("Set-Cookie", f"sid={sid}; Path=/")
+        self.send_header("Location", "/edt")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _cookie_sid(self):
+        for part in self.headers.get("Cookie", "").split(";"):
+            name, _, value = part.strip().partition("=")
+            if name == "sid":
+                return value
+        return None
+
+    def _send(self, body):
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@patch("src.wigor_api._save_debug_html")
+class TestLoginOrRestore(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _WigorHandler)
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}/edt"
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.server.valid_sids = set()
+        self.server.logins = 0
+        self.server.timetable_hits = 0
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.store = SessionStore(tmp.name, cipher=_XorCipher())
+        patcher = patch("src.wigor_api.get_session_store", return_value=self.store)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_second_fetch_skips_cas_login(self, _):
+        first = fetch_wigor_page(self.url, credentials=("alice", "secret"))
+        second = fetch_wigor_page(self.url, credentials=("alice", "secret"))
+
+        self.assertTrue(first.is_timetable)
+        self.assertTrue(second.is_timetable)
+        self.assertEqual(self.server.logins, 1)
+        self.assertEqual(self.store.load("alice", self.url).cookies, {"sid": "sid1"})
+
+    def test_restored_session_fetches_the_page_once(self, _):
+        self.server.valid_sids.add("old")
+        self.store.save("alice", self.url, {"sid": "old"})
+        page = fetch_wigor_page(self.url, credentials=("alice", "secret"))
+
+        self.assertTrue(page.is_timetable)
+        self.assertEqual(self.server.logins, 0)
+        self.assertEqual(self.server.timetable_hits, 1)
+
+    def test_restore_valid_stored_session(self, _):
+        self.server.valid_sids.add("old")
+        self.store.save("alice", self.url, {"sid": "old"})
+        result = login_or_restore("alice", "secret", self.url, self.store)
+
+        self.assertTrue(result["restored"])
+        self.assertEqual(result["cookies_string"], "sid=old")
+        self.assertEqual(result["session"].cookies.get("sid"), "old")
+        self.assertEqual(self.server.logins, 0)
+
+    def test_expired_stored_session_logs_in_again(self, _):
+        # Session encore valide localement, mais expirée côté serveur
+        self.store.save("alice", self.url, {"sid": "expired"})
+        result = login_or_restore("alice", "secret", self.url, self.store)
+
+        self.assertTrue(result["success"])
+        self.assertFalse(result["restored"])
+        self.assertEqual(self.server.logins, 1)
+        self.assertEqual(self.store.load("alice", self.url).cookies, {"sid": "sid1"})
+
+    def test_rejected_stored_session_logs_in_again(self, _):
+        self.store.save("alice", self.url, {"sid": "revoked"})
+        page = fetch_wigor_page(self.url, credentials=("alice", "secret"))
+
+        self.assertTrue(page.is_timetable)
+        self.assertEqual(self.server.logins, 1)
+        self.assertEqual(self.server.timetable_hits, 2)  # fin de connexion + page
+        self.assertEqual(self.store.load("alice", self.url).cookies, {"sid": "sid1"})
+
+    def test_rejected_stored_session_is_deleted(self, _):
+        stored = self.store.save("alice", self.url, {"sid": "expired"})
+        self.assertIsNone(verify_stored_session(self.store, stored, self.url))
+        self.assertIsNone(self.store.load("alice", self.url))
+
+        self.server.valid_sids.add("fresh")
+        stored = self.store.save("alice", self.url, {"sid": "fresh"})
+        session = verify_stored_session(self.store, stored, self.url)
+        self.assertEqual(session.cookies.get("sid"), "fresh")
+        self.assertIsNotNone(self.store.load("alice", self.url))
+
+    def test_login_failure_raises(self, _):
+        with patch("src.wigor_api.login_with_credentials") as login:
+            login.return_value = {"success": False, "error": "Identifiants incorrects"}
+            with self.assertRaises(ValueError):
+                fetch_wigor_page(self.url, credentials=("alice", "wrong"))
+        self.assertIsNone(self.store.load("alice", self.url))
+
+    def test_cookie_header_bypasses_credentials(self, _):
+        page = fetch_wigor_page(self.url, "sid=none", credentials=("alice", "secret"))
+        self.assertFalse(page.is_timetable)
+        self.assertEqual(self.server.logins, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
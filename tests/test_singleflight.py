@@ -0,0 +1,189 @@
+"""
+Tests du regroupement des requêtes identiques simultanées (single-flight).
+"""
+
+import os
+import sys
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import patch
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.html_backend import is_html_parser_available, resolve_html_parser
+from src.singleflight import SingleFlight, get_single_flight, single_flight
+from src.wigor_api import fetch_wigor_html, get_wigor_timetable
+
+FIXTURE = Path(__file__).parent / "fixtures" / "wigor_multi_week.html"
+
+
+def _run_threads(count, target):
+    """Lance count threads sur target et retourne leurs résultats ou exceptions."""
+    results = [None] * count
+
+    def run(index):
+        try:
+            results[index] = target()
+        except Exception as e:
+            results[index] = e
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+
+def _wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition non atteinte")
+        time.sleep(0.005)
+
+
+class TestSingleFlight(unittest.TestCase):
+    def setUp(self):
+        self.group = SingleFlight()
+        self.release = threading.Event()
+        self.calls = 0
+
+    def _slow(self, value):
+        self.calls += 1
+        self.release.wait(5)
+        if isinstance(value, Exception):
+            raise value
+        return [value]
+
+    def test_concurrent_calls_share_one_execution(self):
+        threads, results = _run_threads(6, lambda: self.group.do("k", self._slow, "page"))
+        _wait_until(lambda: self.group.stats()["shared"] == 5)
+        self.release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(results[0], ["page"])
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(self.group.stats(), {"executed": 1, "shared": 5, "in_flight": 0})
+
+    def test_waiters_receive_the_same_error(self):
+        error = ConnectionError("Wigor indisponible")
+        threads, results = _run_threads(4, lambda: self.group.do("k", self._slow, error))
+        _wait_until(lambda: self.group.stats()["shared"] == 3)
+        self.release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.calls, 1)
+        self.assertTrue(all(result is error for result in results))
+
+    def test_completed_calls_are_not_cached(self):
+        self.release.set()
+        first = self.group.do("k", self._slow, "a")
+        second = self.group.do("k", self._slow, "a")
+        self.assertEqual(self.calls, 2)
+        self.assertIsNot(first, second)
+
+    def test_distinct_keys_run_independently(self):
+        self.release.set()
+        self.group.do("a", self._slow, 1)
+        self.group.do("b", self._slow, 2)
+        self.assertEqual(self.group.stats()["executed"], 2)
+
+    def test_disabled_group(self):
+        with patch.dict(os.environ, {"WIGOR_SINGLE_FLIGHT": "off"}):
+            self.assertIsNone(get_single_flight())
+            self.release.set()
+            self.assertEqual(single_flight("k", self._slow, "x"), ["x"])
+        self.assertIsNotNone(get_single_flight())
+
+
+class _SlowWigorHandler(BaseHTTPRequestHandler):
+    """Wigor de test: chaque réponse attend que le test la libère."""
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests += 1
+        server.release.wait(5)
+        data = server.body
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@patch("src.wigor_api._save_debug_html")
+class TestCoalescedTimetableFetch(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _SlowWigorHandler)
+        cls.server.body = FIXTURE.read_bytes()
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}/edt"
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.server.lock = threading.Lock()
+        self.server.requests = 0
+        self.server.release = threading.Event()
+        self.addCleanup(self.server.release.set)
+        patcher = patch.dict(os.environ, {"WIGOR_PARSE_CACHE": "0"})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _coalesce(self, count, target):
+        group = get_single_flight()
+        shared = group.stats()["shared"]
+        threads, results = _run_threads(count, target)
+        _wait_until(lambda: group.stats()["shared"] - shared >= count - 1)
+        self.server.release.set()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_identical_timetable_requests_share_fetch_and_parse(self, _):
+        # Sonde de disponibilité du backend (mémorisée) faite avant de compter les arbres
+        is_html_parser_available(resolve_html_parser(None))
+        real_init = BeautifulSoup.__init__
+        with patch.object(BeautifulSoup, "__init__", autospec=True, side_effect=real_init) as init:
+            results = self._coalesce(8, lambda: get_wigor_timetable(self.url, "sid=a"))
+
+        self.assertEqual(self.server.requests, 1)
+        self.assertEqual(init.call_count, 1)
+        self.assertTrue(results[0]["courses"])
+        self.assertTrue(all(result is results[0] for result in results))
+
+    def test_identical_html_requests_share_one_download(self, _):
+        results = self._coalesce(4, lambda: fetch_wigor_html(self.url, "sid=a"))
+        self.assertEqual(self.server.requests, 1)
+        self.assertEqual(len(set(results)), 1)
+
+    def test_other_cookies_are_fetched_separately(self, _):
+        threads, results = _run_threads(
+            2,
+            lambda: fetch_wigor_html(self.url, f"sid={threading.current_thread().name}"),
+        )
+        _wait_until(lambda: self.server.requests == 2)
+        self.server.release.set()
+        for thread in threads:
+            thread.join()
+        self.assertTrue(all(isinstance(result, str) for result in results))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,175 @@
+"""
+Tests du parsing incrémental et du téléchargement en streaming.
+"""
+
+import gc
+import os
+import sys
+import threading
+import tracemalloc
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.html_backend import make_soup
+from src.stream_parser import StreamingWigorParser, parse_wigor_stream
+from src.timetable_parser import _scan_document, parse_wigor_html
+from src.tracing import disable_tracing, enable_tracing, get_spans
+from src.wigor_api import fetch_wigor_courses_streaming
+from tests.synthetic import generate_wigor_page
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def _chunks(html: str, size: int):
+    for start in range(0, len(html), size):
+        yield html[start : start + size]
+
+
+def _scan_tuple(scan):
+    return (
+        [list(column) for column in scan.day_columns],
+        list(scan.day_cells),
+        [(style, dict(cells)) for style, cells in scan.course_blocks],
+    )
+
+
+class TestStreamingParity(unittest.TestCase):
+    """Le parsing incrémental donne le même résultat que parse_wigor_html (html.parser)."""
+
+    def setUp(self):
+        self.pages = [path.read_text(encoding="utf-8") for path in sorted(FIXTURES.glob("*.html"))]
+        self.pages.append(generate_wigor_page(3, 5, 4, seed=1).html)
+        self.pages += [
+            # td imbriqués, textes hors td, commentaires, script et CDATA
+            '<div class="Case" style="left:120%"><td class="TCase">a<script>x</script>'
+            '<!--c--><![CDATA[d]]> &amp; e&nbsp;<td class="TCase">in</td></td>'
+            '<td class="TCProf"/>p</div>',
+            # Balises non fermées, fermetures orphelines, éléments vides
+            '<div class="Jour" style="left:120%"><td class="TCJour">Lundi 1 Juin<td class="TCJour">'
+            'x</td></div><div class="Case" style="left:120%"><br><img></p><div class="Case">'
+            '<td class="TCase TCProf">T</td></span></div><div class="Case"><td class="TCase">open',
+        ]
+
+    def test_same_courses_and_scan_for_any_chunk_size(self):
+        for index, html in enumerate(self.pages):
+            expected = parse_wigor_html(html, parser="html.parser")
+            expected_scan = _scan_tuple(_scan_document(make_soup(html, "html.parser")))
+            for size in (1, 7, 512, len(html)):
+                with self.subTest(page=index, chunk_size=size):
+                    self.assertEqual(parse_wigor_stream(_chunks(html, size)), expected)
+                    parser = StreamingWigorParser()
+                    for chunk in _chunks(html, size):
+                        parser.feed(chunk)
+                    self.assertEqual(_scan_tuple(parser.close()), expected_scan)
+
+    def test_title_and_inner_case(self):
+        parser = StreamingWigorParser()
+        parser.feed((FIXTURES / "wigor_multi_week.html").read_text(encoding="utf-8"))
+        parser.close()
+        self.assertTrue(parser.title.startswith("EDT"))
+        self.assertTrue(parser.contains_inner_case)
+
+
+class TestIncrementalEmission(unittest.TestCase):
+    def test_courses_are_emitted_before_the_page_ends(self):
+        page = generate_wigor_page(3, 5, 4, seed=2)
+        fed = []
+        first_course_at = []
+
+        def chunks():
+            for chunk in _chunks(page.html, 1024):
+                fed.append(chunk)
+                yield chunk
+
+        def on_course(course):
+            if not first_course_at:
+                first_course_at.append(len(fed))
+
+        emitted = []
+        courses = parse_wigor_stream(
+            chunks(), on_course=lambda c: (on_course(c), emitted.append(dict(c)))
+        )
+
+        self.assertEqual(courses, page.main_week_courses)
+        self.assertLess(first_course_at[0], len(fed) // 4)
+        self.assertEqual(emitted, page.all_courses)
+
+    def test_peak_memory_is_below_tree_parsing(self):
+        html = generate_wigor_page(9, 6, 8, seed=3).html
+
+        def peak(func):
+            gc.collect()
+            tracemalloc.start()
+            try:
+                start, _ = tracemalloc.get_traced_memory()
+                func()
+                _, top = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            return top - start
+
+        stream_peak = peak(lambda: parse_wigor_stream(_chunks(html, 16 * 1024)))
+        tree_peak = peak(lambda: parse_wigor_html(html, parser="html.parser"))
+        self.assertLess(stream_peak, tree_peak / 3)
+
+
+class _ChunkedHandler(BaseHTTPRequestHandler):
+    """Sert la page en Transfer-Encoding: chunked."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = self.server.page.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for start in range(0, len(body), 4000):
+            piece = body[start : start + 4000]
+            self.wfile.write(f"{len(piece):x}\r\n".encode() + piece + b"\r\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestStreamingFetch(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _ChunkedHandler)
+        cls.server.page = (FIXTURES / "wigor_multi_week.html").read_text(encoding="utf-8")
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}/edt"
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def tearDown(self):
+        disable_tracing()
+
+    def test_streaming_fetch_matches_full_parse(self):
+        enable_tracing()
+        emitted = []
+        courses = fetch_wigor_courses_streaming(
+            self.url, "sid=a", on_course=emitted.append, chunk_size=1000
+        )
+
+        self.assertEqual(courses, parse_wigor_html(self.server.page, parser="html.parser"))
+        self.assertEqual(len(emitted), 25)
+        stream_span = next(e for e in get_spans() if e["name"] == "http.stream")
+        self.assertEqual(stream_span["args"]["status"], 200)
+        self.assertEqual(stream_span["args"]["chars"], len(self.server.page))
+
+    def test_empty_url(self):
+        with self.assertRaises(ValueError):
+            fetch_wigor_courses_streaming("")
+
+
+if __name__ == "__main__":
+    unittest.main()
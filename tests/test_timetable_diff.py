@@ -0,0 +1,121 @@
+"""
+Tests du re-parsing incrémental (diff de deux pages Wigor).
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.html_backend import available_html_parsers
+from src.timetable_diff import (
+    PageFingerprint,
+    _split_course_blocks,
+    diff_wigor_html,
+    fingerprint_wigor_html,
+)
+from src.timetable_parser import parse_wigor_html
+
+
+class TestTimetableDiff(unittest.TestCase):
+    """Diff bloc par bloc: seuls les div.Case modifiés sont re-parsés."""
+
+    def setUp(self):
+        fixture = os.path.join(os.path.dirname(__file__), "fixtures", "wigor_multi_week.html")
+        with open(fixture, "r", encoding="utf-8") as f:
+            self.html = f.read()
+        self.fingerprint = fingerprint_wigor_html(self.html)
+
+        # Blocs de la semaine principale (left entre 100% et 200%)
+        self.main_week_blocks = [
+            line
+            for line in self.html.splitlines()
+            if line.startswith('<div class="Case"') and "left:1" in line
+        ]
+
+    def test_fingerprint_matches_full_parse(self):
+        self.assertIsInstance(self.fingerprint, PageFingerprint)
+        self.assertEqual(self.fingerprint.courses, parse_wigor_html(self.html))
+        self.assertEqual(len(self.fingerprint.blocks), 25)
+
+    def test_unchanged_page_is_not_reparsed(self):
+        diff = diff_wigor_html(self.fingerprint, self.html)
+
+        self.assertFalse(diff.changed)
+        self.assertEqual(diff.reparsed_blocks, 0)
+        self.assertIs(diff.fingerprint, self.fingerprint)
+        self.assertIs(diff.courses, self.fingerprint.courses)
+
+    def test_room_change_is_a_modification(self):
+        block = self.main_week_blocks[0]
+        new_html = self.html.replace(block, block.replace("Salle:B204", "Salle:B301"))
+
+        diff = diff_wigor_html(self.fingerprint, new_html)
+
+        self.assertFalse(diff.full_reparse)
+        self.assertEqual(diff.reparsed_blocks, 1)
+        self.assertEqual((diff.added, diff.removed), ([], []))
+        self.assertEqual(len(diff.modified), 1)
+        old, new = diff.modified[0]
+        self.assertEqual((old["salle"], new["salle"]), ("Salle:B204(EPSI)", "Salle:B301(EPSI)"))
+        self.assertEqual(new["jour"], "Lundi 13 Octobre")
+        self.assertEqual(diff.courses, parse_wigor_html(new_html))
+
+    def test_added_and_removed_courses(self):
+        removed_block = self.main_week_blocks[1]
+        added_block = removed_block.replace("top:204px", "top:544px").replace(
+            "13:30 - 17:30", "18:00 - 19:00"
+        )
+        without = self.html.replace(removed_block, "")
+        diff = diff_wigor_html(self.fingerprint, without)
+        self.assertEqual(len(diff.removed), 1)
+        self.assertEqual(diff.removed[0]["titre"], "ARCHITECTURE LOGICIELLE")
+        self.assertEqual((diff.added, diff.modified), ([], []))
+
+        with_extra = self.html.replace(removed_block, removed_block + "\n" + added_block)
+        diff = diff_wigor_html(self.fingerprint, with_extra)
+        self.assertEqual(len(diff.added), 1)
+        self.assertEqual(diff.added[0]["horaire"], "18:00 - 19:00")
+        self.assertEqual(diff.reparsed_blocks, 1)
+        self.assertEqual(diff.courses, parse_wigor_html(with_extra))
+
+    def test_day_header_change_reuses_blocks(self):
+        """Un en-tête de jour modifié ne re-parse que le squelette de la page."""
+        new_html = self.html.replace("Lundi 13 Octobre", "Lundi 13 Novembre")
+
+        diff = diff_wigor_html(self.fingerprint, new_html)
+
+        self.assertFalse(diff.full_reparse)
+        self.assertEqual(diff.reparsed_blocks, 0)
+        self.assertEqual(diff.courses, parse_wigor_html(new_html))
+
+    def test_previous_html_and_every_backend(self):
+        block = self.main_week_blocks[2]
+        new_html = self.html.replace(block, block.replace("ANGLAIS", "ESPAGNOL"))
+        for parser in available_html_parsers():
+            with self.subTest(parser=parser):
+                diff = diff_wigor_html(self.html, new_html, parser=parser)
+                self.assertEqual(len(diff.modified), 1)
+                self.assertEqual(diff.courses, parse_wigor_html(new_html, parser=parser))
+
+    def test_first_page_everything_added(self):
+        diff = diff_wigor_html(None, self.html)
+        self.assertTrue(diff.full_reparse)
+        self.assertEqual(diff.added, self.fingerprint.courses)
+
+    def test_unsplittable_page_falls_back_to_full_parse(self):
+        # div.Case non fermé: découpage textuel impossible
+        html = self.html.replace("</form>", '<div class="Case"><td class="TCase">X</td></form>')
+        self.assertIsNone(_split_course_blocks(html))
+
+        nested = '<div class="Case"><div class="Case"><td class="TCase">A</td></div></div>'
+        self.assertIsNone(_split_course_blocks(nested))
+
+        diff = diff_wigor_html(self.fingerprint, html)
+        self.assertTrue(diff.full_reparse)
+        self.assertEqual(diff.courses, parse_wigor_html(html))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,228 @@
+"""
+Tests de la récupération de l'emploi du temps sur une plage de dates.
+"""
+
+import os
+import sys
+import threading
+import time
+import unittest
+from concurrent.futures import Future
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.course import Course
+from src.timetable_range import (
+    TimetableRangeFetcher,
+    WeekPageCache,
+    course_date,
+    week_start,
+    week_url,
+    weeks_between,
+)
+from tests.synthetic import _COURSE_BLOCK, _DAY_COLUMN, _PAGE_FOOTER, _PAGE_HEADER, day_header
+
+
+def _week_page(monday: date) -> str:
+    """Page Wigor de la semaine d'un lundi, semaines voisines comprises (un cours par jour)."""
+    parts = []
+    for week, offset in ((-1, 0), (0, 100), (1, 200)):
+        first = monday + timedelta(weeks=week)
+        days = [first + timedelta(days=i) for i in range(5)]
+        for i, day in enumerate(days):
+            parts.append(
+                _DAY_COLUMN.format(left=offset + i * 19.9, width=19.6, header=day_header(day))
+            )
+        for i, day in enumerate(days):
+            parts.append(
+                _COURSE_BLOCK.format(
+                    top=204,
+                    left=offset + i * 19.9,
+                    width=19.6,
+                    titre=f"COURS {day.isoformat()}",
+                    prof="DUPONT Jean",
+                    group="",
+                    horaire="09:00 - 12:00",
+                    salle="Salle:B204(EPSI)",
+                )
+            )
+    return _PAGE_HEADER + "".join(parts) + _PAGE_FOOTER
+
+
+class _WeekHandler(BaseHTTPRequestHandler):
+    """Wigor de test: la semaine affichée suit le paramètre date=MM/JJ/AAAA."""
+
+    def do_GET(self):
+        server = self.server
+        value = parse_qs(urlparse(self.path).query)["date"][0]
+        day = datetime.strptime(value, "%m/%d/%Y").date()
+        with server.lock:
+            server.requested.append(day)
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            fail = day in server.failing
+        time.sleep(server.delay)
+        with server.lock:
+            server.in_flight -= 1
+
+        if fail:
+            self.send_response(500)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        data = _week_page(week_start(day)).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestWeekHelpers(unittest.TestCase):
+    def test_week_url_replaces_date(self):
+        url = "https://wigor.example/WebPsDyn.aspx?action=posEDTLMS&Tel=a.b&date=01/05/2026&h=x"
+        self.assertEqual(
+            week_url(url, date(2026, 3, 4)),
+            "https://wigor.example/WebPsDyn.aspx?action=posEDTLMS&Tel=a.b&date=03/04/2026&h=x",
+        )
+        self.assertEqual(
+            week_url("https://wigor.example/edt?Tel=a.b", "2025-12-29"),
+            "https://wigor.example/edt?Tel=a.b&date=12/29/2025",
+        )
+
+    def test_weeks_between(self):
+        self.assertEqual(
+            weeks_between("2025-12-31", date(2026, 1, 12)),
+            [date(2025, 12, 29), date(2026, 1, 5), date(2026, 1, 12)],
+        )
+        self.assertEqual(week_start(datetime(2026, 1, 4, 10)), date(2025, 12, 29))
+        with self.assertRaises(ValueError):
+            weeks_between("2026-01-12", "2026-01-01")
+
+    def test_course_date_across_new_year(self):
+        course = Course(jour="Vendredi 2 Janvier")
+        self.assertEqual(course_date(course, date(2025, 12, 29)), date(2026, 1, 2))
+        course = Course(jour="Lundi 29 Décembre")
+        self.assertEqual(course_date(course, date(2026, 1, 5)), date(2025, 12, 29))
+        self.assertIsNone(course_date(Course(jour="?"), date(2026, 1, 5)))
+
+    def test_week_page_cache_expiry(self):
+        cache = WeekPageCache(ttl=0)
+        submitted = []
+
+        def submit():
+            submitted.append(1)
+            future = Future()
+            future.set_result("page")
+            return future
+
+        cache.get_or_submit(("u", "c"), submit)
+        cache.get_or_submit(("u", "c"), submit)
+        self.assertEqual(len(submitted), 2)
+
+
+@patch("src.wigor_api._save_debug_html")
+class TestTimetableRange(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _WeekHandler)
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}/WebPsDyn.aspx?Tel=a.b"
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        server = self.server
+        server.lock = threading.Lock()
+        server.requested = []
+        server.in_flight = server.max_in_flight = 0
+        server.failing = set()
+        server.delay = 0.0
+        patcher = patch.dict(os.environ, {"WIGOR_PARSE_CACHE": "0"})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.fetcher = TimetableRangeFetcher(max_workers=4)
+        self.addCleanup(self.fetcher.close, wait=True)
+
+    def _wait_for_prefetch(self, count):
+        deadline = time.monotonic() + 5
+        while len(self.server.requested) < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.05)
+
+    def test_range_is_merged_deduped_and_sorted(self, _):
+        result = self.fetcher.get_range(self.url, "2025-12-31", "2026-01-06", "sid=a")
+
+        titles = [course["titre"] for course in result["courses"]]
+        self.assertEqual(
+            titles,
+            [
+                "COURS 2025-12-31",
+                "COURS 2026-01-01",
+                "COURS 2026-01-02",
+                "COURS 2026-01-05",
+                "COURS 2026-01-06",
+            ],
+        )
+        self.assertEqual(list(result["weeks"]), ["2026-W01", "2026-W02"])
+        self.assertEqual(len(result["weeks"]["2026-W01"]), 3)
+
+    def test_weeks_are_fetched_concurrently(self, _):
+        self.server.delay = 0.2
+        self.fetcher.prefetch_weeks = 0
+        result = self.fetcher.get_range(self.url, "2026-03-02", "2026-03-29", "sid=a")
+
+        self.assertEqual(len(result["courses"]), 20)
+        self.assertEqual(len(self.server.requested), 4)
+        self.assertGreater(self.server.max_in_flight, 1)
+
+    def test_adjacent_weeks_are_prefetched(self, _):
+        self.fetcher.get_range(self.url, "2026-03-09", "2026-03-13", "sid=a")
+        self._wait_for_prefetch(3)
+        self.assertEqual(
+            sorted(self.server.requested),
+            [date(2026, 3, 2), date(2026, 3, 9), date(2026, 3, 16)],
+        )
+
+        # Semaine suivante: page déjà téléchargée, seule la semaine d'après est préchargée
+        result = self.fetcher.get_range(self.url, "2026-03-16", "2026-03-20", "sid=a")
+        self.assertEqual(len(result["courses"]), 5)
+        self._wait_for_prefetch(4)
+        self.assertEqual(self.server.requested.count(date(2026, 3, 16)), 1)
+        self.assertEqual(self.server.requested[-1], date(2026, 3, 23))
+        self.assertGreaterEqual(self.fetcher.cache.stats()["hits"], 2)
+
+    def test_other_cookies_do_not_share_pages(self, _):
+        self.fetcher.prefetch_weeks = 0
+        self.fetcher.get_range(self.url, "2026-03-09", "2026-03-09", "sid=a")
+        self.fetcher.get_range(self.url, "2026-03-09", "2026-03-09", "sid=b")
+        self.assertEqual(len(self.server.requested), 2)
+
+    def test_failed_week_is_not_cached(self, _):
+        self.fetcher.prefetch_weeks = 0
+        # Session sans nouvelles tentatives: l'erreur 500 remonte immédiatement
+        session = requests.Session()
+        self.server.failing.add(date(2026, 3, 9))
+        with self.assertRaises(requests.HTTPError):
+            self.fetcher.get_range(self.url, "2026-03-09", "2026-03-13", session=session)
+
+        self.server.failing.clear()
+        result = self.fetcher.get_range(self.url, "2026-03-09", "2026-03-13", session=session)
+        self.assertEqual(len(result["courses"]), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
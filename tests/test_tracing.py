@@ -0,0 +1,138 @@
+"""
+Tests du traçage des étapes du pipeline (spans, export Chrome trace-event).
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src import cli, tracing
+from src.timetable_parser import parse_wigor_html
+from src.tracing import (
+    disable_tracing,
+    enable_tracing,
+    get_spans,
+    is_tracing_enabled,
+    span,
+    summarize_spans,
+    to_chrome_trace,
+)
+from src.wigor_api import fetch_wigor_html
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "wigor_multi_week.html")
+
+
+class TestTracing(unittest.TestCase):
+    """Spans enregistrés seulement quand le traçage est actif."""
+
+    def setUp(self):
+        with open(FIXTURE, "r", encoding="utf-8") as f:
+            self.html = f.read()
+
+    def tearDown(self):
+        disable_tracing()
+
+    def test_disabled_tracing_records_nothing(self):
+        self.assertFalse(is_tracing_enabled())
+        with span("a", chars=1) as first, span("b") as second:
+            first.set(items=3)
+        self.assertIs(first, second)
+        self.assertEqual(get_spans(), [])
+
+    def test_parse_stages_are_traced(self):
+        enable_tracing()
+        courses = parse_wigor_html(self.html)
+
+        spans = {event["name"]: event for event in get_spans()}
+        for name in (
+            "parse.soup",
+            "parse.scan",
+            "parse.map_days",
+            "parse.extract_courses",
+            "parse.assign_days",
+            "parse.week_filter",
+            "parse.sort",
+        ):
+            self.assertIn(name, spans)
+            self.assertEqual(spans[name]["ph"], "X")
+            self.assertGreaterEqual(spans[name]["dur"], 0)
+
+        self.assertEqual(spans["parse.soup"]["args"]["chars"], len(self.html))
+        self.assertEqual(spans["parse.scan"]["args"]["blocks"], 25)
+        self.assertEqual(spans["parse.week_filter"]["args"]["kept"], len(courses))
+
+    @patch("src.wigor_api._save_debug_html")
+    @patch("requests.Session.get")
+    def test_fetch_stages_are_traced(self, mock_get, mock_save):
+        response = Mock(
+            status_code=200,
+            text=self.html,
+            content=self.html.encode("utf-8"),
+            url="https://example.com/edt",
+        )
+        mock_get.return_value = response
+
+        enable_tracing()
+        fetch_wigor_html("https://example.com/edt", "a=b")
+
+        names = [event["name"] for event in get_spans()]
+        self.assertIn("http.get", names)
+        # La page n'est tokenisée qu'au parsing, pas au téléchargement
+        self.assertNotIn("parse.soup", names)
+        http_span = next(e for e in get_spans() if e["name"] == "http.get")
+        self.assertEqual(http_span["args"]["status"], 200)
+        self.assertEqual(http_span["args"]["bytes"], len(self.html.encode("utf-8")))
+
+    def test_failed_span_keeps_error(self):
+        enable_tracing()
+        with self.assertRaises(ValueError):
+            with span("boom"):
+                raise ValueError("x")
+        self.assertEqual(get_spans()[0]["args"]["error"], "ValueError")
+
+    def test_chrome_trace_and_summary(self):
+        enable_tracing()
+        for _ in range(3):
+            with span("etape", items=1):
+                pass
+
+        document = json.loads(json.dumps(to_chrome_trace()))
+        self.assertEqual(len(document["traceEvents"]), 3)
+        summary = summarize_spans()
+        self.assertEqual(summary["etape"]["count"], 3)
+        self.assertLessEqual(summary["etape"]["p50_ms"], summary["etape"]["max_ms"])
+
+    def test_cli_writes_trace_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            trace_path = os.path.join(tmp, "trace.json")
+            argv = ["wigor-cli", "--test-parsing", FIXTURE, "--trace", trace_path]
+            with patch.object(sys, "argv", argv), patch.dict(
+                os.environ, {"WIGOR_PARSE_CACHE": "0"}
+            ):
+                self.assertEqual(cli.main(), 0)
+
+            with open(trace_path, "r", encoding="utf-8") as f:
+                names = {event["name"] for event in json.load(f)["traceEvents"]}
+        self.assertIn("cli.test_parsing", names)
+        self.assertIn("parse.soup", names)
+
+    def test_disabled_overhead_is_negligible(self):
+        """Un span désactivé coûte un appel de fonction (bien moins d'une µs)."""
+        iterations = 100_000
+        start = time.perf_counter()
+        for _ in range(iterations):
+            with span("noop", items=1):
+                pass
+        per_span = (time.perf_counter() - start) / iterations
+        self.assertIs(tracing._tracer, None)
+        self.assertLess(per_span, 20e-6)
+
+
+if __name__ == "__main__":
+    unittest.main()